@@ -34,7 +34,7 @@ from asmgen.registers import (
 from asmgen.asmblocks.noarch import asmgen
 from asmgen.callconv.callconv import callconv
 from asmgen.callconv.fngen import fngen
-from asmgen.asmblocks.noarch import comparison
+from asmgen.asmblocks.noarch import comparison,bscalar_strategy
 from asmgen.asmblocks.operations import opd3_modifier as mod
 
 import sys
@@ -122,24 +122,13 @@ def main():
                 reg=vlen,
                 bit_count=adt_size(dt).bit_length()-1)
     
-    can_vf = True
-    fma_mods = {mod.VF}
+    # alpha is passed in a scalar register, it can be used directly with the
+    # vf form, every other strategy needs it in a vector register
+    fma_mods = set()
     breg = alpha
-    try:
-        gen.fma(
-            adreg=gen.vreg(0),
-            bdreg=gen.freg(1, adt.FP64),
-            cdreg=gen.vreg(2),
-            a_dt=dt,
-            b_dt=dt,
-            c_dt=dt,
-            modifiers=fma_mods
-            )
-    except:
-        can_vf = False
-        fma_mods = {}
-
-    if not can_vf:
+    if bscalar_strategy.VF == gen.select_bscalar_strategy(dt=dt):
+        fma_mods = {mod.VF}
+    else:
         alpha_vreg_idx = rt.reserve_any_reg("vreg")
         alpha_vreg = gen.vreg(alpha_vreg_idx)
         innerblock += gen.fill_vector(sreg=alpha, vreg=alpha_vreg, dt=dt)
@@ -85,6 +85,14 @@ class aarch64(asmgen):
     def set_parameter(self, name : str, value : Union[str,int]):
         raise ValueError(f"Invalid name {name} or value {value}")
 
+    def dt_supportedby_cpuinfo(self, cpuinfo : str, dt : adt) -> bool:
+        if not self.supportedby_cpuinfo(cpuinfo):
+            return False
+        # FP16 arithmetic is optional before Armv8.2 (FEAT_FP16)
+        if adt.HALF == dt:
+            return all(-1 != cpuinfo.find(f) for f in ['fphp', 'asimdhp'])
+        return True
+
     @property
     def are_fregs_in_vregs(self) -> bool:
         return True
@@ -226,6 +234,11 @@ class aarch64(asmgen):
                  dt : adt) -> str:
         return self.asmwrap(f"fmov {dst},{src}")
 
+    def greg_to_freg(self, *, greg : greg_base, freg : freg_base,
+                     dt : adt) -> str:
+        _ = dt # explicitly unused, the size is part of freg
+        return self.asmwrap(f"ucvtf {freg},{greg}")
+
     def zero_freg(self, *, freg : freg_base, dt : adt) -> str:
         _ = dt # explicitly unused
         return self.asmwrap(f"fmov {freg},#0")
@@ -321,6 +334,30 @@ class aarch64(asmgen):
                          offset : int) -> str:
         return self.asmwrap(f"prfm pldl1strm,[{areg},#{offset}]")
 
+    def prefetch_immoff(self, *, areg : greg_base, offset : int,
+                        level : int = 1, write : bool = False) -> str:
+        return self.asmwrap(f"prfm {self.prfop(level, write)},[{areg},#{offset}]")
+
+    @staticmethod
+    def prfop(level : int, write : bool) -> str:
+        """
+        Returns the prefetch operation (e.g. pldl2keep) for the PRFM/PRF* instructions
+
+        :param level: Targeted cache level (1-3)
+        :type level: int
+        :param write: Prefetch in preparation of a store
+        :type write: bool
+        :return: Prefetch operation
+        :rtype: str
+        """
+        if level not in [1,2,3]:
+            raise ValueError(f"Invalid prefetch cache level {level}")
+        kind = "pst" if write else "pld"
+        return f"{kind}l{level}keep"
+
     def load_pointer(self, *, areg : greg_base,
                      name : str) -> str:
         return self.asmwrap(f"ldr {areg},%[{name}]")
+
+    def load_data_address(self, *, areg : greg_base, name : str) -> str:
+        return self.asmwrap(f"adr {areg},{self.labelstr(name)}")
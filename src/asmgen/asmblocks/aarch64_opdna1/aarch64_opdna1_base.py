@@ -54,6 +54,10 @@ class aarch64_opdna1(opdna1):
 
     def check_modifiers(self, modifiers: set[mod]):
 
+        if mod.FF in modifiers:
+            raise ValueError("Base AArch64 has no first-faulting ld/st")
+        if mod.QBCAST in modifiers or mod.OBCAST in modifiers:
+            raise ValueError("Base AArch64 has no segment-replicating loads")
         if mod.TINDEX in modifiers:
             raise ValueError(
                     "Base AArch64 has no ld/st with 2D tile offset indices")
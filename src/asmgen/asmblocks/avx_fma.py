@@ -7,25 +7,46 @@
 X86_64/AVX/FMA asm generator and related types
 """
 
+import re
 from copy import deepcopy
-from typing import Union
+from typing import Union,Callable
 from abc import abstractmethod
 
-from ..asmdata import asm_data
+from ..asmdata import asm_data,adt_fp_bits
 from ..registers import (
     reg_tracker,
     asm_data_type as adt,
     adt_size,
+    adt_is_float,
+    adt_is_int,
     asm_index_type as ait,
+    ait_size,
     treg_base, vreg_base, freg_base, greg_base
 )
 
-from .noarch import asmgen,comparison
+from .noarch import asmgen,comparison,asmunwrap
 from ..callconv.callconv import callconv
 
-from .types.avx_types import x86_greg,avx_freg,xmm_vreg,ymm_vreg,zmm_vreg,reg_prefixer
+from .types.avx_types import (
+    x86_greg,avx_freg,xmm_vreg,ymm_vreg,zmm_vreg,avx512_mreg,reg_prefixer
+)
 
-from .avx_opd3 import avx_fma,avx_fmul,avx_fadd
+from .avx_opd3 import (
+    avx_fma,avx_fmul,avx_fadd,avx_cfma,avx_cadd,
+    avx_fmax,avx_fmin,avx_fdiv
+)
+from .avx_opperm import avx_zip,avx_uzp,avx_trn
+from .avx_opred import avx_faddv,avx_fmaxv,avx_fminv
+from .avx_opcvt import avx_fcvt
+from .avx_opcmp import avx_cmp
+from .avx_opsel import avx_sel
+from .avx_oplut import avx_tbl
+from .operations import opcvt_modifier
+from .avx_opdna1 import (
+    avx128_load,avx128_store,
+    avx256_load,avx256_store,
+    avx512_load,avx512_store
+)
 
 class avxbase(asmgen):
     """
@@ -103,6 +124,26 @@ class avxbase(asmgen):
                 break
         return supported
 
+    def dt_supportedby_cpuinfo(self, cpuinfo : str, dt : adt) -> bool:
+        if not self.supportedby_cpuinfo(cpuinfo):
+            return False
+        if adt.HALF == dt and not self.fma.has_fp16:
+            return False
+        return all(-1 != cpuinfo.find(f) for f in self.get_dt_req_flags(dt))
+
+    def get_dt_req_flags(self, dt : adt) -> list[str]:
+        """
+        Return flags in cpuinfo required in addition to :meth:`get_req_flags` to
+        convert, compare, blend or look up vectors of the data type
+
+        :param dt: Data type of the vector elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: List of cpuinfo flags
+        :rtype: list[str]
+        """
+        _ = dt # explicitly unused, no extensions needed by default
+        return []
+
     dt_suffixes = {
             adt.DOUBLE : "d",
             adt.SINGLE : "s",
@@ -145,6 +186,33 @@ class avxbase(asmgen):
         """
         return f"iota_{size*8}x{count}"
 
+    def rip_address(self, label : str) -> str:
+        """
+        Returns the RIP-relative memory operand addressing ISA data
+
+        :param label: Name of the ISA data entry (see :meth:`isadata`)
+        :type label: str
+        :return: Memory operand for normal or inline ASM use
+        :rtype: str
+        """
+        rip = '%%rip' if self.output_inline else '%rip'
+        return f"{self.labelstr(label)}({rip})"
+
+    def data_address(self, label : str, data : list[asm_data]) -> str:
+        """
+        Ensures the ISA data entry exists and returns its RIP-relative memory operand
+
+        :param label: Name of the ISA data entry (see :meth:`isadata`)
+        :type label: str
+        :param data: Contents of the entry if it doesn't exist yet
+        :type data: list[class:`asmgen.asmdata.asm_data`]
+        :return: Memory operand for normal or inline ASM use
+        :rtype: str
+        """
+        if label not in self.asmdata:
+            self.asmdata[label] = data
+        return self.rip_address(label)
+
     def ensure_indices(self, dt : adt, count : int):
         """
         Ensures iota data for this data type and element count exists
@@ -182,6 +250,48 @@ class avxbase(asmgen):
     def isaendquirks(self, *, rt : reg_tracker, dt : adt):
         return ""
 
+    def nt_fence(self) -> str:
+        return self.asmwrap("sfence")
+
+    def optimize_mode_transitions(self, asmblock : str) -> str:
+        """
+        Returns the ASM block with vzeroupper inserted before ret and call
+        if the upper halves of the vector registers may be dirty, avoiding
+        AVX/SSE transition penalties in the caller/callee. vzeroupper that
+        follows another one without ymm/zmm use in between is removed.
+
+        Inline blocks without ret/call are left as is, the compiler has to handle
+        the transition since it may keep live values in the upper halves
+
+        :param asmblock: ASM generated by this generator
+        :type asmblock: str
+        :return: ASM block with optimized mode transitions
+        :rtype: str
+        """
+        wide_reg = re.compile(r"%%?[yz]mm\d")
+        result = []
+        # None: unknown, e.g. at block start or at a label reachable from elsewhere
+        clean = None
+        wide_used = False
+        for line in asmblock.splitlines(keepends=True):
+            inst = asmunwrap(line)
+            mnemonic = inst.split(' ')[0]
+            if mnemonic in ("vzeroupper", "vzeroall"):
+                if clean:
+                    continue
+                clean = True
+            elif mnemonic in ("ret", "retq", "call", "callq"):
+                if wide_used and not clean:
+                    result.append(line.replace(inst, "vzeroupper", 1))
+                    clean = True
+            elif inst.endswith(':'):
+                clean = False if wide_used else None
+            elif wide_reg.search(inst):
+                wide_used = True
+                clean = False
+            result.append(line)
+        return "".join(result)
+
     def jzero(self, *, reg : greg_base, label : str) -> str:
         preg = self.rpref(reg)
         asmblock  = self.asmwrap(f"test {preg},{preg}")
@@ -281,6 +391,18 @@ class avxbase(asmgen):
 
         return asmblock
 
+    def vector_loop(self, *, count_reg : greg_base, step_reg : greg_base,
+                    label : str, dt : adt,
+                    body : Callable[[avx512_mreg|None, greg_base], str],
+                    mreg : avx512_mreg|None = None) -> str:
+        raise NotImplementedError("AVX/AVX2 has no mask registers for loop tails")
+
+    def ff_loop(self, *, step_reg : greg_base, label : str, dt : adt,
+                load : Callable[[], str],
+                body : Callable[[avx512_mreg|None, greg_base], str],
+                mreg : avx512_mreg|None = None) -> str:
+        raise NotImplementedError("AVX has no first-faulting loads")
+
     @property
     def is_vla(self):
         return False
@@ -408,6 +530,16 @@ class avxbase(asmgen):
         suf = 's'+self.dt_suffixes[dt]
         return self.asmwrap(f"vmov{suf} {src}, {dst}")
 
+    def greg_to_freg(self, *, greg : greg_base, freg : freg_base,
+                     dt : adt) -> str:
+        if dt not in [adt.FP32, adt.FP64]:
+            raise ValueError(f"AVX vcvtsi2s* doesn't support {dt}")
+        # Signed conversion, AVX/AVX2 have no unsigned one, exact below 2^63
+        suf = 's'+self.dt_suffixes[dt]
+        pg = self.rpref(greg)
+        pf = self.rpref(freg)
+        return self.asmwrap(f"vcvtsi2{suf}q {pg},{pf},{pf}")
+
 
     def load_greg(self, *, areg : greg_base, offset : int, dst : greg_base) -> str:
         pareg = self.rpref(areg)
@@ -553,29 +685,97 @@ class avxbase(asmgen):
         index_count = self.simd_size//adt_size(dt)
         self.ensure_indices(dt, index_count)
         label = self.iota_label(dt_size, index_count)
-        label = self.labelstr(label)
 
         pst = self.rpref(streg,size=dt_size)
         pv = self.rpref(vreg)
 
         suf = self.size_suffixes[dt_size]
         result  = self.asmwrap(f"vpbroadcast{suf} {pst},{pv}")
-        #TODO: properly handle RIP
-        rip = '%rip'
-        if self.output_inline:
-            rip = '%%rip'
-        result += self.asmwrap(f"vpmull{suf} {label}({rip}),{pv},{pv}")
+        result += self.asmwrap(f"vpmull{suf} {self.rip_address(label)},{pv},{pv}")
+
+        return result
 
+    def unpack_nibbles(self, *, vreg : vreg_base, lodst : vreg_base, hidst : vreg_base,
+                       tmpreg : vreg_base|None = None) -> str:
+        if tmpreg is None:
+            raise ValueError("AVX needs a temporary register for the nibble mask")
+        if lodst.idx == hidst.idx or tmpreg.idx in [vreg.idx, lodst.idx, hidst.idx]:
+            raise ValueError("The destinations and the temporary register have to be distinct")
+
+        # The byte operations need AVX2 on ymm and AVX512BW on zmm, which
+        # get_dt_req_flags requires for UINT8. Broadcasting the mask as a
+        # dword avoids vpbroadcastb, which would need AVX2 on xmm as well
+        key = "nibble_mask"
+        if key not in self.asmdata:
+            self.asmdata[key] = [asm_data(adt.UINT32, 0x0f0f0f0f)]
+
+        pv = self.rpref(vreg)
+        pl = self.rpref(lodst)
+        ph = self.rpref(hidst)
+        pt = self.rpref(tmpreg)
+        vpand = "vpandq" if isinstance(vreg, zmm_vreg) else "vpand"
+        result = self.asmwrap(f"vbroadcastss {self.rip_address(key)},{pt}")
+        lo  = self.asmwrap(f"{vpand} {pt},{pv},{pl}")
+        # The word shift moves the low nibble of the next byte into the high bits
+        hi  = self.asmwrap(f"vpsrlw $4,{pv},{ph}")
+        hi += self.asmwrap(f"{vpand} {pt},{ph},{ph}")
+        # Don't overwrite the packed bytes before both halves are extracted
+        return result + (hi+lo if lodst.idx == vreg.idx else lo+hi)
+
+    def scale_pow2(self, *, vreg : vreg_base, nreg : vreg_base, dt : adt) -> str:
+        _,mbits,_ = adt_fp_bits(dt)
+        suf = self.size_suffixes[adt_size(dt)]
+        pv = self.rpref(vreg)
+        pn = self.rpref(nreg)
+        result  = self.asmwrap(f"vpsll{suf} ${mbits},{pn},{pn}")
+        result += self.asmwrap(f"vpadd{suf} {pn},{pv},{pv}")
+        return result
+
+    # pylint: disable-next=too-many-arguments
+    def split_exponent(self, *, vreg : vreg_base, ereg : vreg_base, offreg : vreg_base,
+                       tmpreg : vreg_base, dt : adt) -> str:
+        _,mbits,_ = adt_fp_bits(dt)
+        suf = self.size_suffixes[adt_size(dt)]
+        if 'q' == suf and not isinstance(vreg, zmm_vreg):
+            raise ValueError("vpsraq is only available with AVX512")
+        pv = self.rpref(vreg)
+        pe = self.rpref(ereg)
+        po = self.rpref(offreg)
+        pt = self.rpref(tmpreg)
+        # Integer difference to o, its exponent field is e
+        result  = self.asmwrap(f"vpsub{suf} {po},{pv},{pe}")
+        result += self.asmwrap(f"vpsra{suf} ${mbits},{pe},{pe}")
+        result += self.asmwrap(f"vpsll{suf} ${mbits},{pe},{pt}")
+        result += self.asmwrap(f"vpsub{suf} {pt},{pv},{pv}")
         return result
 
+    def sqrt_vreg(self, *, vreg : vreg_base, dst : vreg_base, dt : adt) -> str:
+        if dt not in [adt.FP32, adt.FP64]:
+            raise ValueError(f"AVX vsqrt doesn't support {dt}")
+        suf = 'p'+self.dt_suffixes[dt]
+        return self.asmwrap(f"vsqrt{suf} {self.rpref(vreg)},{self.rpref(dst)}")
+
     def prefetch_l1_immoff(self, *, areg : greg_base, offset : int):
         preg = self.rpref(areg)
         return self.asmwrap(f"prefetcht0 {offset}({preg})")
 
+    def prefetch_immoff(self, *, areg : greg_base, offset : int,
+                        level : int = 1, write : bool = False):
+        if level not in [1,2,3]:
+            raise ValueError(f"Invalid prefetch cache level {level}")
+        preg = self.rpref(areg)
+        # prefetchw always targets L1
+        inst = "prefetchw" if write else f"prefetcht{level-1}"
+        return self.asmwrap(f"{inst} {offset}({preg})")
+
     def load_pointer(self, *, areg : greg_base, name : str):
         preg = self.rpref(areg)
         return self.asmwrap(f"mov %[{name}],{preg}")
 
+    def load_data_address(self, *, areg : greg_base, name : str) -> str:
+        preg = self.rpref(areg)
+        return self.asmwrap(f"lea {self.rip_address(name)},{preg}")
+
     def fill_vector(self, *, sreg : freg_base,
                     vreg : vreg_base, dt : adt):
         suf = 's'+self.dt_suffixes[dt]
@@ -583,23 +783,37 @@ class avxbase(asmgen):
         pv = self.rpref(vreg)
         return self.asmwrap(f"vbroadcast{suf} {ps}, {pv}")
 
+    def vmovu_inst(self, dt : adt) -> str:
+        """
+        Returns the unaligned vector move for the data type. There is no FP16 move,
+        FP16 and integer vectors are moved as FP32 bit patterns
+
+        :param dt: Data type of the vector elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: ASM instruction name
+        :rtype: str
+        """
+        if adt.HALF == dt or not adt_is_float(dt):
+            return "vmovups"
+        return f"vmovup{self.dt_suffixes[dt]}"
+
     def load_vector_voff(self, *, areg : greg_base, voffset : int, vreg : vreg_base, dt : adt):
-        suf = 'p'+self.dt_suffixes[dt]
+        inst = self.vmovu_inst(dt)
         pa = self.rpref(areg)
         pv = self.rpref(vreg)
         address = f"{voffset*self.simd_size}({pa})"
         if 0 == voffset:
             address = f"({pa})"
-        return self.asmwrap(f"vmovu{suf} {address},{pv}")
+        return self.asmwrap(f"{inst} {address},{pv}")
 
     def load_vector_immoff(self, *, areg : greg_base, offset : int, vreg : vreg_base, dt : adt):
-        suf = 'p'+self.dt_suffixes[dt]
+        inst = self.vmovu_inst(dt)
         pa = self.rpref(areg)
         pv = self.rpref(vreg)
         address = f"{offset}({pa})"
         if 0 == offset:
             address = f"({pa})"
-        return self.asmwrap(f"vmovu{suf} {address},{pv}")
+        return self.asmwrap(f"{inst} {address},{pv}")
 
     def load_scalar_immoff(self, *, areg : greg_base, offset : int, freg : freg_base, dt : adt):
         suf = 's'+self.dt_suffixes[dt]
@@ -633,53 +847,308 @@ class avxbase(asmgen):
                 "AVX doesn't have a post-index load, use load_vector_bcast1_immoff instead")
 
     def store_vector_immoff(self, *, areg : greg_base, offset : int, vreg : vreg_base, dt : adt):
-        suf = 'p'+self.dt_suffixes[dt]
+        inst = self.vmovu_inst(dt)
         pa = self.rpref(areg)
         pv = self.rpref(vreg)
         address = f"{offset}({pa})"
         if 0 == offset:
             address = f"({pa})"
-        return self.asmwrap(f"vmovu{suf} {pv},{address}")
+        return self.asmwrap(f"{inst} {pv},{address}")
 
     def store_vector_voff(self, *, areg : greg_base, voffset : int, vreg : vreg_base, dt : adt):
-        suf = 'p'+self.dt_suffixes[dt]
+        inst = self.vmovu_inst(dt)
         pa = self.rpref(areg)
         pv = self.rpref(vreg)
         address = f"{voffset*self.simd_size}({pa})"
         if 0 == voffset:
             address = f"({pa})"
-        return self.asmwrap(f"vmovu{suf} {pv},{address}")
+        return self.asmwrap(f"{inst} {pv},{address}")
 
     def store_vector(self, *, areg : greg_base, vreg : vreg_base, dt : adt):
         return self.store_vector_voff(areg=areg, voffset=0, vreg=vreg, dt=dt)
 
 
+    def scratch_vreg(self, tmpvreg : vreg_base|None, *used : vreg_base) -> vreg_base:
+        """
+        Returns the vector register to use as scratch for multi-instruction
+        sequences (gather masks, upper halves of strided accesses)
+
+        If no register is given, the highest architectural vector register is
+        used. Callers that keep live data in it must pass their own register.
+
+        :param tmpvreg: Caller-provided scratch register or None
+        :type tmpvreg: class:`asmgen.registers.vreg_base`
+        :param used: Registers the scratch register must not alias
+        :type used: class:`asmgen.registers.vreg_base`
+        :return: scratch vector register
+        :rtype: class:`asmgen.registers.vreg_base`
+        """
+        if tmpvreg is None:
+            tmpvreg = self.vreg(self.max_vregs-1)
+        for reg in used:
+            if reg.idx == tmpvreg.idx:
+                raise ValueError(
+                    f"Scratch register {tmpvreg} aliases operand {reg}, "
+                    "pass a different tmpvreg")
+        return tmpvreg
+
+    def strided_addresses(self, *, areg : greg_base, count : int,
+                          byte_stride : int|None = None,
+                          sreg : greg_base|None = None) -> tuple[list[str],list[str],str]:
+        """
+        Returns the addresses of count elements with a constant stride, together
+        with the instructions that have to be executed before each element is
+        accessed and after all elements were accessed
+
+        For GP register strides, x86 addressing only allows scales of 1,2,4 and 8,
+        so the base register is advanced in between and restored at the end
+        (this clobbers the flags)
+
+        :param areg: GP register containing the base address
+        :type areg: class:`asmgen.registers.greg_base`
+        :param count: Number of elements
+        :type count: int
+        :param byte_stride: stride between elements in bytes (immediate)
+        :type byte_stride: int
+        :param sreg: GP register containing the stride between elements in bytes
+        :type sreg: class:`asmgen.registers.greg_base`
+        :return: per-element setup instructions, per-element addresses, restore instructions
+        :rtype: tuple[list[str],list[str],str]
+        """
+        pa = self.rpref(areg)
+        setups = []
+        addresses = []
+        if sreg is None:
+            for i in range(count):
+                offset = i*byte_stride
+                setups.append("")
+                addresses.append(f"{offset}({pa})" if 0 != offset else f"({pa})")
+            return setups, addresses, ""
+
+        ps = self.rpref(sreg)
+        shift = 0
+        for i in range(count):
+            setup = ""
+            if i-shift not in (0,1,2,4,8):
+                setup = self.asmwrap(f"lea ({pa},{ps},2),{pa}")
+                shift += 2
+            scale = i-shift
+            setups.append(setup)
+            if 0 == scale:
+                addresses.append(f"({pa})")
+            else:
+                addresses.append(f"({pa},{ps},{scale})")
+
+        restore = ""
+        if shift > 0:
+            restore += self.asmwrap(f"neg {ps}")
+            for scale in (8,4,2,1):
+                while shift >= scale:
+                    restore += self.asmwrap(f"lea ({pa},{ps},{scale}),{pa}")
+                    shift -= scale
+            restore += self.asmwrap(f"neg {ps}")
+        return setups, addresses, restore
+
+    def xmm_lane_load(self, *, address : str, vreg : vreg_base, lane : int, dt : adt) -> str:
+        """
+        Returns the instruction loading a single element into a lane of an XMM register
+
+        Loading lane 0 zeroes all other lanes
+
+        :param address: memory operand to load from
+        :type address: str
+        :param vreg: XMM register to load into
+        :type vreg: class:`asmgen.asmblocks.types.avx_types.xmm_vreg`
+        :param lane: lane to load into
+        :type lane: int
+        :param dt: Data type of the element
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instruction
+        :rtype: str
+        """
+        pv = self.rpref(xmm_vreg(vreg.idx))
+        if adt.FP64 == dt:
+            if 0 == lane:
+                return self.asmwrap(f"vmovsd {address},{pv}")
+            return self.asmwrap(f"vmovhpd {address},{pv},{pv}")
+        if adt.FP32 == dt:
+            if 0 == lane:
+                return self.asmwrap(f"vmovss {address},{pv}")
+            return self.asmwrap(f"vinsertps ${lane << 4},{address},{pv},{pv}")
+        raise NotImplementedError(f"AVX lane assembly not implemented for {dt}")
+
+    def xmm_lane_store(self, *, address : str, vreg : vreg_base, lane : int, dt : adt) -> str:
+        """
+        Returns the instruction storing a single element from a lane of an XMM register
+
+        :param address: memory operand to store to
+        :type address: str
+        :param vreg: XMM register to store from
+        :type vreg: class:`asmgen.asmblocks.types.avx_types.xmm_vreg`
+        :param lane: lane to store
+        :type lane: int
+        :param dt: Data type of the element
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instruction
+        :rtype: str
+        """
+        pv = self.rpref(xmm_vreg(vreg.idx))
+        if adt.FP64 == dt:
+            if 0 == lane:
+                return self.asmwrap(f"vmovsd {pv},{address}")
+            return self.asmwrap(f"vmovhpd {pv},{address}")
+        if adt.FP32 == dt:
+            if 0 == lane:
+                return self.asmwrap(f"vmovss {pv},{address}")
+            return self.asmwrap(f"vextractps ${lane},{pv},{address}")
+        raise NotImplementedError(f"AVX lane assembly not implemented for {dt}")
+
+    def load_vector_strided(self, *, areg : greg_base,
+                            byte_stride : int|None, sreg : greg_base|None,
+                            vreg : vreg_base, dt : adt,
+                            tmpvreg : vreg_base|None = None) -> str:
+        """
+        Returns the string containing the instructions to load a strided vector
+        by inserting the elements lane by lane. For 256 bit vectors the upper
+        half is assembled in a scratch register and inserted at the end
+
+        :param areg: GP register containing the base address
+        :type areg: class:`asmgen.registers.greg_base`
+        :param byte_stride: stride between elements in bytes (if sreg is None)
+        :type byte_stride: int
+        :param sreg: GP register containing the stride between elements in bytes
+        :type sreg: class:`asmgen.registers.greg_base`
+        :param vreg: vector register to load the values into
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param dt: Data type of the values
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param tmpvreg: scratch vector register (only used for 256 bit vectors)
+        :type tmpvreg: class:`asmgen.registers.vreg_base`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        count = self.simd_size//adt_size(dt)
+        half = 16//adt_size(dt)
+        setups, addresses, restore = self.strided_addresses(
+                areg=areg, count=count, byte_stride=byte_stride, sreg=sreg)
+
+        upper = vreg
+        if count > half:
+            upper = self.scratch_vreg(tmpvreg, vreg)
+
+        asmblock = ""
+        for i in range(count):
+            asmblock += setups[i]
+            dst = vreg if i < half else upper
+            asmblock += self.xmm_lane_load(address=addresses[i], vreg=dst,
+                                           lane=i%half, dt=dt)
+        asmblock += restore
+        if count > half:
+            pu = self.rpref(xmm_vreg(upper.idx))
+            pv = self.rpref(vreg)
+            asmblock += self.asmwrap(f"vinsertf128 $1,{pu},{pv},{pv}")
+        return asmblock
+
+    def store_vector_strided(self, *, areg : greg_base,
+                             byte_stride : int|None, sreg : greg_base|None,
+                             vreg : vreg_base, dt : adt,
+                             tmpvreg : vreg_base|None = None) -> str:
+        """
+        Returns the string containing the instructions to store a vector with
+        a stride by extracting the elements lane by lane. For 256 bit vectors
+        the upper half is extracted into a scratch register first
+
+        :param areg: GP register containing the base address
+        :type areg: class:`asmgen.registers.greg_base`
+        :param byte_stride: stride between elements in bytes (if sreg is None)
+        :type byte_stride: int
+        :param sreg: GP register containing the stride between elements in bytes
+        :type sreg: class:`asmgen.registers.greg_base`
+        :param vreg: vector register to store the values from
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param dt: Data type of the values
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param tmpvreg: scratch vector register (only used for 256 bit vectors)
+        :type tmpvreg: class:`asmgen.registers.vreg_base`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        count = self.simd_size//adt_size(dt)
+        half = 16//adt_size(dt)
+        setups, addresses, restore = self.strided_addresses(
+                areg=areg, count=count, byte_stride=byte_stride, sreg=sreg)
+
+        asmblock = ""
+        upper = vreg
+        if count > half:
+            upper = self.scratch_vreg(tmpvreg, vreg)
+            pu = self.rpref(xmm_vreg(upper.idx))
+            pv = self.rpref(vreg)
+            asmblock += self.asmwrap(f"vextractf128 $1,{pv},{pu}")
+
+        for i in range(count):
+            asmblock += setups[i]
+            src = vreg if i < half else upper
+            asmblock += self.xmm_lane_store(address=addresses[i], vreg=src,
+                                            lane=i%half, dt=dt)
+        asmblock += restore
+        return asmblock
+
     def load_vector_immstride(self, *, areg : greg_base, byte_stride : int,
-                    vreg : vreg_base, dt : adt):
-        raise NotImplementedError("AVX has no load with immediate stride")
+                    vreg : vreg_base, dt : adt,
+                    tmpvreg : vreg_base|None = None):
+        return self.load_vector_strided(areg=areg, byte_stride=byte_stride, sreg=None,
+                                        vreg=vreg, dt=dt, tmpvreg=tmpvreg)
 
     def load_vector_gregstride(self, *, areg : greg_base, sreg : greg_base,
-                    vreg : vreg_base, dt : adt):
-        raise NotImplementedError("AVX has no load with scalar register stride")
+                    vreg : vreg_base, dt : adt,
+                    tmpvreg : vreg_base|None = None):
+        return self.load_vector_strided(areg=areg, byte_stride=None, sreg=sreg,
+                                        vreg=vreg, dt=dt, tmpvreg=tmpvreg)
 
     def load_vector_gather(self, *, areg : greg_base, offvreg : vreg_base,
                            vreg : vreg_base, dt : adt,
-                           it : ait):
+                           it : ait, maskvreg : vreg_base|None = None):
+        # AVX2 gathers: the index vector has as many elements as the destination,
+        # so it is narrower (dpd) or wider (qps) when the element sizes differ
+        count = self.simd_size//adt_size(dt)
+        idx_bytes = count*ait_size(it)
+
+        if idx_bytes > 32:
+            raise ValueError(
+                f"AVX2 has no gather of {count} elements with {ait_size(it)} byte indices")
+
+        def sized(reg : vreg_base, size : int) -> vreg_base:
+            return xmm_vreg(reg.idx) if size <= 16 else ymm_vreg(reg.idx)
+
+        maskvreg = self.scratch_vreg(maskvreg, vreg, offvreg)
+        if vreg.idx == offvreg.idx:
+            raise ValueError("AVX2 gather destination and index registers must differ")
+
         suf = 'p'+self.dt_suffixes[dt]
         pa = self.rpref(areg)
-        pv = self.rpref(vreg)
-        pov = self.rpref(offvreg)
-        address = f"({pa})"
+        pv = self.rpref(sized(vreg, self.simd_size))
+        pm = self.rpref(sized(maskvreg, self.simd_size))
+        pov = self.rpref(sized(offvreg, idx_bytes))
+        address = f"({pa},{pov},1)" # TODO: Explore using scale param
         isuf = self.it_suffixes[it]
-        return self.asmwrap(f"vgather{isuf}{suf} {address},{pov},{pv}")
+
+        # All mask bits set, the gather clears them as elements arrive
+        asmblock  = self.asmwrap(f"vpcmpeqd {pm},{pm},{pm}")
+        asmblock += self.asmwrap(f"vgather{isuf}{suf} {pm},{address},{pv}")
+        return asmblock
 
     def store_vector_immstride(self, *, areg : greg_base, byte_stride : int,
-                    vreg : vreg_base, dt : adt):
-        raise NotImplementedError("AVX has no store with immediate stride")
+                    vreg : vreg_base, dt : adt,
+                    tmpvreg : vreg_base|None = None):
+        return self.store_vector_strided(areg=areg, byte_stride=byte_stride, sreg=None,
+                                         vreg=vreg, dt=dt, tmpvreg=tmpvreg)
 
     def store_vector_gregstride(self, *, areg : greg_base, sreg : greg_base,
-                    vreg : vreg_base, dt : adt):
-        raise NotImplementedError("AVX has no store with scalar register stride")
+                    vreg : vreg_base, dt : adt,
+                    tmpvreg : vreg_base|None = None):
+        return self.store_vector_strided(areg=areg, byte_stride=None, sreg=sreg,
+                                         vreg=vreg, dt=dt, tmpvreg=tmpvreg)
 
     def store_vector_scatter(self, *, areg : greg_base, offvreg : vreg_base,
                              vreg : vreg_base, dt : adt, it : ait):
@@ -744,6 +1213,56 @@ class fma128(avxbase):
                      rpref=self.rpref,
                      has_fp16=False
                      )
+        self.fmax = avx_fmax(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.fmin = avx_fmin(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.fdiv = avx_fdiv(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.cfma = avx_cfma(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.cadd = avx_cadd(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.load = avx128_load(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.store = avx128_store(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.zip = avx_zip(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.uzp = avx_uzp(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.trn = avx_trn(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.faddv = avx_faddv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fmaxv = avx_fmaxv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fminv = avx_fminv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fcvt = avx_fcvt(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.cmp = avx_cmp(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.sel = avx_sel(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.tbl = avx_tbl(asmwrap=self.asmwrap, rpref=self.rpref)
 
     def get_req_flags(self):
         return ['fma', 'avx']
@@ -767,6 +1286,9 @@ class fma128(avxbase):
     def vreg(self, reg_idx):
         return xmm_vreg(reg_idx)
 
+    def mreg(self, reg_idx : int):
+        return xmm_vreg(reg_idx)
+
     def fill_vector(self, *, sreg : freg_base,
                     vreg : vreg_base, dt : adt):
         suf = 's'+self.dt_suffixes[dt]
@@ -820,10 +1342,67 @@ class fma256(avxbase):
                      rpref=self.rpref,
                      has_fp16=False
                      )
+        self.fmax = avx_fmax(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.fmin = avx_fmin(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.fdiv = avx_fdiv(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.cfma = avx_cfma(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.cadd = avx_cadd(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=False
+                     )
+        self.load = avx256_load(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.store = avx256_store(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.zip = avx_zip(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.uzp = avx_uzp(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.trn = avx_trn(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.faddv = avx_faddv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fmaxv = avx_fmaxv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fminv = avx_fminv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fcvt = avx_fcvt(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.cmp = avx_cmp(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.sel = avx_sel(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.tbl = avx_tbl(asmwrap=self.asmwrap, rpref=self.rpref)
 
     def get_req_flags(self):
         return ['fma', 'avx']
 
+    def get_dt_req_flags(self, dt : adt) -> list[str]:
+        # Integer instructions on ymm registers (vpmovzx, vpcmpgt, vpblendvb, ...)
+        # were only added in AVX2, BF16 is widened with vpmovzxwd
+        if adt.BF16 == dt or adt_is_int(dt):
+            return ['avx2']
+        return []
+
     @property
     def max_fregs(self):
         return 16
@@ -843,6 +1422,9 @@ class fma256(avxbase):
     def vreg(self, reg_idx : int):
         return ymm_vreg(reg_idx)
 
+    def mreg(self, reg_idx : int):
+        return ymm_vreg(reg_idx)
+
     def load_vector_bcast1(self, *, areg : greg_base,
                           vreg : vreg_base, dt : adt):
         suf = 's'+self.dt_suffixes[dt]
@@ -869,26 +1451,99 @@ class avx512(avxbase):
                      dt_suffixes=self.dt_suffixes,
                      it_suffixes=self.it_suffixes,
                      rpref=self.rpref,
-                     has_fp16=True
+                     has_fp16=True,
+                     has_evex=True
                      )
         self.fmul = avx_fmul(
                      asmwrap=self.asmwrap,
                      dt_suffixes=self.dt_suffixes,
                      it_suffixes=self.it_suffixes,
                      rpref=self.rpref,
-                     has_fp16=True
+                     has_fp16=True,
+                     has_evex=True
                      )
         self.fadd = avx_fadd(
                      asmwrap=self.asmwrap,
                      dt_suffixes=self.dt_suffixes,
                      it_suffixes=self.it_suffixes,
                      rpref=self.rpref,
-                     has_fp16=True
+                     has_fp16=True,
+                     has_evex=True
+                     )
+        self.fmax = avx_fmax(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=True,
+                     has_evex=True
+                     )
+        self.fmin = avx_fmin(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=True,
+                     has_evex=True
+                     )
+        self.fdiv = avx_fdiv(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=True,
+                     has_evex=True
+                     )
+        self.cfma = avx_cfma(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=True,
+                     has_evex=True
                      )
+        self.cadd = avx_cadd(
+                     asmwrap=self.asmwrap,
+                     dt_suffixes=self.dt_suffixes,
+                     it_suffixes=self.it_suffixes,
+                     rpref=self.rpref,
+                     has_fp16=True,
+                     has_evex=True
+                     )
+        self.load = avx512_load(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.store = avx512_store(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.zip = avx_zip(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.uzp = avx_uzp(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.trn = avx_trn(asmwrap=self.asmwrap, rpref=self.rpref,
+                           data_address=self.data_address)
+        self.faddv = avx_faddv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fmaxv = avx_fmaxv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fminv = avx_fminv(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.fcvt = avx_fcvt(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.cmp = avx_cmp(asmwrap=self.asmwrap, rpref=self.rpref,
+                           has_evex=True, has_fp16=True)
+        self.sel = avx_sel(asmwrap=self.asmwrap, rpref=self.rpref)
+        self.tbl = avx_tbl(asmwrap=self.asmwrap, rpref=self.rpref, has_evex=True)
 
     def get_req_flags(self) -> list[str]:
         return ['avx512f']
 
+    def get_dt_req_flags(self, dt : adt) -> list[str]:
+        # Byte and word elements (vpmov*wb, vpcmpb/w, vpblendmb/w, vpshufb)
+        # need AVX512BW, which AVX512-FP16 implies. Conversions between
+        # 64 bit integers and floats (vcvtpd2qq, vcvtqq2pd, ...) need AVX512DQ
+        if adt.HALF == dt:
+            return ['avx512_fp16']
+        if adt.BF16 == dt:
+            return ['avx512bw', 'avx512_bf16']
+        if adt_is_int(dt) and adt_size(dt) < 4:
+            return ['avx512bw']
+        if adt_is_int(dt) and adt_size(dt) == 8:
+            return ['avx512dq']
+        return []
+
     @property
     def max_fregs(self):
         return 32
@@ -901,15 +1556,65 @@ class avx512(avxbase):
     def simd_size(self):
         return 64
 
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def convert_vectors(self, *, adregs : list[vreg_base], bdregs : list[vreg_base],
+                        a_dt : adt, b_dt : adt,
+                        modifiers : set[opcvt_modifier] = set(), **kwargs) -> str:
+        if (adt.FP32, adt.BF16) == (a_dt, b_dt) and 2 == len(adregs) and 1 == len(bdregs):
+            # Converts both parts with one instruction, the first source is the lower half
+            a0,a1,b = [self.rpref(r) for r in adregs+bdregs]
+            return self.asmwrap(f"vcvtne2ps2bf16 {a0},{a1},{b}")
+        return super().convert_vectors(adregs=adregs, bdregs=bdregs, a_dt=a_dt, b_dt=b_dt,
+                                       modifiers=modifiers, **kwargs)
+
 
 
     def zero_vreg(self, *, vreg : vreg_base, dt : adt):
         preg = self.rpref(vreg)
         return self.asmwrap(f"vpxorq {preg},{preg},{preg}")
 
+    def vector_loop(self, *, count_reg : greg_base, step_reg : greg_base,
+                    label : str, dt : adt,
+                    body : Callable[[avx512_mreg, greg_base], str],
+                    mreg : avx512_mreg|None = None) -> str:
+        if mreg is None:
+            mreg = avx512_mreg(1)
+        count = self.simd_size//adt_size(dt)
+        masksuf = self.size_mask_suffixes[adt_size(dt)]
+        pc = self.rpref(count_reg)
+        ps = self.rpref(step_reg)
+        pm = self.rpref(mreg)
+        pms = self.rpref(step_reg, size=8 if 'q' == masksuf else 4)
+        full = f"{label}_full"
+        end = f"{label}_end"
+
+        asmblock  = self.asmwrap(f"test {pc},{pc}")
+        asmblock += self.asmwrap(f"jz {self.labelstr(end)}")
+        asmblock += self.label(label=label)
+        asmblock += self.asmwrap(f"kxnor{masksuf} {pm},{pm},{pm}")
+        asmblock += self.asmwrap(f"mov ${count},{ps}")
+        asmblock += self.asmwrap(f"cmp {ps},{pc}")
+        asmblock += self.asmwrap(f"jae {self.labelstr(full)}")
+        # Tail: the lowest count_reg bits set
+        asmblock += self.asmwrap(f"mov $-1,{ps}")
+        asmblock += self.asmwrap(f"bzhi {pc},{ps},{ps}")
+        asmblock += self.asmwrap(f"kmov{masksuf} {pms},{pm}")
+        asmblock += self.asmwrap(f"mov ${count},{ps}")
+        asmblock += self.label(label=full)
+        asmblock += body(mreg, step_reg)
+        # Unsigned, so the borrow of the tail iteration also ends the loop
+        asmblock += self.asmwrap(f"sub {ps},{pc}")
+        asmblock += self.asmwrap(f"ja {self.labelstr(label)}")
+        asmblock += self.label(label=end)
+        return asmblock
+
     def vreg(self, reg_idx : int):
         return zmm_vreg(reg_idx)
 
+    def mreg(self, reg_idx : int):
+        return avx512_mreg(reg_idx)
+
     def load_vector_bcast1(self, *, areg : greg_base,
                           vreg : vreg_base, dt : adt):
         suf = 's'+self.dt_suffixes[dt]
@@ -924,6 +1629,26 @@ class avx512(avxbase):
         pv = self.rpref(vreg)
         return self.asmwrap(f"vbroadcast{suf} {offset}({pa}),{pv}")
 
+    def load_vector_immstride(self, *, areg : greg_base, byte_stride : int,
+                    vreg : vreg_base, dt : adt,
+                    tmpvreg : vreg_base|None = None):
+        raise NotImplementedError("AVX512 has no load with immediate stride")
+
+    def load_vector_gregstride(self, *, areg : greg_base, sreg : greg_base,
+                    vreg : vreg_base, dt : adt,
+                    tmpvreg : vreg_base|None = None):
+        raise NotImplementedError("AVX512 has no load with scalar register stride")
+
+    def store_vector_immstride(self, *, areg : greg_base, byte_stride : int,
+                    vreg : vreg_base, dt : adt,
+                    tmpvreg : vreg_base|None = None):
+        raise NotImplementedError("AVX512 has no store with immediate stride")
+
+    def store_vector_gregstride(self, *, areg : greg_base, sreg : greg_base,
+                    vreg : vreg_base, dt : adt,
+                    tmpvreg : vreg_base|None = None):
+        raise NotImplementedError("AVX512 has no store with scalar register stride")
+
     def load_vector_gather(self, *, areg : greg_base, offvreg : vreg_base,
                            vreg : vreg_base, dt : adt,
                            it : ait):
@@ -0,0 +1,174 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX compares
+"""
+
+from enum import Enum
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    adt_is_unsigned,
+    data_reg
+)
+from ..operations import (
+    opcmp,
+    opcmp_modifier as mod,
+    operand_restriction
+)
+from ..types.avx_types import (
+    reg_prefixer,
+    avx_vreg, zmm_vreg,
+    avx512_mreg
+)
+
+class avx_cmp(opcmp):
+    """
+    AVX implementation of cmp. With an AVX512 mask register (k1-k7) as the mask,
+    vcmp/vpcmp write a bit per element. Otherwise the mask is a vector register
+    with all bits of the true elements set, for integers AVX2 can only compare
+    signed elements for EQ, GT and LT. Comparing against zero needs a temporary
+    register passed in the tmpreg parameter, which is zeroed. Integer compares
+    on ymm need AVX2, byte/word compares on zmm AVX512BW and vcmpph AVX512-FP16,
+    see get_dt_req_flags of the generator
+    """
+
+    float_predicates = {'EQ' : 0x00, 'NE' : 0x04, 'LT' : 0x11,
+                        'LE' : 0x12, 'GT' : 0x1e, 'GE' : 0x1d}
+    int_predicates = {'EQ' : 0, 'LT' : 1, 'LE' : 2, 'NE' : 4, 'GE' : 5, 'GT' : 6}
+
+    float_suffixes = {2 : "ph", 4 : "ps", 8 : "pd"}
+    int_suffixes = {1 : "b", 2 : "w", 4 : "d", 8 : "q"}
+
+    def __init__(self,
+                 asmwrap : Callable[[str],str],
+                 rpref : reg_prefixer,
+                 has_evex : bool = False,
+                 has_fp16 : bool = False):
+        self.asmwrap = asmwrap
+        self.rpref = rpref
+        self.has_evex = has_evex
+        self.has_fp16 = has_fp16
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        dts = [adt.FP32, adt.FP64, adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64]
+        if self.has_evex:
+            dts += [adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]
+        if self.has_fp16:
+            dts.append(adt.FP16)
+        return [{'adreg':dt, 'bdreg':dt} for dt in dts]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_required_params(self, modifiers : set[mod]) -> list[set[str]]:
+        if mod.ZERO in modifiers:
+            return [{'tmpreg'}]
+        return []
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for AVX opcmp")
+
+    def vector_mask_inst(self, cond : str, a_dt : adt,
+                         pa : str, pb : str, pm : str) -> str:
+        """
+        Returns the instruction writing a vector register mask
+
+        :param cond: Comparison (EQ, NE, LT, LE, GT, GE)
+        :type cond: str
+        :param a_dt: Data type of the compared elements
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param pa: Prefixed A register
+        :type pa: str
+        :param pb: Prefixed B register
+        :type pb: str
+        :param pm: Prefixed mask register
+        :type pm: str
+        :raises ValueError: If AVX2 can't compare the integers
+        :return: ASM instruction
+        :rtype: str
+        """
+        size = adt_size(a_dt)
+        if adt_is_float(a_dt):
+            pred = self.float_predicates[cond]
+            return f"vcmp{self.float_suffixes[size]} ${pred:#04x},{pb},{pa},{pm}"
+        suf = self.int_suffixes[size]
+        if 'EQ' == cond:
+            return f"vpcmpeq{suf} {pb},{pa},{pm}"
+        if 'GT' == cond:
+            return f"vpcmpgt{suf} {pb},{pa},{pm}"
+        if 'LT' == cond:
+            return f"vpcmpgt{suf} {pa},{pb},{pm}"
+        raise ValueError(f"AVX2 has no integer {cond} compare, use EQ/GT/LT and an inverted sel")
+
+    def mask_reg_inst(self, cond : str, a_dt : adt,
+                      pa : str, pb : str, pm : str) -> str:
+        """
+        Returns the instruction writing an AVX512 mask register
+
+        :param cond: Comparison (EQ, NE, LT, LE, GT, GE)
+        :type cond: str
+        :param a_dt: Data type of the compared elements
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param pa: Prefixed A register
+        :type pa: str
+        :param pb: Prefixed B register
+        :type pb: str
+        :param pm: Prefixed mask register
+        :type pm: str
+        :return: ASM instruction
+        :rtype: str
+        """
+        size = adt_size(a_dt)
+        if adt_is_float(a_dt):
+            pred = self.float_predicates[cond]
+            return f"vcmp{self.float_suffixes[size]} ${pred:#04x},{pb},{pa},{pm}"
+        sign = "u" if adt_is_unsigned(a_dt) else ""
+        pred = self.int_predicates[cond]
+        return f"vpcmp{sign}{self.int_suffixes[size]} ${pred},{pb},{pa},{pm}"
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, a_dt : adt, mreg, cmp : Enum,
+                       modifiers : set[mod],
+                       bdreg : data_reg|None = None,
+                       **kwargs) -> str:
+        cond = self.get_condition(cmp, modifiers)
+        asmblock = ""
+        if bdreg is None:
+            bdreg = kwargs['tmpreg']
+            if not isinstance(bdreg, avx_vreg) or type(bdreg) is not type(adreg):
+                raise ValueError("tmpreg has to be a vector register of the same size as adreg")
+            inst = "vpxord" if isinstance(bdreg, zmm_vreg) else "vpxor"
+            pt = self.rpref(bdreg)
+            asmblock += self.asmwrap(f"{inst} {pt},{pt},{pt}")
+        if not all(isinstance(r, avx_vreg) for r in [adreg, bdreg]):
+            raise ValueError("All dregs of an AVX opcmp must be avx_vreg")
+
+        pa = self.rpref(adreg)
+        pb = self.rpref(bdreg)
+        pm = self.rpref(mreg)
+        if isinstance(mreg, avx512_mreg):
+            if not self.has_evex:
+                raise ValueError("Mask registers require AVX512")
+            if 0 == mreg.idx:
+                raise ValueError("k0 can't be used as a mask")
+            return asmblock + self.asmwrap(self.mask_reg_inst(cond, a_dt, pa, pb, pm))
+
+        if not isinstance(mreg, avx_vreg) or isinstance(mreg, zmm_vreg):
+            raise ValueError("The mask of an AVX opcmp must be a k or xmm/ymm register")
+        if adt_is_unsigned(a_dt) or adt.FP16 == a_dt:
+            raise ValueError(f"{a_dt.name} can only be compared into mask registers")
+        return asmblock + self.asmwrap(self.vector_mask_inst(cond, a_dt, pa, pb, pm))
@@ -0,0 +1,199 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX conversions
+"""
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    adt_is_int,
+    adt_is_signed,
+    data_reg,
+)
+from ..operations import (
+    opcvt,
+    opcvt_modifier as mod,
+    operand_restriction,
+    widening_method
+)
+
+from ..types.avx_types import (
+    reg_prefixer,
+    avx_vreg, xmm_vreg, ymm_vreg, zmm_vreg
+)
+
+class avx_fcvt(opcvt):
+    """
+    AVX implementation of fcvt. Widening conversions read the lower (part 0)
+    or upper (part 1) half of A, narrowing conversions write the lower half of B
+    zeroing the upper half (part 0) or write the upper half keeping the lower
+    half (part 1). Writing the upper half converts into the temporary register
+    passed in the tmpreg parameter first. Conversions from and to unsigned or
+    64 bit integers, to BF16 and narrowing integer conversions require AVX-512.
+    The extensions needed on top of the generator for integer, FP16 and BF16
+    elements are returned by get_dt_req_flags of the generator
+    """
+
+    # Register holding the narrow elements of a register
+    half_vregs = {xmm_vreg : xmm_vreg, ymm_vreg : xmm_vreg, zmm_vreg : ymm_vreg}
+
+    int_names = {adt.SINT32 : "dq", adt.UINT32 : "udq", adt.SINT64 : "qq", adt.UINT64 : "uqq"}
+    float_names = {adt.FP32 : "ps", adt.FP64 : "pd"}
+    size_letters = {1 : "b", 2 : "w", 4 : "d", 8 : "q"}
+
+    def __init__(self,
+                 asmwrap : Callable[[str],str],
+                 rpref : reg_prefixer):
+        self.asmwrap = asmwrap
+        self.rpref = rpref
+
+    @property
+    def widening_method(self) -> widening_method:
+        return widening_method.SPLIT_INSTRUCTIONS
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        pairs = []
+        for idt,fdt in [(adt.SINT32, adt.FP32), (adt.UINT32, adt.FP32),
+                        (adt.SINT64, adt.FP64), (adt.UINT64, adt.FP64)]:
+            pairs += [(idt, fdt), (fdt, idt)]
+        widen = [(adt.FP16, adt.FP32), (adt.FP32, adt.FP64), (adt.BF16, adt.FP32),
+                 (adt.SINT8, adt.SINT16), (adt.SINT16, adt.SINT32), (adt.SINT32, adt.SINT64),
+                 (adt.UINT8, adt.UINT16), (adt.UINT16, adt.UINT32), (adt.UINT32, adt.UINT64)]
+        pairs += widen + [(b,a) for a,b in widen]
+        return [{'adreg':a, 'bdreg':b} for a,b in pairs]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.SAT in modifiers and mod.RTZ in modifiers:
+            raise ValueError("SAT and RTZ are mutually exclusive")
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for AVX opcvt")
+
+    def needs_avx512(self, a_dt : adt, b_dt : adt) -> bool:
+        """
+        Returns whether a conversion only exists in AVX-512
+
+        :param a_dt: Data type to convert from
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type to convert to
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :return: True if the conversion requires AVX-512
+        :rtype: bool
+        """
+        if adt_size(a_dt) == adt_size(b_dt):
+            return {a_dt, b_dt} != {adt.SINT32, adt.FP32}
+        if adt_size(a_dt) > adt_size(b_dt):
+            return adt_is_int(a_dt) or adt.BF16 == b_dt
+        return False
+
+    def get_inst(self, a_dt : adt, b_dt : adt, modifiers : set[mod]) -> str:
+        """
+        Returns the conversion instruction
+
+        :param a_dt: Data type to convert from
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type to convert to
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Modifiers of the operation
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcvt_modifier`]
+        :raises ValueError: If a modifier does not apply to the conversion
+        :return: Instruction name
+        :rtype: str
+        """
+        to_int = adt_is_float(a_dt) and adt_is_int(b_dt)
+        int_narrow = adt_is_int(a_dt) and adt_size(a_dt) > adt_size(b_dt)
+        if mod.RTZ in modifiers and not to_int:
+            raise ValueError("RTZ only applies to floating point to integer conversions")
+        if mod.SAT in modifiers and not int_narrow:
+            raise ValueError("SAT only applies to integer narrowing conversions")
+
+        if to_int:
+            rtz = "t" if mod.RTZ in modifiers else ""
+            return f"vcvt{rtz}{self.float_names[a_dt]}2{self.int_names[b_dt]}"
+        if adt_is_float(b_dt) and adt_is_int(a_dt):
+            return f"vcvt{self.int_names[a_dt]}2{self.float_names[b_dt]}"
+        letters = self.size_letters[adt_size(a_dt)] + self.size_letters[adt_size(b_dt)]
+        if int_narrow:
+            sat = ""
+            if mod.SAT in modifiers:
+                sat = "s" if adt_is_signed(a_dt) else "us"
+            return f"vpmov{sat}{letters}"
+        if adt_is_int(a_dt):
+            return f"vpmov{'s' if adt_is_signed(a_dt) else 'z'}x{letters}"
+        if adt.BF16 == a_dt:
+            return "vpmovzxwd"
+        if adt.BF16 == b_dt:
+            return "vcvtneps2bf16"
+        if adt.FP16 == a_dt:
+            return "vcvtph2ps"
+        if adt.FP16 == b_dt:
+            return "vcvtps2ph"
+        return "vcvtps2pd" if adt.FP32 == a_dt else "vcvtpd2ps"
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value,too-many-locals
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        if not isinstance(adreg, avx_vreg) or type(adreg) is not type(bdreg):
+            raise ValueError("All dregs of an AVX opcvt must be avx_vreg of the same size")
+        if self.needs_avx512(a_dt, b_dt) and not isinstance(adreg, zmm_vreg):
+            raise ValueError(f"{a_dt.name} -> {b_dt.name} conversion requires AVX-512")
+
+        inst = self.get_inst(a_dt, b_dt, modifiers)
+        part = self.get_part(a_dt, b_dt, modifiers, kwargs)
+        half = self.half_vregs[type(adreg)]
+        a,b = self.rpref(adreg), self.rpref(bdreg)
+
+        if adt_size(a_dt) == adt_size(b_dt):
+            return self.asmwrap(f"{inst} {a},{b}")
+
+        if adt_size(a_dt) < adt_size(b_dt):
+            src = self.rpref(half(adreg.idx))
+            asmblock = ""
+            if 1 == part:
+                src = self.rpref(half(bdreg.idx))
+                if isinstance(adreg, zmm_vreg):
+                    asmblock += self.asmwrap(f"vextractf64x4 $1,{a},{src}")
+                elif isinstance(adreg, ymm_vreg):
+                    asmblock += self.asmwrap(f"vextractf128 $1,{a},{src}")
+                else:
+                    asmblock += self.asmwrap(f"vmovhlps {a},{a},{src}")
+            asmblock += self.asmwrap(f"{inst} {src},{b}")
+            if adt.BF16 == a_dt:
+                # BF16 is the upper half of FP32
+                asmblock += self.asmwrap(f"vpslld $16,{b},{b}")
+            return asmblock
+
+        # Round to nearest even
+        imm = "$0," if "vcvtps2ph" == inst else ""
+        if 0 == part:
+            return self.asmwrap(f"{inst} {imm}{a},{self.rpref(half(bdreg.idx))}")
+        if 'tmpreg' not in kwargs:
+            raise ValueError("Writing the upper half requires the tmpreg parameter")
+        tmpreg = kwargs['tmpreg']
+        if not isinstance(tmpreg, avx_vreg) or tmpreg.idx in (adreg.idx, bdreg.idx):
+            raise ValueError("tmpreg must be an avx_vreg not aliasing adreg or bdreg")
+        t = self.rpref(half(tmpreg.idx))
+        asmblock = self.asmwrap(f"{inst} {imm}{a},{t}")
+        if isinstance(adreg, zmm_vreg):
+            asmblock += self.asmwrap(f"vinsertf64x4 $1,{t},{b},{b}")
+        elif isinstance(adreg, ymm_vreg):
+            asmblock += self.asmwrap(f"vinsertf128 $1,{t},{b},{b}")
+        else:
+            asmblock += self.asmwrap(f"vmovlhps {t},{b},{b}")
+        return asmblock
@@ -9,3 +9,8 @@ Meta-module for AVX opd3 operations
 from .avx_fma import *
 from .avx_fmul import *
 from .avx_fadd import *
+from .avx_cfma import *
+from .avx_cadd import *
+from .avx_fmax import *
+from .avx_fmin import *
+from .avx_fdiv import *
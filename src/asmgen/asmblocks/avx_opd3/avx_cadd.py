@@ -0,0 +1,51 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX complex add with rotate instruction sequence
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg,
+)
+from ..operations import opd3_modifier as mod
+
+from .avx_cfma import avx_cfma
+
+class avx_cadd(avx_cfma):
+    """
+    AVX implementation of cadd with the same semantics as FCADD on NEON/SVE
+    (see :class:`asmgen.asmblocks.neon_opd3.neon_cadd`), emulated by a pairwise
+    swap of B followed by an alternating negation and an add.
+    Requires two temporary registers passed in the tmpregs parameter
+    """
+
+    valid_rots = [90, 270]
+
+    def get_base_inst(self, modifiers : set[mod]) -> str:
+        return "vadd"
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        rot = kwargs['rot']
+        self.check_rot(rot)
+        t0,t1 = kwargs['tmpregs']
+        self.check_registers([adreg,bdreg,cdreg], [t0,t1])
+
+        suf = 'p'+self.dt_suffixes[c_dt]
+        # a + i*b = a + (-b.im, b.re), a - i*b = a + (b.im, -b.re)
+        asmblock  = self.swap_pairs(src=bdreg, dst=t0, dt=b_dt)
+        asmblock += self.negate_alternating(reg=t0, zreg=t1, dt=b_dt,
+                                            negate_imag=(270 == rot))
+        asmblock += self.asmwrap(
+                f"{self.get_base_inst(modifiers)}{suf} "
+                f"{self.rpref(t0)},{self.rpref(adreg)},{self.rpref(cdreg)}")
+        return asmblock
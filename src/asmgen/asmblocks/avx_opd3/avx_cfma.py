@@ -0,0 +1,174 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX complex multiply-accumulate instruction sequence
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg,
+)
+from ..operations import opd3_modifier as mod
+from ..types.avx_types import avx_vreg, zmm_vreg
+
+from .avx_opd3_base import avx_opd3_base
+
+class avx_cfma(avx_opd3_base):
+    """
+    AVX implementation of cfma with the same semantics as FCMLA on NEON/SVE
+    (see :class:`asmgen.asmblocks.neon_opd3.neon_cfma`).
+
+    x86 has no complex fma, the operation is emulated with duplicated real/imaginary
+    parts of A and pairwise swapped B, using vfmaddsub/vfmsubadd to negate every other
+    element. This requires two temporary registers passed in the tmpregs parameter
+    """
+
+    valid_rots = [0, 90, 180, 270]
+
+    def get_base_inst(self, modifiers : set[mod]) -> str:
+        return "vfmadd231"
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.NP in modifiers:
+            raise ValueError("Complex fma has no np form, use rot 180/270 instead")
+        if mod.MEM in modifiers or mod.BCAST in modifiers:
+            raise ValueError("AVX complex operations have no memory operands")
+        if mod.MASK in modifiers:
+            raise ValueError("AVX complex operations have no masked form")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [
+            {'adreg':adt.FP64, 'bdreg':adt.FP64, 'cdreg':adt.FP64},
+            {'adreg':adt.FP32, 'bdreg':adt.FP32, 'cdreg':adt.FP32},
+        ]
+
+    def get_required_params(self, modifiers: set[mod]) -> list[set[str]]:
+        return [{'rot'}, {'tmpregs'}]
+
+    def check_rot(self, rot : int):
+        """
+        Checks the rotation of the complex operation
+
+        :param rot: Rotation in degrees
+        :type rot: int
+        :raises ValueError: If the rotation is not supported by the operation
+        """
+        if rot not in self.valid_rots:
+            raise ValueError(f"rot {rot} not one of {self.valid_rots}")
+
+    def check_registers(self, dregs : list[data_reg], tmpregs : list[data_reg]):
+        """
+        Checks the operand and temporary registers
+
+        :param dregs: Operand registers
+        :type dregs: list[class:`asmgen.registers.data_reg`]
+        :param tmpregs: Temporary registers
+        :type tmpregs: list[class:`asmgen.registers.data_reg`]
+        :raises ValueError: If the registers are invalid or temporaries alias operands
+        """
+        if len(tmpregs) != 2:
+            raise ValueError("AVX complex operations require 2 tmpregs")
+        if any(not isinstance(r, avx_vreg) for r in dregs+tmpregs):
+            raise ValueError("All dregs of an AVX opd3 must be avx_vreg")
+        tmp_idxs = {r.idx for r in tmpregs}
+        if len(tmp_idxs) != 2 or tmp_idxs & {r.idx for r in dregs}:
+            raise ValueError("tmpregs have to be distinct from each other and all operands")
+
+    def swap_pairs(self, src : avx_vreg, dst : avx_vreg, dt : adt) -> str:
+        """
+        Swaps real and imaginary parts of all complex numbers
+
+        :param src: Register containing the complex numbers
+        :type src: class:`asmgen.asmblocks.types.avx_types.avx_vreg`
+        :param dst: Register to write the swapped numbers to
+        :type dst: class:`asmgen.asmblocks.types.avx_types.avx_vreg`
+        :param dt: Data type of the real and imaginary parts
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: ASM instruction
+        :rtype: str
+        """
+        # Immediate selects the neighbouring element in every (128 bit lane) position
+        imm = "0x55" if adt.FP64 == dt else "0xb1"
+        return self.asmwrap(
+                f"vpermilp{self.dt_suffixes[dt]} ${imm},{self.rpref(src)},{self.rpref(dst)}")
+
+    def dup_part(self, src : avx_vreg, dst : avx_vreg, dt : adt, imag : bool) -> str:
+        """
+        Duplicates the real or imaginary parts of all complex numbers
+
+        :param src: Register containing the complex numbers
+        :type src: class:`asmgen.asmblocks.types.avx_types.avx_vreg`
+        :param dst: Register to write the duplicated parts to
+        :type dst: class:`asmgen.asmblocks.types.avx_types.avx_vreg`
+        :param dt: Data type of the real and imaginary parts
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param imag: Duplicate the imaginary part if True, the real part otherwise
+        :type imag: bool
+        :return: ASM instruction
+        :rtype: str
+        """
+        psrc = self.rpref(src)
+        pdst = self.rpref(dst)
+        if adt.FP64 == dt:
+            if imag:
+                return self.asmwrap(f"vpermilpd $0xff,{psrc},{pdst}")
+            return self.asmwrap(f"vmovddup {psrc},{pdst}")
+        return self.asmwrap(f"vmovs{'h' if imag else 'l'}dup {psrc},{pdst}")
+
+    def negate_alternating(self, reg : avx_vreg, zreg : avx_vreg,
+                           dt : adt, negate_imag : bool) -> str:
+        """
+        Negates either the real or the imaginary parts of all complex numbers
+
+        :param reg: Register containing the complex numbers, negated in-place
+        :type reg: class:`asmgen.asmblocks.types.avx_types.avx_vreg`
+        :param zreg: Temporary register, set to zero
+        :type zreg: class:`asmgen.asmblocks.types.avx_types.avx_vreg`
+        :param dt: Data type of the real and imaginary parts
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param negate_imag: Negate the imaginary parts if True, the real parts otherwise
+        :type negate_imag: bool
+        :return: ASM instructions
+        :rtype: str
+        """
+        pz = self.rpref(zreg)
+        xor = "vpxorq" if isinstance(zreg, zmm_vreg) else "vpxor"
+        # 0*0 -/+ reg subtracts from even and adds to odd elements (or vice versa)
+        inst = "vfmsubadd231" if negate_imag else "vfmaddsub231"
+        asmblock  = self.asmwrap(f"{xor} {pz},{pz},{pz}")
+        asmblock += self.asmwrap(
+                f"{inst}p{self.dt_suffixes[dt]} {pz},{pz},{self.rpref(reg)}")
+        return asmblock
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        rot = kwargs['rot']
+        self.check_rot(rot)
+        t0,t1 = kwargs['tmpregs']
+        self.check_registers([adreg,bdreg,cdreg], [t0,t1])
+
+        suf = 'p'+self.dt_suffixes[c_dt]
+        if rot in [0, 180]:
+            inst = "vfmadd231" if 0 == rot else "vfnmadd231"
+            asmblock  = self.dup_part(src=adreg, dst=t0, dt=a_dt, imag=False)
+            asmblock += self.asmwrap(
+                    f"{inst}{suf} {self.rpref(bdreg)},{self.rpref(t0)},{self.rpref(cdreg)}")
+            return asmblock
+
+        asmblock  = self.swap_pairs(src=bdreg, dst=t0, dt=b_dt)
+        asmblock += self.negate_alternating(reg=t0, zreg=t1, dt=b_dt,
+                                            negate_imag=(270 == rot))
+        asmblock += self.dup_part(src=adreg, dst=t1, dt=a_dt, imag=True)
+        asmblock += self.asmwrap(
+                f"{self.get_base_inst(modifiers)}{suf} "
+                f"{self.rpref(t0)},{self.rpref(t1)},{self.rpref(cdreg)}")
+        return asmblock
@@ -0,0 +1,41 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX fdiv instruction
+"""
+
+from ...registers import asm_data_type as adt, data_reg
+from ..operations import opd3_modifier as mod
+
+from .avx_opd3_base import avx_opd3_base
+
+class avx_fdiv(avx_opd3_base):
+    """
+    AVX implementation of fdiv
+    """
+
+    def get_base_inst(self, modifiers : set[mod]):
+        return "vdiv"
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.NP in modifiers:
+            raise ValueError("AVX fdiv has no NP form")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        # The divisor is the first AT&T source, which is where the base
+        # implementation puts B only for memory operands
+        if mod.MEM not in modifiers and mod.BCAST not in modifiers:
+            adreg,bdreg = bdreg,adreg
+        return super().implementation(adreg=adreg, bdreg=bdreg, cdreg=cdreg,
+                                      a_dt=a_dt, b_dt=b_dt, c_dt=c_dt,
+                                      modifiers=modifiers, **kwargs)
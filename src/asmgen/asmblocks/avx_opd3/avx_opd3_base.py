@@ -11,6 +11,7 @@ from typing import Callable
 
 from ...registers import (
     asm_data_type as adt,
+    adt_size,
     adt_triple,
     asm_index_type as ait,
     data_reg,
@@ -22,7 +23,12 @@ from ..operations import (
     operand_restriction
 )
 
-from ..types.avx_types import reg_prefixer, avx_vreg
+from ..types.avx_types import (
+    reg_prefixer,
+    x86_greg,
+    avx_vreg, xmm_vreg, ymm_vreg, zmm_vreg,
+    avx512_mreg
+)
 
 from ...util import NIE_MESSAGE
 
@@ -32,6 +38,8 @@ class avx_opd3_base(opd3):
     opd3 operations
     """
 
+    vreg_bytes = {xmm_vreg : 16, ymm_vreg : 32, zmm_vreg : 64}
+
     # pylint: disable-next=too-many-positional-arguments
     def __init__(self,
                  asmwrap : Callable[[str],str],
@@ -39,12 +47,14 @@ class avx_opd3_base(opd3):
                  it_suffixes : dict[ait,str],
                  rpref : reg_prefixer,
                  has_fp16 : bool = False,
+                 has_evex : bool = False,
                  ):
         self.asmwrap = asmwrap
         self.dt_suffixes = dt_suffixes
         self.it_suffixes = it_suffixes
         self.rpref = rpref
         self.has_fp16 = has_fp16
+        self.has_evex = has_evex
 
     @abstractmethod
     def get_base_inst(self, modifiers : set[mod]) -> str:
@@ -71,8 +81,12 @@ class avx_opd3_base(opd3):
             raise ValueError("AVX has no idx form")
         if mod.PART in modifiers:
             raise ValueError("AVX has no partial instructions")
-        if mod.MASK in modifiers:
-            raise NotImplementedError("AVX masked opd3 not yet implemented")
+        if mod.MASK in modifiers and not self.has_evex:
+            raise ValueError("Masked opd3 requires AVX512 mask registers")
+        if mod.MEM in modifiers and mod.BCAST in modifiers:
+            raise ValueError("MEM and BCAST are mutually exclusive")
+        if mod.BCAST in modifiers and not self.has_evex:
+            raise ValueError("Embedded broadcast requires AVX512 (EVEX encoding)")
 
     def supported_dts(self) -> list[dict[str,adt]]:
         supported_list = [
@@ -87,6 +101,10 @@ class avx_opd3_base(opd3):
     def get_required_params(self, modifiers: set[mod]) -> list[set[str]]:
 
         required_extra_params = []
+        if mod.MEM in modifiers or mod.BCAST in modifiers:
+            required_extra_params.append({"areg"})
+        if mod.MASK in modifiers:
+            required_extra_params.append({"mreg"})
         return required_extra_params
 
     def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
@@ -107,13 +125,70 @@ class avx_opd3_base(opd3):
                      modifiers : set[mod] = set(),
                      **kwargs) -> str:
 
-        if any(not isinstance(r, avx_vreg) for r in (adreg,bdreg,cdreg)):
+        memop = mod.MEM in modifiers or mod.BCAST in modifiers
+        if memop and bdreg is not None:
+            raise ValueError("bdreg must be None when B is a memory operand")
+        dregs = (adreg,cdreg) if memop else (adreg,bdreg,cdreg)
+        if any(not isinstance(r, avx_vreg) for r in dregs):
             raise ValueError("All dregs of an AVX opd3 must be avx_vreg")
 
         inst = self.get_base_inst(modifiers=modifiers)
 
         suf = 'p'+self.dt_suffixes[c_dt]
         pa = self.rpref(adreg)
-        pb = self.rpref(bdreg)
         pc = self.rpref(cdreg)
+        if mod.MASK in modifiers:
+            pc += self.build_mask(kwargs['mreg'])
+        if memop:
+            # The first AT&T source is the only one that can be a memory operand,
+            # all operations are commutative in A and B so B takes its place
+            pb = self.build_memop(adreg=adreg, b_dt=b_dt, modifiers=modifiers, **kwargs)
+            return self.asmwrap(f"{inst}{suf} {pb},{pa},{pc}")
+        pb = self.rpref(bdreg)
         return self.asmwrap(f"{inst}{suf} {pa},{pb},{pc}")
+
+    def build_mask(self, mreg : avx512_mreg) -> str:
+        """
+        Returns the merge-masking suffix of the destination, elements with
+        a cleared mask bit keep the value of C
+
+        :param mreg: Mask register, k1-k7
+        :type mreg: class:`asmgen.asmblocks.types.avx_types.avx512_mreg`
+        :return: Mask suffix of the destination operand
+        :rtype: str
+        """
+        if not isinstance(mreg, avx512_mreg) or 0 == mreg.idx:
+            raise ValueError("mreg of an AVX masked opd3 must be one of k1-k7")
+        # Braces have to be escaped in inline ASM
+        lb,rb = ("%{","%}") if self.rpref.output_inline else ("{","}")
+        return f"{lb}{self.rpref(mreg)}{rb}"
+
+    def build_memop(self, *, adreg : avx_vreg, b_dt : adt,
+                    modifiers : set[mod], areg : x86_greg, offset : int = 0,
+                    **kwargs) -> str:
+        """
+        Returns the memory operand for the B component
+
+        :param adreg: Register of the A component, determines the broadcast count
+        :type adreg: class:`asmgen.asmblocks.types.avx_types.avx_vreg`
+        :param b_dt: Data type of the B component
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Modifiers of the operation (MEM or BCAST)
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opd3_modifier`]
+        :param areg: Address register
+        :type areg: class:`asmgen.asmblocks.types.avx_types.x86_greg`
+        :param offset: Byte offset to the address
+        :type offset: int
+        :return: AT&T memory operand
+        :rtype: str
+        """
+        if not isinstance(areg, x86_greg):
+            raise ValueError("areg of an AVX opd3 memory operand must be x86_greg")
+        pareg = self.rpref(areg)
+        address = f"{offset}({pareg})" if offset != 0 else f"({pareg})"
+        if mod.BCAST in modifiers:
+            count = self.vreg_bytes[type(adreg)]//adt_size(b_dt)
+            # Braces have to be escaped in inline ASM
+            lb,rb = ("%{","%}") if self.rpref.output_inline else ("{","}")
+            address += f"{lb}1to{count}{rb}"
+        return address
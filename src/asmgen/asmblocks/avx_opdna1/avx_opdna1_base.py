@@ -51,6 +51,10 @@ class avx_opdna1(opdna1):
         return [{'adreg': dt} for dt in sup_dts]
 
     def check_modifiers(self, modifiers: set[mod]):
+        if mod.FF in modifiers:
+            raise ValueError("AVX has no first-faulting ld/st")
+        if mod.QBCAST in modifiers or mod.OBCAST in modifiers:
+            raise ValueError("AVX has no segment-replicating loads")
         if mod.TINDEX in modifiers:
             raise ValueError("AVX has no ld/st with 2D tile offset indices")
         if mod.GLANE in modifiers:
@@ -69,8 +73,9 @@ class avx_opdna1(opdna1):
             raise ValueError("AVX has no row selection ld/st")
         if mod.COL in modifiers:
             raise ValueError("AVX has no column selection ld/st")
-        if mod.NT in modifiers:
-            raise NotImplementedError("Non-temporals for AVX not yet implemented")
+        if mod.NT in modifiers and \
+          any(m in modifiers for m in [mod.BCAST, mod.VINDEX, mod.ILANE]):
+            raise ValueError("Non-temporal ld/st can't be combined with BCAST/VINDEX/ILANE")
         if mod.MASK in modifiers:
             raise NotImplementedError("Masked ld/st for AVX not yet implemented")
 
@@ -128,6 +133,17 @@ class avx_opdna1(opdna1):
         if dt == adt.FP64: return "vmovupd"
         return "vmovdqu"
 
+    def get_nt_mnemonic(self, dt: adt) -> str:
+        """
+        Non-temporal moves, the address has to be aligned to the vector size.
+        Non-temporal stores are weakly ordered, see :meth:`avxbase.nt_fence`
+        """
+        if self.action == opdna1_action.LOAD:
+            return "vmovntdqa"
+        if dt == adt.FP32: return "vmovntps"
+        if dt == adt.FP64: return "vmovntpd"
+        return "vmovntdq"
+
 
     def build_bcast(self, dreg: avx_vreg, areg: x86_greg, dt: adt,
                     addressing: str) -> str:
@@ -147,6 +163,10 @@ class avx_opdna1(opdna1):
                         lane: int, addressing: str) -> str:
         raise NotImplementedError("Missing lane store implementation")
 
+    def build_masked(self, dreg: avx_vreg, dt: adt, addressing: str,
+                     mreg: avx512_mreg) -> str:
+        raise NotImplementedError("Missing masked ld/st implementation")
+
 
     def implementation(self, *, dregs: list[data_reg], agreg: x86_greg, a_dt: adt,
                        modifiers: set[mod], **kwargs) -> str:
@@ -185,8 +205,14 @@ class avx_opdna1(opdna1):
             else:
                 return self.asmwrap(self.build_lane_store(dreg, agreg, a_dt, lane, addressing))
 
+        if mod.MASK in modifiers:
+            return self.asmwrap(self.build_masked(dreg, a_dt, addressing, kwargs["mreg"]))
+
         pdreg = self.rpref(dreg)
-        inst = self.get_vector_mnemonic(a_dt)
+        if mod.NT in modifiers:
+            inst = self.get_nt_mnemonic(a_dt)
+        else:
+            inst = self.get_vector_mnemonic(a_dt)
         if self.action == opdna1_action.LOAD:
             return self.asmwrap(f"{inst} {addressing}, {pdreg}")
         else:
@@ -252,16 +278,39 @@ class avx128_opdna1(avx_opdna1):
         pdreg = self.rpref(dreg)
         return f"vbroadcast{suf} {addressing}, {pdreg}" 
 
+    def get_required_params(self, modifiers: set[mod]) -> list[set[str]]:
+        required_extra_params = super().get_required_params(modifiers)
+
+        # AVX2 gathers take a vector mask that is consumed by the instruction
+        if mod.VINDEX in modifiers and self.action == opdna1_action.LOAD:
+            required_extra_params.append({"maskreg"})
+
+        return required_extra_params
+
     def build_gather(self, dreg: xmm_vreg, areg: x86_greg, dt: adt, **kwargs) -> str:
         suf = "ps" if adt_size(dt) == 4 else "pd"
-        isuf = "d" if adt_size(kwargs["it"]) == 4 else "q" 
+        isize = adt_size(kwargs["it"])
+        isuf = "d" if isize == 4 else "q"
         vidxreg = kwargs["vidxreg"]
+        maskreg = kwargs["maskreg"]
+
+        # The index vector holds one index per destination element
+        idx_bytes = self.simd_bytes//adt_size(dt)*isize
+        if idx_bytes > 32:
+            raise ValueError(f"AVX2 has no {isuf}{suf} gather into {self.simd_bytes} bytes")
+        if len({dreg.idx, vidxreg.idx, maskreg.idx}) != 3:
+            raise ValueError("AVX2 gather data, index and mask registers must differ")
+
+        vtype = xmm_vreg if self.simd_bytes == 16 else ymm_vreg
+        itype = xmm_vreg if idx_bytes <= 16 else ymm_vreg
 
         pareg = self.rpref(areg)
-        pvidxreg = self.rpref(vidxreg)
-        pdreg = self.rpref(dreg)
+        pvidxreg = self.rpref(itype(vidxreg.idx))
+        pmaskreg = self.rpref(vtype(maskreg.idx))
+        pdreg = self.rpref(vtype(dreg.idx))
 
-        return f"vgather{isuf}{suf} ({pareg}), {pvidxreg}, {pdreg}"
+        return (f"vpcmpeqd {pmaskreg}, {pmaskreg}, {pmaskreg}\n"
+                f"vgather{isuf}{suf} {pmaskreg}, ({pareg},{pvidxreg},1), {pdreg}")
 
     def build_scatter(self, dreg: xmm_vreg, areg: x86_greg, dt: adt, **kwargs) -> str:
         raise NotImplementedError("AVX/AVX2 has no store with vector register stride (Scatter)")
@@ -280,6 +329,39 @@ class avx512_opdna1(avx_opdna1):
                  rpref : Callable[[str],str]):
         super().__init__(action=action, simd_bytes=64, asmwrap=asmwrap, rpref=rpref)
 
+    def check_modifiers(self, modifiers: set[mod]):
+        super().check_modifiers(set(modifiers) - {mod.MASK})
+        if mod.MASK in modifiers and \
+          any(m in modifiers for m in [mod.BCAST, mod.VINDEX, mod.ILANE, mod.NT]):
+            raise ValueError("MASK can't be combined with BCAST/VINDEX/ILANE/NT")
+
+    def get_required_params(self, modifiers: set[mod]) -> list[set[str]]:
+        required_extra_params = super().get_required_params(modifiers)
+        if mod.MASK in modifiers:
+            required_extra_params.append({"mreg"})
+        return required_extra_params
+
+    def build_masked(self, dreg: zmm_vreg, dt: adt, addressing: str,
+                     mreg: avx512_mreg) -> str:
+        """
+        Masked loads zero the inactive elements, masked stores leave the
+        memory of the inactive elements untouched (and don't fault on it)
+        """
+        if not isinstance(mreg, avx512_mreg) or 0 == mreg.idx:
+            raise ValueError("mreg of an AVX512 masked ld/st must be one of k1-k7")
+        if dt in [adt.FP32, adt.FP64]:
+            inst = self.get_vector_mnemonic(dt)
+        else:
+            # Masks need the element size, which the plain vmovdqu doesn't have
+            inst = f"vmovdqu{adt_size(dt)*8}"
+        # Braces have to be escaped in inline ASM
+        lb,rb = ("%{","%}") if self.rpref.output_inline else ("{","}")
+        mask = f"{lb}{self.rpref(mreg)}{rb}"
+        pdreg = self.rpref(dreg)
+        if self.action == opdna1_action.LOAD:
+            return f"{inst} {addressing}, {pdreg}{mask}{lb}z{rb}"
+        return f"{inst} {pdreg}, {addressing}{mask}"
+
     def build_bcast(self, dreg: zmm_vreg, areg: x86_greg, dt: adt, addressing: str) -> str:
         suf = "ss" if adt_size(dt) == 4 else "sd"
 
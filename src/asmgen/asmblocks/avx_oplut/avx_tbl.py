@@ -0,0 +1,93 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX table lookups
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    data_reg
+)
+from ..operations import (
+    oplut,
+    oplut_modifier as mod,
+    operand_restriction
+)
+from ..types.avx_types import (
+    reg_prefixer,
+    avx_vreg, xmm_vreg, ymm_vreg
+)
+
+class avx_tbl(oplut):
+    """
+    AVX implementation of lut. 8-bit tables use vpshufb, which looks up 16
+    elements within every 128 bit lane (indices with bit 7 set give 0, otherwise
+    only the low 4 bits are used), so the table has to be replicated into every
+    lane. 32-bit tables span the whole register (vpermps/vpermd, vpermilps for xmm),
+    AVX512 additionally has 16 and 64-bit tables (vpermw, vpermpd/vpermq).
+    Indices of 16 to 64-bit tables wrap around. vpshufb, vpermd and vpermps need
+    AVX2 on ymm, vpshufb and vpermw AVX512BW on zmm. These are required through
+    get_dt_req_flags of the generator for the integer types, ymm FP32 tables
+    have to be looked up as SINT32/UINT32 bit patterns
+    """
+
+    def __init__(self,
+                 asmwrap : Callable[[str],str],
+                 rpref : reg_prefixer,
+                 has_evex : bool = False):
+        self.asmwrap = asmwrap
+        self.rpref = rpref
+        self.has_evex = has_evex
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        dts = [adt.SINT8, adt.UINT8, adt.FP32, adt.SINT32, adt.UINT32]
+        if self.has_evex:
+            dts += [adt.FP16, adt.BF16, adt.SINT16, adt.UINT16,
+                    adt.FP64, adt.SINT64, adt.UINT64]
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in dts]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.KEEP in modifiers:
+            raise ValueError("AVX table lookups can't keep the destination elements")
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for AVX oplut")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       c_dt : adt, modifiers : set[mod], **kwargs) -> str:
+        if not all(isinstance(r, avx_vreg) for r in [adreg, bdreg, cdreg]):
+            raise ValueError("All dregs of an AVX oplut must be avx_vreg")
+
+        pa = self.rpref(adreg)
+        pb = self.rpref(bdreg)
+        pc = self.rpref(cdreg)
+        size = adt_size(c_dt)
+        if 1 == size:
+            return self.asmwrap(f"vpshufb {pb},{pa},{pc}")
+        if isinstance(adreg, xmm_vreg) and 4 == size:
+            return self.asmwrap(f"vpermilps {pb},{pa},{pc}")
+        if isinstance(adreg, ymm_vreg) and adt_is_float(c_dt):
+            raise ValueError("vpermps needs AVX2, which is only required for integer "
+                             "elements, look up FP32 tables as SINT32/UINT32")
+        if 2 == size:
+            inst = "vpermw"
+        elif adt_is_float(c_dt):
+            inst = "vpermps" if 4 == size else "vpermpd"
+        else:
+            inst = "vpermd" if 4 == size else "vpermq"
+        return self.asmwrap(f"{inst} {pa},{pb},{pc}")
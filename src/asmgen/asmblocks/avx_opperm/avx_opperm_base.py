@@ -0,0 +1,171 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX permutation base case
+"""
+from abc import abstractmethod
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    data_reg,
+)
+from ...asmdata import asm_data
+from ..operations import (
+    opperm,
+    opperm_modifier as mod,
+    operand_restriction
+)
+
+from ..types.avx_types import (
+    reg_prefixer,
+    avx_vreg, xmm_vreg, ymm_vreg, zmm_vreg
+)
+
+from ...util import NIE_MESSAGE
+
+class avx_opperm_base(opperm):
+    """
+    AVX base permutation implementation with methods shared by all
+    permutation operations. AVX has no permutations below 32 bit, elements
+    (or groups) have to be at least 4 bytes large
+
+    Permutations across the 128 bit lanes of zmm registers read their indices
+    from ISA data, which is registered through the data_address callback
+    (see :meth:`asmgen.asmblocks.avx_fma.avxbase.data_address`)
+    """
+
+    vreg_bytes = {xmm_vreg : 16, ymm_vreg : 32, zmm_vreg : 64}
+
+    def __init__(self,
+                 asmwrap : Callable[[str],str],
+                 rpref : reg_prefixer,
+                 data_address : Callable[[str,list[asm_data]],str]):
+        self.asmwrap = asmwrap
+        self.rpref = rpref
+        self.data_address = data_address
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        sup_dts = [
+            adt.FP64, adt.FP32, adt.FP16, adt.BF16,
+            adt.SINT64, adt.SINT32, adt.SINT16, adt.SINT8,
+            adt.UINT64, adt.UINT32, adt.UINT16, adt.UINT8
+        ]
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in sup_dts]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        # Both modifiers only change the instruction sequence
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for AVX opperm")
+
+    def permute_halves(self, pa : str, pb : str, pc : str, vbytes : int, hi : bool) -> str:
+        """
+        Combines the low (or high) halves of A and B, which is what zip, uzp and
+        trn all do with 2 groups per register
+
+        :param pa: Prefixed A register
+        :type pa: str
+        :param pb: Prefixed B register
+        :type pb: str
+        :param pc: Prefixed C register
+        :type pc: str
+        :param vbytes: Register size in bytes
+        :type vbytes: int
+        :param hi: Combine the high halves if True, the low halves otherwise
+        :type hi: bool
+        :return: ASM instruction
+        :rtype: str
+        """
+        if 32 == vbytes:
+            return self.asmwrap(f"vperm2f128 ${'0x31' if hi else '0x20'},{pb},{pa},{pc}")
+        if 64 == vbytes:
+            return self.asmwrap(f"vshuff64x2 ${'0xee' if hi else '0x44'},{pb},{pa},{pc}")
+        return self.asmwrap(f"vunpck{'h' if hi else 'l'}pd {pb},{pa},{pc}")
+
+    def permute_indexed(self, pa : str, pb : str, pc : str,
+                        label : str, indices : list[int], esize : int) -> str:
+        """
+        Permutes the elements of A and B with a two-source vpermi2 (AVX512F).
+        The indices are loaded into C first, so C must not alias A or B
+
+        :param pa: Prefixed A register
+        :type pa: str
+        :param pb: Prefixed B register
+        :type pb: str
+        :param pc: Prefixed C register
+        :type pc: str
+        :param label: Name of the ISA data entry holding the indices
+        :type label: str
+        :param indices: Source index of each 32 bit (4 byte elements) or 64 bit
+                        (larger elements) unit of C, B starts after the last unit of A
+        :type indices: list[int]
+        :param esize: Size of a (group) element in bytes
+        :type esize: int
+        :return: ASM instruction sequence
+        :rtype: str
+        """
+        if pc in (pa, pb):
+            raise ValueError("The C register holds the permutation indices "
+                             "and must not alias A or B")
+        index_dt = adt.UINT32 if 4 == esize else adt.UINT64
+        address = self.data_address(label, [asm_data(index_dt, i) for i in indices])
+        asmblock  = self.asmwrap(f"vmovdqu32 {address},{pc}")
+        asmblock += self.asmwrap(f"vpermi2p{'s' if 4 == esize else 'd'} {pb},{pa},{pc}")
+        return asmblock
+
+    @abstractmethod
+    def permute(self, pa : str, pb : str, pc : str,
+                esize : int, vbytes : int, hi : bool) -> str:
+        """
+        Returns the instruction sequence of the permutation
+
+        :param pa: Prefixed A register
+        :type pa: str
+        :param pb: Prefixed B register
+        :type pb: str
+        :param pc: Prefixed C register
+        :type pc: str
+        :param esize: Size of a (group) element in bytes
+        :type esize: int
+        :param vbytes: Register size in bytes
+        :type vbytes: int
+        :param hi: Second instruction of the pair
+        :type hi: bool
+        :return: ASM instruction sequence
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        dregs = (adreg,bdreg,cdreg)
+        if any(not isinstance(r, avx_vreg) for r in dregs):
+            raise ValueError("All dregs of an AVX opperm must be avx_vreg")
+        if any(type(r) is not type(adreg) for r in dregs):
+            raise ValueError("All dregs of an AVX opperm must have the same size")
+
+        vbytes = self.vreg_bytes[type(adreg)]
+        esize = adt_size(a_dt)*self.get_group(modifiers, kwargs)
+        if esize < 4 or esize > vbytes//2:
+            raise ValueError(f"AVX can't permute groups of {esize} bytes "
+                             f"in {vbytes} byte registers")
+
+        return self.permute(self.rpref(adreg), self.rpref(bdreg), self.rpref(cdreg),
+                            esize=esize, vbytes=vbytes, hi=(mod.HI in modifiers))
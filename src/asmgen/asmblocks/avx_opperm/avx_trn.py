@@ -0,0 +1,31 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX trn permutation instruction sequences
+"""
+
+from .avx_opperm_base import avx_opperm_base
+
+class avx_trn(avx_opperm_base):
+    """
+    AVX implementation of trn (see :class:`asmgen.asmblocks.neon_opperm.neon_trn`).
+    32 bit elements are selected with vshufps and put in place with vpermilps,
+    128 bit groups in zmm registers the same way with vshuff32x4
+    """
+
+    def permute(self, pa : str, pb : str, pc : str,
+                esize : int, vbytes : int, hi : bool) -> str:
+        if 4 == esize:
+            asmblock  = self.asmwrap(f"vshufps ${'0xdd' if hi else '0x88'},{pb},{pa},{pc}")
+            asmblock += self.asmwrap(f"vpermilps $0xd8,{pc},{pc}")
+            return asmblock
+        if 8 == esize:
+            return self.asmwrap(f"vunpck{'h' if hi else 'l'}pd {pb},{pa},{pc}")
+        if 16 == esize and 64 == vbytes:
+            asmblock  = self.asmwrap(f"vshuff32x4 ${'0xdd' if hi else '0x88'},{pb},{pa},{pc}")
+            asmblock += self.asmwrap(f"vshuff32x4 $0xd8,{pc},{pc},{pc}")
+            return asmblock
+        return self.permute_halves(pa, pb, pc, vbytes=vbytes, hi=hi)
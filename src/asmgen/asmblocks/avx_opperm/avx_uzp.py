@@ -0,0 +1,41 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX uzp permutation instruction sequences
+"""
+
+from .avx_opperm_base import avx_opperm_base
+
+class avx_uzp(avx_opperm_base):
+    """
+    AVX implementation of uzp (see :class:`asmgen.asmblocks.neon_opperm.neon_uzp`).
+    Elements are selected within 128 bit lanes, in ymm registers the 64 bit
+    halves of the lanes are put in place with vpermpd (AVX2). zmm registers
+    use vpermi2 with an index table
+    """
+
+    def permute(self, pa : str, pb : str, pc : str,
+                esize : int, vbytes : int, hi : bool) -> str:
+        if 2*esize == vbytes:
+            return self.permute_halves(pa, pb, pc, vbytes=vbytes, hi=hi)
+        if 64 == vbytes:
+            unit = min(esize, 8)
+            units = esize//unit
+            groups = vbytes//esize
+            indices = []
+            for g in range(groups):
+                src = (2*g + int(hi))*units
+                indices += range(src, src+units)
+            return self.permute_indexed(pa, pb, pc,
+                                        label=f"uzp{'2' if hi else '1'}_idx_{esize*8}",
+                                        indices=indices, esize=esize)
+        if 4 == esize:
+            asmblock = self.asmwrap(f"vshufps ${'0xdd' if hi else '0x88'},{pb},{pa},{pc}")
+        else:
+            asmblock = self.asmwrap(f"vunpck{'h' if hi else 'l'}pd {pb},{pa},{pc}")
+        if 32 == vbytes:
+            asmblock += self.asmwrap(f"vpermpd $0xd8,{pc},{pc}")
+        return asmblock
@@ -0,0 +1,44 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX zip permutation instructions
+"""
+
+from .avx_opperm_base import avx_opperm_base
+
+class avx_zip(avx_opperm_base):
+    """
+    AVX implementation of zip (see :class:`asmgen.asmblocks.neon_opperm.neon_zip`).
+    The unpack instructions work within 128 bit lanes. In ymm registers the
+    halves of A and B are combined with vperm2f128 and interleaved with
+    vpermpd (AVX2) and vpermilps, zmm registers use vpermi2 with an index table
+    """
+
+    def permute(self, pa : str, pb : str, pc : str,
+                esize : int, vbytes : int, hi : bool) -> str:
+        if 2*esize == vbytes:
+            return self.permute_halves(pa, pb, pc, vbytes=vbytes, hi=hi)
+        if 64 == vbytes:
+            unit = min(esize, 8)
+            units = esize//unit
+            groups = vbytes//esize
+            first = groups//2 if hi else 0
+            indices = []
+            for g in range(groups):
+                src = (first + g//2)*units + (vbytes//unit if g%2 else 0)
+                indices += range(src, src+units)
+            return self.permute_indexed(pa, pb, pc,
+                                        label=f"zip{'2' if hi else '1'}_idx_{esize*8}",
+                                        indices=indices, esize=esize)
+        if 32 == vbytes:
+            # [A half|B half] -> [A0,B0|A1,B1] in 64 bit units -> interleaved
+            asmblock  = self.permute_halves(pa, pb, pc, vbytes=vbytes, hi=hi)
+            asmblock += self.asmwrap(f"vpermpd $0xd8,{pc},{pc}")
+            if 4 == esize:
+                asmblock += self.asmwrap(f"vpermilps $0xd8,{pc},{pc}")
+            return asmblock
+        return self.asmwrap(f"vunpck{'h' if hi else 'l'}p{'s' if 4 == esize else 'd'} "
+                            f"{pb},{pa},{pc}")
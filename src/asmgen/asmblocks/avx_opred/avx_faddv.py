@@ -0,0 +1,17 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX sum reduction instruction sequence
+"""
+
+from .avx_opred_base import avx_opred_base
+
+class avx_faddv(avx_opred_base):
+    """
+    AVX implementation of faddv (see :class:`asmgen.asmblocks.avx_opred.avx_opred_base`)
+    """
+
+    inst_base = "add"
@@ -0,0 +1,106 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX reduction base case
+"""
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg,
+)
+from ..operations import (
+    opred,
+    opred_modifier as mod,
+    operand_restriction
+)
+
+from ..types.avx_types import (
+    reg_prefixer,
+    avx_freg,
+    avx_vreg, xmm_vreg, ymm_vreg, zmm_vreg
+)
+
+class avx_opred_base(opred):
+    """
+    AVX base reduction implementation. AVX has no reductions across lanes, the
+    register is folded in half with a shuffle and a vertical operation until
+    one element is left. The temporary register for the upper halves has to be
+    passed in the tmpreg parameter
+    """
+
+    inst_base = "invalid"
+
+    dt_suffixes = {adt.FP64 : "d", adt.FP32 : "s"}
+
+    def __init__(self,
+                 asmwrap : Callable[[str],str],
+                 rpref : reg_prefixer):
+        self.asmwrap = asmwrap
+        self.rpref = rpref
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt} for dt in [adt.FP64, adt.FP32]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.ORDERED in modifiers:
+            raise ValueError("AVX has no strictly ordered reductions")
+
+    def get_required_params(self, modifiers : set[mod]) -> list[set[str]]:
+        return [{'tmpreg'}]
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for AVX opred")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        tmpreg = kwargs['tmpreg']
+        if not isinstance(adreg, avx_vreg) or not isinstance(tmpreg, avx_vreg):
+            raise ValueError("adreg and tmpreg of an AVX opred must be avx_vreg")
+        if not isinstance(bdreg, avx_freg):
+            raise ValueError("bdreg of an AVX opred must be avx_freg")
+        if tmpreg.idx in (adreg.idx, bdreg.idx):
+            raise ValueError("tmpreg must not alias adreg or bdreg")
+
+        inst = f"v{self.inst_base}"
+        suf = self.dt_suffixes[a_dt]
+        src = adreg.idx
+        asmblock = ""
+        if isinstance(adreg, zmm_vreg):
+            t,a,b = [self.rpref(ymm_vreg(i)) for i in (tmpreg.idx, src, bdreg.idx)]
+            asmblock += self.asmwrap(f"vextractf64x4 $1,{self.rpref(adreg)},{t}")
+            asmblock += self.asmwrap(f"{inst}p{suf} {t},{a},{b}")
+            src = bdreg.idx
+        if isinstance(adreg, (zmm_vreg, ymm_vreg)):
+            t,a,b = [self.rpref(xmm_vreg(i)) for i in (tmpreg.idx, src, bdreg.idx)]
+            # vextractf128 is VEX only and can't encode ymm16-31, the EVEX
+            # vextractf32x4 can (bit-exact, vextractf64x2 would need AVX512DQ)
+            extract = "vextractf32x4" if isinstance(adreg, zmm_vreg) else "vextractf128"
+            asmblock += self.asmwrap(f"{extract} $1,{self.rpref(ymm_vreg(src))},{t}")
+            asmblock += self.asmwrap(f"{inst}p{suf} {t},{a},{b}")
+            src = bdreg.idx
+
+        t,a,b = [self.rpref(xmm_vreg(i)) for i in (tmpreg.idx, src, bdreg.idx)]
+        if adt.FP32 == a_dt:
+            asmblock += self.asmwrap(f"vmovhlps {a},{a},{t}")
+            asmblock += self.asmwrap(f"{inst}ps {t},{a},{b}")
+            asmblock += self.asmwrap(f"vmovshdup {b},{t}")
+            asmblock += self.asmwrap(f"{inst}ss {t},{b},{b}")
+        else:
+            asmblock += self.asmwrap(f"vpermilpd $1,{a},{t}")
+            asmblock += self.asmwrap(f"{inst}sd {t},{a},{b}")
+        return asmblock
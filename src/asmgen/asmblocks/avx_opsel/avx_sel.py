@@ -0,0 +1,88 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+AVX blends
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    data_reg
+)
+from ..operations import (
+    opsel,
+    opsel_modifier as mod,
+    operand_restriction
+)
+from ..types.avx_types import (
+    reg_prefixer,
+    avx_vreg, zmm_vreg,
+    avx512_mreg
+)
+
+class avx_sel(opsel):
+    """
+    AVX implementation of sel. AVX512 mask registers select with vblendm/vpblendm,
+    vector register masks with vblendv/vpblendvb (using the sign bit of the elements).
+    vpblendvb on ymm needs AVX2 and vpblendmb/w AVX512BW, see get_dt_req_flags
+    of the generator
+    """
+
+    variable_insts = {adt.FP32 : "vblendvps", adt.FP64 : "vblendvpd"}
+    masked_insts = {adt.FP32 : "vblendmps", adt.FP64 : "vblendmpd"}
+    int_suffixes = {1 : "b", 2 : "w", 4 : "d", 8 : "q"}
+
+    def __init__(self,
+                 asmwrap : Callable[[str],str],
+                 rpref : reg_prefixer):
+        self.asmwrap = asmwrap
+        self.rpref = rpref
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in
+                [adt.FP16, adt.BF16, adt.FP32, adt.FP64,
+                 adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64,
+                 adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for AVX opsel")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt, mreg,
+                       modifiers : set[mod], **kwargs) -> str:
+        if not all(isinstance(r, avx_vreg) for r in [adreg, bdreg, cdreg]):
+            raise ValueError("All dregs of an AVX opsel must be avx_vreg")
+
+        freg,treg = self.get_operands(adreg, bdreg, modifiers)
+        pf = self.rpref(freg)
+        pt = self.rpref(treg)
+        pc = self.rpref(cdreg)
+        pm = self.rpref(mreg)
+        if isinstance(mreg, avx512_mreg):
+            if 0 == mreg.idx:
+                raise ValueError("k0 can't be used as a mask")
+            inst = self.masked_insts.get(c_dt, f"vpblendm{self.int_suffixes[adt_size(c_dt)]}")
+            # Braces have to be escaped in inline ASM
+            lb,rb = ("%{","%}") if self.rpref.output_inline else ("{","}")
+            return self.asmwrap(f"{inst} {pt},{pf},{pc}{lb}{pm}{rb}")
+
+        if not isinstance(mreg, avx_vreg) or isinstance(mreg, zmm_vreg):
+            raise ValueError("The mask of an AVX opsel must be a k or xmm/ymm register")
+        inst = self.variable_insts.get(c_dt, "vpblendvb")
+        return self.asmwrap(f"{inst} {pm},{pt},{pf},{pc}")
@@ -6,19 +6,33 @@
 """
 NEON/ASIMD asm generator and related types
 """
+from typing import Callable
+
 from ..registers import (
     reg_tracker,
     asm_data_type as adt,
     adt_size,
+    adt_is_float,
     asm_index_type as ait,
     treg_base,vreg_base,freg_base,greg_base
 )
+from ..asmdata import adt_fp_bits
 from .aarch64 import aarch64
+from .operations import opd3_modifier
 
 from .types.aarch64_types import aarch64_freg
 from .types.neon_types import neon_vreg
-from .neon_opd3 import neon_fma,neon_fmul,neon_fadd
+from .neon_opd3 import (
+    neon_fma,neon_fmul,neon_fadd,neon_dota,neon_mma,
+    neon_cfma,neon_cadd,neon_fmax,neon_fmin,neon_fdiv
+)
 from .neon_opdna1 import neon_load, neon_store
+from .neon_opperm import neon_zip,neon_uzp,neon_trn
+from .neon_opred import neon_faddv,neon_fmaxv,neon_fminv
+from .neon_opcvt import neon_fcvt
+from .neon_opcmp import neon_cmp
+from .neon_opsel import neon_sel
+from .neon_oplut import neon_tbl
 
 class neon(aarch64):
     """
@@ -33,6 +47,7 @@ class neon(aarch64):
             adt.UINT32  : "4s",
             adt.SINT32  : "4s",
             adt.HALF    : "8h",
+            adt.BF16    : "8h",
             adt.UINT16  : "8h",
             adt.SINT16  : "8h",
             adt.FP8E5M2 : "16b",
@@ -48,6 +63,7 @@ class neon(aarch64):
             adt.UINT32  : "s",
             adt.SINT32  : "s",
             adt.HALF    : "h",
+            adt.BF16    : "h",
             adt.UINT16  : "h",
             adt.SINT16  : "h",
             adt.FP8E5M2 : "b",
@@ -75,10 +91,43 @@ class neon(aarch64):
         self.fadd = neon_fadd(asmwrap=self.asmwrap,
                               dt_suffixes=self.dt_suffixes,
                               dt_idxsuffixes=self.dt_idxsuffixes)
+        self.dota = neon_dota(asmwrap=self.asmwrap,
+                              dt_suffixes=self.dt_suffixes,
+                              dt_idxsuffixes=self.dt_idxsuffixes)
+        self.mma = neon_mma(asmwrap=self.asmwrap,
+                            dt_suffixes=self.dt_suffixes,
+                            dt_idxsuffixes=self.dt_idxsuffixes)
+        self.cfma = neon_cfma(asmwrap=self.asmwrap,
+                              dt_suffixes=self.dt_suffixes,
+                              dt_idxsuffixes=self.dt_idxsuffixes)
+        self.cadd = neon_cadd(asmwrap=self.asmwrap,
+                              dt_suffixes=self.dt_suffixes,
+                              dt_idxsuffixes=self.dt_idxsuffixes)
+        self.fmax = neon_fmax(asmwrap=self.asmwrap,
+                              dt_suffixes=self.dt_suffixes,
+                              dt_idxsuffixes=self.dt_idxsuffixes)
+        self.fmin = neon_fmin(asmwrap=self.asmwrap,
+                              dt_suffixes=self.dt_suffixes,
+                              dt_idxsuffixes=self.dt_idxsuffixes)
+        self.fdiv = neon_fdiv(asmwrap=self.asmwrap,
+                              dt_suffixes=self.dt_suffixes,
+                              dt_idxsuffixes=self.dt_idxsuffixes)
 
         self.load = neon_load(asmwrap=self.asmwrap)
         self.store = neon_store(asmwrap=self.asmwrap)
 
+        self.zip = neon_zip(asmwrap=self.asmwrap)
+        self.uzp = neon_uzp(asmwrap=self.asmwrap)
+        self.trn = neon_trn(asmwrap=self.asmwrap)
+
+        self.faddv = neon_faddv(asmwrap=self.asmwrap)
+        self.fmaxv = neon_fmaxv(asmwrap=self.asmwrap)
+        self.fminv = neon_fminv(asmwrap=self.asmwrap)
+        self.fcvt = neon_fcvt(asmwrap=self.asmwrap)
+        self.cmp = neon_cmp(asmwrap=self.asmwrap)
+        self.sel = neon_sel(asmwrap=self.asmwrap)
+        self.tbl = neon_tbl(asmwrap=self.asmwrap)
+
     def get_req_flags(self) -> list[str]:
         """
         Return required flags in cpuinfo for this generator to be supported
@@ -121,6 +170,71 @@ class neon(aarch64):
         """
         return aarch64_freg(reg_idx=vreg.idx, dt=adt.FP128)
 
+    def mma_transpose(self, *, src0 : vreg_base, src1 : vreg_base,
+                      dst0 : vreg_base, dst1 : vreg_base) -> str:
+        """
+        Transposes the 64 bit halves of the 128 bit segments of two registers,
+        which converts between rows and the block layout of :attr:`mma`:
+
+        - src0/src1 holding rows 0/1 of A (or B^T) give the A (or B) operands
+          for the first (dst0) and second (dst1) 64 bit of every segment of the rows
+        - src0/src1 holding the 2x2 C blocks of columns 0-1/2-3 give rows 0/1
+          of the resulting 2x4 block of C (dst0/dst1)
+
+        :param src0: First source register
+        :type src0: class:`asmgen.registers.vreg_base`
+        :param src1: Second source register
+        :type src1: class:`asmgen.registers.vreg_base`
+        :param dst0: Register to write the first 64 bit of every segment to
+        :type dst0: class:`asmgen.registers.vreg_base`
+        :param dst1: Register to write the second 64 bit of every segment to
+        :type dst1: class:`asmgen.registers.vreg_base`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        if dst0.idx in [src0.idx, src1.idx]:
+            raise ValueError("dst0 can't overlap with the sources")
+        asmblock  = self.asmwrap(f"trn1 {dst0}.2d,{src0}.2d,{src1}.2d")
+        asmblock += self.asmwrap(f"trn2 {dst1}.2d,{src0}.2d,{src1}.2d")
+        return asmblock
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def widening_fma(self, *, adreg : vreg_base, bdreg : vreg_base,
+                     cdregs : list[vreg_base],
+                     a_dt : adt, b_dt : adt, c_dt : adt,
+                     modifiers : set[opd3_modifier] = set()) -> str:
+        """
+        NEON lowers 2-way widening of non-FP8 types to the low/high half
+        instructions (e.g. FMLAL/FMLAL2), cdregs[0] accumulates the products of
+        the lower and cdregs[1] of the upper half of the elements.
+        FP8 uses the bottom/top instructions of the generic lowering
+        """
+        ways = adt_size(c_dt)//adt_size(a_dt)
+        if 1 == ways or 1 == adt_size(a_dt) and adt_is_float(a_dt):
+            return super().widening_fma(adreg=adreg, bdreg=bdreg, cdregs=cdregs,
+                                        a_dt=a_dt, b_dt=b_dt, c_dt=c_dt,
+                                        modifiers=modifiers)
+        if ways != 2:
+            raise ValueError(f"NEON has no {ways}-way widening integer fma, use dota")
+        if modifiers - {opd3_modifier.NP}:
+            raise ValueError("NEON widening fma only supports the NP modifier")
+        self.fma.check_dts({'adreg':a_dt, 'bdreg':b_dt, 'cdreg':c_dt})
+        if len(cdregs) != ways:
+            raise ValueError(f"{a_dt.name} -> {c_dt.name} widening fma requires "
+                             f"{ways} C registers, got {len(cdregs)}")
+        self.fma.check_valid_registers([adreg,bdreg]+cdregs)
+
+        inst = "f" if adt_is_float(a_dt) else self.fma.inst_prefix(a_dt, b_dt, c_dt)
+        inst += "mlsl" if opd3_modifier.NP in modifiers else "mlal"
+        wide = self.dt_suffixes[c_dt]
+        half = f"{8//adt_size(a_dt)}{self.dt_idxsuffixes[a_dt]}"
+        # FMLAL2 names the upper half like the lower one, the integer forms the full register
+        high = half if adt_is_float(a_dt) else self.dt_suffixes[a_dt]
+        asmblock  = self.asmwrap(f"{inst} {cdregs[0]}.{wide},{adreg}.{half},{bdreg}.{half}")
+        asmblock += self.asmwrap(f"{inst}2 {cdregs[1]}.{wide},{adreg}.{high},{bdreg}.{high}")
+        return asmblock
+
     @property
     def is_vla(self) -> bool:
         return False
@@ -139,6 +253,18 @@ class neon(aarch64):
     def simd_size_to_greg(self, *, reg: greg_base, dt: adt) -> str:
         return self.mov_greg_imm(reg=reg, imm=16//adt_size(dt))
 
+    def vector_loop(self, *, count_reg : greg_base, step_reg : greg_base,
+                    label : str, dt : adt,
+                    body : Callable[[None, greg_base], str],
+                    mreg : None = None) -> str:
+        raise NotImplementedError("NEON has no predication for loop tails")
+
+    def ff_loop(self, *, step_reg : greg_base, label : str, dt : adt,
+                load : Callable[[], str],
+                body : Callable[[None, greg_base], str],
+                mreg : None = None) -> str:
+        raise NotImplementedError("NEON has no first-faulting loads")
+
     @property
     def c_simd_size_function(self):
         return f"inline size_t get_simd_size() {{ return {self.simd_size}; }}"
@@ -155,6 +281,44 @@ class neon(aarch64):
     def vreg(self, reg_idx : int) -> neon_vreg:
         return neon_vreg(reg_idx)
 
+    def mreg(self, reg_idx : int) -> neon_vreg:
+        return neon_vreg(reg_idx)
+
+    def unpack_nibbles(self, *, vreg : vreg_base, lodst : vreg_base, hidst : vreg_base,
+                       tmpreg : vreg_base|None = None) -> str:
+        if lodst.idx == hidst.idx:
+            raise ValueError("The low and high nibbles have to be written to different registers")
+        lo  = self.asmwrap(f"shl {lodst}.16b,{vreg}.16b,#4")
+        lo += self.asmwrap(f"ushr {lodst}.16b,{lodst}.16b,#4")
+        hi  = self.asmwrap(f"ushr {hidst}.16b,{vreg}.16b,#4")
+        # Don't overwrite the packed bytes before both halves are extracted
+        return hi+lo if lodst.idx == vreg.idx else lo+hi
+
+    def scale_pow2(self, *, vreg : vreg_base, nreg : vreg_base, dt : adt) -> str:
+        _,mbits,_ = adt_fp_bits(dt)
+        suf = self.dt_suffixes[dt]
+        result  = self.asmwrap(f"shl {nreg}.{suf},{nreg}.{suf},#{mbits}")
+        result += self.asmwrap(f"add {vreg}.{suf},{vreg}.{suf},{nreg}.{suf}")
+        return result
+
+    # pylint: disable-next=too-many-arguments
+    def split_exponent(self, *, vreg : vreg_base, ereg : vreg_base, offreg : vreg_base,
+                       tmpreg : vreg_base, dt : adt) -> str:
+        _,mbits,_ = adt_fp_bits(dt)
+        suf = self.dt_suffixes[dt]
+        # Integer difference to o, its exponent field is e
+        result  = self.asmwrap(f"sub {ereg}.{suf},{vreg}.{suf},{offreg}.{suf}")
+        result += self.asmwrap(f"sshr {ereg}.{suf},{ereg}.{suf},#{mbits}")
+        result += self.asmwrap(f"shl {tmpreg}.{suf},{ereg}.{suf},#{mbits}")
+        result += self.asmwrap(f"sub {vreg}.{suf},{vreg}.{suf},{tmpreg}.{suf}")
+        return result
+
+    def sqrt_vreg(self, *, vreg : vreg_base, dst : vreg_base, dt : adt) -> str:
+        if dt not in [adt.FP16, adt.FP32, adt.FP64]:
+            raise ValueError(f"NEON fsqrt doesn't support {dt}")
+        suf = self.dt_suffixes[dt]
+        return self.asmwrap(f"fsqrt {dst}.{suf},{vreg}.{suf}")
+
     def qreg(self, idx : int) -> aarch64_freg:
         """
         Returns the AArch64 128 FP register register corresponding to
@@ -0,0 +1,124 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD compares
+"""
+
+from enum import Enum
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    adt_is_unsigned,
+    data_reg
+)
+from ..operations import (
+    opcmp,
+    opcmp_modifier as mod,
+    operand_restriction
+)
+from ..types.neon_types import neon_vreg
+
+class neon_cmp(opcmp):
+    """
+    NEON/ASIMD implementation of cmp. The mask is a vector register with all
+    bits of the true elements set. NE is a negated EQ, register compares
+    for LT/LE swap the operands of GT/GE
+    """
+
+    suffixes = {1 : "16b", 2 : "8h", 4 : "4s", 8 : "2d"}
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt} for dt in
+                [adt.FP16, adt.FP32, adt.FP64,
+                 adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64,
+                 adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for NEON opcmp")
+
+    def zero_inst(self, cond : str, a_dt : adt) -> tuple[str,str]:
+        """
+        Returns the instruction and the immediate operand comparing against zero
+
+        :param cond: Comparison (EQ, NE, LT, LE, GT, GE)
+        :type cond: str
+        :param a_dt: Data type of the compared elements
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :raises ValueError: If the result wouldn't depend on the input
+        :return: Instruction and immediate, an empty immediate for cmtst
+        :rtype: tuple[str,str]
+        """
+        if adt_is_float(a_dt):
+            return f"fcm{cond.lower()}", "#0.0"
+        if adt_is_unsigned(a_dt):
+            if cond in ['LT', 'GE']:
+                raise ValueError(f"Unsigned {cond} against zero is constant")
+            cond = {'LE' : 'EQ', 'GT' : 'NE'}.get(cond, cond)
+        if 'NE' == cond:
+            return "cmtst", ""
+        return f"cm{cond.lower()}", "#0"
+
+    def reg_inst(self, cond : str, a_dt : adt) -> str:
+        """
+        Returns the instruction comparing two registers with EQ, GT or GE
+
+        :param cond: Comparison (EQ, GT, GE)
+        :type cond: str
+        :param a_dt: Data type of the compared elements
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :return: ASM instruction name
+        :rtype: str
+        """
+        if adt_is_float(a_dt):
+            return f"fcm{cond.lower()}"
+        if adt_is_unsigned(a_dt):
+            return {'EQ' : "cmeq", 'GT' : "cmhi", 'GE' : "cmhs"}[cond]
+        return f"cm{cond.lower()}"
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, a_dt : adt, mreg, cmp : Enum,
+                       modifiers : set[mod],
+                       bdreg : data_reg|None = None,
+                       **kwargs) -> str:
+        regs = [adreg, mreg] + ([] if bdreg is None else [bdreg])
+        if not all(isinstance(r, neon_vreg) for r in regs):
+            raise ValueError("All registers of a NEON opcmp must be neon_vreg")
+
+        cond = self.get_condition(cmp, modifiers)
+        suf = self.suffixes[adt_size(a_dt)]
+        negate = 'NE' == cond and not (bdreg is None and not adt_is_float(a_dt))
+
+        if bdreg is None:
+            inst,imm = self.zero_inst('EQ' if negate else cond, a_dt)
+            other = f"{imm}" if imm else f"{adreg}.{suf}"
+            asmblock = self.asmwrap(f"{inst} {mreg}.{suf},{adreg}.{suf},{other}")
+        else:
+            first,second = adreg,bdreg
+            if cond in ['LT', 'LE']:
+                first,second = bdreg,adreg
+                cond = {'LT' : 'GT', 'LE' : 'GE'}[cond]
+            inst = self.reg_inst('EQ' if negate else cond, a_dt)
+            asmblock = self.asmwrap(f"{inst} {mreg}.{suf},{first}.{suf},{second}.{suf}")
+
+        if negate:
+            asmblock += self.asmwrap(f"mvn {mreg}.16b,{mreg}.16b")
+        return asmblock
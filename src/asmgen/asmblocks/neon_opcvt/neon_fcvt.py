@@ -0,0 +1,142 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD conversions
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    adt_is_int,
+    adt_is_signed,
+    data_reg
+)
+from ..operations import (
+    opcvt,
+    opcvt_modifier as mod,
+    operand_restriction,
+    widening_method
+)
+from ..types.neon_types import neon_vreg
+
+INT_TYPES = {1 : (adt.SINT8, adt.UINT8), 2 : (adt.SINT16, adt.UINT16),
+             4 : (adt.SINT32, adt.UINT32), 8 : (adt.SINT64, adt.UINT64)}
+
+class neon_fcvt(opcvt):
+    """
+    NEON/ASIMD implementation of fcvt. Widening conversions read the lower
+    (part 0) or upper (part 1) half of A, narrowing conversions write the lower
+    half of B zeroing the upper half (part 0) or write the upper half keeping
+    the lower half (part 1)
+    """
+
+    full_suffixes = {1 : "16b", 2 : "8h", 4 : "4s", 8 : "2d"}
+    half_suffixes = {1 : "8b", 2 : "4h", 4 : "2s"}
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    @property
+    def widening_method(self) -> widening_method:
+        return widening_method.SPLIT_INSTRUCTIONS
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        pairs = []
+        for fdt in [adt.FP16, adt.FP32, adt.FP64]:
+            for idt in INT_TYPES[adt_size(fdt)]:
+                pairs += [(idt, fdt), (fdt, idt)]
+        widen = [(adt.FP16, adt.FP32), (adt.FP32, adt.FP64), (adt.BF16, adt.FP32)]
+        for size in [1, 2, 4]:
+            narrow, wide = INT_TYPES[size], INT_TYPES[2*size]
+            widen += [(narrow[0], wide[0]), (narrow[1], wide[1])]
+            # Saturating narrowing from signed to unsigned
+            pairs.append((wide[0], narrow[1]))
+        pairs += widen + [(b,a) for a,b in widen]
+        return [{'adreg':a, 'bdreg':b} for a,b in pairs]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.SAT in modifiers and mod.RTZ in modifiers:
+            raise ValueError("SAT and RTZ are mutually exclusive")
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for NEON opcvt")
+
+    def get_inst(self, a_dt : adt, b_dt : adt, modifiers : set[mod]) -> str:
+        """
+        Returns the conversion instruction (without the upper half suffix)
+
+        :param a_dt: Data type to convert from
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type to convert to
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Modifiers of the operation
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcvt_modifier`]
+        :raises ValueError: If a modifier does not apply to the conversion
+        :return: Instruction name
+        :rtype: str
+        """
+        to_int = adt_is_float(a_dt) and adt_is_int(b_dt)
+        int_narrow = adt_is_int(a_dt) and adt_size(a_dt) > adt_size(b_dt)
+        if mod.RTZ in modifiers and not to_int:
+            raise ValueError("RTZ only applies to floating point to integer conversions")
+        if mod.SAT in modifiers and not int_narrow:
+            raise ValueError("SAT only applies to integer narrowing conversions")
+
+        # Signedness of the integer type(s)
+        sign = "s" if adt_is_signed(b_dt) or adt_is_signed(a_dt) and adt_is_float(b_dt) else "u"
+        if to_int:
+            return f"fcvt{'z' if mod.RTZ in modifiers else 'n'}{sign}"
+        if adt_is_float(b_dt) and adt_is_int(a_dt):
+            return f"{sign}cvtf"
+        if int_narrow:
+            if mod.SAT not in modifiers:
+                return "xtn"
+            if adt_is_signed(a_dt) and not adt_is_signed(b_dt):
+                return "sqxtun"
+            return f"{sign}qxtn"
+        if adt_is_int(a_dt):
+            return f"{sign}xtl"
+        if adt.BF16 == a_dt:
+            return "shll"
+        if adt.BF16 == b_dt:
+            return "bfcvtn"
+        return "fcvtl" if adt_size(a_dt) < adt_size(b_dt) else "fcvtn"
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        if not isinstance(adreg, neon_vreg) or not isinstance(bdreg, neon_vreg):
+            raise ValueError("All dregs of a NEON opcvt must be neon_vreg")
+
+        inst = self.get_inst(a_dt, b_dt, modifiers)
+        part = self.get_part(a_dt, b_dt, modifiers, kwargs)
+        a_size, b_size = adt_size(a_dt), adt_size(b_dt)
+        a_suf, b_suf = self.full_suffixes[a_size], self.full_suffixes[b_size]
+        if a_size < b_size and 0 == part:
+            a_suf = self.half_suffixes[a_size]
+        if a_size > b_size and 0 == part:
+            b_suf = self.half_suffixes[b_size]
+        if 1 == part:
+            inst += "2"
+
+        asmblock = f"{inst} {bdreg}.{b_suf},{adreg}.{a_suf}"
+        if inst.startswith("shll"):
+            # BF16 is the upper half of FP32
+            asmblock += ",#16"
+        return self.asmwrap(asmblock)
@@ -9,3 +9,10 @@ Meta-module for NEON opd3 operations
 from .neon_fma import *
 from .neon_fmul import *
 from .neon_fadd import *
+from .neon_dota import *
+from .neon_mma import *
+from .neon_cfma import *
+from .neon_cadd import *
+from .neon_fmax import *
+from .neon_fmin import *
+from .neon_fdiv import *
@@ -0,0 +1,47 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD complex add with rotate instruction
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg,
+)
+from .neon_cfma import neon_cfma
+
+from ..operations import opd3_modifier as mod
+
+class neon_cadd(neon_cfma):
+    """
+    NEON/ASIMD implementation of cadd (FCADD) on interleaved complex numbers,
+    B is rotated by rot degrees in the complex plane before adding it to A:
+
+    - 90:  c.re = a.re - b.im, c.im = a.im + b.re (c = a + i*b)
+    - 270: c.re = a.re + b.im, c.im = a.im - b.re (c = a - i*b)
+    """
+
+    valid_rots = [90, 270]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.IDX in modifiers:
+            raise ValueError("Complex add has no idx form")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers([adreg,bdreg,cdreg])
+        rot = kwargs['rot']
+        self.check_rot(rot)
+
+        suf = self.dt_suffixes[c_dt]
+
+        return self.asmwrap(f"fcadd {cdreg}.{suf},{adreg}.{suf},{bdreg}.{suf},#{rot}")
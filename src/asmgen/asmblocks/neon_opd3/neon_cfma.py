@@ -0,0 +1,130 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD complex multiply-accumulate instruction
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    data_reg,
+)
+from .neon_opd3_base import neon_opd3_base
+from ..types.neon_types import neon_vreg
+
+from ..operations import opd3_modifier as mod, widening_method
+
+class neon_cfma(neon_opd3_base):
+    """
+    NEON/ASIMD implementation of cfma (FCMLA). Registers hold interleaved
+    complex numbers (real part in the even, imaginary part in the odd element).
+
+    The rot parameter selects which half of the complex product is accumulated:
+
+    - 0:   c.re += a.re*b.re, c.im += a.re*b.im
+    - 90:  c.re -= a.im*b.im, c.im += a.im*b.re
+    - 180: c.re -= a.re*b.re, c.im -= a.re*b.im
+    - 270: c.re += a.im*b.im, c.im -= a.im*b.re
+
+    A full complex fma (c += a*b) is rot 0 followed by rot 90, c += conj(a)*b
+    is rot 0 followed by rot 270. With the IDX modifier the complex number
+    idx of B is used for all elements
+    """
+
+    valid_rots = [0, 90, 180, 270]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.NP in modifiers:
+            raise ValueError("Complex fma has no np form, use rot 180/270 instead")
+        if mod.PART in modifiers:
+            raise ValueError("Complex fma has no partial instructions")
+        if mod.MASK in modifiers:
+            raise ValueError("NEON complex fma has no masked form")
+
+    @property
+    def widening_method(self) -> widening_method:
+        return widening_method.NONE
+
+    def get_required_params(self, modifiers : set[mod]) -> list[set[str]]:
+        return super().get_required_params(modifiers=modifiers) + [{'rot'}]
+
+    def check_valid_registers(self, dregs : list[data_reg]) -> bool:
+        if not all(isinstance(d, neon_vreg) for d in dregs):
+            raise ValueError("All dregs of a NEON opd3 must be neon_vreg")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [
+            {'adreg':adt.FP64, 'bdreg':adt.FP64, 'cdreg':adt.FP64},
+            {'adreg':adt.FP32, 'bdreg':adt.FP32, 'cdreg':adt.FP32},
+            {'adreg':adt.FP16, 'bdreg':adt.FP16, 'cdreg':adt.FP16},
+        ]
+
+    def check_rot(self, rot : int):
+        """
+        Checks the rotation of the complex operation
+
+        :param rot: Rotation in degrees
+        :type rot: int
+        :raises ValueError: If the rotation is not supported by the operation
+        """
+        if rot not in self.valid_rots:
+            raise ValueError(f"rot {rot} not one of {self.valid_rots}")
+
+    def check_idx(self, bdreg : data_reg, idx : int, b_dt : adt):
+        """
+        Checks the index and the B register of an indexed complex fma
+
+        :param bdreg: Register containing the B component
+        :type bdreg: class:`asmgen.registers.data_reg`
+        :param idx: Index of the complex number in B
+        :type idx: int
+        :param b_dt: Type of the B component
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :raises ValueError: If the index is out of range
+        """
+        _ = bdreg # explicitly unused, all registers are allowed
+        if adt.FP64 == b_dt:
+            raise ValueError("Complex fma has no idx form for FP64")
+        max_idx = 16//(2*adt_size(b_dt))-1
+        if not 0 <= idx <= max_idx:
+            raise ValueError(f"idx {idx} outside of [0,{max_idx}]")
+
+    def b_operand(self, bdreg : data_reg, b_dt : adt,
+                  modifiers : set[mod], **kwargs) -> str:
+        """
+        Returns the (possibly indexed) B operand
+
+        :param bdreg: Register containing the B component
+        :type bdreg: class:`asmgen.registers.data_reg`
+        :param b_dt: Type of the B component
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Modifiers of the operation
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opd3_modifier`]
+        :return: string containing the operand
+        :rtype: str
+        """
+        if mod.IDX in modifiers:
+            idx = kwargs['idx']
+            self.check_idx(bdreg=bdreg, idx=idx, b_dt=b_dt)
+            return f"{bdreg}.{self.dt_idxsuffixes[b_dt]}[{idx}]"
+        return f"{bdreg}.{self.dt_suffixes[b_dt]}"
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers([adreg,bdreg,cdreg])
+        rot = kwargs['rot']
+        self.check_rot(rot)
+
+        suf = self.dt_suffixes[c_dt]
+        b_str = self.b_operand(bdreg=bdreg, b_dt=b_dt, modifiers=modifiers, **kwargs)
+
+        return self.asmwrap(f"fcmla {cdreg}.{suf},{adreg}.{suf},{b_str},#{rot}")
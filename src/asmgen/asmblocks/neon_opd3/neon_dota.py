@@ -0,0 +1,139 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD dot product instructions
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_signed,
+    adt_is_unsigned,
+    data_reg,
+)
+from .neon_opd3_base import neon_opd3_base
+from ..types.neon_types import neon_vreg
+
+from ..operations import opd3_modifier as mod, widening_method
+
+class neon_dota(neon_opd3_base):
+    """
+    NEON/ASIMD implementation of dota, every element of C accumulates the dot
+    product of the neighbouring narrow elements of A and B at the same position
+    (i.e. 4 INT8 or 2 BF16 values per 32 bit element).
+
+    With the IDX modifier one group of neighbouring elements of B (idx counted
+    in C elements) is used for all elements of C
+    """
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.NP in modifiers:
+            raise ValueError("NEON/SVE have no np dot products")
+        if mod.PART in modifiers:
+            raise ValueError(
+                    "Dot products have no partial instructions (widening instructions 'dot' neighbours)")
+        if mod.MASK in modifiers:
+            raise ValueError("NEON/SVE dot products have no masked form")
+
+    @property
+    def widening_method(self) -> widening_method:
+        return widening_method.DOT_NEIGHBOURS
+
+    def check_valid_registers(self, dregs : list[data_reg]) -> bool:
+        if not all(isinstance(d, neon_vreg) for d in dregs):
+            raise ValueError("All dregs of a NEON opd3 must be neon_vreg")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [
+            {'adreg':adt.SINT8, 'bdreg':adt.SINT8, 'cdreg':adt.SINT32},
+            {'adreg':adt.UINT8, 'bdreg':adt.UINT8, 'cdreg':adt.UINT32},
+
+            {'adreg':adt.UINT8, 'bdreg':adt.SINT8, 'cdreg':adt.SINT32},
+            {'adreg':adt.SINT8, 'bdreg':adt.UINT8, 'cdreg':adt.SINT32},
+
+            {'adreg':adt.BF16, 'bdreg':adt.BF16, 'cdreg':adt.FP32},
+        ]
+
+    def dot_inst(self, a_dt : adt, b_dt : adt) -> str:
+        """
+        Choose the dot product instruction based on specified types
+
+        :param a_dt: Type of the A component
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Type of the B component
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :return: string containing the instruction
+        :rtype: str
+        """
+        if adt.BF16 == a_dt:
+            return "bfdot"
+        if adt_is_signed(a_dt) and adt_is_signed(b_dt):
+            return "sdot"
+        if adt_is_unsigned(a_dt) and adt_is_unsigned(b_dt):
+            return "udot"
+        if adt_is_unsigned(a_dt) and adt_is_signed(b_dt):
+            return "usdot"
+        if adt_is_signed(a_dt) and adt_is_unsigned(b_dt):
+            return "sudot"
+
+        raise ValueError(f"Unsupported datatypes a={a_dt},b={b_dt}")
+
+    def group_suffix(self, a_dt : adt, c_dt : adt) -> str:
+        """
+        Returns the register suffix of an indexed group of neighbouring elements
+
+        :param a_dt: Type of the A component
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param c_dt: Type of the C component
+        :type c_dt: class:`asmgen.registers.asm_data_type`
+        :return: string containing the suffix (without '.')
+        :rtype: str
+        """
+        ways = adt_size(c_dt)//adt_size(a_dt)
+        return f"{ways}{self.dt_idxsuffixes[a_dt]}"
+
+    def check_idx(self, bdreg : data_reg, idx : int, c_dt : adt):
+        """
+        Checks the index and the B register of an indexed dot product
+
+        :param bdreg: Register containing the B component
+        :type bdreg: class:`asmgen.registers.data_reg`
+        :param idx: Index of the group of B elements
+        :type idx: int
+        :param c_dt: Type of the C component
+        :type c_dt: class:`asmgen.registers.asm_data_type`
+        :raises ValueError: If the index is out of range
+        """
+        _ = bdreg # explicitly unused, all registers are allowed
+        max_idx = 16//adt_size(c_dt)-1
+        if not 0 <= idx <= max_idx:
+            raise ValueError(f"idx {idx} outside of [0,{max_idx}]")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers([adreg,bdreg,cdreg])
+
+        inst = self.dot_inst(a_dt=a_dt, b_dt=b_dt)
+        narrow_suf = self.dt_suffixes[a_dt]
+        wide_suf = self.dt_suffixes[c_dt]
+        if mod.IDX in modifiers:
+            idx = kwargs['idx']
+            self.check_idx(bdreg=bdreg, idx=idx, c_dt=c_dt)
+            b_str = f"{bdreg}.{self.group_suffix(a_dt=a_dt, c_dt=c_dt)}[{idx}]"
+        else:
+            # sudot only has an indexed form, the operands commute
+            if "sudot" == inst:
+                inst = "usdot"
+                adreg,bdreg = bdreg,adreg
+            b_str = f"{bdreg}.{narrow_suf}"
+
+        return self.asmwrap(f"{inst} {cdreg}.{wide_suf},{adreg}.{narrow_suf},{b_str}")
@@ -0,0 +1,43 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD fmax instruction
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import opd3_modifier as mod
+from ..types.neon_types import neon_vreg
+from .neon_opd3_base import neon_opd3_base
+
+class neon_fmax(neon_opd3_base):
+    """
+    NEON/ASIMD implementation of fmax
+    """
+
+    inst_base = "max"
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.NP in modifiers:
+            raise ValueError("NEON fmax has no NP-form")
+        if mod.MASK in modifiers:
+            raise ValueError("NEON fmax has no masked form")
+        if mod.IDX in modifiers or mod.PART in modifiers:
+            raise ValueError("NEON fmax has no idx or partial form")
+
+    def check_valid_registers(self, dregs : list[data_reg]) -> bool:
+        if not all(isinstance(d, neon_vreg) for d in dregs):
+            raise ValueError("All dregs of a NEON opd3 must be neon_vreg")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [
+            {'adreg':adt.FP64, 'bdreg':adt.FP64, 'cdreg':adt.FP64},
+            {'adreg':adt.FP32, 'bdreg':adt.FP32, 'cdreg':adt.FP32},
+            {'adreg':adt.FP16, 'bdreg':adt.FP16, 'cdreg':adt.FP16},
+        ]
@@ -0,0 +1,108 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD matrix-multiply-accumulate instructions
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_signed,
+    adt_is_unsigned,
+    data_reg,
+)
+from .neon_opd3_base import neon_opd3_base
+from ..types.neon_types import neon_vreg
+
+from ..operations import opd3_modifier as mod, widening_method
+
+class neon_mma(neon_opd3_base):
+    """
+    NEON/ASIMD implementation of mma (I8MM/BF16 MMLA instructions)
+
+    Every 128 bit segment is treated as a block: A holds a row-major
+    2 x k matrix, B a column-major k x 2 matrix (i.e. two rows of B^T) and C a
+    row-major 2 x 2 matrix (see :meth:`block_shape`)
+    """
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.NP in modifiers:
+            raise ValueError("NEON/SVE have no np matrix multiplications")
+        if mod.IDX in modifiers:
+            raise ValueError("NEON/SVE matrix multiplications have no idx form")
+        if mod.PART in modifiers:
+            raise ValueError(
+                    "Matrix multiplications have no partial instructions (widening instructions 'dot' neighbours)")
+        if mod.MASK in modifiers:
+            raise ValueError("NEON/SVE matrix multiplications have no masked form")
+
+    @property
+    def widening_method(self) -> widening_method:
+        return widening_method.DOT_NEIGHBOURS
+
+    def check_valid_registers(self, dregs : list[data_reg]) -> bool:
+        if not all(isinstance(d, neon_vreg) for d in dregs):
+            raise ValueError("All dregs of a NEON opd3 must be neon_vreg")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [
+            {'adreg':adt.SINT8, 'bdreg':adt.SINT8, 'cdreg':adt.SINT32},
+            {'adreg':adt.UINT8, 'bdreg':adt.UINT8, 'cdreg':adt.UINT32},
+            {'adreg':adt.UINT8, 'bdreg':adt.SINT8, 'cdreg':adt.SINT32},
+
+            {'adreg':adt.BF16, 'bdreg':adt.BF16, 'cdreg':adt.FP32},
+        ]
+
+    @staticmethod
+    def block_shape(a_dt : adt) -> tuple[int,int,int]:
+        """
+        Returns the shape of the matrix multiplication performed per 128 bit segment
+
+        :param a_dt: Type of the A and B components
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :return: (m,k,n): rows of A and C, columns of A and rows of B, columns of B and C
+        :rtype: tuple[int,int,int]
+        """
+        return (2, 8//adt_size(a_dt), 2)
+
+    def mma_inst(self, a_dt : adt, b_dt : adt) -> str:
+        """
+        Choose the matrix multiplication instruction based on specified types
+
+        :param a_dt: Type of the A component
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Type of the B component
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :return: string containing the instruction
+        :rtype: str
+        """
+        if adt.BF16 == a_dt:
+            return "bfmmla"
+        if adt_is_signed(a_dt) and adt_is_signed(b_dt):
+            return "smmla"
+        if adt_is_unsigned(a_dt) and adt_is_unsigned(b_dt):
+            return "ummla"
+        if adt_is_unsigned(a_dt) and adt_is_signed(b_dt):
+            return "usmmla"
+
+        raise ValueError(f"Unsupported datatypes a={a_dt},b={b_dt}")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers([adreg,bdreg,cdreg])
+
+        inst = self.mma_inst(a_dt=a_dt, b_dt=b_dt)
+        narrow_suf = self.dt_suffixes[a_dt]
+        wide_suf = self.dt_suffixes[c_dt]
+
+        return self.asmwrap(
+                f"{inst} {cdreg}.{wide_suf},{adreg}.{narrow_suf},{bdreg}.{narrow_suf}")
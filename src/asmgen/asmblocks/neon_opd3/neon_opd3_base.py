@@ -48,6 +48,8 @@ class neon_opd3_base(opd3):
             raise ValueError("NEON has no vf form")
         if mod.REGIDX in modifiers:
             raise ValueError("NEON has no regidx form")
+        if mod.MEM in modifiers or mod.BCAST in modifiers:
+            raise ValueError("NEON/SVE have no memory operands")
         # Don't check for MASK here, since SVE inherits from this
 
     def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
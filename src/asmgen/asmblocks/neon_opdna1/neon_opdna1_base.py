@@ -57,6 +57,10 @@ class neon_opdna1(opdna1):
 
     def check_modifiers(self, modifiers: set[mod]):
 
+        if mod.FF in modifiers:
+            raise ValueError("NEON has no first-faulting ld/st")
+        if mod.QBCAST in modifiers or mod.OBCAST in modifiers:
+            raise ValueError("NEON has no segment-replicating loads")
         if mod.TINDEX in modifiers:
             raise ValueError(
                     "NEON has no ld/st with 2D tile offset indices")
@@ -78,8 +82,11 @@ class neon_opdna1(opdna1):
             raise ValueError("NEON has no row selection ld/st")
         if mod.COL in modifiers:
             raise ValueError("NEON has no column selection ld/st")
-        if mod.NT in modifiers:
-            raise NotImplementedError("Non-temporals for NEON not yet implemented")
+        if mod.NT in modifiers and \
+          any(m in modifiers for m in [mod.STRUCT, mod.ILANE, mod.BCAST,
+                                       mod.POSTINC, mod.GOFFSET]):
+            raise ValueError(("Non-temporal ld/st (ldnp/stnp) can't be combined with "
+                              "STRUCT, ILANE, BCAST, POSTINC or GOFFSET"))
                 
         # Modifier/Kwarg Compatibility Checks
         if mod.VOFFSET in modifiers or mod.IOFFSET in modifiers:
@@ -195,6 +202,18 @@ class neon_opdna1(opdna1):
 
         addressing = self.get_addressing(agreg, modifiers, **kwargs)
 
+        # Case 0: LDNP / STNP, non-temporal pair of Q registers
+        if mod.NT in modifiers:
+            if len(dregs) != 2:
+                raise ValueError(("Non-temporal NEON ld/st operate on a pair of registers,"
+                                  f" got {len(dregs)}"))
+            byte_offset = kwargs.get("ioffset", 16*kwargs.get("voffset", 0))
+            if byte_offset % 16 != 0 or not -1024 <= byte_offset <= 1008:
+                raise ValueError(("Non-temporal NEON ld/st offset has to be a multiple of 16"
+                                  f" in [-1024,1008], got {byte_offset}"))
+            inst = "ldnp" if self.action == opdna1_action.LOAD else "stnp"
+            return self.asmwrap(f"{inst} q{dregs[0].idx}, q{dregs[1].idx}, {addressing}")
+
         # Case 1: LDR / STR for IOFFSET / VOFFSET
         if mod.VOFFSET in modifiers or mod.IOFFSET in modifiers:
             inst = "ldr" if self.action == opdna1_action.LOAD else "str"
@@ -0,0 +1,55 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD table lookups
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import (
+    oplut,
+    oplut_modifier as mod,
+    operand_restriction
+)
+from ..types.neon_types import neon_vreg
+
+class neon_tbl(oplut):
+    """
+    NEON/ASIMD implementation of lut with a single register tbl (tbx with KEEP).
+    The table holds 16 8-bit elements, out-of-range indices give 0
+    """
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in [adt.SINT8, adt.UINT8]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for NEON oplut")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       modifiers : set[mod], **kwargs) -> str:
+        if not all(isinstance(r, neon_vreg) for r in [adreg, bdreg, cdreg]):
+            raise ValueError("All dregs of a NEON oplut must be neon_vreg")
+
+        inst = "tbx" if mod.KEEP in modifiers else "tbl"
+        return self.asmwrap(f"{inst} {cdreg}.16b,{{{adreg}.16b}},{bdreg}.16b")
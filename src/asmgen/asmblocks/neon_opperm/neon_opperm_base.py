@@ -0,0 +1,96 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD permutation base case
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    data_reg
+)
+from ..operations import (
+    opperm,
+    opperm_modifier as mod,
+    operand_restriction
+)
+from ..types.neon_types import neon_vreg
+
+class neon_opperm_base(opperm):
+    """
+    NEON/ASIMD base permutation implementation, zip/uzp/trn only differ in the
+    instruction name. Groups are permuted by using a wider arrangement
+    """
+
+    inst_base = "invalid"
+
+    # Arrangement for each (group) element size in bytes
+    size_suffixes = {1 : "16b", 2 : "8h", 4 : "4s", 8 : "2d"}
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        sup_dts = [
+            adt.FP64, adt.FP32, adt.FP16, adt.BF16, adt.FP8E4M3, adt.FP8E5M2,
+            adt.SINT64, adt.SINT32, adt.SINT16, adt.SINT8,
+            adt.UINT64, adt.UINT32, adt.UINT16, adt.UINT8
+        ]
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in sup_dts]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        # Both modifiers only change the instruction name/arrangement
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for NEON opperm")
+
+    def check_valid_registers(self, dregs : list[data_reg]):
+        """
+        Checks the register types of the operands
+
+        :param dregs: Operand registers
+        :type dregs: list[class:`asmgen.registers.data_reg`]
+        :raises ValueError: If any register is not a NEON register
+        """
+        if not all(isinstance(d, neon_vreg) for d in dregs):
+            raise ValueError("All dregs of a NEON opperm must be neon_vreg")
+
+    def get_suffix(self, size : int) -> str:
+        """
+        Returns the arrangement suffix for permuting elements of the given size
+
+        :param size: Size of a (group) element in bytes
+        :type size: int
+        :raises ValueError: If elements of this size can't be permuted
+        :return: register suffix
+        :rtype: str
+        """
+        if size not in self.size_suffixes:
+            raise ValueError(f"{self.inst_base} can't permute groups of {size} bytes")
+        return self.size_suffixes[size]
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers([adreg,bdreg,cdreg])
+        suf = self.get_suffix(adt_size(a_dt)*self.get_group(modifiers, kwargs))
+        part = 2 if mod.HI in modifiers else 1
+
+        return self.asmwrap(f"{self.inst_base}{part} "
+                            f"{cdreg}.{suf},{adreg}.{suf},{bdreg}.{suf}")
@@ -0,0 +1,18 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD trn1/trn2 permutation instructions
+"""
+
+from .neon_opperm_base import neon_opperm_base
+
+class neon_trn(neon_opperm_base):
+    """
+    NEON/ASIMD implementation of trn, trn1/trn2 interleave the even (trn1)
+    or odd (trn2) elements of A and B
+    """
+
+    inst_base = "trn"
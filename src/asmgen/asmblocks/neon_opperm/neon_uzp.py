@@ -0,0 +1,18 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD uzp1/uzp2 permutation instructions
+"""
+
+from .neon_opperm_base import neon_opperm_base
+
+class neon_uzp(neon_opperm_base):
+    """
+    NEON/ASIMD implementation of uzp, uzp1/uzp2 concatenate the even (uzp1)
+    or odd (uzp2) elements of A and B
+    """
+
+    inst_base = "uzp"
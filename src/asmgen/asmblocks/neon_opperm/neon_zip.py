@@ -0,0 +1,18 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD zip1/zip2 permutation instructions
+"""
+
+from .neon_opperm_base import neon_opperm_base
+
+class neon_zip(neon_opperm_base):
+    """
+    NEON/ASIMD implementation of zip, zip1/zip2 interleave the low (zip1)
+    or high (zip2) halves of A and B
+    """
+
+    inst_base = "zip"
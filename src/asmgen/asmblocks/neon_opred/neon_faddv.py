@@ -0,0 +1,47 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD sum reduction instruction sequence
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    data_reg
+)
+from ..operations import opred_modifier as mod
+from ..types.neon_types import neon_vreg
+
+from .neon_opred_base import neon_opred_base
+
+class neon_faddv(neon_opred_base):
+    """
+    NEON/ASIMD implementation of faddv. NEON has no floating point add across
+    all lanes, pairwise adds halve the register into the vector view of the
+    result register until 2 elements are left
+    """
+
+    inst_base = "fadd"
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers(adreg, bdreg)
+        size = adt_size(a_dt)
+        full = self.full_suffixes[size]
+        vres = neon_vreg(bdreg.idx)
+
+        asmblock = ""
+        src = adreg
+        for _ in range(16//size//4):
+            asmblock += self.asmwrap(f"faddp {vres}.{full},{src}.{full},{src}.{full}")
+            src = vres
+        asmblock += self.asmwrap(f"faddp {bdreg.retype(a_dt)},{src}.{self.pair_suffixes[size]}")
+        return asmblock
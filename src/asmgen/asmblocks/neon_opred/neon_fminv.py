@@ -0,0 +1,17 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD minimum reduction instruction
+"""
+
+from .neon_opred_base import neon_opred_base
+
+class neon_fminv(neon_opred_base):
+    """
+    NEON/ASIMD implementation of fminv
+    """
+
+    inst_base = "fmin"
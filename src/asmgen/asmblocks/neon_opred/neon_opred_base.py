@@ -0,0 +1,86 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD reduction base case
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    data_reg
+)
+from ..operations import (
+    opred,
+    opred_modifier as mod,
+    operand_restriction
+)
+from ..types.aarch64_types import aarch64_freg
+from ..types.neon_types import neon_vreg
+
+class neon_opred_base(opred):
+    """
+    NEON/ASIMD base reduction implementation, reduces with the across-lanes
+    instruction (the pairwise instruction for 2 elements)
+    """
+
+    inst_base = "invalid"
+
+    # Arrangement of a full register and of its lowest 2 elements
+    full_suffixes = {8 : "2d", 4 : "4s", 2 : "8h"}
+    pair_suffixes = {8 : "2d", 4 : "2s", 2 : "2h"}
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt} for dt in [adt.FP64, adt.FP32, adt.FP16]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.ORDERED in modifiers:
+            raise ValueError("NEON has no strictly ordered reductions")
+
+    def get_required_params(self, modifiers : set[mod]) -> list[set[str]]:
+        return []
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for NEON opred")
+
+    def check_valid_registers(self, adreg : data_reg, bdreg : data_reg):
+        """
+        Checks the register types of the operands
+
+        :param adreg: Vector register to reduce
+        :type adreg: class:`asmgen.registers.data_reg`
+        :param bdreg: Scalar register to write the result to
+        :type bdreg: class:`asmgen.registers.data_reg`
+        :raises ValueError: If the registers are not a NEON and a FP register
+        """
+        if not isinstance(adreg, neon_vreg):
+            raise ValueError("adreg of a NEON opred must be neon_vreg")
+        if not isinstance(bdreg, aarch64_freg):
+            raise ValueError("bdreg of a NEON opred must be aarch64_freg")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers(adreg, bdreg)
+        size = adt_size(a_dt)
+        bdreg = bdreg.retype(a_dt)
+        if 8 == size:
+            return self.asmwrap(f"{self.inst_base}p {bdreg},{adreg}.{self.pair_suffixes[size]}")
+        return self.asmwrap(f"{self.inst_base}v {bdreg},{adreg}.{self.full_suffixes[size]}")
@@ -0,0 +1,68 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+NEON/ASIMD bitwise selects
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import (
+    opsel,
+    opsel_modifier as mod,
+    operand_restriction
+)
+from ..types.neon_types import neon_vreg
+
+class neon_sel(opsel):
+    """
+    NEON/ASIMD implementation of sel with a bitwise select. Depending on which
+    register is overwritten this is a bsl (mask), bit (false operand) or bif
+    (true operand), otherwise the mask is copied to the destination first
+    """
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in
+                [adt.FP16, adt.BF16, adt.FP32, adt.FP64,
+                 adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64,
+                 adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for NEON opsel")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt, mreg,
+                       modifiers : set[mod], **kwargs) -> str:
+        if not all(isinstance(r, neon_vreg) for r in [adreg, bdreg, cdreg, mreg]):
+            raise ValueError("All registers of a NEON opsel must be neon_vreg")
+
+        freg,treg = self.get_operands(adreg, bdreg, modifiers)
+        if cdreg.idx == mreg.idx:
+            return self.asmwrap(f"bsl {cdreg}.16b,{treg}.16b,{freg}.16b")
+        if cdreg.idx == freg.idx:
+            return self.asmwrap(f"bit {cdreg}.16b,{treg}.16b,{mreg}.16b")
+        if cdreg.idx == treg.idx:
+            return self.asmwrap(f"bif {cdreg}.16b,{freg}.16b,{mreg}.16b")
+        asmblock  = self.asmwrap(f"mov {cdreg}.16b,{mreg}.16b")
+        asmblock += self.asmwrap(f"bsl {cdreg}.16b,{treg}.16b,{freg}.16b")
+        return asmblock
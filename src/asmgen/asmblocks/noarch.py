@@ -12,17 +12,31 @@ Base ASM generator class and ISA-independent utilities
 # pylint: disable=too-many-lines
 
 
+import math
+import re
 from enum import Enum,auto
 from abc import ABC, abstractmethod
-from typing import TypeAlias,Union,TYPE_CHECKING
-
-from .operations import dummy_opd3
+from typing import TypeAlias,Union,Callable,TYPE_CHECKING
+
+from .operations import (
+    dummy_opd3,widening_method,opd3_modifier,
+    dummy_opperm,opperm_modifier,
+    dummy_opred,
+    dummy_opcvt,opcvt_modifier,
+    dummy_opcmp,
+    dummy_opsel,
+    dummy_oplut
+)
 from ..registers import (
     reg_tracker,
     asm_data_type,
     asm_index_type,
+    adt_size,
+    adt_is_float,
+    adt_is_int,
+    adt_is_signed,
     data_reg,
-    greg_base, freg_base, vreg_base, treg_base
+    greg_base, freg_base, vreg_base, treg_base, mreg_base
 )
 from ..asmdata import asm_data
 
@@ -44,6 +58,31 @@ class comparison(Enum):
     LT = auto() # less than
     GT = auto() # greater than
 
+class bscalar_strategy(Enum):
+    """
+    Ways to provide scalar B elements to a vector-times-scalar fma
+    (see :meth:`asmgen.select_bscalar_strategy`)
+    """
+    MEMBCAST = auto() # broadcast from memory by the fma itself, no B registers
+    IDX      = auto() # packed into the lanes of vector registers, indexed fma
+    VF       = auto() # one scalar register per element, vector-scalar fma
+    BCAST    = auto() # one vector register per element, broadcast by a load
+
+def asmunwrap(line : str) -> str:
+    """
+    Returns the bare instruction (or label/directive) of a line emitted by
+    :meth:`asmgen.asmwrap`, regardless of whether the output was inline
+
+    :param line: Single line of normal or inline ASM
+    :type line: str
+    :return: Instruction text without inline quoting and surrounding whitespace
+    :rtype: str
+    """
+    line = line.strip()
+    if line.startswith('"') and line.endswith('\\n\\t"'):
+        line = line[1:-5]
+    return line.strip()
+
 class asmgen(ABC):
     """
     Abstract interface for asm code generator
@@ -63,6 +102,22 @@ class asmgen(ABC):
         self.fmul = dummy_opd3()
         self.fadd = dummy_opd3()
         self.dota = dummy_opd3()
+        self.mma = dummy_opd3()
+        self.cfma = dummy_opd3()
+        self.cadd = dummy_opd3()
+        self.fmax = dummy_opd3()
+        self.fmin = dummy_opd3()
+        self.fdiv = dummy_opd3()
+        self.zip = dummy_opperm()
+        self.uzp = dummy_opperm()
+        self.trn = dummy_opperm()
+        self.faddv = dummy_opred()
+        self.fmaxv = dummy_opred()
+        self.fminv = dummy_opred()
+        self.fcvt = dummy_opcvt()
+        self.cmp = dummy_opcmp()
+        self.sel = dummy_opsel()
+        self.tbl = dummy_oplut()
 
         self.asmdata : dict[str,list[asm_data]] = dict()
 
@@ -206,6 +261,33 @@ class asmgen(ABC):
         """
         raise NotImplementedError(NIE_MESSAGE)
 
+    def optimize_mode_transitions(self, asmblock : str) -> str:
+        """
+        Returns the ASM block with redundant ISA mode transitions removed or
+        moved out of loops, e.g. adjacent smstop/smstart pairs for SME. The block
+        may be normal or inline ASM.
+
+        ISAs without mode transitions return the block unchanged
+
+        :param asmblock: ASM generated by this generator
+        :type asmblock: str
+        :return: ASM block with optimized mode transitions
+        :rtype: str
+        """
+        return asmblock
+
+    def nt_fence(self) -> str:
+        """
+        Returns the string containing the fence required after non-temporal
+        stores (opdna1_modifier.NT) before the data may be consumed by other
+        threads, e.g. sfence on x86. Empty for ISAs where non-temporal
+        accesses are only a hint and ordered like normal stores
+
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        return ""
+
     def isadata(self) -> str:
         """
         Returns a string containing ISA-specific ISA data, like indices for a 
@@ -259,6 +341,35 @@ class asmgen(ABC):
             cpuinfo = f.read()
         return self.supportedby_cpuinfo(cpuinfo)
 
+    def dt_supportedby_cpuinfo(self, cpuinfo : str, dt : asm_data_type) -> bool:
+        """
+        Given a cpuinfo string, return whether the described CPU supports arithmetic
+        on the data type with this generator. Data types that need an ISA extension
+        (i.e. FP16) should check for it in addition to the generator requirements
+
+        :param cpuinfo: string containing a description of the CPU, i.e. /proc/cpuinfo
+        :type cpuinfo: str
+        :param dt: Data type to check
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: True if the data type is supported, otherwise False
+        :rtype: bool
+        """
+        return self.supportedby_cpuinfo(cpuinfo)
+
+    def dt_supported_on_host(self, dt : asm_data_type) -> bool:
+        """
+        Checks whether the current machine supports arithmetic on the data type
+        with this generator
+
+        :param dt: Data type to check
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: True if the data type is supported, otherwise False
+        :rtype: bool
+        """
+        with open("/proc/cpuinfo","r", encoding="utf-8") as f:
+            cpuinfo = f.read()
+        return self.dt_supportedby_cpuinfo(cpuinfo, dt)
+
     @abstractmethod
     def greg(self, reg_idx : int) -> greg_base:
         """
@@ -315,6 +426,19 @@ class asmgen(ABC):
         """
         raise NotImplementedError(NIE_MESSAGE)
 
+    def mreg(self, reg_idx : int) -> mreg_base|vreg_base:
+        """
+        Given a register index, returns the object describing the respective
+        mask register written by cmp and used by sel and masked operations.
+        ISAs without dedicated mask registers return a vector register
+
+        :param reg_idx: Integer index of the mask register
+        :type reg_idx: int
+        :return: object suitable for use as the mreg parameter of operations
+        :rtype: class:`asmgen.registers.mreg_base`|class:`asmgen.registers.vreg_base`
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
     @property
     @abstractmethod
     def simd_size(self) -> int:
@@ -739,6 +863,841 @@ class asmgen(ABC):
         """
         raise NotImplementedError(NIE_MESSAGE)
 
+    @abstractmethod
+    def vector_loop(self, *, count_reg : greg_type, step_reg : greg_type,
+                    label : str, dt : asm_data_type,
+                    body : Callable[[mreg_base|None, greg_type], str],
+                    mreg : mreg_base|None = None) -> str:
+        """
+        Returns the string containing a strip-mined loop over the elements
+        in count_reg, with the tail handled by the ISA's predication
+        (predicates, masks or the vector length) instead of a scalar epilogue
+
+        The body is generated once and called with the predicate/mask register
+        its loads, stores and operations have to use (None if the vector length
+        takes care of the tail) and a GP register containing the number of
+        elements to advance pointers by after each iteration
+
+        :param count_reg: GP register containing the element count, consumed by the loop
+        :type count_reg: class:`asmgen.register.greg_base`
+        :param step_reg: GP register the loop writes the elements per iteration to
+        :type step_reg: class:`asmgen.register.greg_base`
+        :param label: Label name of the loop start, also used as prefix for helper labels
+        :type label: str
+        :param dt: Element data type
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param body: Callable generating the loop body
+        :type body: Callable[[class:`asmgen.registers.mreg_base`|None,
+                    class:`asmgen.register.greg_base`], str]
+        :param mreg: predicate/mask register to use, ISA-specific default if None
+        :type mreg: class:`asmgen.registers.mreg_base`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
+    @abstractmethod
+    def ff_loop(self, *, step_reg : greg_type, label : str, dt : asm_data_type,
+                load : Callable[[], str],
+                body : Callable[[mreg_base|None, greg_type], str],
+                mreg : mreg_base|None = None) -> str:
+        """
+        Returns the string containing a loop over data of unknown length (e.g.
+        terminated by a sentinel) that is read with first-faulting loads
+        (opdna1_modifier.FF), which only fault on the first element and
+        otherwise stop loading at the first inaccessible element
+
+        Every iteration the loads are generated by load, afterwards the number
+        of successfully loaded elements is written to step_reg and the body is
+        generated with the predicate/mask register of the loaded elements (None if
+        the vector length was shortened instead). The loop does not terminate on
+        its own, the body has to branch to the label "{label}_end" to leave it
+
+        :param step_reg: GP register the loop writes the number of loaded elements to
+        :type step_reg: class:`asmgen.register.greg_base`
+        :param label: Label name of the loop start, also used as prefix for helper labels
+        :type label: str
+        :param dt: Element data type
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param load: Callable generating the first-faulting loads
+        :type load: Callable[[], str]
+        :param body: Callable generating the loop body
+        :type body: Callable[[class:`asmgen.registers.mreg_base`|None,
+                    class:`asmgen.register.greg_base`], str]
+        :param mreg: predicate/mask register to use, ISA-specific default if None
+        :type mreg: class:`asmgen.registers.mreg_base`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
+    def widening_fma_cregs(self, *, a_dt : asm_data_type, c_dt : asm_data_type) -> int:
+        """
+        Returns the number of vector registers the wide C component of
+        :meth:`widening_fma` is spread over
+
+        :param a_dt: Data type of the narrow A and B components
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param c_dt: Data type of the wide C component
+        :type c_dt: class:`asmgen.registers.asm_data_type`
+        :return: Number of C registers
+        :rtype: int
+        :raises ValueError: If the ISA has no widening fma
+        """
+        ways = adt_size(c_dt)//adt_size(a_dt)
+        if 1 == ways:
+            return 1
+        method = self.fma.widening_method
+        if widening_method.NONE == method:
+            raise ValueError(f"No widening fma for {a_dt.name} -> {c_dt.name}")
+        if widening_method.DOT_NEIGHBOURS == method:
+            return 1
+        return ways
+
+    def reserve_widening_cregs(self, *, rt : reg_tracker, a_dt : asm_data_type,
+                               c_dt : asm_data_type) -> list[vreg_type]:
+        """
+        Reserves the vector registers for the wide C component of :meth:`widening_fma`.
+        ISAs widening into register groups get an aligned group of consecutive registers
+
+        :param rt: Register tracker to reserve the registers with (type tag 'vreg')
+        :type rt: class:`asmgen.registers.reg_tracker`
+        :param a_dt: Data type of the narrow A and B components
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param c_dt: Data type of the wide C component
+        :type c_dt: class:`asmgen.registers.asm_data_type`
+        :return: Reserved C registers
+        :rtype: list[class:`asmgen.registers.vreg_base`]
+        :raises IndexError: If not enough (consecutive) registers are available
+        """
+        count = self.widening_fma_cregs(a_dt=a_dt, c_dt=c_dt)
+        if widening_method.VEC_GROUP != self.fma.widening_method:
+            return [self.vreg(rt.reserve_any_reg('vreg')) for _ in range(count)]
+
+        used = rt.get_used_regs('vreg')
+        for base in range(0, rt.available_reg_count('vreg')-count+1, count):
+            idxs = range(base, base+count)
+            if not any(i in used for i in idxs):
+                for i in idxs:
+                    rt.reserve_specific_reg('vreg', i)
+                return [self.vreg(i) for i in idxs]
+        raise IndexError(f"No aligned group of {count} vreg registers available")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def widening_fma(self, *, adreg : vreg_type, bdreg : vreg_type,
+                     cdregs : list[vreg_type],
+                     a_dt : asm_data_type, b_dt : asm_data_type, c_dt : asm_data_type,
+                     modifiers : set[opd3_modifier] = set()) -> str:
+        """
+        Returns the string containing the instruction(s) multiplying all narrow
+        elements of A and B and accumulating into the wide elements of cdregs,
+        lowered according to the widening_method of the ISA's fma:
+
+        - SPLIT_INSTRUCTIONS: cdregs[p] accumulates part p of the elements
+        - VEC_GROUP: cdregs is the register group accumulating all elements in order
+        - DOT_NEIGHBOURS: cdregs[0] accumulates the sums of neighbouring products
+
+        Which narrow element ends up in which wide element is ISA-specific, reductions
+        (e.g. over K in a GEMM) are independent of it. Allocate cdregs with
+        :meth:`reserve_widening_cregs`
+
+        :param adreg: Vector register containing the narrow A component
+        :type adreg: class:`asmgen.registers.vreg_base`
+        :param bdreg: Vector register containing the narrow B component
+        :type bdreg: class:`asmgen.registers.vreg_base`
+        :param cdregs: Vector registers containing the wide C component
+        :type cdregs: list[class:`asmgen.registers.vreg_base`]
+        :param a_dt: Data type of the A component
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type of the B component
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param c_dt: Data type of the C component
+        :type c_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Additional fma modifiers (e.g. NP)
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opd3_modifier`]
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        count = self.widening_fma_cregs(a_dt=a_dt, c_dt=c_dt)
+        if len(cdregs) != count:
+            raise ValueError(f"{a_dt.name} -> {c_dt.name} widening fma requires "
+                             f"{count} C registers, got {len(cdregs)}")
+        args = {'adreg':adreg, 'bdreg':bdreg,
+                'a_dt':a_dt, 'b_dt':b_dt, 'c_dt':c_dt}
+        if 1 == count:
+            return self.fma(cdreg=cdregs[0], modifiers=modifiers, **args)
+
+        if widening_method.VEC_GROUP == self.fma.widening_method:
+            names = [str(r) for r in cdregs]
+            group = [str(self.vreg(i)) for i in range(self.max_vregs)]
+            if not any(group[b:b+count] == names for b in range(0, len(group), count)):
+                raise ValueError("cdregs have to be an aligned register group")
+            return self.fma(cdreg=cdregs[0], modifiers=modifiers, **args)
+
+        return "".join(self.fma(cdreg=c, modifiers=modifiers|{opd3_modifier.PART},
+                                part=p, **args)
+                       for p,c in enumerate(cdregs))
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def convert_vectors(self, *, adregs : list[vreg_type], bdregs : list[vreg_type],
+                        a_dt : asm_data_type, b_dt : asm_data_type,
+                        modifiers : set[opcvt_modifier] = set(), **kwargs) -> str:
+        """
+        Returns the string containing the instruction(s) converting all elements
+        of adregs to bdregs. Conversions between types of different size take one
+        narrow register and one wide register per part, lowered according to the
+        widening_method of the ISA's fcvt:
+
+        - SPLIT_INSTRUCTIONS: wide register p holds part p of the narrow elements
+        - VEC_GROUP: the wide registers are the register group holding all elements in order
+
+        Narrowing the result of a widening conversion restores the element order.
+        Conversions fcvt can't do in one step (e.g. SINT32 -> SINT8 or
+        FP32 -> SINT8) are chained through the intermediate_conversion_dt
+        types on SPLIT_INSTRUCTIONS ISAs, chained narrowing conversions
+        overwrite adregs. VEC_GROUP ISAs only convert in one step, as every
+        step needs its own vtype the caller has to chain them.
+        SAT and RTZ only apply to the steps they are valid for.
+        Additional parameters (e.g. tmpreg) are passed on to fcvt
+
+        :param adregs: Vector registers containing the elements to convert
+        :type adregs: list[class:`asmgen.registers.vreg_base`]
+        :param bdregs: Vector registers to write the converted elements to
+        :type bdregs: list[class:`asmgen.registers.vreg_base`]
+        :param a_dt: Data type to convert from
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type to convert to
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Additional fcvt modifiers (e.g. SAT)
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcvt_modifier`]
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        a_size, b_size = adt_size(a_dt), adt_size(b_dt)
+        ways = max(a_size, b_size)//min(a_size, b_size)
+        narrow, wide = (adregs, bdregs) if a_size <= b_size else (bdregs, adregs)
+        if 1 != len(narrow) or ways != len(wide):
+            raise ValueError(f"{a_dt.name} -> {b_dt.name} conversion requires 1 narrow "
+                             f"and {ways} wide registers, got {len(narrow)} and {len(wide)}")
+        mid_dt = self.intermediate_conversion_dt(a_dt=a_dt, b_dt=b_dt)
+        if mid_dt is not None:
+            if widening_method.VEC_GROUP == self.fcvt.widening_method:
+                raise ValueError(f"{a_dt.name} -> {b_dt.name} conversion needs more than "
+                                 "one step, chain the steps setting the vtype for each")
+            return self.convert_vectors_chained(adregs=adregs, bdregs=bdregs,
+                                                a_dt=a_dt, mid_dt=mid_dt, b_dt=b_dt,
+                                                modifiers=modifiers, **kwargs)
+
+        args = {'a_dt':a_dt, 'b_dt':b_dt, **kwargs}
+        if 1 == ways:
+            return self.fcvt(adreg=adregs[0], bdreg=bdregs[0], modifiers=modifiers, **args)
+
+        if widening_method.VEC_GROUP == self.fcvt.widening_method:
+            names = [str(r) for r in wide]
+            group = [str(self.vreg(i)) for i in range(self.max_vregs)]
+            if not any(group[b:b+ways] == names for b in range(0, len(group), ways)):
+                raise ValueError("The wide registers have to be an aligned register group")
+            return self.fcvt(adreg=adregs[0], bdreg=bdregs[0], modifiers=modifiers, **args)
+
+        modifiers = modifiers|{opcvt_modifier.PART}
+        if a_size < b_size:
+            return "".join(self.fcvt(adreg=adregs[0], bdreg=b, modifiers=modifiers,
+                                     part=p, **args)
+                           for p,b in enumerate(bdregs))
+        return "".join(self.fcvt(adreg=a, bdreg=bdregs[0], modifiers=modifiers,
+                                 part=p, **args)
+                       for p,a in enumerate(adregs))
+
+    def intermediate_conversion_dt(self, *, a_dt : asm_data_type,
+                                   b_dt : asm_data_type) -> asm_data_type|None:
+        """
+        Returns the data type convert_vectors converts to first if fcvt can't
+        convert a_dt to b_dt in one step. Integers change their size by a
+        factor of 2 per step, floating point numbers are converted from and to
+        integers of the same size, e.g. FP32 -> SINT32 -> SINT16 -> SINT8 and
+        UINT8 -> UINT16 -> UINT32 -> FP32. Floating point to floating point
+        conversions aren't chained as they would round twice
+
+        :param a_dt: Data type to convert from
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type to convert to
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :return: Intermediate data type, None if the conversion is a single step
+                 or can't be chained
+        :rtype: class:`asmgen.registers.asm_data_type` | None
+        """
+        if {'adreg':a_dt, 'bdreg':b_dt} in self.fcvt.supported_dts():
+            return None
+        adt = asm_data_type
+        int_types = {(1,True):adt.SINT8, (2,True):adt.SINT16,
+                     (4,True):adt.SINT32, (8,True):adt.SINT64,
+                     (1,False):adt.UINT8, (2,False):adt.UINT16,
+                     (4,False):adt.UINT32, (8,False):adt.UINT64}
+        a_size, b_size = adt_size(a_dt), adt_size(b_dt)
+        if adt_is_int(a_dt) and adt_is_int(b_dt) and max(a_size, b_size) > 2*min(a_size, b_size):
+            size = a_size//2 if a_size > b_size else 2*a_size
+            return int_types[(size, adt_is_signed(a_dt))]
+        if adt_is_float(a_dt) and adt_is_int(b_dt) and a_size > b_size:
+            return int_types.get((a_size, adt_is_signed(b_dt)))
+        if adt_is_int(a_dt) and adt_is_float(b_dt) and a_size < b_size:
+            return int_types.get((b_size, adt_is_signed(a_dt)))
+        return None
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value,too-many-arguments
+    def convert_vectors_chained(self, *, adregs : list[vreg_type], bdregs : list[vreg_type],
+                                a_dt : asm_data_type, mid_dt : asm_data_type,
+                                b_dt : asm_data_type,
+                                modifiers : set[opcvt_modifier] = set(), **kwargs) -> str:
+        """
+        Returns the string containing the instruction(s) converting adregs to
+        mid_dt and on to bdregs with convert_vectors. The intermediate values
+        of a narrowing conversion are kept in adregs, the ones of a widening
+        conversion in the last register of their half of bdregs, which is
+        written last
+
+        :param adregs: Vector registers containing the elements to convert
+        :type adregs: list[class:`asmgen.registers.vreg_base`]
+        :param bdregs: Vector registers to write the converted elements to
+        :type bdregs: list[class:`asmgen.registers.vreg_base`]
+        :param a_dt: Data type to convert from
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param mid_dt: Data type to convert to first
+        :type mid_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type to convert to
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Additional fcvt modifiers (e.g. SAT)
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcvt_modifier`]
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        def step(x_dt : asm_data_type, y_dt : asm_data_type,
+                 xregs : list[vreg_base], yregs : list[vreg_base]) -> str:
+            step_modifiers = set(modifiers)
+            if not adt_is_int(x_dt) or adt_size(x_dt) <= adt_size(y_dt):
+                step_modifiers.discard(opcvt_modifier.SAT)
+            if not adt_is_float(x_dt) or not adt_is_int(y_dt):
+                step_modifiers.discard(opcvt_modifier.RTZ)
+            return self.convert_vectors(adregs=xregs, bdregs=yregs, a_dt=x_dt, b_dt=y_dt,
+                                        modifiers=step_modifiers, **kwargs)
+
+        a_size, mid_size = adt_size(a_dt), adt_size(mid_dt)
+        if a_size == mid_size:
+            asmblock = "".join(step(a_dt, mid_dt, [a], [a]) for a in adregs)
+            return asmblock + step(mid_dt, b_dt, adregs, bdregs)
+        if adt_size(b_dt) == mid_size:
+            asmblock = step(a_dt, mid_dt, adregs, bdregs)
+            return asmblock + "".join(step(mid_dt, b_dt, [b], [b]) for b in bdregs)
+        # The intermediate step converts to or from two registers
+        if a_size > mid_size:
+            half = len(adregs)//2
+            midregs = [adregs[0], adregs[half]]
+            asmblock  = step(a_dt, mid_dt, adregs[:half], midregs[:1])
+            asmblock += step(a_dt, mid_dt, adregs[half:], midregs[1:])
+            return asmblock + step(mid_dt, b_dt, midregs, bdregs)
+        half = len(bdregs)//2
+        midregs = [bdregs[half-1], bdregs[-1]]
+        asmblock  = step(a_dt, mid_dt, adregs, midregs)
+        asmblock += step(mid_dt, b_dt, midregs[:1], bdregs[:half])
+        return asmblock + step(mid_dt, b_dt, midregs[1:], bdregs[half:])
+
+    def select_bscalar_strategy(self, *, dt : asm_data_type) -> bscalar_strategy:
+        """
+        Returns the strategy needing the fewest loads and registers to multiply
+        vectors by scalar B elements, in order of preference:
+        MEMBCAST, IDX, VF, BCAST (which every ISA supports). A strategy is
+        only picked if the fma accepts its modifier for dt
+
+        :param dt: Data type of the A, B and C components
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: Strategy to pass to the other bscalar methods
+        :rtype: class:`bscalar_strategy`
+        """
+        # Emit a trial fma per strategy, the modifiers may depend on dt
+        candidates = [(bscalar_strategy.MEMBCAST,
+                       lambda : {'bdreg':None, 'modifiers':{opd3_modifier.BCAST},
+                                 'areg':self.greg(0), 'offset':0}),
+                      (bscalar_strategy.IDX,
+                       lambda : {'bdreg':self.vreg(1), 'modifiers':{opd3_modifier.IDX},
+                                 'idx':0}),
+                      (bscalar_strategy.VF,
+                       lambda : {'bdreg':self.freg(1, dt), 'modifiers':{opd3_modifier.VF}})]
+        for strategy,trial_args in candidates:
+            try:
+                self.fma(adreg=self.vreg(2), cdreg=self.vreg(3),
+                         a_dt=dt, b_dt=dt, c_dt=dt, **trial_args())
+            except (ValueError, NotImplementedError):
+                continue
+            return strategy
+        return bscalar_strategy.BCAST
+
+    def bscalar_reg_count(self, *, strategy : bscalar_strategy, count : int,
+                          dt : asm_data_type) -> int:
+        """
+        Returns the number of registers holding count B elements. These are
+        scalar registers for VF and vector registers otherwise
+
+        :param strategy: Strategy from :meth:`select_bscalar_strategy`
+        :type strategy: class:`bscalar_strategy`
+        :param count: Number of B elements
+        :type count: int
+        :param dt: Data type of the B elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: Number of registers
+        :rtype: int
+        """
+        if bscalar_strategy.MEMBCAST == strategy:
+            return 0
+        if bscalar_strategy.IDX == strategy:
+            per_reg = self.indexable_elements(dt)
+            return (count+per_reg-1)//per_reg
+        return count
+
+    def reserve_bscalar_regs(self, *, rt : reg_tracker, strategy : bscalar_strategy,
+                             count : int, dt : asm_data_type) -> list[freg_type|vreg_type]:
+        """
+        Reserves the registers holding count B elements. ISAs restricting the
+        registers of indexed fmas reserve the lowest ones, so call this first
+
+        :param rt: Register tracker to reserve the registers with (type tags 'freg' and 'vreg')
+        :type rt: class:`asmgen.registers.reg_tracker`
+        :param strategy: Strategy from :meth:`select_bscalar_strategy`
+        :type strategy: class:`bscalar_strategy`
+        :param count: Number of B elements
+        :type count: int
+        :param dt: Data type of the B elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: Reserved B registers
+        :rtype: list[class:`asmgen.registers.freg_base`|class:`asmgen.registers.vreg_base`]
+        """
+        reg_count = self.bscalar_reg_count(strategy=strategy, count=count, dt=dt)
+        if bscalar_strategy.VF == strategy:
+            return [self.freg(rt.reserve_any_reg('freg'), dt) for _ in range(reg_count)]
+        return [self.vreg(rt.reserve_any_reg('vreg')) for _ in range(reg_count)]
+
+    def load_bscalars(self, *, strategy : bscalar_strategy, areg : greg_type,
+                      offset : int, bregs : list[freg_type|vreg_type],
+                      count : int, dt : asm_data_type) -> str:
+        """
+        Returns the string containing the instruction(s) to load count consecutive
+        B elements at areg+offset into bregs. IDX loads whole vector registers,
+        i.e. up to :meth:`indexable_elements`-1 elements past the last one are read
+
+        :param strategy: Strategy from :meth:`select_bscalar_strategy`
+        :type strategy: class:`bscalar_strategy`
+        :param areg: Register containing the address of the first B element
+        :type areg: class:`asmgen.registers.greg_base`
+        :param offset: Byte offset to the address
+        :type offset: int
+        :param bregs: Registers from :meth:`reserve_bscalar_regs`
+        :type bregs: list[class:`asmgen.registers.freg_base`|class:`asmgen.registers.vreg_base`]
+        :param count: Number of B elements
+        :type count: int
+        :param dt: Data type of the B elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        :raises ValueError: If the number of registers doesn't match the strategy
+        """
+        reg_count = self.bscalar_reg_count(strategy=strategy, count=count, dt=dt)
+        if len(bregs) != reg_count:
+            raise ValueError(f"{strategy.name} requires {reg_count} B registers "
+                             f"for {count} elements, got {len(bregs)}")
+        size = adt_size(dt)
+        if bscalar_strategy.IDX == strategy:
+            reg_bytes = self.indexable_elements(dt)*size
+            return "".join(self.load_vector_immoff(areg=areg, offset=offset+i*reg_bytes,
+                                                   vreg=r, dt=dt)
+                           for i,r in enumerate(bregs))
+        if bscalar_strategy.VF == strategy:
+            return "".join(self.load_freg(areg=areg, offset=offset+j*size, dst=r, dt=dt)
+                           for j,r in enumerate(bregs))
+        if bscalar_strategy.BCAST == strategy:
+            return "".join(self.load_vector_bcast1_immoff(areg=areg, offset=offset+j*size,
+                                                          vreg=r, dt=dt)
+                           for j,r in enumerate(bregs))
+        return ""
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def fma_bscalar(self, *, strategy : bscalar_strategy, adreg : vreg_type,
+                    bregs : list[freg_type|vreg_type], j : int, cdreg : vreg_type,
+                    areg : greg_type, offset : int, dt : asm_data_type,
+                    modifiers : set[opd3_modifier] = set()) -> str:
+        """
+        Returns the string containing the instruction(s) accumulating the vector
+        in adreg times B element j into cdreg
+
+        :param strategy: Strategy from :meth:`select_bscalar_strategy`
+        :type strategy: class:`bscalar_strategy`
+        :param adreg: Vector register containing the A component
+        :type adreg: class:`asmgen.registers.vreg_base`
+        :param bregs: Registers loaded by :meth:`load_bscalars`
+        :type bregs: list[class:`asmgen.registers.freg_base`|class:`asmgen.registers.vreg_base`]
+        :param j: Index of the B element
+        :type j: int
+        :param cdreg: Vector register containing the C component
+        :type cdreg: class:`asmgen.registers.vreg_base`
+        :param areg: Register containing the address of the first B element (MEMBCAST)
+        :type areg: class:`asmgen.registers.greg_base`
+        :param offset: Byte offset to the address (MEMBCAST)
+        :type offset: int
+        :param dt: Data type of the A, B and C components
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Additional fma modifiers (e.g. NP)
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opd3_modifier`]
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        args = {'adreg':adreg, 'cdreg':cdreg, 'a_dt':dt, 'b_dt':dt, 'c_dt':dt}
+        if bscalar_strategy.MEMBCAST == strategy:
+            return self.fma(bdreg=None, modifiers=modifiers|{opd3_modifier.BCAST},
+                            areg=areg, offset=offset+j*adt_size(dt), **args)
+        if bscalar_strategy.IDX == strategy:
+            per_reg = self.indexable_elements(dt)
+            return self.fma(bdreg=bregs[j//per_reg], modifiers=modifiers|{opd3_modifier.IDX},
+                            idx=j%per_reg, **args)
+        if bscalar_strategy.VF == strategy:
+            return self.fma(bdreg=bregs[j], modifiers=modifiers|{opd3_modifier.VF}, **args)
+        return self.fma(bdreg=bregs[j], modifiers=modifiers, **args)
+
+    def outer_product_kstep(self, *, strategy : bscalar_strategy,
+                            adregs : list[vreg_type], areg : greg_type, offset : int,
+                            bregs : list[freg_type|vreg_type],
+                            cdregs : list[list[vreg_type]],
+                            dt : asm_data_type) -> str:
+        """
+        Returns the string containing the instructions for one k step of an
+        outer product microkernel: loads the B elements at areg+offset and
+        accumulates adregs[i] times B element j into cdregs[i][j]
+
+        :param strategy: Strategy from :meth:`select_bscalar_strategy`
+        :type strategy: class:`bscalar_strategy`
+        :param adregs: Vector registers containing the A column
+        :type adregs: list[class:`asmgen.registers.vreg_base`]
+        :param areg: Register containing the address of the B row
+        :type areg: class:`asmgen.registers.greg_base`
+        :param offset: Byte offset to the address
+        :type offset: int
+        :param bregs: Registers from :meth:`reserve_bscalar_regs` for len(cdregs[0]) elements
+        :type bregs: list[class:`asmgen.registers.freg_base`|class:`asmgen.registers.vreg_base`]
+        :param cdregs: Vector registers containing the C block, indexed [i][j]
+        :type cdregs: list[list[class:`asmgen.registers.vreg_base`]]
+        :param dt: Data type of the A, B and C components
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        if len(cdregs) != len(adregs):
+            raise ValueError(f"Got {len(adregs)} A registers for {len(cdregs)} rows of C")
+        count = len(cdregs[0])
+        asmblock = self.load_bscalars(strategy=strategy, areg=areg, offset=offset,
+                                      bregs=bregs, count=count, dt=dt)
+        for j in range(count):
+            for adreg,crow in zip(adregs, cdregs):
+                asmblock += self.fma_bscalar(strategy=strategy, adreg=adreg,
+                                             bregs=bregs, j=j, cdreg=crow[j],
+                                             areg=areg, offset=offset, dt=dt)
+        return asmblock
+
+    def accumulator_count(self, *, latency : int, throughput : float) -> int:
+        """
+        Returns the number of independent accumulators a reduction has to be
+        split across to keep the FMA units busy. Each FMA into an accumulator
+        waits for the previous one, so latency*throughput FMAs have to be in flight
+
+        :param latency: FMA latency in cycles
+        :type latency: int
+        :param throughput: Number of FMAs issued per cycle
+        :type throughput: float
+        :return: Number of accumulators
+        :rtype: int
+        """
+        return max(1, math.ceil(latency*throughput))
+
+    def reduce_accumulators(self, *, accregs : list[vreg_type], freg : freg_type,
+                            tmpreg : vreg_type, dt : asm_data_type) -> str:
+        """
+        Returns the string containing the instructions to sum up the partial
+        accumulators accregs in a tree of vector adds and to reduce the result
+        into freg. accregs are clobbered
+
+        :param accregs: Vector registers containing the partial sums
+        :type accregs: list[class:`asmgen.registers.vreg_base`]
+        :param freg: Scalar register to write the sum to
+        :type freg: class:`asmgen.registers.freg_base`
+        :param tmpreg: Temporary vector register for the horizontal reduction
+        :type tmpreg: class:`asmgen.registers.vreg_base`
+        :param dt: Data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        if not accregs:
+            raise ValueError("No accumulators to reduce")
+
+        asmblock = ""
+        regs = list(accregs)
+        while len(regs) > 1:
+            # Adds of one level are independent of each other
+            for a,b in zip(regs[0::2], regs[1::2]):
+                asmblock += self.fadd(adreg=a, bdreg=b, cdreg=a,
+                                      a_dt=dt, b_dt=dt, c_dt=dt)
+            regs = regs[0::2]
+        asmblock += self.faddv(adreg=regs[0], bdreg=freg, dt=dt, tmpreg=tmpreg)
+        return asmblock
+
+    def perm_setup(self, *, group : int, tmpreg : vreg_type) -> str:
+        """
+        Returns the string containing the instructions preparing the state the
+        trn permutation needs for the given group size. Empty unless overridden
+        by an ISA
+
+        :param group: Number of consecutive elements permuted as one element
+        :type group: int
+        :param tmpreg: Temporary vector register
+        :type tmpreg: class:`asmgen.registers.vreg_base`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        return ""
+
+    def trn_pair(self, *, adreg : vreg_type, bdreg : vreg_type, lodreg : vreg_type,
+                 hidreg : vreg_type, dt : asm_data_type, group : int) -> str:
+        """
+        Returns the string containing the instructions to write both trn
+        permutations of adreg and bdreg, the low one to lodreg and the high one
+        to hidreg. One of the destinations may alias adreg or bdreg, it is
+        written last
+
+        :param adreg: First source register
+        :type adreg: class:`asmgen.registers.vreg_base`
+        :param bdreg: Second source register
+        :type bdreg: class:`asmgen.registers.vreg_base`
+        :param lodreg: Register to write the trn permutation to
+        :type lodreg: class:`asmgen.registers.vreg_base`
+        :param hidreg: Register to write the trn.hi permutation to
+        :type hidreg: class:`asmgen.registers.vreg_base`
+        :param dt: Data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param group: Number of consecutive elements permuted as one element
+        :type group: int
+        :raises ValueError: If both destinations alias the sources or the ISA
+                            can't write a permutation to its destination
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        sources = {adreg.idx, bdreg.idx}
+        if lodreg.idx == hidreg.idx or {lodreg.idx, hidreg.idx} <= sources:
+            raise ValueError("Only one destination may alias the sources")
+        modifiers = {opperm_modifier.GROUP} if group > 1 else set()
+        lo = self.trn(adreg=adreg, bdreg=bdreg, cdreg=lodreg, dt=dt,
+                      modifiers=modifiers, group=group)
+        hi = self.trn(adreg=adreg, bdreg=bdreg, cdreg=hidreg, dt=dt,
+                      modifiers=modifiers|{opperm_modifier.HI}, group=group)
+        return hi+lo if lodreg.idx in sources else lo+hi
+
+    def transpose(self, *, srcregs : list[vreg_type], dstregs : list[vreg_type],
+                  tmpreg : vreg_type, dt : asm_data_type) -> str:
+        """
+        Returns the string containing the instructions to transpose the N x N
+        block held in the rows srcregs into the rows dstregs, where N is the number
+        of elements per vector register. Uses log2(N) stages of trn pairs with
+        doubling group sizes and renames registers instead of moving them, so
+        N+1 registers are enough: dstregs may alias srcregs and tmpreg, e.g.
+        dstregs=srcregs transposes in place. srcregs and tmpreg are clobbered
+
+        :param srcregs: Vector registers containing the rows of the block
+        :type srcregs: list[class:`asmgen.registers.vreg_base`]
+        :param dstregs: Vector registers to write the rows of the transposed block to
+        :type dstregs: list[class:`asmgen.registers.vreg_base`]
+        :param tmpreg: Temporary vector register, distinct from srcregs
+        :type tmpreg: class:`asmgen.registers.vreg_base`
+        :param dt: Data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :raises ValueError: If the vector length is not fixed, the registers don't
+                            fit or no renaming ends in dstregs (e.g. transposing
+                            2 x 2 in place needs a move)
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        if self.is_vla:
+            raise ValueError("Transposes require a fixed vector length")
+        n = self.simd_size//adt_size(dt)
+        if len(srcregs) != n or len(dstregs) != n:
+            raise ValueError(f"Transposing {dt.name} requires {n} source and destination rows")
+        if len({r.idx for r in srcregs+[tmpreg]}) != n+1:
+            raise ValueError("Source and temporary registers must be distinct")
+        if len({r.idx for r in dstregs}) != n:
+            raise ValueError("Destination registers must be distinct")
+
+        stages = n.bit_length()-1
+        if [r.idx for r in dstregs] == [r.idx for r in srcregs] and stages % 2 == 0:
+            # Each stage rotates the free register through one slot of every
+            # pair and the next stage rotates it back through the same slots:
+            # the slots whose two group bits are equal hit all pairs of both
+            rows = list(srcregs)
+            free = tmpreg
+            asmblock = ""
+            try:
+                for stage in range(stages):
+                    group = 1 << stage
+                    other = group << 1 if stage % 2 == 0 else group >> 1
+                    slots = [k for k in range(n) if bool(k & group) == bool(k & other)]
+                    if stage % 2:
+                        slots.reverse()
+                    asmblock += self.perm_setup(group=group, tmpreg=free)
+                    for k in slots:
+                        i,j = k & ~group, k | group
+                        lo,hi = rows[i],rows[j]
+                        if k == i:
+                            rows[i],free = free,lo
+                        else:
+                            rows[j],free = free,hi
+                        asmblock += self.trn_pair(adreg=lo, bdreg=hi, lodreg=rows[i],
+                                                  hidreg=rows[j], dt=dt, group=group)
+                return asmblock
+            except ValueError:
+                pass
+
+        # Depth-first search over the order of the pairs and which of their
+        # registers gets renamed, the last stage has to hit dstregs
+        failed = set()
+        visited = 0
+        def permute(rows : list[vreg_base], free : vreg_base, group : int,
+                    pending : tuple[int,...]) -> str|None:
+            nonlocal visited
+            if not pending:
+                if 2*group >= n:
+                    return ""
+                group *= 2
+                rest = permute(rows, free, group,
+                               tuple(i for i in range(n) if not i & group))
+                if rest is None:
+                    return None
+                return self.perm_setup(group=group, tmpreg=free)+rest
+            state = (tuple(r.idx for r in rows), free.idx, group, pending)
+            if state in failed:
+                return None
+            visited += 1
+            if visited > 20000:
+                raise ValueError("No register renaming found for the transpose")
+            final = 2*group == n
+            for i in pending:
+                j = i+group
+                lo,hi = rows[i],rows[j]
+                if final:
+                    live = {r.idx for r in rows}-{lo.idx, hi.idx}
+                    if dstregs[i].idx in live or dstregs[j].idx in live:
+                        continue
+                    options = [(dstregs[i], dstregs[j], free)]
+                else:
+                    # The first permutation goes to the free register, the
+                    # second overwrites one source and frees the other
+                    options = [(free, lo, hi), (free, hi, lo),
+                               (lo, free, hi), (hi, free, lo)]
+                for lodreg,hidreg,nextfree in options:
+                    try:
+                        asmblock = self.trn_pair(adreg=lo, bdreg=hi, lodreg=lodreg,
+                                                 hidreg=hidreg, dt=dt, group=group)
+                    except ValueError:
+                        continue
+                    nextrows = list(rows)
+                    nextrows[i],nextrows[j] = lodreg,hidreg
+                    rest = permute(nextrows, nextfree, group,
+                                   tuple(k for k in pending if k != i))
+                    if rest is not None:
+                        return asmblock+rest
+            failed.add(state)
+            return None
+
+        asmblock = permute(list(srcregs), tmpreg, 1, tuple(range(0, n, 2)))
+        if asmblock is None:
+            raise ValueError("No register renaming found for the transpose")
+        return self.perm_setup(group=1, tmpreg=tmpreg)+asmblock
+
+    def unpack_nibbles(self, *, vreg : vreg_type, lodst : vreg_type, hidst : vreg_type,
+                       tmpreg : vreg_type|None = None) -> str:
+        """
+        Returns the string containing the instructions to split every byte of vreg
+        into its low and high 4 bits, e.g. to use packed 4-bit values as table
+        indices. Either destination may be vreg itself
+
+        :param vreg: Vector register containing the packed bytes
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param lodst: Vector register to write the low nibbles to (as bytes)
+        :type lodst: class:`asmgen.registers.vreg_base`
+        :param hidst: Vector register to write the high nibbles to (as bytes)
+        :type hidst: class:`asmgen.registers.vreg_base`
+        :param tmpreg: Temporary vector register, required by some ISAs
+        :type tmpreg: class:`asmgen.registers.vreg_base`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
+    def scale_pow2(self, *, vreg : vreg_type, nreg : vreg_type,
+                   dt : asm_data_type) -> str:
+        """
+        Returns the string containing the instructions to multiply the elements of
+        vreg by 2^n, where nreg holds the integers n (signed, same element size).
+        The result has to be a normal number, unless the ISA has a native
+        instruction for this, the exponent field is incremented by n. nreg is clobbered
+
+        :param vreg: Vector register containing the elements to scale
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param nreg: Vector register containing the exponents to add
+        :type nreg: class:`asmgen.registers.vreg_base`
+        :param dt: Floating point data type of the elements of vreg
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
+    # pylint: disable-next=too-many-arguments
+    def split_exponent(self, *, vreg : vreg_type, ereg : vreg_type, offreg : vreg_type,
+                       tmpreg : vreg_type, dt : asm_data_type) -> str:
+        """
+        Returns the string containing the instructions to split the positive normal
+        elements x of vreg into m*2^e with m in [o,2*o), where o is the element of
+        offreg (e.g. 2/3 to get m-1 in [-1/3,1/3)). vreg is overwritten with m, ereg
+        with the integers e (signed, same element size)
+
+        :param vreg: Vector register containing the elements to split
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param ereg: Vector register to write the exponents to
+        :type ereg: class:`asmgen.registers.vreg_base`
+        :param offreg: Vector register containing o in all elements
+        :type offreg: class:`asmgen.registers.vreg_base`
+        :param tmpreg: Temporary vector register
+        :type tmpreg: class:`asmgen.registers.vreg_base`
+        :param dt: Floating point data type of the elements of vreg
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
+    def sqrt_vreg(self, *, vreg : vreg_type, dst : vreg_type,
+                  dt : asm_data_type) -> str:
+        """
+        Returns the string containing the instruction(s) to write the square roots
+        of the elements of vreg to dst
+
+        :param vreg: Vector register containing the radicands
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param dst: Vector register to write the square roots to
+        :type dst: class:`asmgen.registers.vreg_base`
+        :param dt: Floating point data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
     @abstractmethod
     def zero_greg(self, *, greg : greg_type) -> str:
         """
@@ -861,6 +1820,24 @@ class asmgen(ABC):
         """
         raise NotImplementedError(NIE_MESSAGE)
 
+    def greg_to_freg(self, *, greg : greg_type, freg : freg_type,
+                     dt : asm_data_type) -> str:
+        """
+        Returns the string containing the instruction(s) to convert the unsigned
+        integer in a GP register to a floating point value in a scalar register,
+        e.g. to divide by an element count
+
+        :param greg: GP register containing the integer
+        :type greg: class:`asmgen.register.greg_base`
+        :param freg: scalar register to write the converted value to
+        :type freg: class:`asmgen.register.freg_base`
+        :param dt: Floating point data type to convert to
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
     @abstractmethod
     def mov_greg_to_param(self, *, src : greg_type, param : str) -> str:
         """
@@ -1090,6 +2067,103 @@ class asmgen(ABC):
         """
         raise NotImplementedError(NIE_MESSAGE)
 
+    @abstractmethod
+    def prefetch_immoff(self, *, areg : greg_type, offset : int,
+                        level : int = 1, write : bool = False) -> str:
+        """
+        Returns the string containing the instruction(s) to issue a prefetch
+        targeting the given cache level, optionally with the intent to write.
+        ISAs without some of the hints fall back to the closest available one
+
+        :param areg: GP register containing the base address
+        :type areg: class:`asmgen.register.greg_base`
+        :param offset: immediate offset in bytes, within
+                       [:attr:`min_prefetch_offset`, :attr:`max_prefetch_offset`]
+        :type offset: int
+        :param level: Targeted cache level (1-3)
+        :type level: int
+        :param write: Prefetch in preparation of a store
+        :type write: bool
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
+    def prefetch_voff(self, *, areg : greg_type, voffset : int, dt : asm_data_type,
+                      level : int = 1, write : bool = False) -> str:
+        """
+        Returns the string containing the instruction(s) to issue a prefetch
+        with an offset in number of vector registers (see :meth:`prefetch_immoff`)
+
+        Vector-length-agnostic ISAs have to override this
+
+        :param areg: GP register containing the base address
+        :type areg: class:`asmgen.register.greg_base`
+        :param voffset: offset in number of vector registers
+        :type voffset: int
+        :param dt: Data type of the prefetched elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param level: Targeted cache level (1-3)
+        :type level: int
+        :param write: Prefetch in preparation of a store
+        :type write: bool
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        _ = dt # explicitly unused
+        if self.is_vla:
+            raise NotImplementedError("Vector offsets require a fixed vector length")
+        return self.prefetch_immoff(areg=areg, offset=voffset*self.simd_size,
+                                    level=level, write=write)
+
+    def insert_prefetches(self, asmblock : str, *, aregs : list[greg_type],
+                          distance : int, level : int = 1,
+                          write : bool = False) -> str:
+        """
+        Returns the ASM block with a prefetch at the given distance inserted
+        at the top of every innermost loop for each of the address registers
+        used inside that loop. The block may be normal or inline ASM, but has to
+        match the current output mode.
+
+        A loop is a label that is only targeted by a single backward branch
+
+        :param asmblock: ASM generated by this generator
+        :type asmblock: str
+        :param aregs: Address registers streamed through in the loops
+        :type aregs: list[class:`asmgen.register.greg_base`]
+        :param distance: Prefetch distance in bytes ahead of the address registers
+        :type distance: int
+        :param level: Targeted cache level (1-3)
+        :type level: int
+        :param write: Prefetch in preparation of a store
+        :type write: bool
+        :return: ASM block with inserted prefetches
+        :rtype: str
+        """
+        if not self.min_prefetch_offset <= distance <= self.max_prefetch_offset:
+            raise ValueError(f"Prefetch distance {distance} outside of "
+                             f"[{self.min_prefetch_offset},{self.max_prefetch_offset}]")
+        lines = asmblock.splitlines(keepends=True)
+        tokens = [[t.lstrip('%') for t in re.split(r"[\s,()\[\]{}]+", asmunwrap(l))]
+                  for l in lines]
+        labels = [i for i,l in enumerate(lines) if asmunwrap(l).endswith(':')]
+        inserts = []
+        for lbl_idx in labels:
+            label = asmunwrap(lines[lbl_idx])[:-1]
+            refs = [i for i,t in enumerate(tokens) if label in t]
+            if 1 != len(refs) or refs[0] < lbl_idx:
+                continue
+            if any(lbl_idx < i < refs[0] for i in labels):
+                continue
+            body = tokens[lbl_idx+1:refs[0]]
+            prefetches = "".join(
+                    self.prefetch_immoff(areg=a, offset=distance, level=level, write=write)
+                    for a in aregs if any(str(a) in t for t in body))
+            inserts.append((lbl_idx+1, prefetches))
+        for idx,prefetches in reversed(inserts):
+            lines.insert(idx, prefetches)
+        return "".join(lines)
+
     @abstractmethod
     def load_pointer(self, *, areg : greg_type, name : str):
         """
@@ -1105,6 +2179,20 @@ class asmgen(ABC):
         """
         raise NotImplementedError(NIE_MESSAGE)
 
+    def load_data_address(self, *, areg : greg_type, name : str) -> str:
+        """
+        Returns the string containing the instruction(s) to load the address of
+        the ISA data entry name (see :meth:`isadata`) into a general purpose register
+
+        :param areg: GP register to load the address into
+        :type areg: class:`asmgen.register.greg_base`
+        :param name: Name of the entry in the ISA data storage
+        :type name: str
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        raise NotImplementedError(NIE_MESSAGE)
+
     @abstractmethod
     def load_scalar_immoff(self, *, areg : greg_type, offset : int,
                            freg : freg_type, dt : asm_data_type):
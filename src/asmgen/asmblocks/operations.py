@@ -16,6 +16,7 @@ from ..registers import (
     data_reg,
     asm_data_type as adt,
     adt_triple,
+    adt_size,
 )
 
 class operand_restriction(Enum):
@@ -337,27 +338,39 @@ class opd3_modifier(Enum):
     PART = auto()
     VF = auto()
     MASK = auto()
+    MEM = auto()   # B component read from memory
+    BCAST = auto() # B component broadcast from a single element in memory
 
 
 class opd3(operation):
     """
     Assembly/IR instruction with 3 data operands
 
-    Data operands means registers. Exanding to memory (shared/tensor mem in GPUs,
-    TCMs, x86 mem operands, etc...) operands is planned
+    Data operands means registers. x86 memory operands for the B component are
+    supported through the MEM/BCAST modifiers (bdreg is None, the address is
+    passed as areg + optional byte offset). Expanding to other memory (shared/tensor
+    mem in GPUs, TCMs, etc...) operands is planned
     Examples:
       fma      op1, op2, op3      : op3      <-   op1 * op2      + op3
       fma.np   op1, op2, op3      : op3      <- -(op1 * op2)     + op3
       fma.idx  op1, op2, op3, idx : op3      <-   op1 * op2[idx] + op3
+      fma.mem  op1, [a], op3      : op3      <-   op1 * [a]      + op3
+      fma.bcast op1, [a], op3     : op3      <-   op1 * {[a]}    + op3
       fmul     op1, op2, op3      : op3      <-   op1 * op2
       opa      op1, op2, op3      : op3      <-   op1 o op2      + op3
       dota     op1, op2, op3      : op3      <-   op1 . op2      + op3
-      dota.idx op1, op2, op3      : op3[idx] <-   op1 . op2      + op3[idx]
+      dota.idx op1, op2, op3, idx : op3      <-   op1 . op2[idx] + op3
       mma      op1, op2, op3      : op3      <-   op1 x op2      + op3
+      cfma     op1, op2, op3, rot : op3      <-   rot(op1 * op2) + op3
+      cadd     op1, op2, op3, rot : op3      <-   op1 + rot(op2)
+      fmax     op1, op2, op3      : op3      <-   max(op1, op2)
+      fmin     op1, op2, op3      : op3      <-   min(op1, op2)
+      fdiv     op1, op2, op3      : op3      <-   op1 / op2
     (*: elementwise multiplication)
     (o: outer product)
     (.: dot product)
     (x: matrix product)
+    (rot: rotation in the complex plane of interleaved complex numbers)
     """
     NIE_MESSAGE="Method not implemented"
 
@@ -468,10 +481,13 @@ class opdna1_modifier(Enum):
     STRUCT = auto()  # load a structure with multiple components 
                      # (i.e [Re,Im], [x,y,z] or [r,g,b,a])
     BCAST = auto()   # Broadcast one value into all lanes
+    QBCAST = auto()  # Broadcast one 128 bit quadword into all 128 bit segments
+    OBCAST = auto()  # Broadcast one 256 bit octaword into all 256 bit segments
     MASK  = auto()   # Masked operation
     ROW = auto()     # Row of a treg
     COL = auto()     # Column of a treg
     NT  = auto()     # Non-temporal ld/st
+    FF  = auto()     # First-faulting (speculative) load
 
 class opdna1_action(Enum):
     """
@@ -569,3 +585,680 @@ class dummy_opdna1(opdna1):
                        a_dt : adt,
                        modifiers : set[opdna1_modifier], **kwargs) -> str:
         raise NotImplementedError(self.NIE_MESSAGE)
+
+class opperm_modifier(Enum):
+    """
+    Possible modifiers for a permutation instruction/operation
+    """
+    HI = auto()    # second instruction of the pair (zip2/uzp2/trn2)
+    GROUP = auto() # permute groups of consecutive elements as one element
+
+class opperm(operation):
+    """
+    Assembly/IR instruction permuting the elements of 2 data operands into
+    a third data operand. All operands have the same data type.
+    Examples (a = [a0,a1,a2,a3], b = [b0,b1,b2,b3]):
+      zip       op1, op2, op3        : op3 <- [a0,b0,a1,b1]
+      zip.hi    op1, op2, op3        : op3 <- [a2,b2,a3,b3]
+      uzp       op1, op2, op3        : op3 <- [a0,a2,b0,b2]
+      uzp.hi    op1, op2, op3        : op3 <- [a1,a3,b1,b3]
+      trn       op1, op2, op3        : op3 <- [a0,b0,a2,b2]
+      trn.hi    op1, op2, op3        : op3 <- [a1,b1,a3,b3]
+      trn.group op1, op2, op3, group : op3 <- [a0,a1,b0,b1] (group = 2)
+    """
+    NIE_MESSAGE="Method not implemented"
+
+    @abstractmethod
+    def check_modifiers(self, modifiers : set[opperm_modifier]):
+        """
+        Checks whether the operations supports the specified modifiers
+
+
+        :param modifiers: set containing the modifiers to check
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opperm_modifier`]
+        :raises ValueError: If an unsupported modifier is in the specified set
+        """
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opperm_modifier]) -> list[set[str]]:
+        if opperm_modifier.GROUP in modifiers:
+            return [{'group'}]
+        return []
+
+    def get_group(self, modifiers : set[opperm_modifier], kwargs : dict) -> int:
+        """
+        Returns the number of consecutive elements permuted as one element
+
+        :param modifiers: Modifiers of the operation
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opperm_modifier`]
+        :param kwargs: Additional parameters of the operation
+        :type kwargs: dict
+        :raises ValueError: If the group is not a power of 2
+        :return: number of elements in a group
+        :rtype: int
+        """
+        if opperm_modifier.GROUP not in modifiers:
+            return 1
+        group = kwargs['group']
+        if group < 1 or 0 != (group & (group-1)):
+            raise ValueError(f"group {group} has to be a power of 2")
+        return group
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def __call__(self, *,
+                 adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                 dt : adt,
+                 modifiers : set[opperm_modifier] = set(),
+                 **kwargs) -> str:
+        """
+        Return the ASM/IR instruction(s)
+
+        :param adreg : Data register containing elements of the A component
+        :type adreg : class:`asmgen.registers.data_reg`
+        :param bdreg : Data register containing elements of the B component
+        :type bdreg : class:`asmgen.registers.data_reg`
+        :param cdreg : Data register to write the permuted elements to
+        :type cdreg : class:`asmgen.registers.data_reg`
+        :param dt : Data type of all components
+        :type dt : class:`asmgen.registers.asm_data_type`
+        :return : ASM/IR instruction(s) corresponding to the operation
+        :rtype : str
+        """
+
+        return self.execute(
+            dregs=[adreg,bdreg,cdreg],
+            gregs=[],
+            dts={'adreg':dt,'bdreg':dt,'cdreg':dt},
+            modifiers=modifiers,
+            **kwargs
+        )
+
+class dummy_opperm(opperm):
+    """
+    Dummy opperm operation; ISAs assign this by default to operations they do not support
+    """
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def check_modifiers(self, modifiers : set[opperm_modifier]):
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opperm_modifier]) -> list[set[str]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[Enum],
+                                      rstr : operand_restriction) -> int:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[opperm_modifier], **kwargs) -> str:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+class opred_modifier(Enum):
+    """
+    Possible modifiers for a reduction instruction/operation
+    """
+    ORDERED = auto() # strictly ordered reduction, accumulating onto op2
+
+class opred(operation):
+    """
+    Assembly/IR instruction(s) reducing all elements of a vector data operand
+    into a scalar data operand
+    Examples:
+      faddv         op1, op2 : op2 <- op1[0] + op1[1] + ... + op1[n-1]
+      faddv.ordered op1, op2 : op2 <- (((op2 + op1[0]) + op1[1]) + ...) + op1[n-1]
+      fmaxv         op1, op2 : op2 <- max(op1[0], ..., op1[n-1])
+      fminv         op1, op2 : op2 <- min(op1[0], ..., op1[n-1])
+    Unordered reductions may sum in any order (usually a tree)
+    """
+    NIE_MESSAGE="Method not implemented"
+
+    @abstractmethod
+    def check_modifiers(self, modifiers : set[opred_modifier]):
+        """
+        Checks whether the operations supports the specified modifiers
+
+
+        :param modifiers: set containing the modifiers to check
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opred_modifier`]
+        :raises ValueError: If an unsupported modifier is in the specified set
+        """
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def __call__(self, *,
+                 adreg : data_reg, bdreg : data_reg, dt : adt,
+                 modifiers : set[opred_modifier] = set(),
+                 **kwargs) -> str:
+        """
+        Return the ASM/IR instruction(s)
+
+        :param adreg : Vector register containing the elements to reduce
+        :type adreg : class:`asmgen.registers.data_reg`
+        :param bdreg : Scalar register to write the result to
+        :type bdreg : class:`asmgen.registers.data_reg`
+        :param dt : Data type of all elements
+        :type dt : class:`asmgen.registers.asm_data_type`
+        :return : ASM/IR instruction(s) corresponding to the operation
+        :rtype : str
+        """
+
+        return self.execute(
+            dregs=[adreg,bdreg],
+            gregs=[],
+            dts={'adreg':dt,'bdreg':dt},
+            modifiers=modifiers,
+            **kwargs
+        )
+
+class dummy_opred(opred):
+    """
+    Dummy opred operation; ISAs assign this by default to operations they do not support
+    """
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def check_modifiers(self, modifiers : set[opred_modifier]):
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opred_modifier]) -> list[set[str]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[Enum],
+                                      rstr : operand_restriction) -> int:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[opred_modifier], **kwargs) -> str:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+class opcvt_modifier(Enum):
+    """
+    Possible modifiers for a conversion instruction/operation
+    """
+    PART = auto() # widening reads/narrowing writes one part of the narrow register
+    SAT = auto()  # saturating integer narrowing (truncating otherwise)
+    RTZ = auto()  # round towards zero converting to integer (to nearest even otherwise)
+
+class opcvt(operation):
+    """
+    Assembly/IR instruction(s) converting the elements of a data operand to
+    another data type
+    Examples:
+      fcvt          op1, op2       : op2 <- convert(op1)
+      fcvt.part     op1, op2, part : op2 <- convert(part of op1)    (widening)
+      fcvt.part     op1, op2, part : part of op2 <- convert(op1)    (narrowing)
+      fcvt.sat      op1, op2       : op2 <- saturate(op1)           (integer narrowing)
+    Which elements of the narrow register form a part is given by the widening
+    method: SPLIT_INSTRUCTIONS converts one part per instruction, VEC_GROUP
+    converts between a register and a register group in one instruction
+    """
+    NIE_MESSAGE="Method not implemented"
+
+    @property
+    @abstractmethod
+    def widening_method(self) -> widening_method:
+        """
+        Return the method used to deal with widening and narrowing conversions
+
+        :return : widening method
+        :rtype : class:`asmgen.asmblocks.operations.widening_method`
+        """
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    @property
+    def interleaved_parts(self) -> bool:
+        """
+        Return whether the parts of SPLIT_INSTRUCTIONS conversions are interleaved
+        (even/odd elements) instead of the lower/upper half of the narrow register
+
+        :return : True if the parts are interleaved
+        :rtype : bool
+        """
+        return False
+
+    @abstractmethod
+    def check_modifiers(self, modifiers : set[opcvt_modifier]):
+        """
+        Checks whether the operations supports the specified modifiers
+
+
+        :param modifiers: set containing the modifiers to check
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcvt_modifier`]
+        :raises ValueError: If an unsupported modifier is in the specified set
+        """
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opcvt_modifier]) -> list[set[str]]:
+        if opcvt_modifier.PART in modifiers:
+            return [{'part'}]
+        return []
+
+    def get_part(self, a_dt : adt, b_dt : adt,
+                 modifiers : set[opcvt_modifier], kwargs : dict) -> int:
+        """
+        Returns the part of the narrow register a conversion reads or writes
+
+        :param a_dt: Data type to convert from
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type to convert to
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Modifiers of the operation
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcvt_modifier`]
+        :param kwargs: Additional parameters of the operation
+        :type kwargs: dict
+        :raises ValueError: If the part is out of range for the data types
+        :return: part of the narrow register, 0 without the PART modifier
+        :rtype: int
+        """
+        ways = max(adt_size(a_dt), adt_size(b_dt))//min(adt_size(a_dt), adt_size(b_dt))
+        if opcvt_modifier.PART not in modifiers:
+            return 0
+        if 1 == ways:
+            raise ValueError("Conversions between types of the same size have no parts")
+        part = kwargs['part']
+        if not 0 <= part < ways:
+            raise ValueError(f"part {part} has to be in [0,{ways-1}]")
+        return part
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def __call__(self, *,
+                 adreg : data_reg, bdreg : data_reg,
+                 a_dt : adt, b_dt : adt,
+                 modifiers : set[opcvt_modifier] = set(),
+                 **kwargs) -> str:
+        """
+        Return the ASM/IR instruction(s)
+
+        :param adreg : Data register containing the elements to convert
+        :type adreg : class:`asmgen.registers.data_reg`
+        :param bdreg : Data register to write the converted elements to
+        :type bdreg : class:`asmgen.registers.data_reg`
+        :param a_dt : Data type to convert from
+        :type a_dt : class:`asmgen.registers.asm_data_type`
+        :param b_dt : Data type to convert to
+        :type b_dt : class:`asmgen.registers.asm_data_type`
+        :return : ASM/IR instruction(s) corresponding to the operation
+        :rtype : str
+        """
+
+        return self.execute(
+            dregs=[adreg,bdreg],
+            gregs=[],
+            dts={'adreg':a_dt,'bdreg':b_dt},
+            modifiers=modifiers,
+            **kwargs
+        )
+
+class dummy_opcvt(opcvt):
+    """
+    Dummy opcvt operation; ISAs assign this by default to operations they do not support
+    """
+
+    @property
+    def widening_method(self) -> widening_method:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def check_modifiers(self, modifiers : set[opcvt_modifier]):
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opcvt_modifier]) -> list[set[str]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[Enum],
+                                      rstr : operand_restriction) -> int:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[opcvt_modifier], **kwargs) -> str:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+class opcmp_modifier(Enum):
+    """
+    Possible modifiers for a compare instruction/operation
+    """
+    ZERO = auto() # compare op1 against zero, there is no op2
+
+class opcmp(operation):
+    """
+    Assembly/IR instruction(s) comparing the elements of 2 data operands and
+    writing the result to a mask. Depending on the ISA the mask is a predicate/mask
+    register (SVE, AVX512) or a vector register with all bits of true elements set
+    (NEON, AVX2), RVV writes a mask register group into a vector register
+    Examples:
+      cmp      op1, op2, mask, cmp : mask <- op1 <cmp> op2
+      cmp.zero op1, mask, cmp      : mask <- op1 <cmp> 0
+    The comparison is given as :class:`asmgen.asmblocks.noarch.comparison`,
+    EZ and NZ are the same as EQ and NE against zero
+    """
+    NIE_MESSAGE="Method not implemented"
+
+    conditions = ['EQ', 'NE', 'LT', 'LE', 'GT', 'GE']
+
+    @abstractmethod
+    def check_modifiers(self, modifiers : set[opcmp_modifier]):
+        """
+        Checks whether the operations supports the specified modifiers
+
+
+        :param modifiers: set containing the modifiers to check
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcmp_modifier`]
+        :raises ValueError: If an unsupported modifier is in the specified set
+        """
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opcmp_modifier]) -> list[set[str]]:
+        return []
+
+    def get_condition(self, cmp : Enum, modifiers : set[opcmp_modifier]) -> str:
+        """
+        Returns the name of the comparison, with EZ/NZ mapped to EQ/NE
+
+        :param cmp: Comparison to perform
+        :type cmp: class:`asmgen.asmblocks.noarch.comparison`
+        :param modifiers: Modifiers of the operation
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcmp_modifier`]
+        :raises ValueError: If EZ/NZ are used without comparing against zero
+        :return: One of EQ, NE, LT, LE, GT, GE
+        :rtype: str
+        """
+        cond = {'EZ' : 'EQ', 'NZ' : 'NE'}.get(cmp.name, cmp.name)
+        if cond not in self.conditions:
+            raise ValueError(f"Invalid comparison {cmp.name}")
+        if cmp.name in ['EZ', 'NZ'] and opcmp_modifier.ZERO not in modifiers:
+            raise ValueError(f"{cmp.name} compares against zero, needs the ZERO modifier")
+        return cond
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def __call__(self, *,
+                 adreg : data_reg, bdreg : data_reg|None,
+                 mreg, dt : adt, cmp : Enum,
+                 modifiers : set[opcmp_modifier] = set(),
+                 **kwargs) -> str:
+        """
+        Return the ASM/IR instruction(s)
+
+        :param adreg : Data register containing elements of the A component
+        :type adreg : class:`asmgen.registers.data_reg`
+        :param bdreg : Data register containing elements of the B component,
+            None when comparing against zero
+        :type bdreg : class:`asmgen.registers.data_reg`
+        :param mreg : Register to write the mask to (see :meth:`asmgen.asmblocks.noarch.asmgen.mreg`)
+        :type mreg : class:`asmgen.registers.mreg_base` or class:`asmgen.registers.vreg_base`
+        :param dt : Data type of both components
+        :type dt : class:`asmgen.registers.asm_data_type`
+        :param cmp : Comparison to perform
+        :type cmp : class:`asmgen.asmblocks.noarch.comparison`
+        :return : ASM/IR instruction(s) corresponding to the operation
+        :rtype : str
+        """
+        if (opcmp_modifier.ZERO in modifiers) != (bdreg is None):
+            raise ValueError("bdreg has to be None exactly when comparing against zero")
+        dregs = [adreg] if bdreg is None else [adreg,bdreg]
+        dts = {'adreg':dt} if bdreg is None else {'adreg':dt,'bdreg':dt}
+
+        return self.execute(
+            dregs=dregs,
+            gregs=[],
+            dts=dts,
+            modifiers=modifiers,
+            mreg=mreg,
+            cmp=cmp,
+            **kwargs
+        )
+
+class dummy_opcmp(opcmp):
+    """
+    Dummy opcmp operation; ISAs assign this by default to operations they do not support
+    """
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def check_modifiers(self, modifiers : set[opcmp_modifier]):
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opcmp_modifier]) -> list[set[str]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[Enum],
+                                      rstr : operand_restriction) -> int:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def implementation(self, *,
+                       adreg : data_reg, a_dt : adt, mreg, cmp : Enum,
+                       modifiers : set[opcmp_modifier], **kwargs) -> str:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+class opsel_modifier(Enum):
+    """
+    Possible modifiers for a select instruction/operation
+    """
+    INV = auto() # select op1 where the mask is set (inverted mask)
+
+class opsel(operation):
+    """
+    Assembly/IR instruction(s) selecting the elements of 2 data operands by a mask
+    written by :class:`opcmp`, all operands have the same data type
+    Examples (mask = [1,0,0,1]):
+      sel     op1, op2, op3, mask : op3 <- [b0,a1,a2,b3]
+      sel.inv op1, op2, op3, mask : op3 <- [a0,b1,b2,a3]
+    """
+    NIE_MESSAGE="Method not implemented"
+
+    @abstractmethod
+    def check_modifiers(self, modifiers : set[opsel_modifier]):
+        """
+        Checks whether the operations supports the specified modifiers
+
+
+        :param modifiers: set containing the modifiers to check
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opsel_modifier`]
+        :raises ValueError: If an unsupported modifier is in the specified set
+        """
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opsel_modifier]) -> list[set[str]]:
+        return []
+
+    def get_operands(self, adreg : data_reg, bdreg : data_reg,
+                     modifiers : set[opsel_modifier]) -> tuple[data_reg,data_reg]:
+        """
+        Returns the operands selected where the mask is clear and where it is set
+
+        :param adreg: Data register containing elements of the A component
+        :type adreg: class:`asmgen.registers.data_reg`
+        :param bdreg: Data register containing elements of the B component
+        :type bdreg: class:`asmgen.registers.data_reg`
+        :param modifiers: Modifiers of the operation
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opsel_modifier`]
+        :return: (false operand, true operand)
+        :rtype: tuple[class:`asmgen.registers.data_reg`,class:`asmgen.registers.data_reg`]
+        """
+        if opsel_modifier.INV in modifiers:
+            return bdreg, adreg
+        return adreg, bdreg
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def __call__(self, *,
+                 adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                 mreg, dt : adt,
+                 modifiers : set[opsel_modifier] = set(),
+                 **kwargs) -> str:
+        """
+        Return the ASM/IR instruction(s)
+
+        :param adreg : Data register containing elements selected where the mask is clear
+        :type adreg : class:`asmgen.registers.data_reg`
+        :param bdreg : Data register containing elements selected where the mask is set
+        :type bdreg : class:`asmgen.registers.data_reg`
+        :param cdreg : Data register to write the selected elements to
+        :type cdreg : class:`asmgen.registers.data_reg`
+        :param mreg : Mask (see :meth:`asmgen.asmblocks.noarch.asmgen.mreg`)
+        :type mreg : class:`asmgen.registers.mreg_base` or class:`asmgen.registers.vreg_base`
+        :param dt : Data type of all components
+        :type dt : class:`asmgen.registers.asm_data_type`
+        :return : ASM/IR instruction(s) corresponding to the operation
+        :rtype : str
+        """
+
+        return self.execute(
+            dregs=[adreg,bdreg,cdreg],
+            gregs=[],
+            dts={'adreg':dt,'bdreg':dt,'cdreg':dt},
+            modifiers=modifiers,
+            mreg=mreg,
+            **kwargs
+        )
+
+class dummy_opsel(opsel):
+    """
+    Dummy opsel operation; ISAs assign this by default to operations they do not support
+    """
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def check_modifiers(self, modifiers : set[opsel_modifier]):
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[opsel_modifier]) -> list[set[str]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[Enum],
+                                      rstr : operand_restriction) -> int:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt, mreg,
+                       modifiers : set[opsel_modifier], **kwargs) -> str:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+class oplut_modifier(Enum):
+    """
+    Possible modifiers for a table lookup instruction/operation
+    """
+    KEEP = auto() # keep the destination element for out-of-range indices (tbx)
+
+class oplut(operation):
+    """
+    Assembly/IR instruction(s) looking up the elements of a table held in a data
+    register, with per-element indices taken from a second data register
+    Examples (table = [t0,t1,t2,t3], indices = [3,0,7,1]):
+      lut      op1, op2, op3 : op3 <- [t3,t0,0,t1]
+      lut.keep op1, op2, op3 : op3 <- [t3,t0,c2,t1]
+    The number of table entries depends on the ISA and data type, tables with
+    16 8-bit entries replicated into every 128 bit segment are supported by all
+    ISAs implementing the operation
+    """
+    NIE_MESSAGE="Method not implemented"
+
+    @abstractmethod
+    def check_modifiers(self, modifiers : set[oplut_modifier]):
+        """
+        Checks whether the operations supports the specified modifiers
+
+
+        :param modifiers: set containing the modifiers to check
+        :type modifiers: set[class:`asmgen.asmblocks.operations.oplut_modifier`]
+        :raises ValueError: If an unsupported modifier is in the specified set
+        """
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[oplut_modifier]) -> list[set[str]]:
+        return []
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def __call__(self, *,
+                 adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                 dt : adt,
+                 modifiers : set[oplut_modifier] = set(),
+                 **kwargs) -> str:
+        """
+        Return the ASM/IR instruction(s)
+
+        :param adreg : Data register containing the table
+        :type adreg : class:`asmgen.registers.data_reg`
+        :param bdreg : Data register containing the indices (unsigned, same size as dt)
+        :type bdreg : class:`asmgen.registers.data_reg`
+        :param cdreg : Data register to write the looked up elements to
+        :type cdreg : class:`asmgen.registers.data_reg`
+        :param dt : Data type of the table elements
+        :type dt : class:`asmgen.registers.asm_data_type`
+        :return : ASM/IR instruction(s) corresponding to the operation
+        :rtype : str
+        """
+
+        return self.execute(
+            dregs=[adreg,bdreg,cdreg],
+            gregs=[],
+            dts={'adreg':dt,'bdreg':dt,'cdreg':dt},
+            modifiers=modifiers,
+            **kwargs
+        )
+
+class dummy_oplut(oplut):
+    """
+    Dummy oplut operation; ISAs assign this by default to operations they do not support
+    """
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def check_modifiers(self, modifiers : set[oplut_modifier]):
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_required_params(self, modifiers : set[oplut_modifier]) -> list[set[str]]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[Enum],
+                                      rstr : operand_restriction) -> int:
+        raise NotImplementedError(self.NIE_MESSAGE)
+
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[oplut_modifier], **kwargs) -> str:
+        raise NotImplementedError(self.NIE_MESSAGE)
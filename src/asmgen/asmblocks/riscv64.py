@@ -143,7 +143,7 @@ class riscv64(asmgen):
         return asmblock
 
     def loopend(self, *, reg : greg_base, label : str) -> str:
-        asmblock = f"\"bnez {reg}, {self.labelstr(label)}\\n\\t\"\n"
+        asmblock = self.asmwrap(f"bnez {reg},{self.labelstr(label)}")
 
         return asmblock
 
@@ -204,6 +204,12 @@ class riscv64(asmgen):
         dt_suf = self.fdt_suffixes[dt]
         return self.asmwrap(f"fmv.{dt_suf} {dst},{src}")
 
+    def greg_to_freg(self, *, greg : greg_base, freg : freg_base,
+                     dt : adt) -> str:
+        # fdt_suffixes are the ones of the moves, conversions use s for single
+        dt_suf = {adt.DOUBLE : "d", adt.SINGLE : "s", adt.HALF : "h"}[dt]
+        return self.asmwrap(f"fcvt.{dt_suf}.lu {freg},{greg}")
+
     def mov_greg(self, *, src : greg_base, dst : greg_base) -> str:
         # There is no mov instruction?
         return self.asmwrap(f"add {dst},{src},0")
@@ -260,11 +266,11 @@ class riscv64(asmgen):
 
     @property
     def min_prefetch_offset(self):
-        return 0
+        return -2048
 
     @property
     def max_prefetch_offset(self):
-        return 32760
+        return 2016
 
     def min_load_immoff(self, dt : adt):
         _ = dt # explicitly unused
@@ -286,9 +292,22 @@ class riscv64(asmgen):
         # Needs Zicbop
         return self.asmwrap(f"prefetch.r {offset}({areg})")
 
+    def prefetch_immoff(self, *, areg : greg_base, offset : int,
+                        level : int = 1, write : bool = False) -> str:
+        # Needs Zicbop, which has no cache level hints
+        if level not in [1,2,3]:
+            raise ValueError(f"Invalid prefetch cache level {level}")
+        if offset % 32:
+            raise ValueError(f"Zicbop prefetch offset {offset} is not a multiple of 32")
+        kind = "w" if write else "r"
+        return self.asmwrap(f"prefetch.{kind} {offset}({areg})")
+
     def load_pointer(self, *, areg : greg_base, name : str) -> str:
         return self.asmwrap(f"ld {areg},%[{name}]")
 
+    def load_data_address(self, *, areg : greg_base, name : str) -> str:
+        return self.asmwrap(f"lla {areg},{self.labelstr(name)}")
+
     def load_scalar_immoff(self, *, areg : greg_base, offset : int,
                            freg : freg_base,  dt : adt) -> str:
         dt_suf = self.fdt_suffixes[dt]
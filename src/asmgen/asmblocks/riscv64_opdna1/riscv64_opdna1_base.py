@@ -55,6 +55,10 @@ class riscv64_opdna1(opdna1):
 
     def check_modifiers(self, modifiers : set[mod]):
 
+        if mod.FF in modifiers:
+            raise ValueError("RISC-V +D/F has no first-faulting ld/st")
+        if mod.QBCAST in modifiers or mod.OBCAST in modifiers:
+            raise ValueError("RISC-V +D/F has no segment-replicating loads")
         if mod.TINDEX in modifiers:
             raise ValueError("RISC-V +D/F has no ld/st with 2D tile offset indices")
         if mod.VINDEX in modifiers:
@@ -7,6 +7,8 @@
 RISC-V RVV 1.0 asm generator and related types
 """
 
+from typing import Callable
+
 from ..registers import (
     reg_tracker,
     asm_data_type as adt,
@@ -15,11 +17,21 @@ from ..registers import (
     treg_base,
     vreg_base, freg_base, greg_base
 )
+from ..asmdata import adt_fp_bits
 from .riscv64 import riscv64
 from .types.rvv_types import rvv_vreg
 
-from .rvv_opd3 import rvv_fma,rvv_fmul,rvv_fadd
+from .rvv_opd3 import (
+    rvv_fma,rvv_fmul,rvv_fadd,rvv_dota,rvv_cfma,rvv_cadd,
+    rvv_fmax,rvv_fmin,rvv_fdiv
+)
 from .rvv_opdna1 import rvv_load,rvv_store
+from .rvv_opperm import rvv_zip,rvv_uzp,rvv_trn
+from .rvv_opred import rvv_faddv,rvv_fmaxv,rvv_fminv
+from .rvv_opcvt import rvv_fcvt
+from .rvv_opcmp import rvv_cmp
+from .rvv_opsel import rvv_sel
+from .rvv_oplut import rvv_tbl
 
 
 # pylint: disable=too-many-public-methods
@@ -35,6 +47,14 @@ class rvv(riscv64):
             adt.HALF    : "e16",
             adt.FP8E4M3 : "e8",
             adt.FP8E5M2 : "e8",
+            adt.SINT64  : "e64",
+            adt.UINT64  : "e64",
+            adt.SINT32  : "e32",
+            adt.UINT32  : "e32",
+            adt.SINT16  : "e16",
+            adt.UINT16  : "e16",
+            adt.SINT8   : "e8",
+            adt.UINT8   : "e8",
             }
     it_suffixes = {
             ait.INT64 : "ei64",
@@ -45,23 +65,82 @@ class rvv(riscv64):
 
     def __init__(self):
         super().__init__()
-        self.fma = rvv_fma(asmwrap=self.asmwrap)
-        self.fmul = rvv_fmul(asmwrap=self.asmwrap)
-        self.fadd = rvv_fadd(asmwrap=self.asmwrap)
+        # FP16 arithmetic needs Zvfh, disabling it rejects FP16 operands
+        self.zvfh = True
+        # Mask-undisturbed vtype, required by masked opd3 to keep the inactive elements
+        self.mu = False
+        # Tail-undisturbed vtype, required to accumulate across a shortened vl
+        self.tu = False
+        self.fma = rvv_fma(asmwrap=self.asmwrap,
+                           zvfh_getter=lambda : self.zvfh,
+                           mu_getter=lambda : self.mu)
+        self.fmul = rvv_fmul(asmwrap=self.asmwrap,
+                             zvfh_getter=lambda : self.zvfh,
+                             mu_getter=lambda : self.mu)
+        self.fadd = rvv_fadd(asmwrap=self.asmwrap,
+                             zvfh_getter=lambda : self.zvfh,
+                             mu_getter=lambda : self.mu)
+        self.fmax = rvv_fmax(asmwrap=self.asmwrap,
+                             zvfh_getter=lambda : self.zvfh,
+                             mu_getter=lambda : self.mu)
+        self.fmin = rvv_fmin(asmwrap=self.asmwrap,
+                             zvfh_getter=lambda : self.zvfh,
+                             mu_getter=lambda : self.mu)
+        self.fdiv = rvv_fdiv(asmwrap=self.asmwrap,
+                             zvfh_getter=lambda : self.zvfh,
+                             mu_getter=lambda : self.mu)
+        self.cfma = rvv_cfma(asmwrap=self.asmwrap,
+                             zvfh_getter=lambda : self.zvfh)
+        self.cadd = rvv_cadd(asmwrap=self.asmwrap,
+                             zvfh_getter=lambda : self.zvfh)
+        self.zip = rvv_zip(asmwrap=self.asmwrap)
+        self.uzp = rvv_uzp(asmwrap=self.asmwrap)
+        self.trn = rvv_trn(asmwrap=self.asmwrap)
+        self.faddv = rvv_faddv(asmwrap=self.asmwrap)
+        self.fmaxv = rvv_fmaxv(asmwrap=self.asmwrap)
+        self.fminv = rvv_fminv(asmwrap=self.asmwrap)
+        self.cmp = rvv_cmp(asmwrap=self.asmwrap,
+                           zvfh_getter=lambda : self.zvfh)
+        self.sel = rvv_sel(asmwrap=self.asmwrap)
+        self.tbl = rvv_tbl(asmwrap=self.asmwrap)
 
         self.lmul = 1
+        # Fixed VLEN in bits (VLS), None generates VLA code
+        self.vlen = None
+        # Emit Zihintntl hints for non-temporal loads/stores
+        self.zihintntl = False
+        # Use Zvqdotq for dot products
+        self.zvqdotq = False
+        self.dota = rvv_dota(asmwrap=self.asmwrap,
+                             zvqdotq_getter=lambda : self.zvqdotq)
 
         self.load = rvv_load(asmwrap=self.asmwrap,
-                             lmul_getter=lambda : self.lmul)
+                             lmul_getter=lambda : self.lmul,
+                             ntl_getter=lambda : self.zihintntl)
         self.store = rvv_store(asmwrap=self.asmwrap,
-                               lmul_getter=lambda : self.lmul)
+                               lmul_getter=lambda : self.lmul,
+                               ntl_getter=lambda : self.zihintntl)
+        self.fcvt = rvv_fcvt(asmwrap=self.asmwrap,
+                             lmul_getter=lambda : self.lmul)
 
     def get_parameters(self) -> list[str]:
-        return ["LMUL"]
+        return ["LMUL", "VL", "ZIHINTNTL", "ZVQDOTQ", "ZVFH", "MU", "TU"]
 
     def get_param_value(self, name : str) -> int|str:
         if "LMUL" == name:
             return self.lmul
+        if "VL" == name:
+            return 0 if self.vlen is None else self.vlen
+        if "ZIHINTNTL" == name:
+            return int(self.zihintntl)
+        if "ZVQDOTQ" == name:
+            return int(self.zvqdotq)
+        if "ZVFH" == name:
+            return int(self.zvfh)
+        if "MU" == name:
+            return int(self.mu)
+        if "TU" == name:
+            return int(self.tu)
         return super().get_param_value(name)
 
     def set_parameter(self, name : str, value : int|str):
@@ -76,6 +155,27 @@ class rvv(riscv64):
                 raise NotImplementedError(
                         ("{value} is not an integer. Fractional "
                          "LMUL is not implemented yet"))
+        elif "VL" == name:
+            if isinstance(value, str) and value.isdigit():
+                value = int(value)
+            if not isinstance(value, int):
+                raise ValueError(f"Invalid VL {value}")
+            if 0 == value:
+                self.vlen = None
+            elif value.bit_count() != 1 or not 32 <= value <= 65536:
+                raise ValueError(f"Invalid VL {value}, must be a power of 2 from 32 to 65536")
+            else:
+                self.vlen = value
+        elif "ZIHINTNTL" == name and str(value) in ["0", "1"]:
+            self.zihintntl = "1" == str(value)
+        elif "ZVQDOTQ" == name and str(value) in ["0", "1"]:
+            self.zvqdotq = "1" == str(value)
+        elif "ZVFH" == name and str(value) in ["0", "1"]:
+            self.zvfh = "1" == str(value)
+        elif "MU" == name and str(value) in ["0", "1"]:
+            self.mu = "1" == str(value)
+        elif "TU" == name and str(value) in ["0", "1"]:
+            self.tu = "1" == str(value)
         else:
             raise ValueError(f"Invalid name {name} or value {value}")
 
@@ -88,6 +188,14 @@ class rvv(riscv64):
         print(f"Extensions: {extensions}")
         return "v" in extensions
 
+    def dt_supportedby_cpuinfo(self, cpuinfo : str, dt : adt) -> bool:
+        if not self.supportedby_cpuinfo(cpuinfo):
+            return False
+        if adt.HALF == dt:
+            isa_idx = cpuinfo.find("rv64")+4
+            return "zvfh" in cpuinfo[isa_idx:].split()[0].split("_")
+        return True
+
     def isaquirks(self, *, rt : reg_tracker, dt : adt) -> str:
 
         vlreg_idx = 0
@@ -112,6 +220,18 @@ class rvv(riscv64):
     def vreg(self, reg_idx : int) -> vreg_base:
         return rvv_vreg(reg_idx * self.lmul)
 
+    def mreg(self, reg_idx : int) -> vreg_base:
+        # Masks always fit into a single register, independent of LMUL
+        return rvv_vreg(reg_idx)
+
+    @property
+    def vtype_policy(self) -> str:
+        """
+        Tail agnostic and mask agnostic or, with the TU/MU parameters, tail/mask
+        undisturbed
+        """
+        return f"{'tu' if self.tu else 'ta'}, {'mu' if self.mu else 'ma'}"
+
     def jvzero(self, *, vreg1 : vreg_base, freg : freg_base,
                vreg2 : vreg_base, greg : greg_base, label : str,
                dt : adt) -> str:
@@ -129,7 +249,7 @@ class rvv(riscv64):
 
     @property
     def is_vla(self):
-        return True
+        return self.vlen is None
 
     def indexable_elements(self, dt : adt):
         return self.simd_size//adt_size(dt)
@@ -140,15 +260,225 @@ class rvv(riscv64):
 
     @property
     def simd_size(self):
+        if self.vlen is not None:
+            return self.vlen//8*self.lmul
         return 1
 
     def simd_size_to_greg(self, *, reg : greg_base,
                           dt : adt) -> str:
+        if self.vlen is not None:
+            return self.mov_greg_imm(reg=reg, imm=self.simd_size//adt_size(dt))
         esfx = adt_size(dt)*8
-        return self.asmwrap(f"vsetvli {reg}, zero, e{esfx}, m{self.lmul}, ta, ma")
+        return self.asmwrap(f"vsetvli {reg}, zero, e{esfx}, m{self.lmul}, {self.vtype_policy}")
+
+    def vector_loop(self, *, count_reg : greg_base, step_reg : greg_base,
+                    label : str, dt : adt,
+                    body : Callable[[None, greg_base], str],
+                    mreg : None = None) -> str:
+        if mreg is not None:
+            raise ValueError("RVV loop tails are handled through vl, no mask is used")
+        end = f"{label}_end"
+
+        asmblock  = self.asmwrap(f"beqz {count_reg},{self.labelstr(end)}")
+        asmblock += self.label(label=label)
+        asmblock += self.vsetvli(vlreg=step_reg, avlreg=count_reg, dt=dt)
+        asmblock += body(None, step_reg)
+        asmblock += self.asmwrap(f"sub {count_reg},{count_reg},{step_reg}")
+        asmblock += self.asmwrap(f"bnez {count_reg},{self.labelstr(label)}")
+        asmblock += self.label(label=end)
+        # Code after the loop expects the full vector length again
+        asmblock += self.vsetvlmax(reg=step_reg, dt=dt)
+        return asmblock
+
+    def read_vl(self, *, reg : greg_base) -> str:
+        """
+        Reads the current vector length, e.g. after it was shortened by a
+        first-faulting load
+
+        :param reg: GP register to write the vector length to
+        :type reg: class:`asmgen.registers.greg_base`
+        :return: string with the required RVV ASM
+        :rtype: str
+        """
+        return self.asmwrap(f"csrr {reg}, vl")
+
+    def complex_mask(self, *, tmpreg : rvv_vreg) -> str:
+        """
+        Sets all odd elements (imaginary parts of interleaved complex numbers)
+        in the mask register v0, as required by cfma and cadd. Uses the
+        element width of the current vtype
+
+        :param tmpreg: Temporary vector register
+        :type tmpreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :return: string with the required RVV ASM
+        :rtype: str
+        """
+        return self.perm_setup(group=1, tmpreg=tmpreg)
+
+    def perm_setup(self, *, group : int, tmpreg : rvv_vreg) -> str:
+        """
+        Sets all elements of odd groups in the mask register v0, as required
+        by trn. Uses the element width of the current vtype
+
+        :param group: Number of consecutive elements permuted as one element
+        :type group: int
+        :param tmpreg: Temporary vector register
+        :type tmpreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :return: string with the required RVV ASM
+        :rtype: str
+        """
+        asmblock  = self.asmwrap(f"vid.v {tmpreg}")
+        if group > 1:
+            asmblock += self.asmwrap(f"vsrl.vi {tmpreg},{tmpreg},{group.bit_length()-1}")
+        asmblock += self.asmwrap(f"vand.vi {tmpreg},{tmpreg},1")
+        asmblock += self.asmwrap(f"vmsne.vi v0,{tmpreg},0")
+        return asmblock
+
+    def vop_imm(self, *, op : str, vd : rvv_vreg, vs : rvv_vreg, imm : int,
+                greg : greg_base) -> str:
+        """
+        Returns a vector-immediate instruction, going through a GP register if
+        the immediate doesn't fit into the 5 bit immediate field
+
+        :param op: Instruction without the operand suffix, e.g. vand
+        :type op: str
+        :param vd: Destination vector register
+        :type vd: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param vs: Source vector register
+        :type vs: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param imm: Immediate value
+        :type imm: int
+        :param greg: GP register for immediates outside of -16..15
+        :type greg: class:`asmgen.registers.greg_base`
+        :return: string with the required RVV ASM
+        :rtype: str
+        """
+        if -16 <= imm <= 15:
+            return self.asmwrap(f"{op}.vi {vd},{vs},{imm}")
+        asmblock  = self.mov_greg_imm(reg=greg, imm=imm)
+        asmblock += self.asmwrap(f"{op}.vx {vd},{vs},{greg}")
+        return asmblock
+
+    def check_gather_setup(self, *, group : int, idxreg : rvv_vreg, tmpreg : rvv_vreg):
+        """
+        Checks the parameters of :meth:`zip_setup` and :meth:`uzp_setup`
+
+        :param group: Number of consecutive elements permuted as one element
+        :type group: int
+        :param idxreg: Vector register to write the indices to
+        :type idxreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param tmpreg: Temporary vector register
+        :type tmpreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :raises ValueError: If the group is not a power of 2 or the registers alias
+        """
+        if group < 1 or 0 != (group & (group-1)):
+            raise ValueError(f"group {group} has to be a power of 2")
+        if idxreg.idx == tmpreg.idx or 0 in (idxreg.idx, tmpreg.idx):
+            raise ValueError("idxreg and tmpreg have to be distinct and not v0")
+
+    def zip_setup(self, *, group : int, hi : bool, idxreg : rvv_vreg,
+                  tmpreg : rvv_vreg, greg : greg_base) -> str:
+        """
+        Prepares the gather indices in idxreg and the mask of odd groups in v0,
+        as required by zip with the same group and HI modifier. Uses the element
+        width and vector length of the current vtype, the indices have to fit
+        into an element
+
+        :param group: Number of consecutive elements permuted as one element
+        :type group: int
+        :param hi: Prepare zip.hi (zip2) instead of zip (zip1)
+        :type hi: bool
+        :param idxreg: Vector register to write the indices to
+        :type idxreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param tmpreg: Temporary vector register
+        :type tmpreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param greg: Temporary GP register
+        :type greg: class:`asmgen.registers.greg_base`
+        :return: string with the required RVV ASM
+        :rtype: str
+        """
+        self.check_gather_setup(group=group, idxreg=idxreg, tmpreg=tmpreg)
+        shift = group.bit_length()-1
+
+        asmblock  = self.perm_setup(group=group, tmpreg=tmpreg)
+        # Element j of group 2k and 2k+1 comes from element j of group k
+        asmblock += self.asmwrap(f"vid.v {idxreg}")
+        if group > 1:
+            asmblock += self.vop_imm(op="vand", vd=tmpreg, vs=idxreg, imm=group-1, greg=greg)
+        asmblock += self.asmwrap(f"vsrl.vi {idxreg},{idxreg},{shift+1}")
+        if group > 1:
+            asmblock += self.asmwrap(f"vsll.vi {idxreg},{idxreg},{shift}")
+            asmblock += self.asmwrap(f"vor.vv {idxreg},{idxreg},{tmpreg}")
+        if hi:
+            asmblock += self.read_vl(reg=greg)
+            asmblock += self.asmwrap(f"srli {greg},{greg},1")
+            asmblock += self.asmwrap(f"vadd.vx {idxreg},{idxreg},{greg}")
+        return asmblock
+
+    def uzp_setup(self, *, group : int, hi : bool, idxreg : rvv_vreg,
+                  tmpreg : rvv_vreg, greg : greg_base) -> str:
+        """
+        Prepares the gather indices in idxreg and the mask of the upper half in
+        v0, as required by uzp with the same group and HI modifier. Uses the
+        element width and vector length of the current vtype, the indices have
+        to fit into an element
+
+        :param group: Number of consecutive elements permuted as one element
+        :type group: int
+        :param hi: Prepare uzp.hi (uzp2) instead of uzp (uzp1)
+        :type hi: bool
+        :param idxreg: Vector register to write the indices to
+        :type idxreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param tmpreg: Temporary vector register
+        :type tmpreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param greg: Temporary GP register
+        :type greg: class:`asmgen.registers.greg_base`
+        :return: string with the required RVV ASM
+        :rtype: str
+        """
+        self.check_gather_setup(group=group, idxreg=idxreg, tmpreg=tmpreg)
+
+        # Element j of group k comes from element j of group 2k (2k+1 for hi),
+        # wrapped around into B for the upper half
+        asmblock  = self.asmwrap(f"vid.v {idxreg}")
+        if group > 1:
+            asmblock += self.vop_imm(op="vand", vd=tmpreg, vs=idxreg, imm=group-1, greg=greg)
+        asmblock += self.asmwrap(f"vsll.vi {idxreg},{idxreg},1")
+        if group > 1:
+            asmblock += self.asmwrap(f"vsub.vv {idxreg},{idxreg},{tmpreg}")
+        if hi:
+            asmblock += self.vop_imm(op="vadd", vd=idxreg, vs=idxreg, imm=group, greg=greg)
+        # The vector length is a power of 2
+        asmblock += self.read_vl(reg=greg)
+        asmblock += self.asmwrap(f"addi {greg},{greg},-1")
+        asmblock += self.asmwrap(f"vand.vx {idxreg},{idxreg},{greg}")
+        asmblock += self.asmwrap(f"srli {greg},{greg},1")
+        asmblock += self.asmwrap(f"vid.v {tmpreg}")
+        asmblock += self.asmwrap(f"vmsgtu.vx v0,{tmpreg},{greg}")
+        return asmblock
+
+    def ff_loop(self, *, step_reg : greg_base, label : str, dt : adt,
+                load : Callable[[], str],
+                body : Callable[[None, greg_base], str],
+                mreg : None = None) -> str:
+        if mreg is not None:
+            raise ValueError("RVV first-faulting loads shorten vl, no mask is used")
+
+        asmblock  = self.label(label=label)
+        asmblock += self.vsetvlmax(reg=step_reg, dt=dt)
+        asmblock += load()
+        asmblock += self.read_vl(reg=step_reg)
+        asmblock += body(None, step_reg)
+        asmblock += self.jump(label=label)
+        asmblock += self.label(label=f"{label}_end")
+        # Code after the loop expects the full vector length again
+        asmblock += self.vsetvlmax(reg=step_reg, dt=dt)
+        return asmblock
 
     @property
     def c_simd_size_function(self):
+        if self.vlen is not None:
+            return f"inline size_t get_simd_size() {{ return {self.simd_size}; }}"
         pre_oi = self.output_inline
         self.set_output_inline(yesno=True)
         result  = "inline size_t get_simd_size() {\n"
@@ -166,12 +496,72 @@ class rvv(riscv64):
 
     def add_greg_voff(self, *, reg : greg_base, offset : int,
                       dt : adt) -> str:
+        if self.vlen is not None:
+            imm = offset*self.simd_size
+            if not -2048 <= imm <= 2047:
+                raise ValueError(f"offset {offset} exceeds the addi immediate range")
+            return self.asmwrap(f"addi {reg},{reg},{imm}")
         raise NotImplementedError(
                 "RVV doesn't have an instruction to add a vector offset to a gp register")
 
     def zero_vreg(self, *, vreg : vreg_base, dt : adt) -> str:
         return self.asmwrap(f"vmv.v.i {vreg},0")
 
+    def unpack_nibbles(self, *, vreg : vreg_base, lodst : vreg_base, hidst : vreg_base,
+                       tmpreg : vreg_base|None = None) -> str:
+        # vtype has to be set for 8-bit elements
+        if lodst.idx == hidst.idx:
+            raise ValueError("The low and high nibbles have to be written to different registers")
+        lo = self.asmwrap(f"vand.vi {lodst},{vreg},15")
+        hi = self.asmwrap(f"vsrl.vi {hidst},{vreg},4")
+        # Don't overwrite the packed bytes before both halves are extracted
+        return hi+lo if lodst.idx == vreg.idx else lo+hi
+
+    def shift_imm(self, inst : str, dst : vreg_base, src : vreg_base, amount : int) -> str:
+        """
+        Returns the vector shift by an immediate, split into several shifts if
+        the amount doesn't fit the 5 bit immediate
+
+        :param inst: Shift instruction (vsll, vsrl, vsra)
+        :type inst: str
+        :param dst: Destination vector register
+        :type dst: class:`asmgen.registers.vreg_base`
+        :param src: Source vector register
+        :type src: class:`asmgen.registers.vreg_base`
+        :param amount: Shift amount
+        :type amount: int
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        result = ""
+        while amount > 31:
+            result += self.asmwrap(f"{inst}.vi {dst},{src},31")
+            src = dst
+            amount -= 31
+        return result + self.asmwrap(f"{inst}.vi {dst},{src},{amount}")
+
+    def scale_pow2(self, *, vreg : vreg_base, nreg : vreg_base, dt : adt) -> str:
+        # vtype has to be set for the element size of dt
+        _,mbits,_ = adt_fp_bits(dt)
+        result  = self.shift_imm("vsll", nreg, nreg, mbits)
+        result += self.asmwrap(f"vadd.vv {vreg},{vreg},{nreg}")
+        return result
+
+    # pylint: disable-next=too-many-arguments
+    def split_exponent(self, *, vreg : vreg_base, ereg : vreg_base, offreg : vreg_base,
+                       tmpreg : vreg_base, dt : adt) -> str:
+        _,mbits,_ = adt_fp_bits(dt)
+        # Integer difference to o, its exponent field is e
+        result  = self.asmwrap(f"vsub.vv {ereg},{vreg},{offreg}")
+        result += self.shift_imm("vsra", ereg, ereg, mbits)
+        result += self.shift_imm("vsll", tmpreg, ereg, mbits)
+        result += self.asmwrap(f"vsub.vv {vreg},{vreg},{tmpreg}")
+        return result
+
+    def sqrt_vreg(self, *, vreg : vreg_base, dst : vreg_base, dt : adt) -> str:
+        # vtype has to be set for the element size of dt
+        return self.asmwrap(f"vfsqrt.v {dst},{vreg}")
+
 
     @property
     def min_load_voff(self) -> int:
@@ -196,6 +586,8 @@ class rvv(riscv64):
 
     @property
     def max_add_voff(self) -> int:
+        if self.vlen is not None:
+            return 2047//self.simd_size
         return 0
 
     def greg_to_voffs(self, *, streg : greg_base, vreg : vreg_base, dt : adt) -> str:
@@ -266,6 +658,42 @@ class rvv(riscv64):
             raise NotImplementedError("RVV has no vector stores with address offset")
         return self.store_vector(areg=areg, vreg=vreg, dt=dt)
 
+    def check_vl(self, *, reg : greg_base, label : str) -> str:
+        """
+        Branches to the label if VLEN of the executing hardware differs
+        from the one set through the "VL" parameter
+
+        :param reg: GP register to clobber
+        :type reg: class:`asmgen.registers.greg_base`
+        :param label: Label to branch to on mismatch
+        :type label: str
+        :return: String with the required RVV ASM
+        :rtype: str
+        """
+        if self.vlen is None:
+            raise ValueError("VL parameter not set, nothing to check")
+        asmblock = self.vlenb_to_greg(reg=reg)
+        vlenb = self.vlen//8
+        if vlenb <= 2048:
+            asmblock += self.asmwrap(f"addi {reg},{reg},{-vlenb}")
+        else:
+            # vlenb is a power of 2, so shift it down to compare against 1
+            asmblock += self.asmwrap(f"srli {reg},{reg},{vlenb.bit_length()-1}")
+            asmblock += self.asmwrap(f"addi {reg},{reg},-1")
+        asmblock += self.asmwrap(f"bnez {reg},{self.labelstr(label)}")
+        return asmblock
+
+    def vlenb_to_greg(self, *, reg : greg_base) -> str:
+        """
+        Reads VLEN in bytes into a GP register
+
+        :param reg: GP register to write to
+        :type reg: class:`asmgen.registers.greg_base`
+        :return: String with the required RVV ASM
+        :rtype: str
+        """
+        return self.asmwrap(f"csrr {reg},vlenb")
+
     def vsetvli(self, *, vlreg : greg_base, avlreg : greg_base, dt : adt) -> str:
         """
         Set RVV vlen by requesting an AVL
@@ -280,7 +708,7 @@ class rvv(riscv64):
         :rtype: str
         """
         dt_size = 'e'+str(adt_size(dt)*8)
-        return self.asmwrap(f"vsetvli {vlreg}, {avlreg}, {dt_size}, m{self.lmul}, ta, ma")
+        return self.asmwrap(f"vsetvli {vlreg}, {avlreg}, {dt_size}, m{self.lmul}, {self.vtype_policy}")
 
     def vsetvlmax(self, *, reg : greg_base, dt : adt) -> str:
         """
@@ -294,7 +722,7 @@ class rvv(riscv64):
         :rtype: str
         """
         dt_size = 'e'+str(adt_size(dt)*8)
-        return self.asmwrap(f"vsetvli {reg}, zero, {dt_size}, m{self.lmul}, ta, ma")
+        return self.asmwrap(f"vsetvli {reg}, zero, {dt_size}, m{self.lmul}, {self.vtype_policy}")
 
     def load_vector_immstride(self, *, areg : greg_base, byte_stride : int,
                     vreg : vreg_base, dt : adt) -> str:
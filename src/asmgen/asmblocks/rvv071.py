@@ -8,6 +8,8 @@ RISC-V RVV 0.7.1 asm generator and related types
 """
 
 from .rvv import rvv
+from .rvv_opred import rvv071_faddv
+from .rvv_opcvt import rvv071_fcvt
 
 from ..registers import asm_data_type as adt, adt_size, greg_base
 
@@ -25,13 +27,23 @@ class rvv071(rvv):
             adt.FP8E5M2 : "b",
             }
 
+    def __init__(self):
+        super().__init__()
+        self.faddv = rvv071_faddv(asmwrap=self.asmwrap)
+        self.fcvt = rvv071_fcvt(asmwrap=self.asmwrap,
+                                lmul_getter=lambda : self.lmul)
+
     def simd_size_to_greg(self, *, reg : greg_base,
                           dt : adt) -> str:
+        if self.vlen is not None:
+            return super().simd_size_to_greg(reg=reg, dt=dt)
         esfx = adt_size(dt)*8
         return self.asmwrap(f"vsetvli {reg}, zero, e{esfx}, m{self.lmul}")
 
     @property
     def c_simd_size_function(self):
+        if self.vlen is not None:
+            return super().c_simd_size_function
         pre_oi = self.output_inline
         self.set_output_inline(yesno=True)
         result  = "inline size_t get_simd_size() {\n"
@@ -47,6 +59,10 @@ class rvv071(rvv):
         self.set_output_inline(yesno=pre_oi)
         return result
 
+    def vlenb_to_greg(self, *, reg : greg_base) -> str:
+        # There is no vlenb CSR in 0.7.1, this overwrites vl/vtype
+        return self.asmwrap(f"vsetvli {reg}, zero, e8, m1")
+
     def vsetvli(self, *, vlreg : greg_base, avlreg : greg_base, dt : adt) -> str:
         dt_size = 'e'+str(adt_size(dt)*8)
         return self.asmwrap(f"vsetvli {vlreg}, {avlreg}, {dt_size}, m1")
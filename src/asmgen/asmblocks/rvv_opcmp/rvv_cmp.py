@@ -0,0 +1,125 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV 1.0 and 0.7.1 compares
+"""
+
+from enum import Enum
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    adt_is_unsigned,
+    data_reg
+)
+from ..operations import (
+    opcmp,
+    opcmp_modifier as mod,
+    operand_restriction
+)
+from ..types.riscv64_types import riscv64_freg
+from ..types.rvv_types import rvv_vreg
+
+class rvv_cmp(opcmp):
+    """
+    RVV implementation of cmp. The mask register holds a bit per element,
+    so it has to be v0 to be used by masked operations and sel.
+    There are no register compares for GT/GE, so these swap the operands of LT/LE.
+    Comparing floats against zero needs a temporary FP register passed in
+    the tmpreg parameter
+    """
+
+    fmv_suffixes = {2 : "h", 4 : "w", 8 : "d"}
+    # Integer compares against zero, LT has no immediate form
+    zero_forms = {'EQ' : ("vmseq", "vi", "0"), 'NE' : ("vmsne", "vi", "0"),
+                  'LT' : ("vmslt", "vx", "zero"), 'LE' : ("vmsle", "vi", "0"),
+                  'GT' : ("vmsgt", "vi", "0"), 'GE' : ("vmsgt", "vi", "-1")}
+
+    def __init__(self,
+                 asmwrap : Callable[[str],str],
+                 zvfh_getter : Callable[[],bool] = lambda : True):
+        self.asmwrap = asmwrap
+        self.get_zvfh = zvfh_getter
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        dts = [adt.FP32, adt.FP64,
+               adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64,
+               adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]
+        if self.get_zvfh():
+            dts.append(adt.FP16)
+        return [{'adreg':dt, 'bdreg':dt} for dt in dts]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for RVV opcmp")
+
+    def zero_compare(self, cond : str, a_dt : adt,
+                     adreg : rvv_vreg, mreg : rvv_vreg,
+                     tmpreg : riscv64_freg|None) -> str:
+        """
+        Returns the ASM comparing A against zero
+
+        :param cond: Comparison (EQ, NE, LT, LE, GT, GE)
+        :type cond: str
+        :param a_dt: Data type of the compared elements
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param adreg: Compared register
+        :type adreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param mreg: Mask register
+        :type mreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param tmpreg: FP register set to zero for float compares
+        :type tmpreg: class:`asmgen.asmblocks.types.riscv64_types.riscv64_freg`|None
+        :raises ValueError: If the result wouldn't depend on the input
+            or tmpreg is missing for floats
+        :return: ASM instructions
+        :rtype: str
+        """
+        if adt_is_float(a_dt):
+            if not isinstance(tmpreg, riscv64_freg):
+                raise ValueError("Comparing floats against zero requires an FP tmpreg")
+            asmblock  = self.asmwrap(f"fmv.{self.fmv_suffixes[adt_size(a_dt)]}.x {tmpreg},zero")
+            asmblock += self.asmwrap(f"vmf{cond.lower()}.vf {mreg},{adreg},{tmpreg}")
+            return asmblock
+        if adt_is_unsigned(a_dt):
+            if cond in ['LT', 'GE']:
+                raise ValueError(f"Unsigned {cond} against zero is constant")
+            cond = {'LE' : 'EQ', 'GT' : 'NE'}.get(cond, cond)
+        inst,form,zero = self.zero_forms[cond]
+        return self.asmwrap(f"{inst}.{form} {mreg},{adreg},{zero}")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, a_dt : adt, mreg, cmp : Enum,
+                       modifiers : set[mod],
+                       bdreg : data_reg|None = None,
+                       **kwargs) -> str:
+        cond = self.get_condition(cmp, modifiers)
+        if not isinstance(mreg, rvv_vreg):
+            raise ValueError("The mask of an RVV opcmp must be rvv_vreg")
+        if not all(isinstance(r, rvv_vreg) for r in [adreg, bdreg] if r is not None):
+            raise ValueError("All dregs of an RVV opcmp must be rvv_vreg")
+        if bdreg is None:
+            return self.zero_compare(cond, a_dt, adreg, mreg, kwargs.get('tmpreg'))
+
+        if cond in ['GT', 'GE']:
+            cond = {'GT' : 'LT', 'GE' : 'LE'}[cond]
+            adreg,bdreg = bdreg,adreg
+        if adt_is_float(a_dt):
+            inst = f"vmf{cond.lower()}"
+        else:
+            sign = "u" if adt_is_unsigned(a_dt) and cond in ['LT', 'LE'] else ""
+            inst = f"vms{cond.lower()}{sign}"
+        return self.asmwrap(f"{inst}.vv {mreg},{adreg},{bdreg}")
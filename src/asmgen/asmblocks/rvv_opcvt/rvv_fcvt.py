@@ -0,0 +1,165 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV 1.0 and 0.7.1 conversions
+"""
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    adt_is_int,
+    adt_is_signed,
+    data_reg
+)
+from ..operations import (
+    opcvt,
+    opcvt_modifier as mod,
+    operand_restriction,
+    widening_method
+)
+from ..types.rvv_types import rvv_vreg
+
+class rvv_fcvt(opcvt):
+    """
+    RVV 1.0 implementation of fcvt. Widening and narrowing conversions convert
+    between a register and an aligned group of 2 registers, vtype has to be set
+    for the narrower data type. The group must not overlap the register.
+    BF16 conversions require Zvfbfmin
+    """
+
+    narrow_suffix = "w"
+
+    def __init__(self, asmwrap : Callable[[str],str], lmul_getter : Callable[[],int]):
+        self.asmwrap = asmwrap
+        self.get_lmul = lmul_getter
+
+    @property
+    def widening_method(self) -> widening_method:
+        return widening_method.VEC_GROUP
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        pairs = []
+        for idts,fdt in [((adt.SINT16, adt.UINT16), adt.FP16),
+                         ((adt.SINT32, adt.UINT32), adt.FP32),
+                         ((adt.SINT64, adt.UINT64), adt.FP64)]:
+            for idt in idts:
+                pairs += [(idt, fdt), (fdt, idt)]
+        widen = [(adt.FP16, adt.FP32), (adt.FP32, adt.FP64), (adt.BF16, adt.FP32),
+                 (adt.SINT8, adt.SINT16), (adt.SINT16, adt.SINT32), (adt.SINT32, adt.SINT64),
+                 (adt.UINT8, adt.UINT16), (adt.UINT16, adt.UINT32), (adt.UINT32, adt.UINT64)]
+        pairs += widen + [(b,a) for a,b in widen]
+        return [{'adreg':a, 'bdreg':b} for a,b in pairs]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.PART in modifiers:
+            raise ValueError("RVV has no partial instructions (using vgroups instead)")
+        if mod.SAT in modifiers and mod.RTZ in modifiers:
+            raise ValueError("SAT and RTZ are mutually exclusive")
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for RVV opcvt")
+
+    def check_group(self, narrow : rvv_vreg, wide : rvv_vreg):
+        """
+        Checks the register group of a widening or narrowing conversion
+
+        :param narrow: Register containing the narrow elements
+        :type narrow: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param wide: First register of the group containing the wide elements
+        :type wide: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :raises ValueError: If the group is unaligned or overlaps the narrow register
+        """
+        group = 2*self.get_lmul()
+        if 0 != wide.idx % group:
+            raise ValueError(f"{wide} is not aligned to a group of {group} registers")
+        if wide.idx <= narrow.idx < wide.idx+group:
+            raise ValueError(f"{narrow} overlaps the register group starting at {wide}")
+
+    def get_inst(self, a_dt : adt, b_dt : adt, modifiers : set[mod]) -> str:
+        """
+        Returns the conversion instruction
+
+        :param a_dt: Data type to convert from
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param b_dt: Data type to convert to
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :param modifiers: Modifiers of the operation
+        :type modifiers: set[class:`asmgen.asmblocks.operations.opcvt_modifier`]
+        :raises ValueError: If a modifier does not apply to the conversion
+        :return: Instruction name
+        :rtype: str
+        """
+        to_int = adt_is_float(a_dt) and adt_is_int(b_dt)
+        int_narrow = adt_is_int(a_dt) and adt_size(a_dt) > adt_size(b_dt)
+        if mod.RTZ in modifiers and not to_int:
+            raise ValueError("RTZ only applies to floating point to integer conversions")
+        if mod.SAT in modifiers and not int_narrow:
+            raise ValueError("SAT only applies to integer narrowing conversions")
+
+        unsigned = "" if adt_is_signed(a_dt) or adt_is_signed(b_dt) else "u"
+        if to_int:
+            rtz = "rtz." if mod.RTZ in modifiers else ""
+            return f"vfcvt.{rtz}x{unsigned}.f.v"
+        if adt_is_float(b_dt) and adt_is_int(a_dt):
+            return f"vfcvt.f.x{unsigned}.v"
+        if int_narrow:
+            if mod.SAT in modifiers:
+                return f"vnclip{unsigned}.{self.narrow_suffix}i"
+            return f"vnsrl.{self.narrow_suffix}i"
+        if adt_is_int(a_dt):
+            return f"vwadd{unsigned}.vx"
+        bf16 = "bf16" if adt.BF16 in (a_dt, b_dt) else ""
+        if adt_size(a_dt) < adt_size(b_dt):
+            return f"vfwcvt{bf16}.f.f.v"
+        return f"vfncvt{bf16}.f.f.{self.narrow_suffix}"
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        if not isinstance(adreg, rvv_vreg) or not isinstance(bdreg, rvv_vreg):
+            raise ValueError("All dregs of an RVV opcvt must be rvv_vreg")
+
+        inst = self.get_inst(a_dt, b_dt, modifiers)
+        if adt_size(a_dt) < adt_size(b_dt):
+            self.check_group(narrow=adreg, wide=bdreg)
+        elif adt_size(a_dt) > adt_size(b_dt):
+            self.check_group(narrow=bdreg, wide=adreg)
+
+        if inst.startswith("vwadd"):
+            # Widening integer conversion: add zero
+            return self.asmwrap(f"{inst} {bdreg},{adreg},zero")
+        if inst.startswith("vn"):
+            # Narrowing integer conversion: (clipping) shift by zero
+            return self.asmwrap(f"{inst} {bdreg},{adreg},0")
+        return self.asmwrap(f"{inst} {bdreg},{adreg}")
+
+class rvv071_fcvt(rvv_fcvt):
+    """
+    RVV 0.7.1 implementation of fcvt. Narrowing instructions use the same
+    suffixes as all other instructions, there are no conversions rounding
+    towards zero and no BF16 conversions
+    """
+
+    narrow_suffix = "v"
+
+    def get_inst(self, a_dt : adt, b_dt : adt, modifiers : set[mod]) -> str:
+        if mod.RTZ in modifiers:
+            raise ValueError("RVV 0.7.1 has no conversions rounding towards zero")
+        if adt.BF16 in (a_dt, b_dt):
+            raise ValueError("RVV 0.7.1 has no BF16 conversions")
+        return super().get_inst(a_dt, b_dt, modifiers)
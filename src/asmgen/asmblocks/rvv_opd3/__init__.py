@@ -9,3 +9,9 @@ Meta-module for RVV opd3 operations
 from .rvv_fma import *
 from .rvv_fmul import *
 from .rvv_fadd import *
+from .rvv_dota import *
+from .rvv_cfma import *
+from .rvv_cadd import *
+from .rvv_fmax import *
+from .rvv_fmin import *
+from .rvv_fdiv import *
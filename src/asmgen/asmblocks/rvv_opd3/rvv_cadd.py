@@ -0,0 +1,46 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV complex add with rotate instruction sequence
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import opd3_modifier as mod
+
+from .rvv_cfma import rvv_cfma
+
+class rvv_cadd(rvv_cfma):
+    """
+    RVV implementation of cadd with the same semantics as FCADD on NEON/SVE
+    (see :class:`asmgen.asmblocks.neon_opd3.neon_cadd`). Same requirements
+    as :class:`asmgen.asmblocks.rvv_opd3.rvv_cfma`
+    """
+
+    valid_rots = [90, 270]
+
+    def get_base_inst(self, modifiers : set[mod]) -> str:
+        return "add"
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        rot = kwargs['rot']
+        self.check_rot(rot)
+        t0,t1 = kwargs['tmpregs']
+        self.check_registers([adreg,bdreg,cdreg], [t0,t1])
+
+        # a + i*b = a + (-b.im, b.re), a - i*b = a + (b.im, -b.re)
+        asmblock  = self.swap_pairs_signed(src=bdreg, tmpregs=[t0,t1],
+                                           negate_imag=(270 == rot))
+        asmblock += self.asmwrap(f"vf{self.get_base_inst(modifiers)}.vv {cdreg},{adreg},{t0}")
+        return asmblock
@@ -0,0 +1,155 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV complex multiply-accumulate instruction sequence
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import opd3_modifier as mod
+from ..types.rvv_types import rvv_vreg
+
+from .rvv_opd3_base import rvv_opd3_base
+
+class rvv_cfma(rvv_opd3_base):
+    """
+    RVV implementation of cfma with the same semantics as FCMLA on NEON/SVE
+    (see :class:`asmgen.asmblocks.neon_opd3.neon_cfma`).
+
+    RVV has no complex instructions, real/imaginary parts are moved into place
+    with slides merged under a mask. v0 has to contain a mask with all odd
+    elements (imaginary parts) set (see :meth:`asmgen.asmblocks.rvv.rvv.complex_mask`)
+    and two temporary registers have to be passed in the tmpregs parameter
+    """
+
+    valid_rots = [0, 90, 180, 270]
+
+    def get_base_inst(self, modifiers : set[mod]) -> str:
+        return "macc"
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.NP in modifiers:
+            raise ValueError("Complex fma has no np form, use rot 180/270 instead")
+        if mod.VF in modifiers:
+            raise ValueError("RVV complex operations have no vf form")
+        if mod.MASK in modifiers:
+            raise ValueError("RVV complex operations have no masked form")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return self.filter_zvfh([
+            {'adreg':adt.FP64, 'bdreg':adt.FP64, 'cdreg':adt.FP64},
+            {'adreg':adt.FP32, 'bdreg':adt.FP32, 'cdreg':adt.FP32},
+            {'adreg':adt.FP16, 'bdreg':adt.FP16, 'cdreg':adt.FP16},
+        ])
+
+    def get_required_params(self, modifiers: set[mod]) -> list[set[str]]:
+        return [{'rot'}, {'tmpregs'}]
+
+    def check_rot(self, rot : int):
+        """
+        Checks the rotation of the complex operation
+
+        :param rot: Rotation in degrees
+        :type rot: int
+        :raises ValueError: If the rotation is not supported by the operation
+        """
+        if rot not in self.valid_rots:
+            raise ValueError(f"rot {rot} not one of {self.valid_rots}")
+
+    def check_registers(self, dregs : list[data_reg], tmpregs : list[data_reg]):
+        """
+        Checks the operand and temporary registers
+
+        :param dregs: Operand registers
+        :type dregs: list[class:`asmgen.registers.data_reg`]
+        :param tmpregs: Temporary registers
+        :type tmpregs: list[class:`asmgen.registers.data_reg`]
+        :raises ValueError: If the registers are invalid, temporaries alias
+                            operands or any register is the mask register v0
+        """
+        if len(tmpregs) != 2:
+            raise ValueError("RVV complex operations require 2 tmpregs")
+        if not all(isinstance(r, rvv_vreg) for r in dregs+tmpregs):
+            raise ValueError("All dregs of an RVV opd3 must be rvv_vreg")
+        if any(0 == r.idx for r in dregs+tmpregs):
+            raise ValueError("v0 holds the complex mask and can't be an operand")
+        tmp_idxs = {r.idx for r in tmpregs}
+        if len(tmp_idxs) != 2 or tmp_idxs & {r.idx for r in dregs}:
+            raise ValueError("tmpregs have to be distinct from each other and all operands")
+
+    def swap_pairs_signed(self, src : rvv_vreg, tmpregs : list[rvv_vreg],
+                          negate_imag : bool) -> str:
+        """
+        Swaps real and imaginary parts of all complex numbers and negates the
+        new real or imaginary parts (i.e. multiplies by -i or i)
+
+        :param src: Register containing the complex numbers
+        :type src: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param tmpregs: Temporary registers, the result is written to the first one
+        :type tmpregs: list[class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`]
+        :param negate_imag: Negate the imaginary parts if True, the real parts otherwise
+        :type negate_imag: bool
+        :return: ASM instructions
+        :rtype: str
+        """
+        t0,t1 = tmpregs
+        asmblock  = self.asmwrap(f"vslidedown.vi {t0},{src},1")
+        asmblock += self.asmwrap(f"vslideup.vi {t1},{src},1")
+        asmblock += self.asmwrap(f"vmerge.vvm {t0},{t0},{t1},v0")
+        asmblock += self.asmwrap(f"vfneg.v {t1},{t0}")
+        if negate_imag:
+            asmblock += self.asmwrap(f"vmerge.vvm {t0},{t0},{t1},v0")
+        else:
+            asmblock += self.asmwrap(f"vmerge.vvm {t0},{t1},{t0},v0")
+        return asmblock
+
+    def dup_part(self, src : rvv_vreg, dst : rvv_vreg, imag : bool) -> str:
+        """
+        Duplicates the real or imaginary parts of all complex numbers
+
+        :param src: Register containing the complex numbers
+        :type src: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param dst: Register to write the duplicated parts to
+        :type dst: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param imag: Duplicate the imaginary part if True, the real part otherwise
+        :type imag: bool
+        :return: ASM instructions
+        :rtype: str
+        """
+        if imag:
+            asmblock  = self.asmwrap(f"vslidedown.vi {dst},{src},1")
+            asmblock += self.asmwrap(f"vmerge.vvm {dst},{dst},{src},v0")
+        else:
+            asmblock  = self.asmwrap(f"vslideup.vi {dst},{src},1")
+            asmblock += self.asmwrap(f"vmerge.vvm {dst},{src},{dst},v0")
+        return asmblock
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        rot = kwargs['rot']
+        self.check_rot(rot)
+        t0,t1 = kwargs['tmpregs']
+        self.check_registers([adreg,bdreg,cdreg], [t0,t1])
+
+        if rot in [0, 180]:
+            inst = "vf"+("nmsac" if 180 == rot else self.get_base_inst(modifiers))
+            asmblock  = self.dup_part(src=adreg, dst=t0, imag=False)
+            asmblock += self.asmwrap(f"{inst}.vv {cdreg},{t0},{bdreg}")
+            return asmblock
+
+        asmblock  = self.swap_pairs_signed(src=bdreg, tmpregs=[t0,t1],
+                                           negate_imag=(270 == rot))
+        asmblock += self.dup_part(src=adreg, dst=t1, imag=True)
+        asmblock += self.asmwrap(f"vf{self.get_base_inst(modifiers)}.vv {cdreg},{t1},{t0}")
+        return asmblock
@@ -0,0 +1,85 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV dot product instructions (Zvqdotq)
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_is_signed,
+    adt_is_unsigned,
+    data_reg
+)
+from ..operations import opd3_modifier as mod, widening_method
+from ..types.rvv_types import rvv_vreg
+
+from .rvv_opd3_base import rvv_opd3_base
+
+class rvv_dota(rvv_opd3_base):
+    """
+    RVV implementation of dota using the Zvqdotq extension. Every 32 bit
+    element of C accumulates the dot product of the 4 neighbouring 8 bit
+    elements of A and B at the same position, so vtype has to be set for
+    32 bit elements.
+
+    RVV 1.0 itself has no instructions reducing neighbouring elements
+    """
+
+    def __init__(self,
+                 asmwrap : Callable[[str],str],
+                 zvqdotq_getter : Callable[[],bool] = lambda : False):
+        super().__init__(asmwrap=asmwrap)
+        self.get_zvqdotq = zvqdotq_getter
+
+    @property
+    def widening_method(self) -> widening_method:
+        return widening_method.DOT_NEIGHBOURS
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=modifiers)
+        if mod.NP in modifiers:
+            raise ValueError("RVV has no np dot products")
+        if mod.VF in modifiers:
+            raise ValueError("RVV dot products have no vf form")
+        if mod.MASK in modifiers:
+            raise ValueError("RVV dot products have no masked form")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [
+            {'adreg':adt.SINT8, 'bdreg':adt.SINT8, 'cdreg':adt.SINT32},
+            {'adreg':adt.UINT8, 'bdreg':adt.UINT8, 'cdreg':adt.UINT32},
+
+            {'adreg':adt.SINT8, 'bdreg':adt.UINT8, 'cdreg':adt.SINT32},
+            {'adreg':adt.UINT8, 'bdreg':adt.SINT8, 'cdreg':adt.SINT32},
+        ]
+
+    def get_base_inst(self, modifiers : set[mod]) -> str:
+        return "qdot"
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        if not self.get_zvqdotq():
+            raise NotImplementedError(
+                    "RVV 1.0 has no dot products, enable Zvqdotq with the ZVQDOTQ parameter")
+        if not all(isinstance(r, rvv_vreg) for r in (adreg,bdreg,cdreg)):
+            raise ValueError("All dregs of an RVV dota must be rvv_vreg")
+
+        # vqdotsu multiplies signed vs2 with unsigned vs1, the
+        # unsigned*signed vector-vector case swaps the operands
+        if adt_is_unsigned(a_dt) and adt_is_signed(b_dt):
+            adreg,bdreg = bdreg,adreg
+            a_dt,b_dt = b_dt,a_dt
+        suf = self.inst_suffix(a_dt=a_dt, b_dt=b_dt, c_dt=c_dt)
+        inst = f"v{self.get_base_inst(modifiers)}{suf}.vv"
+
+        return self.asmwrap(f"{inst} {cdreg},{adreg},{bdreg}")
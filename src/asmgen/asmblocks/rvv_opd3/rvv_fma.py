@@ -19,8 +19,10 @@ class rvv_fma(rvv_opd3_base):
     """
 
     def __init__(self,
-                 asmwrap : Callable[[str],str]):
-        super().__init__(asmwrap=asmwrap)
+                 asmwrap : Callable[[str],str],
+                 zvfh_getter : Callable[[],bool] = lambda : True,
+                 mu_getter : Callable[[],bool] = lambda : False):
+        super().__init__(asmwrap=asmwrap, zvfh_getter=zvfh_getter, mu_getter=mu_getter)
 
         self.operand_order = [2,1,0]
 
@@ -0,0 +1,34 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV 1.0 and 0.7.1 fmin
+"""
+
+from ...registers import asm_data_type as adt
+from ..operations import opd3_modifier as mod
+
+from .rvv_opd3_base import rvv_opd3_base
+
+class rvv_fmin(rvv_opd3_base):
+    """
+    RVV 1.0 and 0.7.1 implementation of fmin
+    """
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers)
+
+        if mod.NP in modifiers:
+            raise ValueError("RVV fmin has no NP form")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return self.filter_zvfh([
+            {'adreg':adt.FP64, 'bdreg':adt.FP64, 'cdreg':adt.FP64},
+            {'adreg':adt.FP32, 'bdreg':adt.FP32, 'cdreg':adt.FP32},
+            {'adreg':adt.FP16, 'bdreg':adt.FP16, 'cdreg':adt.FP16},
+        ])
+
+    def get_base_inst(self, modifiers : set[mod]):
+        return "min"
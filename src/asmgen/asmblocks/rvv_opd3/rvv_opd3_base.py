@@ -35,8 +35,12 @@ class rvv_opd3_base(opd3):
     """
 
     def __init__(self,
-                 asmwrap : Callable[[str],str]):
+                 asmwrap : Callable[[str],str],
+                 zvfh_getter : Callable[[],bool] = lambda : True,
+                 mu_getter : Callable[[],bool] = lambda : False):
         self.asmwrap = asmwrap
+        self.get_zvfh = zvfh_getter
+        self.get_mu = mu_getter
 
         self.operand_order = [2,0,1]
 
@@ -62,14 +66,30 @@ class rvv_opd3_base(opd3):
             raise ValueError("RVV has no regidx form")
         if mod.IDX in modifiers:
             raise ValueError("RVV has no idx form")
+        if mod.MEM in modifiers or mod.BCAST in modifiers:
+            raise ValueError("RVV has no memory operands")
         if mod.PART in modifiers:
             raise ValueError("RVV has no partial instructions (using vgroups instead)")
-        if mod.MASK in modifiers:
-            raise NotImplementedError("RVV masked opd3 not implemented yet")
+        if mod.MASK in modifiers and not self.get_mu():
+            raise ValueError(
+                    "RVV masked opd3 requires a mask-undisturbed vtype (MU parameter)")
+
 
+    def filter_zvfh(self, dts : list[dict[str,adt]]) -> list[dict[str,adt]]:
+        """
+        Removes the data type combinations with FP16 operands if Zvfh is disabled
+
+        :param dts: supported data type combinations
+        :type dts: list[dict[str,class:`asmgen.registers.asm_data_type`]]
+        :return: data type combinations that can be used
+        :rtype: list[dict[str,class:`asmgen.registers.asm_data_type`]]
+        """
+        if self.get_zvfh():
+            return dts
+        return [d for d in dts if adt.FP16 not in d.values()]
 
     def supported_dts(self) -> list[dict[str,adt]]:
-        return [
+        return self.filter_zvfh([
             {'adreg':adt.FP64, 'bdreg':adt.FP64, 'cdreg':adt.FP64},
             {'adreg':adt.FP32, 'bdreg':adt.FP32, 'cdreg':adt.FP32},
             {'adreg':adt.FP16, 'bdreg':adt.FP16, 'cdreg':adt.FP16},
@@ -97,7 +117,7 @@ class rvv_opd3_base(opd3):
             {'adreg':adt.UINT32, 'bdreg':adt.SINT32, 'cdreg':adt.SINT64},
             {'adreg':adt.UINT16, 'bdreg':adt.SINT16, 'cdreg':adt.SINT32},
             {'adreg':adt.UINT8, 'bdreg':adt.SINT8, 'cdreg':adt.SINT16},
-        ]
+        ])
 
     def get_required_params(self, modifiers: set[mod]) -> list[set[str]]:
         return []
@@ -163,6 +183,24 @@ class rvv_opd3_base(opd3):
         raise RuntimeError("Unsupported datatype")
 
 
+    def build_mask(self, *, cdreg : rvv_vreg, mreg : rvv_vreg|None) -> str:
+        """
+        Returns the mask operand, the mask is always v0 and elements with
+        a cleared mask bit keep the value of C
+
+        :param cdreg: Destination register, must not overlap v0
+        :type cdreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param mreg: Mask register, if passed it has to be v0
+        :type mreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`|None
+        :return: Mask operand string
+        :rtype: str
+        """
+        if mreg is not None and (not isinstance(mreg, rvv_vreg) or 0 != mreg.idx):
+            raise ValueError("The mask of an RVV masked opd3 must be v0")
+        if 0 == cdreg.idx:
+            raise ValueError("The destination of an RVV masked opd3 must not be v0")
+        return ",v0.t"
+
     # modfier set is only read, therefore a mutable default is ok
     # pylint: disable-next=dangerous-default-value,too-many-locals
     def implementation(self, *,
@@ -186,6 +224,8 @@ class rvv_opd3_base(opd3):
             raise ValueError(
                     ("Either all dregs of an RVV opd3 must be rvv_vreg"
                      " or a and c must be rvv_vreg and b must be riscv64_freg"))
+        if mod.VF in modifiers and not adt_is_float(b_dt):
+            raise ValueError("RVV vf forms take a floating point scalar B")
 
         # RVV specific check not covered by standard checks
         if adt_size(a_dt) < adt_size(c_dt):
@@ -207,5 +247,7 @@ class rvv_opd3_base(opd3):
         operands_string = ','.join([operands[i] for i in self.operand_order])
 
         inst_str = f"{inst} {operands_string}"
+        if mod.MASK in modifiers:
+            inst_str += self.build_mask(cdreg=cdreg, mreg=kwargs.get('mreg'))
 
         return self.asmwrap(inst_str)
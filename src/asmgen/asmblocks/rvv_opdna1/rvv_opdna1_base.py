@@ -37,10 +37,12 @@ class rvv_opdna1(opdna1):
 
     def __init__(self, action : opdna1_action,
                  asmwrap : Callable[[str],str],
-                 lmul_getter :Callable[[],int]):
+                 lmul_getter :Callable[[],int],
+                 ntl_getter : Callable[[],bool] = lambda : False):
         self.action = action
         self.asmwrap = asmwrap
         self.get_lmul = lmul_getter
+        self.get_ntl = ntl_getter
 
         self.scalar_opdna1 = riscv64_opdna1(action=action, asmwrap=asmwrap)
 
@@ -85,8 +87,15 @@ class rvv_opdna1(opdna1):
             raise ValueError("RVV has no row selection ld/st")
         if mod.COL in modifiers:
             raise ValueError("RVV has no column selection ld/st")
-        if mod.NT in modifiers:
-            raise NotImplementedError("Non-temporals for RVV not yet implemented")
+        if mod.NT in modifiers and mod.VINDEX in modifiers:
+            raise ValueError("Non-temporal ld/st can't be combined with VINDEX")
+        if mod.FF in modifiers:
+            if self.action != opdna1_action.LOAD:
+                raise ValueError("FF modifier is only valid for LOAD operations")
+            if mod.GSTRIDE in modifiers or mod.VINDEX in modifiers:
+                raise ValueError("RVV has only unit-stride first-faulting loads")
+        if mod.QBCAST in modifiers or mod.OBCAST in modifiers:
+            raise ValueError("RVV has no segment-replicating loads")
 
         #TODO: invalid combinations
         if (mod.GSTRIDE in modifiers) and (mod.VINDEX in modifiers):
@@ -118,6 +127,10 @@ class rvv_opdna1(opdna1):
         raise ValueError("No restriction {rstr} on operand {op} for RVV opdna1")
 
 
+    # Zihintntl locality levels: innermost private, all private,
+    # innermost shared and all levels
+    ntl_levels = ["p1", "pall", "s1", "all"]
+
     def get_instruction(self, base : str,
                         modifiers: set[mod], dt : adt, **kwargs):
 
@@ -130,6 +143,7 @@ class rvv_opdna1(opdna1):
         # +e
         # if mod.VINDEX: +i
         # +{eew}
+        # if mod.FF: +ff
 
         if mod.GSTRIDE in modifiers:
             inst_name += "s"
@@ -143,6 +157,8 @@ class rvv_opdna1(opdna1):
             inst_name += "i"
 
         inst_name += str(adt_size(dt)*8)
+        if mod.FF in modifiers:
+            inst_name += "ff"
 
         inst_name += ".v"
 
@@ -206,6 +222,12 @@ class rvv_opdna1(opdna1):
 
 
         dreg_str = str(dregs[0])
-        return self.asmwrap(f"{inst} {dreg_str}, {addressing}")
-        
-        raise NotImplementedError(self.NIE_MESSAGE)
+        asmblock = f"{inst} {dreg_str}, {addressing}"
+        # Zihintntl hints apply to the following memory access, without the
+        # extension the access is emitted as a normal one (the hint is a no-op)
+        if mod.NT in modifiers and self.get_ntl():
+            ntlevel = kwargs.get("ntlevel", "all")
+            if ntlevel not in self.ntl_levels:
+                raise ValueError(f"Invalid ntlevel {ntlevel}, must be one of {self.ntl_levels}")
+            asmblock = f"ntl.{ntlevel}\n" + asmblock
+        return self.asmwrap(asmblock)
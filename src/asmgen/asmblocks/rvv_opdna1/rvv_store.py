@@ -18,7 +18,9 @@ class rvv_store(rvv_opdna1):
     """
 
     def __init__(self, asmwrap : Callable[[str],str],
-                 lmul_getter :Callable[[],int]):
+                 lmul_getter :Callable[[],int],
+                 ntl_getter : Callable[[],bool] = lambda : False):
         super().__init__(action=action.STORE,
                          asmwrap=asmwrap,
-                         lmul_getter=lmul_getter)
+                         lmul_getter=lmul_getter,
+                         ntl_getter=ntl_getter)
@@ -0,0 +1,62 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV table lookups
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import (
+    oplut,
+    oplut_modifier as mod,
+    operand_restriction
+)
+from ..types.rvv_types import rvv_vreg
+
+class rvv_tbl(oplut):
+    """
+    RVV implementation of lut with vrgather.vv, vtype has to be set for the
+    element size of the table. The table holds all elements of the register
+    group, indices >= VLMAX give 0. The destination must not overlap the
+    table or the indices
+    """
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in
+                [adt.FP16, adt.BF16, adt.FP32, adt.FP64,
+                 adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64,
+                 adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.KEEP in modifiers:
+            raise ValueError("RVV vrgather always zeroes out-of-range elements")
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for RVV oplut")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       modifiers : set[mod], **kwargs) -> str:
+        if not all(isinstance(r, rvv_vreg) for r in [adreg, bdreg, cdreg]):
+            raise ValueError("All dregs of an RVV oplut must be rvv_vreg")
+        if cdreg.idx in [adreg.idx, bdreg.idx]:
+            raise ValueError("The destination of an RVV oplut must not overlap its sources")
+
+        return self.asmwrap(f"vrgather.vv {cdreg},{adreg},{bdreg}")
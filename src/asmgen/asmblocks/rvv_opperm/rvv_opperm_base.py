@@ -0,0 +1,98 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV permutation base case
+"""
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import (
+    opperm,
+    opperm_modifier as mod,
+    operand_restriction
+)
+from ..types.rvv_types import rvv_vreg
+
+class rvv_opperm_base(opperm):
+    """
+    RVV base permutation implementation with methods shared by all
+    permutation operations. Permutations operate on the element width of the
+    current vtype, the data type only has to have the same size
+    """
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        sup_dts = [
+            adt.FP64, adt.FP32, adt.FP16, adt.BF16, adt.FP8E4M3, adt.FP8E5M2,
+            adt.SINT64, adt.SINT32, adt.SINT16, adt.SINT8,
+            adt.UINT64, adt.UINT32, adt.UINT16, adt.UINT8
+        ]
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in sup_dts]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        # Both modifiers only change the instruction sequence
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for RVV opperm")
+
+    def check_dregs(self, dregs : list[data_reg]):
+        """
+        Checks that all registers are vector registers other than the mask register v0
+
+        :param dregs: Registers used by the permutation
+        :type dregs: list[class:`asmgen.registers.data_reg`]
+        :raises ValueError: If a register is not an RVV vector register or is v0
+        """
+        if not all(isinstance(r, rvv_vreg) for r in dregs):
+            raise ValueError("All dregs of an RVV opperm must be rvv_vreg")
+        if any(0 == r.idx for r in dregs):
+            raise ValueError("v0 holds the permutation mask and can't be an operand")
+
+    def gather(self, *, adreg : rvv_vreg, bdreg : rvv_vreg, cdreg : rvv_vreg,
+               kwargs : dict) -> str:
+        """
+        Gathers the elements of A and B with the indices in idxreg and merges
+        the elements gathered from B into C where v0 is set. The indices and
+        the mask are prepared by the setup method of the permutation
+
+        :param adreg: A register
+        :type adreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param bdreg: B register
+        :type bdreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param cdreg: C register
+        :type cdreg: class:`asmgen.asmblocks.types.rvv_types.rvv_vreg`
+        :param kwargs: Keyword arguments of the operation with idxreg and tmpreg
+        :type kwargs: dict
+        :return: ASM instruction sequence
+        :rtype: str
+        """
+        if 'idxreg' not in kwargs or 'tmpreg' not in kwargs:
+            raise ValueError("RVV gather permutations need the idxreg and tmpreg parameters")
+        idxreg = kwargs['idxreg']
+        tmpreg = kwargs['tmpreg']
+        self.check_dregs([adreg,bdreg,cdreg,idxreg,tmpreg])
+        # vrgather can't overwrite its sources, the merge reads both results
+        if cdreg.idx in {adreg.idx, bdreg.idx, idxreg.idx}:
+            raise ValueError("C must not alias the A, B or index registers")
+        if tmpreg.idx in {adreg.idx, bdreg.idx, cdreg.idx, idxreg.idx}:
+            raise ValueError("tmpreg must not alias the A, B, C or index registers")
+
+        asmblock  = self.asmwrap(f"vrgather.vv {cdreg},{adreg},{idxreg}")
+        asmblock += self.asmwrap(f"vrgather.vv {tmpreg},{bdreg},{idxreg}")
+        asmblock += self.asmwrap(f"vmerge.vvm {cdreg},{cdreg},{tmpreg},v0")
+        return asmblock
@@ -0,0 +1,55 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV trn permutation instruction sequence
+"""
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import opperm_modifier as mod
+from .rvv_opperm_base import rvv_opperm_base
+
+class rvv_trn(rvv_opperm_base):
+    """
+    RVV implementation of trn (see :class:`asmgen.asmblocks.neon_opperm.neon_trn`).
+
+    The neighbouring groups are moved into place with a slide by one group and
+    merged under a mask. v0 has to contain a mask with all elements of odd
+    groups set (see :meth:`asmgen.asmblocks.rvv.rvv.perm_setup`). The slide
+    uses C as a temporary register, if C aliases A or B (trn) or B (trn.hi)
+    another temporary register has to be passed in the tmpreg parameter
+    """
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        group = self.get_group(modifiers, kwargs)
+        if group > 31:
+            raise ValueError("RVV trn supports groups of at most 31 elements")
+
+        hi = mod.HI in modifiers
+        # vslideup can't overwrite its source, the merge reads both sources
+        clobbered = {bdreg.idx} if hi else {adreg.idx, bdreg.idx}
+        tmpreg = kwargs.get('tmpreg', cdreg)
+        if tmpreg.idx in clobbered:
+            if 'tmpreg' in kwargs:
+                raise ValueError("tmpreg must not alias the A or B registers")
+            raise ValueError("tmpreg required when C aliases the A or B registers")
+
+        self.check_dregs([adreg,bdreg,cdreg,tmpreg])
+
+        if hi:
+            asmblock  = self.asmwrap(f"vslidedown.vi {tmpreg},{adreg},{group}")
+            asmblock += self.asmwrap(f"vmerge.vvm {cdreg},{tmpreg},{bdreg},v0")
+        else:
+            asmblock  = self.asmwrap(f"vslideup.vi {tmpreg},{bdreg},{group}")
+            asmblock += self.asmwrap(f"vmerge.vvm {cdreg},{adreg},{tmpreg},v0")
+        return asmblock
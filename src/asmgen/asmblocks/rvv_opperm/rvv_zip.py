@@ -0,0 +1,37 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV zip permutation instruction sequence
+"""
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import opperm_modifier as mod
+from .rvv_opperm_base import rvv_opperm_base
+
+class rvv_zip(rvv_opperm_base):
+    """
+    RVV implementation of zip (see :class:`asmgen.asmblocks.neon_opperm.neon_zip`).
+
+    The elements are gathered from A and B with vrgather and merged under a mask.
+    v0 has to contain a mask with all elements of odd groups set and idxreg
+    the source index of each element in A or B
+    (see :meth:`asmgen.asmblocks.rvv.rvv.zip_setup`, called with the same group
+    and HI modifier). C and the temporary register passed in the tmpreg
+    parameter must not alias A, B or the index register
+    """
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        # The group only changes the indices prepared by zip_setup
+        self.get_group(modifiers, kwargs)
+        return self.gather(adreg=adreg, bdreg=bdreg, cdreg=cdreg, kwargs=kwargs)
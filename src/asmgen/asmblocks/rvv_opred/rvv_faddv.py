@@ -0,0 +1,54 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV sum reduction instruction sequence
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import opred_modifier as mod
+
+from .rvv_opred_base import rvv_opred_base
+
+class rvv_faddv(rvv_opred_base):
+    """
+    RVV 1.0 implementation of faddv with vfredusum, the ORDERED form uses
+    vfredosum starting from the value in bdreg
+    """
+
+    inst_base = "usum"
+
+    def check_modifiers(self, modifiers : set[mod]):
+        # vfredosum implements the ORDERED form
+        pass
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        tmpreg = kwargs['tmpreg']
+        self.check_registers(adreg, bdreg, tmpreg)
+        if mod.ORDERED in modifiers:
+            asmblock  = self.asmwrap(f"vfmv.s.f {tmpreg},{bdreg}")
+            asmblock += self.asmwrap(f"vfredosum.vs {tmpreg},{adreg},{tmpreg}")
+        else:
+            # Integer zero is +0.0 for all floating point types
+            asmblock  = self.asmwrap(f"vmv.s.x {tmpreg},zero")
+            asmblock += self.asmwrap(f"vfred{self.inst_base}.vs {tmpreg},{adreg},{tmpreg}")
+        asmblock += self.asmwrap(f"vfmv.f.s {bdreg},{tmpreg}")
+        return asmblock
+
+class rvv071_faddv(rvv_faddv):
+    """
+    RVV 0.7.1 implementation of faddv, the unordered sum is named vfredsum
+    """
+
+    inst_base = "sum"
@@ -0,0 +1,17 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV maximum reduction instruction sequence
+"""
+
+from .rvv_opred_base import rvv_opred_base
+
+class rvv_fmaxv(rvv_opred_base):
+    """
+    RVV 1.0 and 0.7.1 implementation of fmaxv
+    """
+
+    inst_base = "max"
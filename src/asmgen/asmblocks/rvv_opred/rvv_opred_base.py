@@ -0,0 +1,85 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV 1.0 and 0.7.1 reduction base
+"""
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import (
+    opred,
+    opred_modifier as mod,
+    operand_restriction
+)
+from ..types.riscv64_types import riscv64_freg
+from ..types.rvv_types import rvv_vreg
+
+class rvv_opred_base(opred):
+    """
+    RVV 1.0 and 0.7.1 base reduction implementation. The reduction instructions
+    write element 0 of a vector register, which is moved to the scalar result.
+    The temporary register for this has to be passed in the tmpreg parameter
+    """
+
+    inst_base = "invalid"
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt} for dt in [adt.FP64, adt.FP32, adt.FP16]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.ORDERED in modifiers:
+            raise ValueError(f"vfred{self.inst_base} has no strictly ordered form")
+
+    def get_required_params(self, modifiers : set[mod]) -> list[set[str]]:
+        return [{'tmpreg'}]
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for RVV opred")
+
+    def check_registers(self, adreg : data_reg, bdreg : data_reg, tmpreg : data_reg):
+        """
+        Checks the operand and temporary registers
+
+        :param adreg: Vector register to reduce
+        :type adreg: class:`asmgen.registers.data_reg`
+        :param bdreg: Scalar register to write the result to
+        :type bdreg: class:`asmgen.registers.data_reg`
+        :param tmpreg: Temporary vector register
+        :type tmpreg: class:`asmgen.registers.data_reg`
+        :raises ValueError: If the register types are invalid or tmpreg aliases adreg
+        """
+        if not isinstance(adreg, rvv_vreg) or not isinstance(tmpreg, rvv_vreg):
+            raise ValueError("adreg and tmpreg of an RVV opred must be rvv_vreg")
+        if not isinstance(bdreg, riscv64_freg):
+            raise ValueError("bdreg of an RVV opred must be riscv64_freg")
+        if tmpreg.idx == adreg.idx:
+            raise ValueError("tmpreg must not alias adreg")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        tmpreg = kwargs['tmpreg']
+        self.check_registers(adreg, bdreg, tmpreg)
+        # Element 0 of adreg is the start value, max/min don't change by using it twice
+        asmblock  = self.asmwrap(f"vfred{self.inst_base}.vs {tmpreg},{adreg},{adreg}")
+        asmblock += self.asmwrap(f"vfmv.f.s {bdreg},{tmpreg}")
+        return asmblock
@@ -0,0 +1,61 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+RVV 1.0 and 0.7.1 selects
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import (
+    opsel,
+    opsel_modifier as mod,
+    operand_restriction
+)
+from ..types.rvv_types import rvv_vreg
+
+class rvv_sel(opsel):
+    """
+    RVV implementation of sel using vmerge, which only takes its mask from v0
+    """
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in
+                [adt.FP16, adt.BF16, adt.FP32, adt.FP64,
+                 adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64,
+                 adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for RVV opsel")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       mreg, modifiers : set[mod], **kwargs) -> str:
+        if not all(isinstance(r, rvv_vreg) for r in [adreg, bdreg, cdreg, mreg]):
+            raise ValueError("All registers of an RVV opsel must be rvv_vreg")
+        if 0 != mreg.idx:
+            raise ValueError("The mask of an RVV opsel must be v0")
+        if 0 == cdreg.idx:
+            raise ValueError("The destination of an RVV opsel must not be v0")
+
+        freg,treg = self.get_operands(adreg, bdreg, modifiers)
+        return self.asmwrap(f"vmerge.vvm {cdreg},{freg},{treg},{mreg}")
@@ -7,16 +7,25 @@
 SME asm generator
 """
 
+import re
+from typing import Callable
+
 from ..registers import (
     asm_data_type as adt,
     reg_tracker,
     adt_size,
     treg_base, vreg_base, greg_base,
 )
+from .noarch import asmunwrap
+from .operations import dummy_opd3
 from .sve import sve
 
-from .types.sme_types import sme_treg
-from .sme_opd3 import sme_fopa
+from .types.sve_types import sve_preg
+from .types.sme_types import sme_treg, sme_vgroup, sme_za_vgroup
+from .sme_opd3 import sme_fopa, sme_fma
+from .sme_opdna1 import sme_load,sme_store
+from .sve_opperm import sve_zip,sve_uzp,sve_trn
+from .sve_opred import sve_faddv
 
 
 
@@ -30,18 +39,30 @@ class sme(sve):
         self.valid_rcregs = [str(self.greg(i)) for i in range(12,16)]
         self.fopa = sme_fopa(asmwrap=self.asmwrap,
                              dt_suffixes=self.dt_suffixes)
+        self.fma = sme_fma(asmwrap=self.asmwrap,
+                           dt_suffixes=self.dt_suffixes,
+                           dt_idxsuffixes=self.dt_suffixes)
+        # The SVE MMLA instructions are illegal in streaming mode
+        self.mma = dummy_opd3()
+        self.load = sme_load(asmwrap=self.asmwrap)
+        self.store = sme_store(asmwrap=self.asmwrap)
+        # Permuting 128 bit groups is illegal in streaming mode
+        self.zip = sve_zip(asmwrap=self.asmwrap, streaming=True)
+        self.uzp = sve_uzp(asmwrap=self.asmwrap, streaming=True)
+        self.trn = sve_trn(asmwrap=self.asmwrap, streaming=True)
+        # fadda is illegal in streaming mode
+        self.faddv = sve_faddv(asmwrap=self.asmwrap, streaming=True)
 
     @property
     def c_simd_size_function(self):
+        if self.vl is not None:
+            return super().c_simd_size_function
         pre_oi = self.output_inline
         self.set_output_inline(yesno=True)
         result  = "inline size_t get_simd_size() {\n"
         result += "    size_t byte_size = 0;\n"
         result += "    __asm__ volatile(\n"
-        result += "        "+self.asmwrap("smstart")
-        result += "        "+self.asmwrap("mov %[byte_size],#0")
-        result += "        "+self.asmwrap("incb %[byte_size]")
-        result += "        "+self.asmwrap("smstop")
+        result += "        "+self.asmwrap("rdsvl %[byte_size],#1")
         result += "    : [byte_size] \"=r\" (byte_size)\n"
         result += "    :\n"
         result += "    :\n"
@@ -56,6 +77,7 @@ class sme(sve):
         # set p0 to true (default sve preg)
         asmblock += super().isaquirks(rt=rt,dt=dt)
         # set pn8 to true (default sme preg)
+        self.reserve_preg(rt, 'ptrue_pn', 8)
         asmblock += self.ptrue(self.preg(8,True), dt)
         return asmblock
 
@@ -64,15 +86,177 @@ class sme(sve):
         asmblock += self.asmwrap("smstop")
         return asmblock
 
+    # Scalar instructions that behave the same in and out of streaming mode
+    scalar_mnemonics = {
+        'add', 'adds', 'sub', 'subs', 'cmp', 'cmn', 'tst', 'neg',
+        'mov', 'movz', 'movk', 'movn', 'mul', 'madd', 'msub',
+        'lsl', 'lsr', 'asr', 'and', 'ands', 'orr', 'eor', 'csel',
+        'ldr', 'ldrsw', 'ldp', 'str', 'stp', 'adr', 'adrp', 'prfm',
+    }
+    scalar_operand = re.compile(
+        r"^([xw]([0-9]|[12][0-9]|30)|w?sp|[xw]zr|lr|fp|lsl|lsr|asr|[su]xt[bhwx]|pld\w*|pst\w*)$")
+
+    @classmethod
+    def is_scalar_inst(cls, inst : str) -> bool:
+        """
+        Checks whether an instruction only uses GP registers and neither branches
+        nor changes the mode, i.e. it can be moved in or out of a streaming region.
+        Comments and empty lines count as scalar, labels do not.
+        Inline operands (%[name]) are assumed to be GP registers
+
+        :param inst: Instruction as returned by :func:`asmgen.asmblocks.noarch.asmunwrap`
+        :type inst: str
+        :return: True if the instruction is mode-independent scalar code
+        :rtype: bool
+        """
+        if not inst or inst.startswith("//"):
+            return True
+        mnemonic, _, operands = inst.partition(' ')
+        if mnemonic.lower() not in cls.scalar_mnemonics:
+            return False
+        operands = re.sub(r"%\[\w+\]", "x0", operands)
+        return all(cls.scalar_operand.match(tok.lower())
+                   for tok in re.findall(r"[A-Za-z_][\w.]*", operands))
+
+    @staticmethod
+    def _coalesce_streaming(lines : list[str]) -> bool:
+        """
+        Removes smstop/smstart pairs that are only separated by scalar code
+        """
+        insts = [asmunwrap(l) for l in lines]
+        for i,inst in enumerate(insts):
+            if "smstop" != inst:
+                continue
+            j = i+1
+            while j < len(insts) and sme.is_scalar_inst(insts[j]):
+                j += 1
+            if j < len(insts) and "smstart" == insts[j]:
+                del lines[j]
+                del lines[i]
+                return True
+        return False
+
+    @staticmethod
+    def _hoist_streaming(lines : list[str]) -> bool:
+        """
+        Moves a smstart/smstop pair enclosing a loop body out of the loop if the
+        loop label is only targeted by the backward branch and the code outside of
+        the streaming region in the body is scalar
+        """
+        insts = [asmunwrap(l) for l in lines]
+        tokens = [re.split(r"[\s,]+", inst) for inst in insts]
+        for lbl_idx,inst in enumerate(insts):
+            if not inst.endswith(':'):
+                continue
+            label = inst[:-1]
+            refs = [i for i,t in enumerate(tokens) if label in t]
+            if 1 != len(refs) or refs[0] < lbl_idx:
+                continue
+            br_idx = refs[0]
+            body = insts[lbl_idx+1:br_idx]
+            if 1 != body.count("smstart") or 1 != body.count("smstop"):
+                continue
+            start = lbl_idx+1+body.index("smstart")
+            stop = lbl_idx+1+body.index("smstop")
+            if start > stop:
+                continue
+            outside = insts[lbl_idx+1:start] + insts[stop+1:br_idx]
+            if not all(sme.is_scalar_inst(i) for i in outside):
+                continue
+            stop_line = lines.pop(stop)
+            lines.insert(br_idx, stop_line)
+            start_line = lines.pop(start)
+            lines.insert(lbl_idx, start_line)
+            return True
+        return False
+
+    def optimize_mode_transitions(self, asmblock : str) -> str:
+        """
+        Returns the ASM block with adjacent streaming regions merged and
+        streaming mode switches hoisted out of loops whose bodies are entirely
+        in a streaming region. Only scalar code (see :meth:`is_scalar_inst`)
+        is moved into streaming mode.
+
+        Note that smstart zeroes the Z, P and ZA registers, which code after a
+        removed smstart can no longer rely on
+
+        :param asmblock: ASM generated by this generator
+        :type asmblock: str
+        :return: ASM block with optimized mode transitions
+        :rtype: str
+        """
+        lines = asmblock.splitlines(keepends=True)
+        while self._coalesce_streaming(lines) or self._hoist_streaming(lines):
+            pass
+        return "".join(lines)
+
+    def ff_loop(self, *, step_reg : greg_base, label : str, dt : adt,
+                load : Callable[[], str],
+                body : Callable[[sve_preg, greg_base], str],
+                mreg : sve_preg|None = None) -> str:
+        raise NotImplementedError("First-faulting loads are illegal in streaming mode")
+
     def max_tregs(self, dt : adt) -> int:
         return adt_size(dt)
 
     def treg(self, reg_idx : int, dt : adt) -> treg_base:
         return sme_treg(reg_idx, dt)
 
+    def vgroup(self, reg_idx : int, count : int) -> sme_vgroup:
+        """
+        Returns an SME2 multi-vector operand of count consecutive Z registers
+
+        :param reg_idx: Index of the first register, has to be a multiple of count
+        :type reg_idx: int
+        :param count: Number of registers (2 or 4)
+        :type count: int
+        :return: Vector group
+        :rtype: class:`asmgen.asmblocks.types.sme_types.sme_vgroup`
+        """
+        return sme_vgroup(reg_idx, count)
+
+    def za_vgroup(self, *, vsreg : greg_base, offset : int, vgx : int) -> sme_za_vgroup:
+        """
+        Returns an SME2 ZA array vector group to be used as C component of
+        multi-vector operations
+
+        :param vsreg: Vector select register (x8-x11)
+        :type vsreg: class:`asmgen.register.greg_base`
+        :param offset: Immediate vector select offset
+        :type offset: int
+        :param vgx: Number of vectors in the group (2 or 4)
+        :type vgx: int
+        :return: ZA array vector group
+        :rtype: class:`asmgen.asmblocks.types.sme_types.sme_za_vgroup`
+        """
+        return sme_za_vgroup(vsreg, offset, vgx)
+
+    def extract_za_vgroup(self, *, zavg : sme_za_vgroup,
+                          vgroup : sme_vgroup, dt : adt) -> str:
+        """
+        Returns ASM string for moving a ZA array vector group to a multi-vector operand
+
+        The multi-vector MOVA only has a doubleword form, since the move is bit-exact it
+        is used for all element sizes.
+
+        :param zavg: ZA array vector group to read
+        :type zavg: class:`asmgen.asmblocks.types.sme_types.sme_za_vgroup`
+        :param vgroup: Destination registers, same size as the ZA vector group
+        :type vgroup: class:`asmgen.asmblocks.types.sme_types.sme_vgroup`
+        :param dt: Data type of the values
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String containing the necessary ASM instructions
+        :rtype: str
+        """
+        if zavg.vgx != vgroup.count:
+            raise ValueError(f"Vector group sizes differ ({zavg.vgx} != {vgroup.count})")
+        if dt not in self.dt_suffixes:
+            raise ValueError(f"Unsupported data type {dt}")
+        return self.asmwrap(f"mov {vgroup.with_suffix('.d')}, {zavg.with_suffix('.d')}")
+
     def zero_treg(self, *, treg : treg_base, dt : adt) -> str:
         suf = self.dt_suffixes[dt]
-        return self.asmwrap(f"zero {treg}.{suf}")
+        return self.asmwrap(f"zero {{{treg}.{suf}}}")
 
 
     def insert_tile_rows(self, *,
@@ -111,9 +295,10 @@ class sme(sve):
         if 1 == len(vregs):
             opt_preg = ",p0/m"
             roff_str = f"{roff_start}"
+            vsrc = f"{vregs[0]}.{suf}"
 
         return self.asmwrap(
-            f"mov {treg}h.{suf}[{rreg},{roff_str}]{opt_preg},{vsrc}")
+            f"mov {treg}h.{suf}[{rreg.get_wreg()},{roff_str}]{opt_preg},{vsrc}")
 
     def extract_tile_rows(self, *,
                        rreg : greg_base,
@@ -152,9 +337,10 @@ class sme(sve):
         if 1 == len(vregs):
             opt_preg = ",p0/m"
             roff_str = f"{roff_start}"
+            vdest = f"{vregs[0]}.{suf}"
 
         return self.asmwrap(
-            f"mov {vdest}{opt_preg},{treg}h.{suf}[{rreg},{roff_str}]")
+            f"mov {vdest}{opt_preg},{treg}h.{suf}[{rreg.get_wreg()},{roff_str}]")
 
 
     def load_tile_row(self, *,
@@ -234,7 +420,7 @@ class sme(sve):
         if voff > 0:
             address = f"[{areg}, #{voff}, MUL VL]"
         return self.asmwrap(
-            f"st1{msuf} {{{treg}h.{suf}[{rreg_str},{roff}]}},p0/m,{address}")
+            f"st1{msuf} {{{treg}h.{suf}[{rreg_str},{roff}]}},p0,{address}")
 
     def load_tile(self, *, areg : greg_base,
                    treg : treg_base, dt : adt) -> str:
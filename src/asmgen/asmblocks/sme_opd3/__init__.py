@@ -8,3 +8,4 @@ Meta-module for SME opd3 operations
 """
 
 from .sme_fopa import *
+from .sme_fma import *
@@ -0,0 +1,76 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SME fma instruction, including the SME2 multi-vector ZA array forms
+"""
+from ...registers import data_reg, asm_data_type as adt, adt_size
+from ..operations import opd3_modifier as mod
+from ..sve_opd3.sve_fma import sve_fma
+from ..types.sve_types import sve_vreg
+from ..types.sme_types import sme_vgroup, sme_za_vgroup
+
+class sme_fma(sve_fma):
+    """
+    SME implementation of fma
+
+    With an sme_za_vgroup as C component, the SME2 multi-vector form accumulating
+    into ZA array vectors is generated (adreg: sme_vgroup, bdreg: sve_vreg z0-z15
+    or sme_vgroup of the same size), i.e.
+      fmla za.s[w8, 0, vgx4], {z0.s-z3.s}, z4.s
+    Widening FP16->FP32 uses FMLAL, where every C element spans two ZA vectors:
+      fmlal za.s[w8, 0:1, vgx4], {z0.h-z3.h}, z4.h
+    All other operands are handled like SVE
+    """
+
+    za_dts = [
+        {'adreg':adt.FP64, 'bdreg':adt.FP64, 'cdreg':adt.FP64},
+        {'adreg':adt.FP32, 'bdreg':adt.FP32, 'cdreg':adt.FP32},
+        {'adreg':adt.FP16, 'bdreg':adt.FP16, 'cdreg':adt.FP16},
+        {'adreg':adt.FP16, 'bdreg':adt.FP16, 'cdreg':adt.FP32},
+    ]
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        if not isinstance(cdreg, sme_za_vgroup):
+            return super().implementation(
+                    adreg=adreg, bdreg=bdreg, cdreg=cdreg,
+                    a_dt=a_dt, b_dt=b_dt, c_dt=c_dt,
+                    modifiers=modifiers, **kwargs)
+
+        if modifiers - {mod.NP}:
+            raise ValueError("SME2 ZA array fma only supports the NP modifier")
+        if {'adreg':a_dt, 'bdreg':b_dt, 'cdreg':c_dt} not in self.za_dts:
+            raise ValueError(f"SME2 ZA array fma not supported for {a_dt.name} -> {c_dt.name}")
+        if not isinstance(adreg, sme_vgroup):
+            raise ValueError(f"{adreg} is not an sme_vgroup")
+        if adreg.count != cdreg.vgx:
+            raise ValueError((f"Vector group size of A ({adreg.count}) and "
+                              f"ZA (vgx{cdreg.vgx}) differ"))
+
+        asuf = f".{self.dt_suffixes[a_dt]}"
+        csuf = f".{self.dt_suffixes[c_dt]}"
+        if isinstance(bdreg, sme_vgroup):
+            if bdreg.count != adreg.count:
+                raise ValueError("Vector groups of A and B must have the same size")
+            bstr = bdreg.with_suffix(asuf)
+        elif isinstance(bdreg, sve_vreg):
+            if bdreg.idx > 15:
+                raise ValueError("Single B vector of SME2 multi-vector fma must be z0-z15")
+            bstr = f"{bdreg}{asuf}"
+        else:
+            raise ValueError(f"{bdreg} is neither an sve_vreg nor an sme_vgroup")
+
+        ways = adt_size(c_dt)//adt_size(a_dt)
+        inst = "fmls" if mod.NP in modifiers else "fmla"
+        if ways > 1:
+            inst += "l"
+        return self.asmwrap(
+            f"{inst} {cdreg.with_suffix(csuf, ways)}, {adreg.with_suffix(asuf)}, {bstr}")
@@ -49,6 +49,8 @@ class sme_fopa(opd3):
             raise ValueError("SME has no regidx form")
         if mod.VF in modifiers:
             raise ValueError("SME has no vf form")
+        if mod.MEM in modifiers or mod.BCAST in modifiers:
+            raise ValueError("SME has no memory operands")
         if mod.PART in modifiers:
             raise ValueError("SME has no partial instructions (widening instructions 'dot' neighbours)")
         if mod.MASK in modifiers:
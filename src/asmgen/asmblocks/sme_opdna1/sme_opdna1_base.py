@@ -16,14 +16,15 @@ from ..operations import (
 from ...registers import asm_data_type as adt, adt_size, data_reg
 
 from ..types.aarch64_types import aarch64_greg
-from ..types.sve_types import sve_preg
-from ..types.sme_types import sme_treg
+from ..types.sve_types import sve_preg, sve_vreg
+from ..types.sme_types import sme_treg, sme_vtuple_str
 from ..sve_opdna1 import sve_opdna1
 
 class sme_opdna1(opdna1):
     """
     AArch64 SME instruction generator.
-    Handles ZA tile slices (sme_treg) and SME2 Non-Temporal loads/stores.
+    Handles ZA tile slices (sme_treg), SME2 multi-vector (2 or 4 Z registers with
+    a predicate-as-counter) and SME2 Non-Temporal loads/stores.
     Routes all other operations to sve_opdna1.
     """
 
@@ -49,6 +50,8 @@ class sme_opdna1(opdna1):
 
         if mod.TINDEX in modifiers:
             raise ValueError("SME uses ROW/COL modifiers instead of TINDEX")
+        if mod.FF in modifiers:
+            raise ValueError("First-faulting loads are illegal in streaming mode")
         if mod.GLANE in modifiers:
             raise ValueError("SME has no GP-reg lane ld/st")
         if mod.ILANE in modifiers:
@@ -65,6 +68,10 @@ class sme_opdna1(opdna1):
             raise NotImplementedError("Masked ld/st for SME not yet implemented")
         if mod.BCAST in modifiers:
             raise ValueError("SME native instructions do not support BCAST")
+        if mod.OBCAST in modifiers:
+            raise ValueError("ld1ro (FEAT_F64MM) is illegal in streaming mode")
+        if mod.QBCAST in modifiers and (mod.ROW in modifiers or mod.COL in modifiers):
+            raise ValueError("QBCAST can't be combined with tile slice modifiers (ROW/COL)")
         if mod.VINDEX in modifiers:
             raise ValueError("SME native instructions do not support vector indices (Gathers/Scatters)")
         if mod.TOFFSET in modifiers:
@@ -98,10 +105,8 @@ class sme_opdna1(opdna1):
 
 
     def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        # Multi-vector tuples (consecutive or strided) are checked by sme_vtuple_str
         rstrs = {
-            'bdreg' : {operand_restriction.IDXOTHERPLUSNMOD},
-            'cdreg' : {operand_restriction.IDXOTHERPLUSNMOD},
-            'ddreg' : {operand_restriction.IDXOTHERPLUSNMOD},
             'rowreg': {operand_restriction.IDXMIN,
                        operand_restriction.IDXMAX},
             'colreg': {operand_restriction.IDXMIN,
@@ -118,15 +123,6 @@ class sme_opdna1(opdna1):
                                       rstr : operand_restriction) \
       -> int|set[int]|tuple[str,int]:
 
-        if mod.NT in modifiers:
-            if oprnd in {'bdreg', 'cdreg', 'ddreg'} and \
-              rstr == operand_restriction.IDXOTHERPLUSNMOD:
-                return (chr(ord(oprnd[0])-1)+'dreg', 8, 32)
-        else:
-            if oprnd in {'bdreg', 'cdreg', 'ddreg'} and \
-              rstr == operand_restriction.IDXOTHERPLUSNMOD:
-                return (chr(ord(oprnd[0])-1)+'dreg', 1, 32)
-
         if oprnd in {'rowreg', 'colreg'} and \
           rstr == operand_restriction.IDXMAX:
             return 15
@@ -177,8 +173,10 @@ class sme_opdna1(opdna1):
             raise ValueError("No dregs provided")
 
         # --- ROUTING LOGIC ---
-        # If it's not a Tile Register AND it's not a Non-Temporal instruction, SVE handles it.
-        if not isinstance(dregs[0], sme_treg) and mod.NT not in modifiers:
+        # Single Z/scalar registers that are not Non-Temporal are handled by SVE,
+        # tile slices and multi-vector operations by SME
+        multi = len(dregs) > 1 and isinstance(dregs[0], sve_vreg)
+        if not isinstance(dregs[0], sme_treg) and mod.NT not in modifiers and not multi:
             return self.sve_opdna1(dregs=dregs, areg=agreg, dt=a_dt,
                                    modifiers=modifiers, **kwargs)
 
@@ -187,11 +185,16 @@ class sme_opdna1(opdna1):
         addressing = self.get_addressing(agreg, modifiers, a_dt, **kwargs)
 
         # SME specific checks not handled by default checks
-        if mod.NT in modifiers:
+        if mod.NT in modifiers or multi:
             if len(dregs) not in [1, 2, 4]:
-                raise ValueError(("SME2 non-temporal operations require 1, 2, or"
+                raise ValueError(("SME2 multi-vector operations require 1, 2, or"
                                  f" 4 vector registers, got {len(dregs)}"))
-                
+            if mod.IOFFSET in modifiers:
+                raise ValueError("SME2 multi-vector operations have no element offset form")
+            if mod.VOFFSET in modifiers and kwargs['voffset'] % len(dregs) != 0:
+                raise ValueError((f"voffset of a {len(dregs)}-register operation must be a "
+                                  f"multiple of {len(dregs)}"))
+
         if mod.ROW in modifiers or mod.COL in modifiers:
             if len(dregs) != 1:
                 raise ValueError(("SME tile slice operations accept exactly one "
@@ -218,31 +221,18 @@ class sme_opdna1(opdna1):
             preg = kwargs.get("preg", sve_preg(0))
             preg_str = f"{preg}/z" if self.action == opdna1_action.LOAD else f"{preg}"
 
-        elif mod.NT in modifiers:
-            # Validate strided Z-register tuples for SME2
-            if len(dregs) == 2:
-                if dregs[1].idx != dregs[0].idx + 8:
-                    raise ValueError(("SME2 2-register operations require a register"
-                                     f" stride of 8 (e.g. Z0, Z8). Got z{dregs[0].idx},"
-                                     f" z{dregs[1].idx}"))
-                if (dregs[0].idx % 16) >= 8:
-                    raise ValueError(("First register of SME2 2-register tuple must be"
-                                     f"Z0-Z7 or Z16-Z23. Got z{dregs[0].idx}"))
-            
-            elif len(dregs) == 4:
-                for i in range(1, 4):
-                    if dregs[i].idx != dregs[0].idx + i * 4:
-                        raise ValueError(("SME2 4-register operations require a register"
-                                          "stride of 4 (e.g. Z0, Z4, Z8, Z12)."))
-                if (dregs[0].idx % 16) >= 4:
-                    raise ValueError(("First register of SME2 4-register tuple must be Z0-Z3"
-                                     f" or Z16-Z19. Got z{dregs[0].idx}"))
-
-            dregs_str = ", ".join([f"{r}{esuf}" for r in dregs])
-            inst = f"{self.inst_base}nt1{msuf}"
-            
+        elif mod.NT in modifiers or multi:
+            if not all(isinstance(r, sve_vreg) for r in dregs):
+                raise ValueError("SME2 multi-vector operations require sve_vreg dregs")
+            # Consecutive ({z0.s-z3.s}) or strided ({z0.s, z4.s, z8.s, z12.s}) tuples
+            dregs_str = sme_vtuple_str(dregs, esuf)[1:-1]
+            nt = "nt" if mod.NT in modifiers else ""
+            inst = f"{self.inst_base}{nt}1{msuf}"
+
             # Predicate-as-counter (PN8-PN15) validation and string generation
-            preg = kwargs.get("preg", sve_preg(8, is_pn=True)) 
+            preg = kwargs.get("preg", sve_preg(8, is_pn=True))
+            if not preg.is_pn or preg.idx < 8:
+                raise ValueError(f"SME2 multi-vector operations require pn8-pn15, got {preg}")
             preg_str = f"{preg}/z" if self.action == opdna1_action.LOAD else f"{preg}"
         else:
             raise ValueError("Unhandled SME instruction configuration")
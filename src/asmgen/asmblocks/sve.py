@@ -7,7 +7,11 @@
 SVE asm generator
 """
 
+from typing import Callable
+
 from .aarch64 import aarch64
+from .noarch import comparison,bscalar_strategy
+from .operations import opdna1_modifier,opcmp_modifier
 
 from ..registers import (
     reg_tracker,
@@ -17,9 +21,20 @@ from ..registers import (
     ait_size,
     treg_base, vreg_base, freg_base, greg_base
 )
+from ..asmdata import adt_fp_bits
 
 from .types.sve_types import sve_vreg,sve_preg
-from .sve_opd3 import sve_fma,sve_fmul,sve_fadd
+from .sve_opd3 import (
+    sve_fma,sve_fmul,sve_fadd,sve_dota,sve_mma,
+    sve_cfma,sve_cadd,sve_fmax,sve_fmin,sve_fdiv
+)
+from .sve_opdna1 import sve_load,sve_store
+from .sve_opperm import sve_zip,sve_uzp,sve_trn
+from .sve_opred import sve_faddv,sve_fmaxv,sve_fminv
+from .sve_opcvt import sve_fcvt
+from .sve_opcmp import sve_cmp
+from .sve_opsel import sve_sel
+from .sve_oplut import sve_tbl
 
 from .neon import neon
 
@@ -58,6 +73,86 @@ class sve(aarch64):
         self.fadd = sve_fadd(asmwrap=self.asmwrap,
                              dt_suffixes=self.dt_suffixes,
                              dt_idxsuffixes=self.dt_suffixes)
+        self.dota = sve_dota(asmwrap=self.asmwrap,
+                             dt_suffixes=self.dt_suffixes,
+                             dt_idxsuffixes=self.dt_suffixes)
+        self.mma = sve_mma(asmwrap=self.asmwrap,
+                           dt_suffixes=self.dt_suffixes,
+                           dt_idxsuffixes=self.dt_suffixes)
+        self.cfma = sve_cfma(asmwrap=self.asmwrap,
+                             dt_suffixes=self.dt_suffixes,
+                             dt_idxsuffixes=self.dt_suffixes)
+        self.cadd = sve_cadd(asmwrap=self.asmwrap,
+                             dt_suffixes=self.dt_suffixes,
+                             dt_idxsuffixes=self.dt_suffixes)
+        self.fmax = sve_fmax(asmwrap=self.asmwrap,
+                             dt_suffixes=self.dt_suffixes,
+                             dt_idxsuffixes=self.dt_suffixes)
+        self.fmin = sve_fmin(asmwrap=self.asmwrap,
+                             dt_suffixes=self.dt_suffixes,
+                             dt_idxsuffixes=self.dt_suffixes)
+        self.fdiv = sve_fdiv(asmwrap=self.asmwrap,
+                             dt_suffixes=self.dt_suffixes,
+                             dt_idxsuffixes=self.dt_suffixes)
+        self.load = sve_load(asmwrap=self.asmwrap)
+        self.store = sve_store(asmwrap=self.asmwrap)
+
+        self.zip = sve_zip(asmwrap=self.asmwrap)
+        self.uzp = sve_uzp(asmwrap=self.asmwrap)
+        self.trn = sve_trn(asmwrap=self.asmwrap)
+
+        self.faddv = sve_faddv(asmwrap=self.asmwrap)
+        self.fmaxv = sve_fmaxv(asmwrap=self.asmwrap)
+        self.fminv = sve_fminv(asmwrap=self.asmwrap)
+        self.fcvt = sve_fcvt(asmwrap=self.asmwrap)
+        self.cmp = sve_cmp(asmwrap=self.asmwrap)
+        self.sel = sve_sel(asmwrap=self.asmwrap)
+        self.tbl = sve_tbl(asmwrap=self.asmwrap)
+
+        # Fixed vector length in bits (VLS), None generates VLA code
+        self.vl = None
+
+    def get_parameters(self) -> list[str]:
+        return ["VL"]
+
+    def get_param_value(self, name : str) -> int|str:
+        if "VL" == name:
+            return 0 if self.vl is None else self.vl
+        return super().get_param_value(name)
+
+    def set_parameter(self, name : str, value : int|str):
+        if "VL" == name:
+            if isinstance(value, str) and value.isdigit():
+                value = int(value)
+            if not isinstance(value, int):
+                raise ValueError(f"Invalid VL {value}")
+            if 0 == value:
+                self.vl = None
+            elif 0 != value % 128 or not 128 <= value <= 2048:
+                raise ValueError(f"Invalid VL {value}, must be a multiple of 128 up to 2048")
+            else:
+                self.vl = value
+        else:
+            raise ValueError(f"Invalid name {name} or value {value}")
+
+    def check_vl(self, *, reg : greg_base, label : str) -> str:
+        """
+        Branches to the label if the vector length of the executing hardware differs
+        from the one set through the "VL" parameter
+
+        :param reg: GP register to clobber
+        :type reg: class:`asmgen.registers.greg_base`
+        :param label: Label to branch to on mismatch
+        :type label: str
+        :return: String with the required SVE ASM
+        :rtype: str
+        """
+        if self.vl is None:
+            raise ValueError("VL parameter not set, nothing to check")
+        asmblock  = self.asmwrap(f"rdvl {reg},#1")
+        asmblock += self.asmwrap(f"cmp {reg},#{self.vl//8}")
+        asmblock += self.asmwrap(f"b.ne {self.labelstr(label)}")
+        return asmblock
 
     def get_req_flags(self) -> list[str]:
         """
@@ -74,7 +169,28 @@ class sve(aarch64):
                 break
         return supported
 
+    def reserve_preg(self, rt : reg_tracker, alias : str, idx : int):
+        """
+        Reserves and aliases a predicate register that the generator uses
+        implicitly, if the register tracker tracks predicates ('preg')
+
+        :param rt: register tracker
+        :type rt: class:`asmgen.registers.reg_tracker`
+        :param alias: alias name of the register
+        :type alias: str
+        :param idx: register index
+        :type idx: int
+        """
+        if 'preg' not in rt.registered_types:
+            return
+        if alias in rt.aliased_regs['preg']:
+            return
+        rt.reserve_specific_reg('preg', idx)
+        rt.alias_reg('preg', alias, idx)
+
     def isaquirks(self, *, rt : reg_tracker, dt : adt) -> str:
+        # p0 is the default governing predicate of all operations
+        self.reserve_preg(rt, 'ptrue', 0)
         asmblock = self.ptrue(self.preg(0), dt)
         return asmblock
 
@@ -94,30 +210,141 @@ class sve(aarch64):
 
     @property
     def is_vla(self) -> bool:
-        return True
+        return self.vl is None
 
     @property
     def max_vregs(self) -> int:
         return 32
 
+    @property
+    def max_pregs(self) -> int:
+        """
+        Number of predicate registers, to be tracked as 'preg' in a reg_tracker
+        """
+        return 16
+
     @property
     def simd_size(self) -> int:
+        if self.vl is not None:
+            return self.vl//8
         return 1
 
 
     def simd_size_to_greg(self, *, reg: greg_base, dt: adt) -> str:
+        if self.vl is not None:
+            return self.asmwrap(f"mov {reg},#{self.simd_size//adt_size(dt)}")
         suf = self.dt_mnem_suffixes[dt]
         result  = self.asmwrap(f"mov {reg},#0")
         result += self.asmwrap(f"inc{suf} {reg}")
 
         return result
 
+    def vector_loop(self, *, count_reg : greg_base, step_reg : greg_base,
+                    label : str, dt : adt,
+                    body : Callable[[sve_preg, greg_base], str],
+                    mreg : sve_preg|None = None) -> str:
+        if mreg is None:
+            mreg = self.preg(1)
+        suf = self.dt_suffixes[dt]
+        msuf = self.dt_mnem_suffixes[dt]
+        end = f"{label}_end"
+
+        if self.vl is not None:
+            asmblock = self.simd_size_to_greg(reg=step_reg, dt=dt)
+        else:
+            asmblock = self.asmwrap(f"cnt{msuf} {step_reg}")
+        asmblock += self.asmwrap(f"whilelo {mreg}.{suf},xzr,{count_reg}")
+        asmblock += self.asmwrap(f"b.none {self.labelstr(end)}")
+        asmblock += self.label(label=label)
+        asmblock += body(mreg, step_reg)
+        # Saturates at zero, so the last partial vector ends the loop
+        asmblock += self.asmwrap(f"uqdec{msuf} {count_reg}")
+        asmblock += self.asmwrap(f"whilelo {mreg}.{suf},xzr,{count_reg}")
+        asmblock += self.asmwrap(f"b.first {self.labelstr(label)}")
+        asmblock += self.label(label=end)
+        return asmblock
+
+    def mma_transpose(self, *, src0 : vreg_base, src1 : vreg_base,
+                      dst0 : vreg_base, dst1 : vreg_base) -> str:
+        """
+        Transposes the 64 bit halves of the 128 bit segments of two registers,
+        which converts between rows and the block layout of :attr:`mma`:
+
+        - src0/src1 holding rows 0/1 of A (or B^T) give the A (or B) operands
+          for the first (dst0) and second (dst1) 64 bit of every segment of the rows
+        - src0/src1 holding the 2x2 C blocks of columns 0-1/2-3 give rows 0/1
+          of the resulting 2x4 block of C (dst0/dst1)
+
+        :param src0: First source register
+        :type src0: class:`asmgen.registers.vreg_base`
+        :param src1: Second source register
+        :type src1: class:`asmgen.registers.vreg_base`
+        :param dst0: Register to write the first 64 bit of every segment to
+        :type dst0: class:`asmgen.registers.vreg_base`
+        :param dst1: Register to write the second 64 bit of every segment to
+        :type dst1: class:`asmgen.registers.vreg_base`
+        :return: String containing the required ASM instructions
+        :rtype: str
+        """
+        if dst0.idx in [src0.idx, src1.idx]:
+            raise ValueError("dst0 can't overlap with the sources")
+        asmblock  = self.asmwrap(f"trn1 {dst0}.d,{src0}.d,{src1}.d")
+        asmblock += self.asmwrap(f"trn2 {dst1}.d,{src0}.d,{src1}.d")
+        return asmblock
+
+    def setffr(self) -> str:
+        """
+        Sets all elements of the first-fault register (FFR) to true, required
+        before a sequence of first-faulting loads
+
+        :return: String with the required SVE ASM
+        :rtype: str
+        """
+        return self.asmwrap("setffr")
+
+    def rdffr(self, *, preg : sve_preg, govpreg : sve_preg|None = None) -> str:
+        """
+        Reads the first-fault register (FFR), i.e. the elements successfully
+        loaded by the preceding first-faulting loads, into a predicate register
+
+        :param preg: Predicate register to write the FFR to
+        :type preg: class:`asmgen.asmblocks.types.sve_types.sve_preg`
+        :param govpreg: Governing predicate register, None to read the FFR unpredicated
+        :type govpreg: class:`asmgen.asmblocks.types.sve_types.sve_preg`
+        :return: String with the required SVE ASM
+        :rtype: str
+        """
+        if govpreg is None:
+            return self.asmwrap(f"rdffr {preg}.b")
+        return self.asmwrap(f"rdffr {preg}.b, {govpreg}/z")
+
+    def ff_loop(self, *, step_reg : greg_base, label : str, dt : adt,
+                load : Callable[[], str],
+                body : Callable[[sve_preg, greg_base], str],
+                mreg : sve_preg|None = None) -> str:
+        if mreg is None:
+            mreg = self.preg(1)
+        suf = self.dt_suffixes[dt]
+
+        asmblock  = self.label(label=label)
+        asmblock += self.setffr()
+        asmblock += load()
+        # p0 is all-true for dt, so only the loaded elements of dt are set
+        asmblock += self.rdffr(preg=mreg, govpreg=self.preg(0))
+        asmblock += self.asmwrap(f"cntp {step_reg},p0,{mreg}.{suf}")
+        asmblock += body(mreg, step_reg)
+        asmblock += self.jump(label=label)
+        asmblock += self.label(label=f"{label}_end")
+        return asmblock
+
     def indexable_elements(self, dt : adt) -> int:
         # 128 bits are indexable
         return 16//adt_size(dt)
 
     @property
     def c_simd_size_function(self) -> str:
+        if self.vl is not None:
+            return f"inline size_t get_simd_size() {{ return {self.simd_size}; }}"
         pre_oi = self.output_inline
         self.set_output_inline(yesno=True)
         result  = "inline size_t get_simd_size() {\n"
@@ -135,6 +362,9 @@ class sve(aarch64):
         return result
 
     def add_greg_voff(self, *, reg : greg_base, offset : int, dt : adt) -> str:
+        if self.vl is not None and abs(offset*self.simd_size) <= 4095:
+            inst = "add" if offset >= 0 else "sub"
+            return self.asmwrap(f"{inst} {reg},{reg},#{abs(offset*self.simd_size)}")
         return self.asmwrap(f"incb {reg}, ALL, MUL #{offset}")
 
     def greg_to_voffs(self, *, streg : greg_base, vreg : vreg_base, dt : adt) -> str:
@@ -174,6 +404,8 @@ class sve(aarch64):
 
     @property
     def max_add_voff(self) -> int:
+        if self.vl is not None:
+            return max(16, 4095//self.simd_size)
         return 16
 
     def fill_vector(self, *, sreg : freg_base,
@@ -200,6 +432,14 @@ class sve(aarch64):
         raise NotImplementedError(
             "SVE has no vector loads with immediate offset, use load_vector_voff")
 
+    def prefetch_voff(self, *, areg : greg_base, voffset : int, dt : adt,
+                      level : int = 1, write : bool = False) -> str:
+        if not -32 <= voffset <= 31:
+            raise ValueError(f"Prefetch voffset {voffset} outside of [-32,31]")
+        msuf = self.dt_mnem_suffixes[dt]
+        prfop = self.prfop(level, write)
+        return self.asmwrap(f"prf{msuf} {prfop}, p0, [{areg}, #{voffset}, MUL VL]")
+
     def load_vector_bcast1(self, *, areg : greg_base,
                           vreg : vreg_base, dt : adt) -> str:
         suf = self.dt_suffixes[dt]
@@ -217,6 +457,73 @@ class sve(aarch64):
         raise NotImplementedError(
                 "SVE doesn't have a post-index ld1r{suf}, use load_vector_bcast1_immoff instead")
 
+    def reserve_bscalar_regs(self, *, rt : reg_tracker, strategy : bscalar_strategy,
+                             count : int, dt : adt) -> list[freg_base|vreg_base]:
+        if bscalar_strategy.IDX != strategy:
+            return super().reserve_bscalar_regs(rt=rt, strategy=strategy, count=count, dt=dt)
+        reg_count = self.bscalar_reg_count(strategy=strategy, count=count, dt=dt)
+        used = rt.get_used_regs('vreg')
+        free = [i for i in range(sve_fma.max_idx_reg(dt)+1) if i not in used]
+        if len(free) < reg_count:
+            raise IndexError(f"Indexed fma needs {reg_count} free registers "
+                             f"in z0-z{sve_fma.max_idx_reg(dt)}")
+        for i in free[:reg_count]:
+            rt.reserve_specific_reg('vreg', i)
+        return [self.vreg(i) for i in free[:reg_count]]
+
+    def load_bscalars(self, *, strategy : bscalar_strategy, areg : greg_base,
+                      offset : int, bregs : list[freg_base|vreg_base],
+                      count : int, dt : adt) -> str:
+        if bscalar_strategy.IDX != strategy:
+            return super().load_bscalars(strategy=strategy, areg=areg, offset=offset,
+                                         bregs=bregs, count=count, dt=dt)
+        reg_count = self.bscalar_reg_count(strategy=strategy, count=count, dt=dt)
+        if len(bregs) != reg_count:
+            raise ValueError(f"{strategy.name} requires {reg_count} B registers "
+                             f"for {count} elements, got {len(bregs)}")
+        if not self.bcastq_offsets_encodable(offset=offset, count=reg_count):
+            raise ValueError(f"ld1rq can't encode the B offsets {offset} to "
+                             f"{offset+(reg_count-1)*16}, use outer_product_kstep "
+                             "which falls back to broadcast loads")
+        # Indexed fmla selects within each 128 bit segment, so every segment
+        # needs a copy of the B elements
+        return "".join(self.load_vector_bcastq_immoff(areg=areg, offset=offset+i*16,
+                                                      vreg=r, dt=dt)
+                       for i,r in enumerate(bregs))
+
+    def outer_product_kstep(self, *, strategy : bscalar_strategy,
+                            adregs : list[vreg_base], areg : greg_base, offset : int,
+                            bregs : list[freg_base|vreg_base],
+                            cdregs : list[list[vreg_base]],
+                            dt : adt) -> str:
+        if bscalar_strategy.IDX != strategy or not cdregs:
+            return super().outer_product_kstep(strategy=strategy, adregs=adregs, areg=areg,
+                                               offset=offset, bregs=bregs, cdregs=cdregs,
+                                               dt=dt)
+        count = len(cdregs[0])
+        reg_count = self.bscalar_reg_count(strategy=strategy, count=count, dt=dt)
+        if self.bcastq_offsets_encodable(offset=offset, count=reg_count):
+            return super().outer_product_kstep(strategy=strategy, adregs=adregs, areg=areg,
+                                               offset=offset, bregs=bregs, cdregs=cdregs,
+                                               dt=dt)
+        if len(cdregs) != len(adregs):
+            raise ValueError(f"Got {len(adregs)} A registers for {len(cdregs)} rows of C")
+        if len(bregs) != reg_count:
+            raise ValueError(f"{strategy.name} requires {reg_count} B registers "
+                             f"for {count} elements, got {len(bregs)}")
+        # ld1rq can't reach the offset, broadcast the elements one by one
+        # into the B registers instead, round robin to overlap loads and fmas
+        asmblock = ""
+        for j in range(count):
+            breg = bregs[j%reg_count]
+            asmblock += self.load_vector_bcast1_immoff(areg=areg, offset=offset+j*adt_size(dt),
+                                                       vreg=breg, dt=dt)
+            for adreg,crow in zip(adregs, cdregs):
+                asmblock += self.fma_bscalar(strategy=bscalar_strategy.BCAST, adreg=adreg,
+                                             bregs=[breg], j=0, cdreg=crow[j],
+                                             areg=areg, offset=offset, dt=dt)
+        return asmblock
+
     def store_vector_voff(self, *, areg : greg_base, voffset : int,
                           vreg : vreg_base, dt : adt) -> str:
         suf = self.dt_suffixes[dt]
@@ -236,6 +543,69 @@ class sve(aarch64):
         return self.store_vector_voff(areg=areg, voffset=0, vreg=vreg, dt=dt)
 
     # SVE-specific
+    def bcastq_offsets_encodable(self, *, offset : int, count : int) -> bool:
+        """
+        Returns whether count consecutive ld1rq loads starting at the byte offset
+        can all use the scalar+immediate form
+
+        :param offset: Byte offset of the first load
+        :type offset: int
+        :param count: Number of 128 bit blocks loaded
+        :type count: int
+        :return: True if all offsets are multiples of 16 in [-128,112]
+        :rtype: bool
+        """
+        return 0 == offset % 16 and -128 <= offset and offset+(count-1)*16 <= 112
+
+    def load_vector_bcastq_immoff(self, *, areg : greg_base, offset : int,
+                                  vreg : vreg_base, dt : adt) -> str:
+        """
+        Returns the string containing the instruction to load 128 bits at
+        areg+offset into every 128 bit segment of the vector register (ld1rq)
+
+        :param areg: Register containing the address
+        :type areg: class:`asmgen.registers.greg_base`
+        :param offset: Byte offset, multiple of 16 in [-128,112]
+        :type offset: int
+        :param vreg: Vector register to load into
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param dt: Data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String with the required SVE ASM
+        :rtype: str
+        """
+        modifiers = {opdna1_modifier.QBCAST}
+        if 0 != offset:
+            modifiers.add(opdna1_modifier.IOFFSET)
+        return self.load(dregs=[vreg], areg=areg, dt=dt,
+                         modifiers=modifiers, ioffset=offset)
+
+    def load_vector_bcasto_immoff(self, *, areg : greg_base, offset : int,
+                                  vreg : vreg_base, dt : adt) -> str:
+        """
+        Returns the string containing the instruction to load 256 bits at
+        areg+offset into every 256 bit segment of the vector register (ld1ro,
+        requires FEAT_F64MM and a vector length of at least 256 bits)
+
+        :param areg: Register containing the address
+        :type areg: class:`asmgen.registers.greg_base`
+        :param offset: Byte offset, multiple of 32 in [-256,224]
+        :type offset: int
+        :param vreg: Vector register to load into
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param dt: Data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String with the required SVE ASM
+        :rtype: str
+        """
+        if self.vl is not None and self.vl < 256:
+            raise ValueError(f"ld1ro requires a vector length of at least 256 bits, VL is {self.vl}")
+        modifiers = {opdna1_modifier.OBCAST}
+        if 0 != offset:
+            modifiers.add(opdna1_modifier.IOFFSET)
+        return self.load(dregs=[vreg], areg=areg, dt=dt,
+                         modifiers=modifiers, ioffset=offset)
+
     def preg(self, idx : int, is_pn : bool = False) -> sve_preg:
         """
         returns an SVE predicate register with the specified index
@@ -249,20 +619,131 @@ class sve(aarch64):
         """
         return sve_preg(idx, is_pn)
 
-    def ptrue(self, reg : sve_preg, dt : adt) -> str:
+    def mreg(self, reg_idx : int) -> sve_preg:
+        return self.preg(reg_idx)
+
+    def unpack_nibbles(self, *, vreg : vreg_base, lodst : vreg_base, hidst : vreg_base,
+                       tmpreg : vreg_base|None = None) -> str:
+        if lodst.idx == hidst.idx:
+            raise ValueError("The low and high nibbles have to be written to different registers")
+        lo  = self.asmwrap(f"lsl {lodst}.b,{vreg}.b,#4")
+        lo += self.asmwrap(f"lsr {lodst}.b,{lodst}.b,#4")
+        hi  = self.asmwrap(f"lsr {hidst}.b,{vreg}.b,#4")
+        # Don't overwrite the packed bytes before both halves are extracted
+        return hi+lo if lodst.idx == vreg.idx else lo+hi
+
+    def scale_pow2(self, *, vreg : vreg_base, nreg : vreg_base, dt : adt) -> str:
+        if dt not in [adt.FP16, adt.FP32, adt.FP64]:
+            raise ValueError(f"SVE fscale doesn't support {dt}")
+        suf = self.dt_suffixes[dt]
+        return self.asmwrap(f"fscale {vreg}.{suf},p0/m,{vreg}.{suf},{nreg}.{suf}")
+
+    # pylint: disable-next=too-many-arguments
+    def split_exponent(self, *, vreg : vreg_base, ereg : vreg_base, offreg : vreg_base,
+                       tmpreg : vreg_base, dt : adt) -> str:
+        _,mbits,_ = adt_fp_bits(dt)
+        suf = self.dt_suffixes[dt]
+        # Integer difference to o, its exponent field is e
+        result  = self.asmwrap(f"sub {ereg}.{suf},{vreg}.{suf},{offreg}.{suf}")
+        result += self.asmwrap(f"asr {ereg}.{suf},{ereg}.{suf},#{mbits}")
+        result += self.asmwrap(f"lsl {tmpreg}.{suf},{ereg}.{suf},#{mbits}")
+        result += self.asmwrap(f"sub {vreg}.{suf},{vreg}.{suf},{tmpreg}.{suf}")
+        return result
+
+    def sqrt_vreg(self, *, vreg : vreg_base, dst : vreg_base, dt : adt) -> str:
+        if dt not in [adt.FP16, adt.FP32, adt.FP64]:
+            raise ValueError(f"SVE fsqrt doesn't support {dt}")
+        suf = self.dt_suffixes[dt]
+        return self.asmwrap(f"fsqrt {dst}.{suf},p0/m,{vreg}.{suf}")
+
+    ptrue_patterns = ["POW2", "VL1", "VL2", "VL3", "VL4", "VL5", "VL6", "VL7", "VL8",
+                      "VL16", "VL32", "VL64", "VL128", "VL256", "MUL4", "MUL3", "ALL"]
+
+    def ptrue(self, reg : sve_preg, dt : adt, pattern : str|None = None) -> str:
         """
         Stores an all-true mask for the specified data type in the specified
-        predicate register
+        predicate register, or only the elements selected by the pattern
 
         :param reg: Predicate register
         :type reg: class:`asmgen.asmblocks.types.sve_types.sve_preg`
         :param dt: Data type to use
         :type dt: class:`asmgen.registers.asm_data_type`
+        :param pattern: SVE predicate constraint (e.g. VL4, POW2, MUL3)
+        :type pattern: str
         :return: String with the required SVE ASM
         :rtype: str
         """
         suf = self.dt_suffixes[dt]
-        return self.asmwrap(f"ptrue {reg}.{suf}")
+        if pattern is None:
+            return self.asmwrap(f"ptrue {reg}.{suf}")
+        if pattern.upper() not in self.ptrue_patterns:
+            raise ValueError(f"Invalid SVE predicate pattern {pattern}")
+        if reg.is_pn:
+            raise ValueError("ptrue into predicate-as-counter registers takes no pattern")
+        return self.asmwrap(f"ptrue {reg}.{suf},{pattern.upper()}")
+
+    def pfalse(self, reg : sve_preg) -> str:
+        """
+        Clears all elements of the specified predicate register
+
+        :param reg: Predicate register
+        :type reg: class:`asmgen.asmblocks.types.sve_types.sve_preg`
+        :return: String with the required SVE ASM
+        :rtype: str
+        """
+        return self.asmwrap(f"pfalse {reg}.b")
+
+    def whilelt(self, *, preg : sve_preg, reg1 : greg_base, reg2 : greg_base,
+                dt : adt, signed : bool = True) -> str:
+        """
+        Sets the elements of the predicate register for which reg1 + element index
+        is less than reg2
+
+        :param preg: Predicate register to write
+        :type preg: class:`asmgen.asmblocks.types.sve_types.sve_preg`
+        :param reg1: GP register with the start value
+        :type reg1: class:`asmgen.registers.greg_base`
+        :param reg2: GP register with the bound
+        :type reg2: class:`asmgen.registers.greg_base`
+        :param dt: Data type of the predicated elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param signed: Compare as signed (whilelt) or unsigned (whilelo) values
+        :type signed: bool
+        :return: String with the required SVE ASM
+        :rtype: str
+        """
+        suf = self.dt_suffixes[dt]
+        inst = "whilelt" if signed else "whilelo"
+        return self.asmwrap(f"{inst} {preg}.{suf},{reg1},{reg2}")
+
+    def cmp_vreg(self, *, preg : sve_preg, govpreg : sve_preg,
+                 vreg1 : vreg_base, vreg2 : vreg_base|None,
+                 cmp : comparison, dt : adt) -> str:
+        """
+        Compares the active elements of two vector registers (or one against zero
+        for EZ/NZ) and writes the result into a predicate register.
+        Inactive elements are set to false
+
+        :param preg: Predicate register to write the result to
+        :type preg: class:`asmgen.asmblocks.types.sve_types.sve_preg`
+        :param govpreg: Governing predicate register
+        :type govpreg: class:`asmgen.asmblocks.types.sve_types.sve_preg`
+        :param vreg1: First vector register
+        :type vreg1: class:`asmgen.registers.vreg_base`
+        :param vreg2: Second vector register, None to compare against zero
+        :type vreg2: class:`asmgen.registers.vreg_base`
+        :param cmp: Comparison to perform
+        :type cmp: class:`asmgen.asmblocks.noarch.comparison`
+        :param dt: Data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :return: String with the required SVE ASM
+        :rtype: str
+        """
+        if cmp in [comparison.EZ, comparison.NZ] and vreg2 is not None:
+            raise ValueError(f"{cmp.name} compares against zero, vreg2 must be None")
+        modifiers = {opcmp_modifier.ZERO} if vreg2 is None else set()
+        return self.cmp(adreg=vreg1, bdreg=vreg2, mreg=preg, dt=dt, cmp=cmp,
+                        modifiers=modifiers, preg=govpreg)
 
 
     def load_vector_immstride(self, *, areg : greg_base, byte_stride : int,
@@ -0,0 +1,86 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE compares
+"""
+
+from enum import Enum
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    adt_is_unsigned,
+    data_reg
+)
+from ..operations import (
+    opcmp,
+    opcmp_modifier as mod,
+    operand_restriction
+)
+from ..types.sve_types import sve_vreg, sve_preg
+
+class sve_cmp(opcmp):
+    """
+    SVE implementation of cmp writing a predicate register. Only the elements
+    active in the governing predicate (preg parameter, p0 by default) are compared,
+    inactive elements are set to false
+    """
+
+    suffixes = {1 : "b", 2 : "h", 4 : "s", 8 : "d"}
+
+    unsigned_conditions = {'LT' : 'lo', 'LE' : 'ls', 'GT' : 'hi', 'GE' : 'hs'}
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt} for dt in
+                [adt.FP16, adt.FP32, adt.FP64,
+                 adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64,
+                 adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for SVE opcmp")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, a_dt : adt, mreg, cmp : Enum,
+                       modifiers : set[mod],
+                       bdreg : data_reg|None = None,
+                       **kwargs) -> str:
+        vregs = [adreg] + ([] if bdreg is None else [bdreg])
+        if not all(isinstance(r, sve_vreg) for r in vregs):
+            raise ValueError("All dregs of a SVE opcmp must be sve_vreg")
+        if not isinstance(mreg, sve_preg):
+            raise ValueError("The mask of a SVE opcmp must be a sve_preg")
+
+        cond = self.get_condition(cmp, modifiers)
+        suf = self.suffixes[adt_size(a_dt)]
+        govpreg = kwargs.get('preg', 'p0')
+
+        if adt_is_float(a_dt):
+            inst = f"fcm{cond.lower()}"
+            other = "#0.0"
+        else:
+            if adt_is_unsigned(a_dt):
+                inst = f"cmp{self.unsigned_conditions.get(cond, cond.lower())}"
+            else:
+                inst = f"cmp{cond.lower()}"
+            other = "#0"
+        if bdreg is not None:
+            other = f"{bdreg}.{suf}"
+        return self.asmwrap(f"{inst} {mreg}.{suf},{govpreg}/z,{adreg}.{suf},{other}")
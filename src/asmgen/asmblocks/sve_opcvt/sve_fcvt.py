@@ -0,0 +1,111 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE conversions
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    adt_is_int,
+    adt_is_signed,
+    data_reg
+)
+from ..operations import opcvt_modifier as mod
+from ..neon_opcvt.neon_fcvt import neon_fcvt
+from ..types.sve_types import sve_vreg, sve_preg
+
+class sve_fcvt(neon_fcvt):
+    """
+    SVE(2) implementation of fcvt. The narrow elements of a part are
+    interleaved with the other part: widening conversions read the even
+    (part 0) or odd (part 1) elements of A, narrowing conversions write the
+    even elements of B zeroing the odd ones (part 0, truncation leaves them
+    unspecified) or write the odd elements keeping the even ones (part 1).
+    Predicated instructions use p0 unless the
+    preg parameter selects another predicate
+    """
+
+    suffixes = {1 : "b", 2 : "h", 4 : "s", 8 : "d"}
+
+    @property
+    def interleaved_parts(self) -> bool:
+        return True
+
+    def get_preg(self, kwargs : dict) -> sve_preg:
+        """
+        Returns the governing predicate of the conversion
+
+        :param kwargs: Additional parameters of the operation
+        :type kwargs: dict
+        :raises ValueError: If the preg parameter is not a SVE predicate
+        :return: governing predicate
+        :rtype: class:`asmgen.asmblocks.types.sve_types.sve_preg`
+        """
+        preg = kwargs.get('preg', sve_preg(0))
+        if not isinstance(preg, sve_preg):
+            raise ValueError(f"{preg} is not a valid sve_preg")
+        return preg
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value,too-many-locals
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        if not isinstance(adreg, sve_vreg) or not isinstance(bdreg, sve_vreg):
+            raise ValueError("All dregs of a SVE opcvt must be sve_vreg")
+
+        # Checks the modifiers against the data types
+        self.get_inst(a_dt, b_dt, modifiers)
+        part = self.get_part(a_dt, b_dt, modifiers, kwargs)
+        preg = self.get_preg(kwargs)
+        a_size, b_size = adt_size(a_dt), adt_size(b_dt)
+        a = f"{adreg}.{self.suffixes[a_size]}"
+        b = f"{bdreg}.{self.suffixes[b_size]}"
+        # Signedness of the integer type(s)
+        sign = "s" if adt_is_signed(b_dt) or adt_is_signed(a_dt) and adt_is_float(b_dt) else "u"
+
+        if a_size == b_size:
+            if adt_is_int(a_dt):
+                return self.asmwrap(f"{sign}cvtf {b},{preg}/m,{a}")
+            if mod.RTZ in modifiers:
+                return self.asmwrap(f"fcvtz{sign} {b},{preg}/m,{a}")
+            # SVE only converts to integers rounding towards zero, round beforehand
+            asmblock  = self.asmwrap(f"frintn {b},{preg}/m,{a}")
+            asmblock += self.asmwrap(f"fcvtz{sign} {b},{preg}/m,{b}")
+            return asmblock
+
+        half = "bt"[part]
+        if a_size < b_size:
+            if adt_is_int(a_dt):
+                return self.asmwrap(f"{sign}shll{half} {b},{a},#0")
+            if adt.BF16 == a_dt:
+                # BF16 is the upper half of FP32
+                if 0 == part:
+                    return self.asmwrap(f"lsl {b},{adreg}.s,#16")
+                asmblock  = self.asmwrap(f"movprfx {bdreg},{adreg}")
+                asmblock += self.asmwrap(f"and {b},{b},#0xffff0000")
+                return asmblock
+            inst = "fcvtlt" if part else "fcvt"
+            return self.asmwrap(f"{inst} {b},{preg}/m,{a}")
+
+        if adt_is_float(a_dt):
+            inst = "bfcvt" if adt.BF16 == b_dt else "fcvt"
+            inst += "nt" if part else ""
+            return self.asmwrap(f"{inst} {b},{preg}/m,{a}")
+        if mod.SAT in modifiers:
+            inst = "sqxtun" if adt_is_signed(a_dt) and "u" == sign else f"{sign}qxtn"
+            return self.asmwrap(f"{inst}{half} {b},{a}")
+        # Truncation keeps the lower half of each wide element, the even
+        # narrow elements, which are the only ones trn1 reads for part 1
+        if 1 == part:
+            return self.asmwrap(f"trn1 {b},{b},{adreg}.{self.suffixes[b_size]}")
+        if bdreg.idx == adreg.idx:
+            return ""
+        return self.asmwrap(f"mov {bdreg}.d,{adreg}.d")
@@ -9,3 +9,10 @@ Meta-module for SVE opd3 operations
 from .sve_fma import *
 from .sve_fmul import *
 from .sve_fadd import *
+from .sve_dota import *
+from .sve_mma import *
+from .sve_cfma import *
+from .sve_cadd import *
+from .sve_fmax import *
+from .sve_fmin import *
+from .sve_fdiv import *
@@ -0,0 +1,52 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE complex add with rotate instruction
+"""
+from ...registers import data_reg,asm_data_type as adt
+from ..neon_opd3.neon_cadd import neon_cadd
+from ..operations import opd3_modifier as mod
+from ..types.sve_types import sve_vreg
+
+class sve_cadd(neon_cadd):
+    """
+    SVE implementation of cadd. FCADD is destructive, a C register different
+    from A is initialized with a MOVPRFX
+    """
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=set(modifiers) - {mod.MASK})
+
+    def check_valid_registers(self, dregs : list[data_reg]) -> bool:
+        if not all(isinstance(d, sve_vreg) for d in dregs):
+            raise ValueError("All dregs of a SVE opd3 must be sve_vreg")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers([adreg,bdreg,cdreg])
+        rot = kwargs['rot']
+        self.check_rot(rot)
+
+        sve_preg = kwargs.get('preg', 'p0')
+        if mod.MASK in modifiers:
+            if 'mreg' not in kwargs:
+                raise ValueError("MASK modifier, but no mreg parameter passed")
+            sve_preg = kwargs['mreg']
+
+        suf = self.dt_suffixes[c_dt]
+        asmblock = ""
+        if cdreg.idx != adreg.idx:
+            if cdreg.idx == bdreg.idx:
+                raise ValueError("cdreg can only alias bdreg if it also aliases adreg")
+            asmblock += self.asmwrap(f"movprfx {cdreg},{adreg}")
+        asmblock += self.asmwrap(
+                f"fcadd {cdreg}.{suf},{sve_preg}/m,{cdreg}.{suf},{bdreg}.{suf},#{rot}")
+        return asmblock
@@ -0,0 +1,59 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE complex multiply-accumulate instruction
+"""
+from ...registers import data_reg,asm_data_type as adt
+from ..neon_opd3.neon_cfma import neon_cfma
+from ..operations import opd3_modifier as mod
+from ..types.sve_types import sve_vreg
+
+class sve_cfma(neon_cfma):
+    """
+    SVE implementation of cfma, indices select a complex number of B
+    within each 128 bit segment
+    """
+
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=set(modifiers) - {mod.MASK})
+        if mod.MASK in modifiers and mod.IDX in modifiers:
+            raise ValueError("SVE indexed complex fma has no masked form")
+
+    def check_valid_registers(self, dregs : list[data_reg]) -> bool:
+        if not all(isinstance(d, sve_vreg) for d in dregs):
+            raise ValueError("All dregs of a SVE opd3 must be sve_vreg")
+
+    def check_idx(self, bdreg : data_reg, idx : int, b_dt : adt):
+        super().check_idx(bdreg=bdreg, idx=idx, b_dt=b_dt)
+        # The index takes up bits of the register field
+        max_reg = 7 if adt.FP16 == b_dt else 15
+        if bdreg.idx > max_reg:
+            raise ValueError(f"Indexed B register has to be z0-z{max_reg}")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       a_dt : adt, b_dt : adt, c_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers([adreg,bdreg,cdreg])
+        rot = kwargs['rot']
+        self.check_rot(rot)
+
+        suf = self.dt_suffixes[c_dt]
+        b_str = self.b_operand(bdreg=bdreg, b_dt=b_dt, modifiers=modifiers, **kwargs)
+
+        # Only the vector form is predicated
+        sve_preg = ""
+        if mod.IDX not in modifiers:
+            sve_preg = f"{kwargs.get('preg', 'p0')}/m,"
+            if mod.MASK in modifiers:
+                if 'mreg' not in kwargs:
+                    raise ValueError("MASK modifier, but no mreg parameter passed")
+                sve_preg = f"{kwargs['mreg']}/m,"
+
+        return self.asmwrap(f"fcmla {cdreg}.{suf},{sve_preg}{adreg}.{suf},{b_str},#{rot}")
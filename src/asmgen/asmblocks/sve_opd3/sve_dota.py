@@ -0,0 +1,37 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE dot product instructions
+"""
+from ...registers import data_reg,asm_data_type as adt,adt_size
+from ..neon_opd3.neon_dota import neon_dota
+from ..types.sve_types import sve_vreg
+
+class sve_dota(neon_dota):
+    """
+    SVE implementation of dota, indices select a group of B elements
+    within each 128 bit segment
+    """
+
+    def check_valid_registers(self, dregs : list[data_reg]) -> bool:
+        if not all(isinstance(d, sve_vreg) for d in dregs):
+            raise ValueError("All dregs of a SVE opd3 must be sve_vreg")
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return super().supported_dts() + [
+            {'adreg':adt.SINT16, 'bdreg':adt.SINT16, 'cdreg':adt.SINT64},
+            {'adreg':adt.UINT16, 'bdreg':adt.UINT16, 'cdreg':adt.UINT64},
+        ]
+
+    def group_suffix(self, a_dt : adt, c_dt : adt) -> str:
+        return self.dt_idxsuffixes[a_dt]
+
+    def check_idx(self, bdreg : data_reg, idx : int, c_dt : adt):
+        super().check_idx(bdreg=bdreg, idx=idx, c_dt=c_dt)
+        # The index takes up bits of the register field
+        max_reg = 7 if 4 == adt_size(c_dt) else 15
+        if bdreg.idx > max_reg:
+            raise ValueError(f"Indexed B register has to be z0-z{max_reg}")
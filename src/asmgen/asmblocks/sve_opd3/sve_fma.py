@@ -6,7 +6,7 @@
 """
 SVE fma instruction
 """
-from ...registers import data_reg,asm_data_type as adt
+from ...registers import data_reg,asm_data_type as adt,adt_size
 from ..neon_opd3.neon_fma import neon_fma
 from ..operations import opd3_modifier as mod
 from ..types.sve_types import sve_vreg
@@ -18,20 +18,65 @@ class sve_fma(neon_fma):
     # modfier set is only read, therefore a mutable default is ok
     # pylint: disable-next=dangerous-default-value,too-many-locals,too-many-branches
     
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=set(modifiers) - {mod.MASK})
+
     def check_valid_registers(self, dregs : list[data_reg]) -> bool:
         if not all(isinstance(d, sve_vreg) for d in dregs):
             raise ValueError("All dregs of a SVE opd3 must be sve_vreg")
 
+    @staticmethod
+    def max_idx_reg(b_dt : adt) -> int:
+        """
+        Returns the highest register usable as B in an indexed fma, the index
+        takes up bits of the register field
+
+        :param b_dt: Type of the B component
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :return: Highest register index
+        :rtype: int
+        """
+        return 15 if 8 == adt_size(b_dt) else 7
+
+    def check_idx(self, bdreg : data_reg, idx : int, b_dt : adt):
+        """
+        Checks the index and the B register of an indexed fma. The index
+        selects an element within each 128 bit segment of B
+
+        :param bdreg: Register containing the B component
+        :type bdreg: class:`asmgen.registers.data_reg`
+        :param idx: Index of the B element
+        :type idx: int
+        :param b_dt: Type of the B component
+        :type b_dt: class:`asmgen.registers.asm_data_type`
+        :raises ValueError: If the index or the register is out of range
+        """
+        max_idx = 16//adt_size(b_dt)-1
+        if not 0 <= idx <= max_idx:
+            raise ValueError(f"idx {idx} outside of [0,{max_idx}]")
+        max_reg = self.max_idx_reg(b_dt)
+        if bdreg.idx > max_reg:
+            raise ValueError(f"Indexed B register has to be z0-z{max_reg}")
+
     def implementation(self, *,
                        adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
                        a_dt : adt, b_dt : adt, c_dt : adt,
                        modifiers : set[mod] = set(),
                        **kwargs) -> str:
-        sve_preg = 'p0/m'
+        if mod.IDX in modifiers:
+            if mod.MASK in modifiers:
+                raise ValueError("SVE indexed fma has no predicated form")
+            self.check_idx(bdreg=bdreg, idx=kwargs['idx'], b_dt=b_dt)
+            # Indexed forms are unpredicated
+            return super().implementation(
+                    adreg=adreg, bdreg=bdreg, cdreg=cdreg,
+                    a_dt=a_dt, b_dt=b_dt, c_dt=c_dt,
+                    modifiers=modifiers, **kwargs)
+        sve_preg = f"{kwargs.get('preg', 'p0')}/m"
         if mod.MASK in modifiers:
             if 'mreg' not in kwargs:
                 raise ValueError("MASK modifier, but no mreg parameter passed")
-            sve_preg=kwargs['mreg']+"/m"
+            sve_preg=f"{kwargs['mreg']}/m"
         return super().implementation(
                 adreg=adreg, bdreg=bdreg, cdreg=cdreg,
                 a_dt=a_dt, b_dt=b_dt, c_dt=c_dt,
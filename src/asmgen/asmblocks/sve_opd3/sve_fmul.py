@@ -19,6 +19,9 @@ class sve_fmul(neon_fmul):
     # modifier set is only read, therefore a mutable default is ok
     # pylint: disable-next=dangerous-default-value,too-many-locals,too-many-branches
 
+    def check_modifiers(self, modifiers : set[mod]):
+        super().check_modifiers(modifiers=set(modifiers) - {mod.MASK})
+
     def check_valid_registers(self, dregs : list[data_reg]) -> bool:
         if not all(isinstance(d, sve_vreg) for d in dregs):
             raise ValueError("All dregs of a SVE opd3 must be sve_vreg")
@@ -28,11 +31,11 @@ class sve_fmul(neon_fmul):
                        a_dt : adt, b_dt : adt, c_dt : adt,
                        modifiers : set[mod] = set(),
                        **kwargs) -> str:
-        sve_preg = 'p0/m'
+        sve_preg = f"{kwargs.get('preg', 'p0')}/m"
         if mod.MASK in modifiers:
             if 'mreg' not in kwargs:
                 raise ValueError("MASK modifier, but no mreg parameter passed")
-            sve_preg=kwargs['mreg']+"/m"
+            sve_preg=f"{kwargs['mreg']}/m"
         return super().implementation(
                 adreg=adreg, bdreg=bdreg, cdreg=cdreg,
                 a_dt=a_dt, b_dt=b_dt, c_dt=c_dt,
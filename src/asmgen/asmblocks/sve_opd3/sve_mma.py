@@ -0,0 +1,20 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE matrix-multiply-accumulate instructions
+"""
+from ...registers import data_reg
+from ..neon_opd3.neon_mma import neon_mma
+from ..types.sve_types import sve_vreg
+
+class sve_mma(neon_mma):
+    """
+    SVE implementation of mma, every 128 bit segment computes an independent block
+    """
+
+    def check_valid_registers(self, dregs : list[data_reg]) -> bool:
+        if not all(isinstance(d, sve_vreg) for d in dregs):
+            raise ValueError("All dregs of a SVE opd3 must be sve_vreg")
@@ -55,17 +55,34 @@ class sve_opdna1(opdna1):
             raise ValueError("SVE has no ld/st with immediate strides")
         if mod.GSTRIDE in modifiers:
             raise ValueError("SVE has no ld/st with GP-reg strides")
-        if mod.MASK in modifiers:
-            raise NotImplementedError("Masked ld/st for SVE not yet implemented")
         if mod.ROW in modifiers:
             raise ValueError("SVE has no row selection ld/st")
         if mod.COL in modifiers:
             raise ValueError("SVE has no column selection ld/st")
-        if mod.NT in modifiers:
-            raise NotImplementedError("Non-temporals for SVE not yet implemented")
+        if mod.NT in modifiers and \
+          any(m in modifiers for m in [mod.STRUCT, mod.BCAST, mod.VINDEX, mod.POSTINC]):
+            raise ValueError("Non-temporal ld/st can't be combined with STRUCT/BCAST/VINDEX/POSTINC")
+        if mod.FF in modifiers:
+            if self.action != opdna1_action.LOAD:
+                raise ValueError("FF modifier is only valid for LOAD operations")
+            # ldff1 only has register offset and vector index forms
+            if any(m in modifiers for m in [mod.IOFFSET, mod.VOFFSET, mod.STRUCT,
+                                            mod.BCAST, mod.NT, mod.POSTINC]):
+                raise ValueError("First-faulting loads can't be combined with "
+                                 "IOFFSET/VOFFSET/STRUCT/BCAST/NT/POSTINC")
 
         if mod.BCAST in modifiers and self.action != opdna1_action.LOAD:
             raise ValueError("BCAST modifier is only valid for LOAD operations")
+        if mod.QBCAST in modifiers or mod.OBCAST in modifiers:
+            if self.action != opdna1_action.LOAD:
+                raise ValueError("QBCAST/OBCAST modifiers are only valid for LOAD operations")
+            if mod.QBCAST in modifiers and mod.OBCAST in modifiers:
+                raise ValueError("QBCAST and OBCAST are mutually exclusive")
+            # ld1rq/ld1ro only have scalar+immediate and scalar+scalar forms
+            if any(m in modifiers for m in [mod.BCAST, mod.STRUCT, mod.NT, mod.FF,
+                                            mod.VINDEX, mod.VOFFSET, mod.POSTINC]):
+                raise ValueError("QBCAST/OBCAST can't be combined with "
+                                 "BCAST/STRUCT/NT/FF/VINDEX/VOFFSET/POSTINC")
             
         if mod.VINDEX in modifiers and \
           (mod.VOFFSET in modifiers or mod.IOFFSET in modifiers):
@@ -84,6 +101,8 @@ class sve_opdna1(opdna1):
         if mod.VINDEX in modifiers:
             required.append({"vidxreg"})
             required.append({"it"})
+        if mod.MASK in modifiers:
+            required.append({"preg"})
 
         return required
 
@@ -136,7 +155,14 @@ class sve_opdna1(opdna1):
             return f"[{areg}, #{kwargs['voffset']}, MUL VL]"
             
         if mod.IOFFSET in modifiers:
-            return f"[{areg}, #{kwargs['ioffset']}]"
+            ioffset = kwargs['ioffset']
+            if mod.QBCAST in modifiers or mod.OBCAST in modifiers:
+                # Offset is encoded in multiples of the replicated block
+                block = 16 if mod.QBCAST in modifiers else 32
+                if 0 != ioffset % block or not -8*block <= ioffset < 8*block:
+                    raise ValueError(f"ioffset {ioffset} has to be a multiple of {block} "
+                                     f"in [{-8*block},{7*block}]")
+            return f"[{areg}, #{ioffset}]"
             
         if mod.GOFFSET in modifiers:
             offreg = kwargs["offreg"]
@@ -185,14 +211,22 @@ class sve_opdna1(opdna1):
         msuf = self.get_mem_suffix(a_dt)
         esuf = self.get_element_suffix(a_dt)
 
-        # 2. Build Base Instruction (e.g. ld1w, ld2d, ld1rw)
+        # 2. Build Base Instruction (e.g. ld1w, ld2d, ld1rw, ld1rqw, ldnt1w, ldff1w)
         nstructs = kwargs.get("nstructs", 1)
         if mod.BCAST in modifiers:
             inst = f"{self.inst_base}1r{msuf}"
+        elif mod.QBCAST in modifiers:
+            inst = f"{self.inst_base}1rq{msuf}"
+        elif mod.OBCAST in modifiers:
+            inst = f"{self.inst_base}1ro{msuf}"
+        elif mod.NT in modifiers:
+            inst = f"{self.inst_base}nt1{msuf}"
+        elif mod.FF in modifiers:
+            inst = f"{self.inst_base}ff1{msuf}"
         else:
             inst = f"{self.inst_base}{nstructs}{msuf}"
 
-        # 3. Resolve Predicate (Default to p0 if not passed)
+        # 3. Resolve Predicate (Default to p0 if not passed, required with MASK)
         preg = kwargs.get("preg", sve_preg(0))
         if not isinstance(preg, sve_preg):
             raise ValueError(f"{preg} is not a valid sve_preg")
@@ -0,0 +1,63 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE table lookups
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    adt_size,
+    data_reg
+)
+from ..operations import (
+    oplut,
+    oplut_modifier as mod,
+    operand_restriction
+)
+from ..types.sve_types import sve_vreg
+
+class sve_tbl(oplut):
+    """
+    SVE implementation of lut with a single register tbl (SVE2 tbx with KEEP).
+    The table holds all elements of the vector, out-of-range indices give 0
+    """
+
+    suffixes = {1 : "b", 2 : "h", 4 : "s", 8 : "d"}
+
+    def __init__(self, asmwrap : Callable[[str],str]):
+        self.asmwrap = asmwrap
+
+    def supported_dts(self) -> list[dict[str,adt]]:
+        return [{'adreg':dt, 'bdreg':dt, 'cdreg':dt} for dt in
+                [adt.FP16, adt.BF16, adt.FP32, adt.FP64,
+                 adt.SINT8, adt.SINT16, adt.SINT32, adt.SINT64,
+                 adt.UINT8, adt.UINT16, adt.UINT32, adt.UINT64]]
+
+    def check_modifiers(self, modifiers : set[mod]):
+        pass
+
+    def get_operand_restrictions(self, oprnd : str) -> set[operand_restriction]:
+        return set()
+
+    def get_operand_restriction_value(self, oprnd : str,
+                                      modifiers : set[mod],
+                                      rstr : operand_restriction) \
+      -> int|set[int]|tuple[str,int]:
+        raise ValueError(f"No restriction {rstr} on operand {oprnd} for SVE oplut")
+
+    # pylint: disable-next=too-many-arguments
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg, cdreg : data_reg,
+                       c_dt : adt, modifiers : set[mod], **kwargs) -> str:
+        if not all(isinstance(r, sve_vreg) for r in [adreg, bdreg, cdreg]):
+            raise ValueError("All dregs of a SVE oplut must be sve_vreg")
+
+        suf = self.suffixes[adt_size(c_dt)]
+        if mod.KEEP in modifiers:
+            return self.asmwrap(f"tbx {cdreg}.{suf},{adreg}.{suf},{bdreg}.{suf}")
+        return self.asmwrap(f"tbl {cdreg}.{suf},{{{adreg}.{suf}}},{bdreg}.{suf}")
@@ -0,0 +1,35 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE permutation base case
+"""
+
+from typing import Callable
+
+from ...registers import data_reg
+from ..neon_opperm.neon_opperm_base import neon_opperm_base
+from ..types.sve_types import sve_vreg
+
+class sve_opperm_base(neon_opperm_base):
+    """
+    SVE base permutation implementation. Permuting 128 bit groups (.q)
+    requires FEAT_F64MM and is illegal in streaming mode
+    """
+
+    size_suffixes = {1 : "b", 2 : "h", 4 : "s", 8 : "d", 16 : "q"}
+
+    def __init__(self, asmwrap : Callable[[str],str], streaming : bool = False):
+        super().__init__(asmwrap=asmwrap)
+        self.streaming = streaming
+
+    def check_valid_registers(self, dregs : list[data_reg]):
+        if not all(isinstance(d, sve_vreg) for d in dregs):
+            raise ValueError("All dregs of a SVE opperm must be sve_vreg")
+
+    def get_suffix(self, size : int) -> str:
+        if 16 == size and self.streaming:
+            raise ValueError(f"{self.inst_base} on 128 bit groups is illegal in streaming mode")
+        return super().get_suffix(size)
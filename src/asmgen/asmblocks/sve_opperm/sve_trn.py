@@ -0,0 +1,17 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE trn1/trn2 permutation instructions
+"""
+
+from .sve_opperm_base import sve_opperm_base
+
+class sve_trn(sve_opperm_base):
+    """
+    SVE implementation of trn (see :class:`asmgen.asmblocks.neon_opperm.neon_trn`)
+    """
+
+    inst_base = "trn"
@@ -0,0 +1,17 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE uzp1/uzp2 permutation instructions
+"""
+
+from .sve_opperm_base import sve_opperm_base
+
+class sve_uzp(sve_opperm_base):
+    """
+    SVE implementation of uzp (see :class:`asmgen.asmblocks.neon_opperm.neon_uzp`)
+    """
+
+    inst_base = "uzp"
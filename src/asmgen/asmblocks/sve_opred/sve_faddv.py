@@ -0,0 +1,43 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE sum reduction instructions
+"""
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import opred_modifier as mod
+
+from .sve_opred_base import sve_opred_base
+
+class sve_faddv(sve_opred_base):
+    """
+    SVE implementation of faddv (tree order), the ORDERED form uses fadda,
+    which is illegal in streaming mode
+    """
+
+    inst_base = "fadd"
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.ORDERED in modifiers and self.streaming:
+            raise ValueError("fadda is illegal in streaming mode")
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        if mod.ORDERED not in modifiers:
+            return super().implementation(adreg=adreg, bdreg=bdreg, a_dt=a_dt, b_dt=b_dt,
+                                          modifiers=modifiers, **kwargs)
+        self.check_valid_registers(adreg, bdreg)
+        preg = self.get_preg(kwargs)
+        bdreg = bdreg.retype(a_dt)
+        return self.asmwrap(f"fadda {bdreg},{preg},{bdreg},{adreg}.{self.suffixes[a_dt]}")
@@ -0,0 +1,17 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE minimum reduction instruction
+"""
+
+from .sve_opred_base import sve_opred_base
+
+class sve_fminv(sve_opred_base):
+    """
+    SVE implementation of fminv
+    """
+
+    inst_base = "fmin"
@@ -0,0 +1,68 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SVE reduction base case
+"""
+
+from typing import Callable
+
+from ...registers import (
+    asm_data_type as adt,
+    data_reg
+)
+from ..operations import opred_modifier as mod
+from ..neon_opred.neon_opred_base import neon_opred_base
+from ..types.aarch64_types import aarch64_freg
+from ..types.sve_types import sve_vreg, sve_preg
+
+class sve_opred_base(neon_opred_base):
+    """
+    SVE base reduction implementation, reduces all active lanes (p0 by default,
+    the preg parameter selects another predicate)
+    """
+
+    suffixes = {adt.FP64 : "d", adt.FP32 : "s", adt.FP16 : "h"}
+
+    def __init__(self, asmwrap : Callable[[str],str], streaming : bool = False):
+        super().__init__(asmwrap=asmwrap)
+        self.streaming = streaming
+
+    def check_modifiers(self, modifiers : set[mod]):
+        if mod.ORDERED in modifiers:
+            raise ValueError(f"{self.inst_base}v has no strictly ordered form")
+
+    def check_valid_registers(self, adreg : data_reg, bdreg : data_reg):
+        if not isinstance(adreg, sve_vreg):
+            raise ValueError("adreg of a SVE opred must be sve_vreg")
+        if not isinstance(bdreg, aarch64_freg):
+            raise ValueError("bdreg of a SVE opred must be aarch64_freg")
+
+    def get_preg(self, kwargs : dict) -> sve_preg:
+        """
+        Returns the governing predicate of the reduction
+
+        :param kwargs: Additional parameters of the operation
+        :type kwargs: dict
+        :raises ValueError: If the preg parameter is not a SVE predicate
+        :return: governing predicate
+        :rtype: class:`asmgen.asmblocks.types.sve_types.sve_preg`
+        """
+        preg = kwargs.get('preg', sve_preg(0))
+        if not isinstance(preg, sve_preg):
+            raise ValueError(f"{preg} is not a valid sve_preg")
+        return preg
+
+    # modfier set is only read, therefore a mutable default is ok
+    # pylint: disable-next=dangerous-default-value
+    def implementation(self, *,
+                       adreg : data_reg, bdreg : data_reg,
+                       a_dt : adt, b_dt : adt,
+                       modifiers : set[mod] = set(),
+                       **kwargs) -> str:
+        self.check_valid_registers(adreg, bdreg)
+        preg = self.get_preg(kwargs)
+        return self.asmwrap(f"{self.inst_base}v {bdreg.retype(a_dt)},{preg},"
+                            f"{adreg}.{self.suffixes[a_dt]}")
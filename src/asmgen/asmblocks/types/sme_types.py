@@ -7,7 +7,12 @@
 SME register types
 """
 
-from ...registers import treg_base, asm_data_type as adt, adt_size
+from ...registers import (
+    treg_base, vreg_base, greg_base,
+    asm_data_type as adt,
+    adt_size
+)
+from .sve_types import sve_vreg
 
 
 # pylint: disable-next=too-few-public-methods
@@ -33,3 +38,123 @@ class sme_treg(treg_base):
 
     def __str__(self) -> str:
         return f"za{self.idx}"
+
+def sme_vtuple_str(vregs : list[vreg_base], esuf : str, allow_strided : bool = True) -> str:
+    """
+    Returns the SME2 multi-vector list for 1, 2 or 4 Z registers, i.e.
+    "{z0.s-z3.s}" for consecutive or "{z0.s, z4.s, z8.s, z12.s}" for strided registers
+
+    :param vregs: Registers of the tuple
+    :type vregs: list[class:`asmgen.registers.vreg_base`]
+    :param esuf: Element suffix including the dot, i.e. ".s"
+    :type esuf: str
+    :param allow_strided: Whether the instruction accepts strided tuples
+    :type allow_strided: bool
+    :return: Register list in braces
+    :rtype: str
+    """
+    n = len(vregs)
+    if n not in [1, 2, 4]:
+        raise ValueError(f"SME2 multi-vector operands consist of 1, 2 or 4 registers, got {n}")
+    first = vregs[0].idx
+    if 1 == n:
+        return f"{{{vregs[0]}{esuf}}}"
+    if all(r.idx == first+i for i,r in enumerate(vregs)):
+        if first % n != 0:
+            raise ValueError((f"First register of a consecutive {n}-register tuple must be "
+                              f"a multiple of {n}. Got z{first}"))
+        return f"{{{vregs[0]}{esuf}-{vregs[-1]}{esuf}}}"
+
+    stride = 16//n
+    if not allow_strided:
+        raise ValueError(f"Registers of the {n}-register tuple must be consecutive")
+    if any(r.idx != first+i*stride for i,r in enumerate(vregs)):
+        raise ValueError((f"SME2 {n}-register tuples must be consecutive or have a "
+                          f"register stride of {stride}"))
+    if (first % 16) >= stride:
+        raise ValueError((f"First register of a strided {n}-register tuple must be "
+                          f"Z0-Z{stride-1} or Z16-Z{16+stride-1}. Got z{first}"))
+    return "{"+", ".join(f"{r}{esuf}" for r in vregs)+"}"
+
+# pylint: disable-next=too-few-public-methods
+class sme_vgroup(vreg_base):
+    """
+    SME2 multi-vector operand of 2 or 4 consecutive Z registers
+    """
+    def __init__(self, reg_idx : int, count : int):
+        if count not in [2, 4]:
+            raise ValueError(f"SME2 vector groups consist of 2 or 4 registers, got {count}")
+        if reg_idx % count != 0:
+            raise ValueError(f"First register of a {count}-register group must be "
+                             f"a multiple of {count}")
+        self.reg_idx = reg_idx
+        self.count = count
+
+    @property
+    def idx(self) -> int:
+        return self.reg_idx
+
+    @property
+    def vregs(self) -> list[sve_vreg]:
+        """
+        Individual registers of the group
+        """
+        return [sve_vreg(self.reg_idx+i) for i in range(self.count)]
+
+    def with_suffix(self, esuf : str) -> str:
+        """
+        Returns the register list with element suffixes, i.e. "{z0.s-z3.s}"
+
+        :param esuf: Element suffix including the dot, i.e. ".s"
+        :type esuf: str
+        :return: Register list in braces
+        :rtype: str
+        """
+        return sme_vtuple_str(self.vregs, esuf, allow_strided=False)
+
+    def __str__(self) -> str:
+        return f"{{z{self.idx}-z{self.idx+self.count-1}}}"
+
+# pylint: disable-next=too-few-public-methods
+class sme_za_vgroup(treg_base):
+    """
+    SME2 ZA array vector group, i.e. ZA.S[w8, 0, VGx4]: the vectors selected by
+    a vector select register (w8-w11) plus an immediate offset, one per register
+    of the multi-vector operand
+    """
+    def __init__(self, vsreg : greg_base, offset : int, vgx : int):
+        if vsreg.idx < 8 or vsreg.idx > 11:
+            raise ValueError(f"ZA vector select register {vsreg} is not w8-w11")
+        if vgx not in [2, 4]:
+            raise ValueError(f"ZA vector groups consist of 2 or 4 vectors, got {vgx}")
+        if offset < 0 or offset > 7:
+            raise ValueError(f"ZA vector select offset {offset} is not in [0,7]")
+        self.vsreg = vsreg
+        self.offset = offset
+        self.vgx = vgx
+
+    @property
+    def idx(self) -> int:
+        return self.offset
+
+    def with_suffix(self, esuf : str, nslices : int = 1) -> str:
+        """
+        Returns the ZA array operand, i.e. "za.s[w8, 0, vgx4]"
+
+        :param esuf: Element suffix including the dot, i.e. ".s"
+        :type esuf: str
+        :param nslices: Number of consecutive vectors every element spans (widening
+                        instructions), the offset is printed as a range for > 1
+        :type nslices: int
+        :return: ZA array operand
+        :rtype: str
+        """
+        offset = str(self.offset)
+        if nslices > 1:
+            if self.offset % nslices != 0:
+                raise ValueError(f"ZA vector select offset must be a multiple of {nslices}")
+            offset = f"{self.offset}:{self.offset+nslices-1}"
+        return f"za{esuf}[{self.vsreg.get_wreg()}, {offset}, vgx{self.vgx}]"
+
+    def __str__(self) -> str:
+        return self.with_suffix("")
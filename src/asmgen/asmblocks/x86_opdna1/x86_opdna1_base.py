@@ -38,6 +38,10 @@ class x86_opdna1(opdna1):
         return [{'adreg': dt} for dt in sup_dts]
 
     def check_modifiers(self, modifiers: set[mod]):
+        if mod.FF in modifiers:
+            raise ValueError("Base X86 has no first-faulting ld/st")
+        if mod.QBCAST in modifiers or mod.OBCAST in modifiers:
+            raise ValueError("Base X86 has no segment-replicating loads")
         if mod.TINDEX in modifiers:
             raise ValueError("Base X86 has no ld/st with 2D tile offset indices")
         if mod.VINDEX in modifiers:
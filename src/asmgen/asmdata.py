@@ -7,8 +7,9 @@
 Classes to store various constant data to be used with ASM instructions
 """
 
-import struct
+import math
 from dataclasses import dataclass
+from fractions import Fraction
 
 from .registers import asm_data_type as adt, adt_size, adt_is_float
 
@@ -67,9 +68,10 @@ def adt_fp_bits(dt: adt) -> tuple[int,int,bool]:
 
 def get_fp_hex_value(value : float, ebits: int, mbits: int, signbit : bool = True) -> str:
     """
-    Converts a floating-point value into its hexadecimal representation,
-    extracting the specified number of exponent bits and mantissa bits,
-    along with an optional sign bit.
+    Converts a floating-point value into its hexadecimal representation
+    in a format with the specified number of exponent bits and mantissa bits,
+    along with an optional sign bit. The value is rounded to nearest even,
+    values too large for the format become infinity
 
     :param value: The floating-point value to convert
     :type value: float
@@ -79,7 +81,7 @@ def get_fp_hex_value(value : float, ebits: int, mbits: int, signbit : bool = Tru
     :type mbits: int
     :param signbit: Indicates whether to include a sign bit (default is True)
     :type signbit: bool
-    :return: The hexadecimal representation of the modified floating-point value
+    :return: The hexadecimal representation of the rounded floating-point value
     :rtype: str
     :raises ValueError: If the total number of bits (sign + exponent + mantissa) 
                         is not 8, 16, 32, or 64
@@ -89,24 +91,37 @@ def get_fp_hex_value(value : float, ebits: int, mbits: int, signbit : bool = Tru
     if ebits+mbits+(1 if signbit else 0) not in [8,16,32,64]:
         raise ValueError("Total number of bits has to be either 8,16,32 or 64")
 
-
-    result_int = 0
-
-    bits = struct.unpack('>Q', struct.pack('>d', value))[0]
-
-
-    # mantissa
-    result_int |= (bits & ((1 << mbits) - 1))
-    bits >>= mbits
-
-
-    # exponent
-    result_int |= ((bits & ((1 << ebits) -1)) << mbits)
-    bits >>= ebits
+    bias = (1 << (ebits-1)) - 1
+    emask = (1 << ebits) - 1
+
+    if math.isnan(value):
+        result_int = (emask << mbits) | (1 << (mbits-1))
+    elif math.isinf(value):
+        result_int = emask << mbits
+    elif 0 == value:
+        result_int = 0
+    else:
+        frac = abs(Fraction(value))
+        # 2^exp <= frac < 2^(exp+1), clamped to the subnormal exponent
+        exp = frac.numerator.bit_length() - frac.denominator.bit_length()
+        if Fraction(2)**exp > frac:
+            exp -= 1
+        exp = max(exp, 1-bias)
+        # Round to nearest even, may carry into the next exponent
+        mantissa = round(frac / Fraction(2)**(exp-mbits))
+        if mantissa >> (mbits+1):
+            mantissa >>= 1
+            exp += 1
+        if exp+bias >= emask:
+            result_int = emask << mbits
+        elif mantissa >> mbits:
+            result_int = ((exp+bias) << mbits) | (mantissa & ((1 << mbits) - 1))
+        else:
+            result_int = mantissa
 
     # sign
-    if signbit:
-        result_int |= ((bits & 0x1) << mbits+ebits)
+    if signbit and math.copysign(1.0, value) < 0:
+        result_int |= 1 << (mbits+ebits)
 
     return hex(result_int)
 
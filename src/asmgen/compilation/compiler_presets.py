@@ -5,34 +5,37 @@
 # ------------------------------------------------------------------------------
 """
 Various parameters and values for compilation for different ISAs
+
+The Arm targets enable FEAT_FP16 (SVE implies it) and the RVV target enables Zvfh,
+so the generated FP16 arithmetic is accepted by the assemblers
 """
 arch_flags  : dict[str,dict[str,list[str]]] = {
         'g++' : {
             'fma128': ['-mavx', '-mfma'],
             'fma256': ['-mavx', '-mfma'],
             'avx512': ['-mavx512f'],
-            'neon': ['-march=armv8-a'],
-            'sve': ['-march=armv8-a+sve'],
+            'neon': ['-march=armv8.2-a+fp16'],
+            'sve': ['-march=armv8.2-a+sve'],
             'sme': ['-march=armv8-a+sme'],
-            'rvv': ['-march=rv64imafdcv'],
+            'rvv': ['-march=rv64imafdcv_zvfh'],
             'rvv071': ['-fail_on_purpose'],
             },
         'clang++' : {
             'fma128': ['-mavx', '-mfma'],
             'fma256': ['-mavx', '-mfma'],
             'avx512': ['-mavx512f'],
-            'neon': ['-march=armv8-a'],
-            'sve': ['-march=armv8-a+sve'],
+            'neon': ['-march=armv8.2-a+fp16'],
+            'sve': ['-march=armv8.2-a+sve'],
             'sme': ['-march=armv8-a+sme'],
-            'rvv': ['-march=rv64imafdcv'],
+            'rvv': ['-march=rv64imafdcv_zvfh'],
             'rvv071': ['-mepi'],
             },
         'armclang++' : {
             'fma128': ['-fail_on_purpose'],
             'fma256': ['-fail_on_purpose'],
             'avx512': ['-fail_on_purpose'],
-            'neon': ['-march=armv8-a'],
-            'sve': ['-march=armv8-a+sve'],
+            'neon': ['-march=armv8.2-a+fp16'],
+            'sve': ['-march=armv8.2-a+sve'],
             'sme': ['-march=armv8-a+sme'],
             'rvv': ['-fail_on_purpose'],
             'rvv071': ['-fail_on_purpose'],
@@ -160,3 +160,39 @@ def vec_fp64_close(fn, eg=identity):
     """
     return vec_fp64_condition(fn,
         f"std::abs(b - {eg('a')}) < 4.0*std::numeric_limits<double>::epsilon()")
+
+def vec_fp16_condition(function_name, condition):
+    """
+    Base condition evaluating two vectors of FP16 values
+    """
+    return f"""
+    bool {function_name}(const std::vector<_Float16>& avec, const std::vector<_Float16>& bvec)
+    {{
+        return std::equal(avec.begin(), avec.end(),
+                          bvec.begin(),
+                          [](_Float16 a, _Float16 b)
+                          {{
+                              return {condition};
+                          }});
+    }}
+    """
+
+def vec_fp16_relation(function_name, expression_generator, relation):
+    """
+    Base condition based on a relation between all FP16 elements in two vectors
+    """
+    return vec_fp16_condition(function_name, f"b {relation} {expression_generator('a')}")
+
+def vec_fp16_eq(fn, eg):
+    """
+    Equality of all FP16 elements in two vectors
+    """
+    return vec_fp16_relation(fn, eg, "==")
+
+def vec_fp16_close(fn, eg=identity):
+    """
+    Epsilon-closeness of all FP16 elements in two vectors, compared in FP32
+    (the FP16 epsilon is 2^-10)
+    """
+    return vec_fp16_condition(fn,
+        f"std::abs(static_cast<float>(b) - static_cast<float>({eg('a')})) < 4.0f*0x1p-10f")
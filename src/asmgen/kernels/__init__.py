@@ -0,0 +1,12 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Meta-module for kernel generators built on top of the asm generators
+"""
+from .sme_gemm import *
+from .lut_dequant import *
+from .vmath import *
+from .rownorm import *
@@ -0,0 +1,375 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+GEMV microkernel generator for 4-bit weights dequantized with table lookups
+"""
+
+from enum import Enum, auto
+
+from ..asmdata import asm_data
+from ..registers import (
+    reg_tracker,
+    asm_data_type as adt,
+    greg_base, freg_base
+)
+from ..asmblocks.noarch import asmgen
+from ..asmblocks.rvv import rvv
+from ..asmblocks.operations import widening_method
+
+class lut_method(Enum):
+    """
+    Ways to accumulate the looked up weights
+    """
+    FMA = auto() # widen the weights to FP32 and fma them with FP32 activations
+    DOT = auto() # dot products of the INT8 weights with INT8 activations
+
+class lut_dequant:
+    """
+    Generates GEMV microkernels computing y[r] = sum_k W[r,k]*x[k] for a block of
+    rows of 4-bit quantized weights. The weights are never written back to memory:
+    every byte holds two 4-bit indices into a codebook of 16 INT8 values, which are
+    split with unpack_nibbles, looked up with tbl and passed on in registers.
+
+    K is processed in groups of :attr:`group_size` weights (two vectors of indices),
+    every group of every row has its own FP32 scale d and, for FMA, optionally an
+    FP32 offset m, so that W[r,k] = d*codebook[index] + m. Zero points can be
+    applied as m = -d*z or, for a fixed zero point, folded into the codebook.
+
+    - FMA: the codes are widened to FP32 (int8 -> int16 -> int32 -> FP32) and
+      accumulated with fma, x holds K FP32 activations. Needs an ISA converting
+      in parts (SPLIT_INSTRUCTIONS), i.e. NEON, SVE or AVX
+    - DOT: the codes are accumulated with INT8 dot products into INT32, which
+      are scaled by d and the per-group FP32 scale of the INT8 activations x.
+      Needs SINT8 dota, i.e. NEON, SVE or RVV (with Zvqdotq)
+
+    The packed weights of a group are ordered such that the looked up codes end up
+    next to their activations, see :meth:`pack_group`. The table is loaded as one
+    full vector, see :meth:`table`. The vector length has to be fixed.
+
+    The ISA quirks have to be set up for 8-bit elements before the kernel (e.g. p0
+    all-true for bytes on SVE), on RVV the kernel switches vtype between 8 and 32-bit
+    elements and leaves it set for 32-bit elements
+    """
+
+    def __init__(self, *, gen : asmgen, rt : reg_tracker,
+                 method : lut_method = lut_method.FMA, rows : int = 1):
+        """
+        Constructor method
+
+        :param gen: Generator to use
+        :type gen: class:`asmgen.asmblocks.noarch.asmgen`
+        :param rt: register tracker to allocate the internally used registers from
+        :type rt: class:`asmgen.registers.reg_tracker`
+        :param method: How to accumulate the looked up weights
+        :type method: class:`asmgen.kernels.lut_dequant.lut_method`
+        :param rows: Number of rows of W (and elements of y) computed at once
+        :type rows: int
+        """
+        if gen.is_vla:
+            raise ValueError("The LUT dequantization kernel requires a fixed vector length")
+        if rows < 1:
+            raise ValueError("The kernel has to compute at least one row")
+        if lut_method.FMA == method and \
+          widening_method.SPLIT_INSTRUCTIONS != gen.fcvt.widening_method:
+            raise ValueError("FMA accumulation needs conversions split into parts")
+        if lut_method.DOT == method:
+            dts = {'adreg':adt.SINT8, 'bdreg':adt.SINT8, 'cdreg':adt.SINT32}
+            try:
+                supported = any(dts.items() <= sup.items() for sup in gen.dota.supported_dts())
+            except NotImplementedError:
+                supported = False
+            if not supported:
+                raise ValueError("DOT accumulation needs SINT8 dot products")
+
+        self.gen = gen
+        self.rt = rt
+        self.method = method
+        self.rows = rows
+
+    @property
+    def group_size(self) -> int:
+        """
+        Number of weights sharing a scale (and offset), two per byte of a vector
+        """
+        return 2*self.gen.simd_size
+
+    def reserve(self, type_tag : str) -> int:
+        """
+        Reserves a register for use in the kernel
+
+        :param type_tag: Type of the register
+        :type type_tag: str
+        :return: Index of the reserved register
+        :rtype: int
+        """
+        return self.rt.reserve_any_reg(type_tag)
+
+    def code_order(self) -> list[int]:
+        """
+        Returns the position of every code byte after widening it to FP32:
+        byte b of the looked up codes ends up in the FP32 vector (result[b] // lanes),
+        lane (result[b] % lanes). Identity for DOT and ISAs widening the lower/upper
+        halves, SVE widens the even/odd elements
+
+        :return: List with the position of every code byte
+        :rtype: list[int]
+        """
+        size = self.gen.simd_size
+        if lut_method.DOT == self.method:
+            return list(range(size))
+
+        # Two steps of 2-way widening, each part becomes one wide register
+        parts = [list(range(size))]
+        for _ in range(2):
+            if self.gen.fcvt.interleaved_parts:
+                parts = [p[i::2] for p in parts for i in range(2)]
+            else:
+                parts = [p[h*len(p)//2:(h+1)*len(p)//2] for p in parts for h in range(2)]
+        order = [0]*size
+        lanes = size//4
+        for k,part in enumerate(parts):
+            for l,byte in enumerate(part):
+                order[byte] = k*lanes + l
+        return order
+
+    def pack_group(self, indices : list[int]) -> list[int]:
+        """
+        Packs the codebook indices of one group of weights into bytes. The low
+        nibble of byte b holds the index of weight code_order()[b], the high
+        nibble the one of weight simd_size + code_order()[b]
+
+        :param indices: Codebook indices (0-15) of the group_size weights in order
+        :type indices: list[int]
+        :return: List of simd_size bytes
+        :rtype: list[int]
+        """
+        if len(indices) != self.group_size:
+            raise ValueError(f"A group consists of {self.group_size} weights")
+        if any(i < 0 or i > 15 for i in indices):
+            raise ValueError("Codebook indices have to be in [0,15]")
+        half = self.gen.simd_size
+        return [indices[o] | indices[half+o] << 4 for o in self.code_order()]
+
+    def table(self, codebook : list[int]) -> list[int]:
+        """
+        Returns the table vector for a codebook, replicated into every 128 bit
+        segment as some ISAs only look up within segments
+
+        :param codebook: 16 INT8 values
+        :type codebook: list[int]
+        :return: List of simd_size INT8 values
+        :rtype: list[int]
+        """
+        if len(codebook) != 16:
+            raise ValueError("The codebook has to contain 16 values")
+        return codebook*(self.gen.simd_size//16)
+
+    def add_table(self, name : str, codebook : list[int]):
+        """
+        Adds the table vector for a codebook to the ISA data of the generator,
+        which is emitted with the label name by
+        :meth:`asmgen.asmblocks.noarch.asmgen.isadata`
+
+        :param name: Name of the label
+        :type name: str
+        :param codebook: 16 INT8 values
+        :type codebook: list[int]
+        """
+        self.gen.asmdata[name] = [asm_data(adt.SINT8, v) for v in self.table(codebook)]
+
+    def vtype(self, dt : adt, vlreg : greg_base|None) -> str:
+        """
+        Returns the instruction switching vtype to dt on RVV, nothing otherwise
+
+        :param dt: Data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param vlreg: GP register to write the vector length to (RVV only)
+        :type vlreg: class:`asmgen.registers.greg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        if vlreg is None:
+            return ""
+        return self.gen.vsetvlmax(reg=vlreg, dt=dt)
+
+    # pylint: disable-next=too-many-arguments,too-many-locals
+    def generate(self, *, wregs : list[greg_base], sregs : list[greg_base],
+                 xreg : greg_base, lutreg : greg_base, kreg : greg_base,
+                 yregs : list[freg_base],
+                 mregs : list[greg_base]|None = None,
+                 xsreg : greg_base|None = None,
+                 label : str = "lut_dequant") -> str:
+        """
+        Returns the microkernel. All address registers and kreg are modified
+
+        :param wregs: Address of the packed weights of every row
+        :type wregs: list[class:`asmgen.registers.greg_base`]
+        :param sregs: Address of the FP32 group scales of every row
+        :type sregs: list[class:`asmgen.registers.greg_base`]
+        :param xreg: Address of the activations (FP32 for FMA, INT8 for DOT)
+        :type xreg: class:`asmgen.registers.greg_base`
+        :param lutreg: Address of the table (see :meth:`table`)
+        :type lutreg: class:`asmgen.registers.greg_base`
+        :param kreg: Number of groups (K/group_size), must be at least 1
+        :type kreg: class:`asmgen.registers.greg_base`
+        :param yregs: FP32 registers to write the result of every row to
+        :type yregs: list[class:`asmgen.registers.freg_base`]
+        :param mregs: Address of the FP32 group offsets of every row, None for no
+            offsets (FMA only)
+        :type mregs: list[class:`asmgen.registers.greg_base`]
+        :param xsreg: Address of the FP32 group scales of the activations (DOT only)
+        :type xsreg: class:`asmgen.registers.greg_base`
+        :param label: Prefix of the labels used in the kernel
+        :type label: str
+        :return: String with the kernel ASM
+        :rtype: str
+        """
+        gen = self.gen
+        dot = lut_method.DOT == self.method
+        if any(len(regs) != self.rows for regs in [wregs, sregs, yregs]):
+            raise ValueError(f"wregs, sregs and yregs need one register per row ({self.rows})")
+        if mregs is not None and (dot or len(mregs) != self.rows):
+            raise ValueError("mregs needs one register per row and is only supported for FMA")
+        if (xsreg is None) == dot:
+            raise ValueError("xsreg is required for (and only for) DOT accumulation")
+
+        vlreg = gen.greg(self.reserve('greg')) if isinstance(gen, rvv) else None
+        regs = {name : gen.vreg(self.reserve('vreg'))
+                for name in ['tbl', 'tmp', 'lo', 'hi', 'scale']}
+        accs = [[gen.vreg(self.reserve('vreg')) for _ in range(1 if dot else 2)]
+                for _ in range(self.rows)]
+
+        asmblock  = self.vtype(adt.SINT8, vlreg)
+        asmblock += gen.load_vector(areg=lutreg, vreg=regs['tbl'], dt=adt.SINT8)
+        asmblock += self.vtype(adt.FP32, vlreg)
+        for acc in accs:
+            for a in acc:
+                asmblock += gen.zero_vreg(vreg=a, dt=adt.FP32)
+
+        asmblock += gen.loopbegin(reg=kreg, label=f"{label}_k")
+        if dot:
+            for name in ['xlo', 'xhi', 'xscale', 'iacc']:
+                regs[name] = gen.vreg(self.reserve('vreg'))
+            asmblock += self.dot_group(wregs=wregs, sregs=sregs, xreg=xreg, xsreg=xsreg,
+                                       vlreg=vlreg, regs=regs, accs=accs)
+        else:
+            for name in ['h0', 'h1', 'w0', 'w1', 'x'] + ([] if mregs is None else ['off']):
+                regs[name] = gen.vreg(self.reserve('vreg'))
+            asmblock += self.fma_group(wregs=wregs, sregs=sregs, mregs=mregs, xreg=xreg,
+                                       regs=regs, accs=accs)
+        asmblock += gen.loopend(reg=kreg, label=f"{label}_k")
+
+        for acc,y in zip(accs, yregs):
+            asmblock += gen.reduce_accumulators(accregs=acc, freg=y, tmpreg=regs['tmp'],
+                                                dt=adt.FP32)
+        return asmblock
+
+    def lookup(self, *, wreg : greg_base, regs : dict) -> tuple[str,list]:
+        """
+        Returns the ASM loading the packed weights of one group and looking up the
+        codes of the low and high nibbles
+
+        :param wreg: Address of the packed weights, advanced to the next group
+        :type wreg: class:`asmgen.registers.greg_base`
+        :param regs: Vector registers of the kernel
+        :type regs: dict[str,class:`asmgen.registers.vreg_base`]
+        :return: ASM and the registers holding the codes of the low and high nibbles
+        :rtype: tuple[str,list[class:`asmgen.registers.vreg_base`]]
+        """
+        gen = self.gen
+        tblv, tmpv, lov, hiv = regs['tbl'], regs['tmp'], regs['lo'], regs['hi']
+        asmblock  = gen.load_vector(areg=wreg, vreg=lov, dt=adt.UINT8)
+        asmblock += gen.add_greg_voff(reg=wreg, offset=1, dt=adt.UINT8)
+        asmblock += gen.unpack_nibbles(vreg=lov, lodst=lov, hidst=hiv, tmpreg=tmpv)
+        # Out of place as vrgather can't look up in place, the temporary
+        # register is free again
+        asmblock += gen.tbl(adreg=tblv, bdreg=lov, cdreg=tmpv, dt=adt.SINT8)
+        asmblock += gen.tbl(adreg=tblv, bdreg=hiv, cdreg=lov, dt=adt.SINT8)
+        return asmblock, [tmpv, lov]
+
+    # pylint: disable-next=too-many-arguments,too-many-locals
+    def fma_group(self, *, wregs : list[greg_base], sregs : list[greg_base],
+                  mregs : list[greg_base]|None, xreg : greg_base,
+                  regs : dict, accs : list[list]) -> str:
+        """
+        Returns the ASM of one group with FMA accumulation, the 8 FP32 vectors of
+        weights are dequantized one after another and accumulated alternately
+        into the two accumulators of each row
+
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        fp = {'a_dt':adt.FP32, 'b_dt':adt.FP32, 'c_dt':adt.FP32}
+        asmblock = ""
+        for r,acc in enumerate(accs):
+            asmblock += gen.load_vector_bcast1(areg=sregs[r], vreg=regs['scale'], dt=adt.FP32)
+            asmblock += gen.add_greg_imm(reg=sregs[r], imm=4)
+            if mregs is not None:
+                asmblock += gen.load_vector_bcast1(areg=mregs[r], vreg=regs['off'],
+                                                   dt=adt.FP32)
+                asmblock += gen.add_greg_imm(reg=mregs[r], imm=4)
+            lookup, codes = self.lookup(wreg=wregs[r], regs=regs)
+            asmblock += lookup
+            k = 0
+            for c in codes:
+                asmblock += gen.convert_vectors(adregs=[c], bdregs=[regs['h0'], regs['h1']],
+                                                a_dt=adt.SINT8, b_dt=adt.SINT16)
+                for h in [regs['h0'], regs['h1']]:
+                    asmblock += gen.convert_vectors(adregs=[h],
+                                                    bdregs=[regs['w0'], regs['w1']],
+                                                    a_dt=adt.SINT16, b_dt=adt.SINT32)
+                    for w in [regs['w0'], regs['w1']]:
+                        asmblock += gen.convert_vectors(adregs=[w], bdregs=[w],
+                                                        a_dt=adt.SINT32, b_dt=adt.FP32)
+                        asmblock += gen.fmul(adreg=w, bdreg=regs['scale'], cdreg=w, **fp)
+                        if mregs is not None:
+                            asmblock += gen.fadd(adreg=w, bdreg=regs['off'], cdreg=w, **fp)
+                        asmblock += gen.load_vector_voff(areg=xreg, voffset=k,
+                                                        vreg=regs['x'], dt=adt.FP32)
+                        asmblock += gen.fma(adreg=w, bdreg=regs['x'], cdreg=acc[k%2], **fp)
+                        k += 1
+        asmblock += gen.add_greg_voff(reg=xreg, offset=k, dt=adt.FP32)
+        return asmblock
+
+    # pylint: disable-next=too-many-arguments
+    def dot_group(self, *, wregs : list[greg_base], sregs : list[greg_base],
+                  xreg : greg_base, xsreg : greg_base, vlreg : greg_base|None,
+                  regs : dict, accs : list[list]) -> str:
+        """
+        Returns the ASM of one group with DOT accumulation, the INT32 dot products
+        of each row are converted to FP32 and accumulated scaled by the product of
+        the weight and activation scales
+
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        fp = {'a_dt':adt.FP32, 'b_dt':adt.FP32, 'c_dt':adt.FP32}
+        iacc = regs['iacc']
+        asmblock  = gen.load_vector_bcast1(areg=xsreg, vreg=regs['xscale'], dt=adt.FP32)
+        asmblock += gen.add_greg_imm(reg=xsreg, imm=4)
+        asmblock += self.vtype(adt.SINT8, vlreg)
+        for x in [regs['xlo'], regs['xhi']]:
+            asmblock += gen.load_vector(areg=xreg, vreg=x, dt=adt.SINT8)
+            asmblock += gen.add_greg_voff(reg=xreg, offset=1, dt=adt.SINT8)
+        for r,acc in enumerate(accs):
+            asmblock += self.vtype(adt.SINT8, vlreg) if r else ""
+            lookup, codes = self.lookup(wreg=wregs[r], regs=regs)
+            asmblock += lookup
+            asmblock += self.vtype(adt.SINT32, vlreg)
+            asmblock += gen.zero_vreg(vreg=iacc, dt=adt.FP32)
+            for c,x in zip(codes, [regs['xlo'], regs['xhi']]):
+                asmblock += gen.dota(adreg=c, bdreg=x, cdreg=iacc,
+                                     a_dt=adt.SINT8, b_dt=adt.SINT8, c_dt=adt.SINT32)
+            asmblock += gen.convert_vectors(adregs=[iacc], bdregs=[iacc],
+                                            a_dt=adt.SINT32, b_dt=adt.FP32)
+            asmblock += gen.load_vector_bcast1(areg=sregs[r], vreg=regs['scale'], dt=adt.FP32)
+            asmblock += gen.add_greg_imm(reg=sregs[r], imm=4)
+            asmblock += gen.fmul(adreg=regs['scale'], bdreg=regs['xscale'],
+                                 cdreg=regs['scale'], **fp)
+            asmblock += gen.fma(adreg=iacc, bdreg=regs['scale'], cdreg=acc[0], **fp)
+        return asmblock
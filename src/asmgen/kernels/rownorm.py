@@ -0,0 +1,539 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Generators for fused row-wise normalizations (softmax, layernorm, rmsnorm)
+"""
+
+from typing import Callable
+
+from ..registers import (
+    reg_tracker,
+    asm_data_type as adt,
+    adt_size,
+    greg_base, vreg_base, freg_base
+)
+from ..asmblocks.noarch import asmgen
+from ..asmblocks.rvv import rvv
+from ..asmblocks.rvv071 import rvv071
+from ..asmblocks.types.sve_types import sve_preg
+from ..asmblocks.operations import opd3_modifier as mod, opdna1_modifier as ldst_mod
+from .vmath import vmath, vmath_accuracy, poly_scheme
+
+class rownorm:
+    """
+    Generates kernels normalizing one row of n elements, which are read from
+    memory twice: a first pass accumulates the statistics of the row in vector
+    registers, which are reduced across the elements and broadcast back, a
+    second pass writes the normalized row. Rows that fit into L1 are only read
+    from memory once.
+
+    - softmax: y = e^(x-max(x))/sum(e^(x-max(x))), the second pass writes the
+      exponentials and sums them, a third pass scales y in place while it is
+      still in L1. The exponential is :meth:`asmgen.kernels.vmath.vmath.exp`
+    - layernorm: y = (x-mean)/sqrt(var+eps)*gamma + beta, the sums of x and x^2
+      are accumulated shifted by the first element of the row to avoid the
+      cancellation of var = E[x^2] - E[x]^2 for rows with a large mean
+    - rmsnorm: y = x/sqrt(mean(x^2)+eps)*gamma
+
+    The loops are built with :meth:`asmgen.asmblocks.noarch.asmgen.vector_loop`,
+    the tail of the row is handled with the loop predicate on SVE and AVX512 and
+    with vl on RVV, which requires the tail-undisturbed vtype (TU parameter) to
+    keep the accumulators intact in the last iteration. NEON and AVX/AVX2 have
+    no predication, there the elements after the last full vector are processed
+    one at a time by a scalar remainder loop, which loads them into the lowest
+    element of the vector registers with the other elements zeroed.
+
+    The ISA quirks have to be set up for dt before the kernels (e.g. p0 all-true
+    on SVE, vtype on RVV). The constants are stored in the ISA data of the
+    generator like the ones of :class:`asmgen.kernels.vmath.vmath`
+    """
+
+    # Passed as mask to the loop bodies by the scalar remainder loop
+    scalar_tail = object()
+
+    def __init__(self, *, gen : asmgen, rt : reg_tracker, dt : adt = adt.FP32,
+                 eps : float = 1e-5, scheme : poly_scheme = poly_scheme.HORNER):
+        """
+        Constructor method
+
+        :param gen: Generator to use
+        :type gen: class:`asmgen.asmblocks.noarch.asmgen`
+        :param rt: register tracker to allocate the internally used registers from,
+            has to track fregs on ISAs with separate FP registers
+        :type rt: class:`asmgen.registers.reg_tracker`
+        :param dt: Floating point data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param eps: Value added to the variance (mean square) of layernorm (rmsnorm)
+        :type eps: float
+        :param scheme: How to evaluate the polynomial of the exponential in softmax
+        :type scheme: class:`asmgen.kernels.vmath.poly_scheme`
+        """
+        if dt not in vmath_accuracy:
+            raise ValueError(f"{dt} is not supported by rownorm")
+        if isinstance(gen, rvv071):
+            raise ValueError("RVV 0.7.1 zeroes the tail elements of the accumulators")
+        if isinstance(gen, rvv) and not gen.get_param_value("TU"):
+            raise ValueError("RVV accumulators need the tail-undisturbed vtype (TU parameter)")
+        if eps < 0:
+            raise ValueError("eps must not be negative")
+        self.gen = gen
+        self.rt = rt
+        self.dt = dt
+        self.eps = eps
+        self.vmath = vmath(gen=gen, rt=rt, dt=dt, scheme=scheme)
+        self.regs = {}
+
+    def greg(self, name : str) -> greg_base:
+        """
+        Returns the GP register with the given name, reserves it on first use
+
+        :param name: Name of the register
+        :type name: str
+        :return: GP register
+        :rtype: class:`asmgen.registers.greg_base`
+        """
+        if name not in self.regs:
+            self.regs[name] = self.gen.greg(self.rt.reserve_any_reg('greg'))
+        return self.regs[name]
+
+    def vreg(self, name : str) -> vreg_base:
+        """
+        Returns the vector register with the given name, reserves it on first use
+
+        :param name: Name of the register
+        :type name: str
+        :return: Vector register
+        :rtype: class:`asmgen.registers.vreg_base`
+        """
+        if name not in self.regs:
+            self.regs[name] = self.gen.vreg(self.rt.reserve_any_reg('vreg'))
+        return self.regs[name]
+
+    def freg(self) -> freg_base:
+        """
+        Returns the scalar register the reductions are written to, which is
+        the lowest element of the 'red' vector register if the ISA has no
+        separate FP registers
+        """
+        if 'freg' not in self.regs:
+            if self.gen.are_fregs_in_vregs:
+                idx = self.vreg('red').idx
+            else:
+                idx = self.rt.reserve_any_reg('freg')
+            self.regs['freg'] = self.gen.freg(idx, self.dt)
+        return self.regs['freg']
+
+    def fp(self) -> dict:
+        """
+        Returns the data type arguments of the opd3 operations
+        """
+        return {'a_dt':self.dt, 'b_dt':self.dt, 'c_dt':self.dt}
+
+    def masked(self, mreg) -> dict:
+        """
+        Returns the arguments restricting an opd3 operation to the active
+        elements of the loop, none if the tail is handled through vl or there
+        is no tail
+        """
+        if mreg is None or mreg is self.scalar_tail:
+            return {}
+        return {'modifiers':{mod.MASK}, 'mreg':mreg}
+
+    def load(self, *, areg : greg_base, vreg : vreg_base, mreg) -> str:
+        """
+        Returns the load of the active elements of the loop, the inactive
+        elements are zeroed
+
+        :return: String with the required ASM
+        :rtype: str
+        """
+        if mreg is self.scalar_tail:
+            return self.gen.load_freg(areg=areg, offset=0, dst=self.gen.freg(vreg.idx, self.dt),
+                                      dt=self.dt)
+        if mreg is None:
+            return self.gen.load_vector(areg=areg, vreg=vreg, dt=self.dt)
+        # SVE passes the governing predicate of ld/st as preg
+        key = 'preg' if isinstance(mreg, sve_preg) else 'mreg'
+        return self.gen.load(dregs=[vreg], areg=areg, dt=self.dt,
+                             modifiers={ldst_mod.MASK}, **{key:mreg})
+
+    def store(self, *, areg : greg_base, vreg : vreg_base, mreg) -> str:
+        """
+        Returns the store of the active elements of the loop
+
+        :return: String with the required ASM
+        :rtype: str
+        """
+        if mreg is self.scalar_tail:
+            return self.gen.store_freg(areg=areg, offset=0, src=self.gen.freg(vreg.idx, self.dt),
+                                       dt=self.dt)
+        if mreg is None:
+            return self.gen.store_vector(areg=areg, vreg=vreg, dt=self.dt)
+        key = 'preg' if isinstance(mreg, sve_preg) else 'mreg'
+        return self.gen.store(dregs=[vreg], areg=areg, dt=self.dt,
+                              modifiers={ldst_mod.MASK}, **{key:mreg})
+
+    def advance(self, areg : greg_base, step : greg_base) -> str:
+        """
+        Returns the ASM moving an address past the elements of the current
+        iteration, vsetvli may split the last two vectors evenly
+
+        :param areg: Address register to advance
+        :type areg: class:`asmgen.registers.greg_base`
+        :param step: Number of elements processed by the current iteration
+        :type step: class:`asmgen.registers.greg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        off = self.greg('off')
+        asmblock  = gen.mov_greg(src=step, dst=off)
+        asmblock += gen.shift_greg_left(reg=off, bit_count=adt_size(self.dt).bit_length()-1)
+        asmblock += gen.add_greg_greg(dst=areg, reg1=areg, reg2=off)
+        return asmblock
+
+    def loop(self, *, nreg : greg_base, label : str,
+             body : Callable[[object, greg_base], str]) -> str:
+        """
+        Returns a loop over the n elements of the row, see
+        :meth:`asmgen.asmblocks.noarch.asmgen.vector_loop`. Without predication
+        the body is called with None as mask for the full vectors and with
+        :attr:`scalar_tail` for each of the remaining elements
+
+        :param nreg: GP register containing the number of elements
+        :type nreg: class:`asmgen.registers.greg_base`
+        :param label: Label of the loop
+        :type label: str
+        :param body: Generates the loop body from the mask and step registers
+        :type body: Callable
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        cnt, step = self.greg('cnt'), self.greg('step')
+        asmblock = gen.mov_greg(src=nreg, dst=cnt)
+        try:
+            return asmblock + gen.vector_loop(count_reg=cnt, step_reg=step, label=label,
+                                              dt=self.dt, body=body)
+        except NotImplementedError:
+            pass
+        if not gen.are_fregs_in_vregs:
+            raise NotImplementedError("The scalar remainder loop loads into the vector registers")
+        shift = (gen.simd_size//adt_size(self.dt)).bit_length()-1
+        asmblock += gen.shift_greg_right(reg=cnt, bit_count=shift)
+        asmblock += gen.simd_size_to_greg(reg=step, dt=self.dt)
+        asmblock += gen.loopbegin_nz(reg=cnt, label=label, labelskip=f"{label}_end")
+        asmblock += body(None, step)
+        asmblock += gen.loopend(reg=cnt, label=label)
+        asmblock += gen.label(label=f"{label}_end")
+        # n modulo the number of elements per vector, one element per iteration
+        asmblock += gen.mov_greg(src=nreg, dst=step)
+        asmblock += gen.shift_greg_right(reg=step, bit_count=shift)
+        asmblock += gen.shift_greg_left(reg=step, bit_count=shift)
+        asmblock += gen.sub_greg_greg(dst=cnt, reg1=nreg, reg2=step)
+        asmblock += gen.mov_greg_imm(reg=step, imm=1)
+        asmblock += gen.loopbegin_nz(reg=cnt, label=f"{label}_tail",
+                                     labelskip=f"{label}_tail_end")
+        asmblock += body(self.scalar_tail, step)
+        asmblock += gen.loopend(reg=cnt, label=f"{label}_tail")
+        asmblock += gen.label(label=f"{label}_tail_end")
+        return asmblock
+
+    def allreduce(self, op : str, vreg : vreg_base) -> str:
+        """
+        Returns the ASM reducing the elements of vreg with an opred operation
+        (faddv, fmaxv) and broadcasting the result back into all elements
+
+        :param op: Name of the reduction
+        :type op: str
+        :param vreg: Vector register to reduce
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        asmblock  = getattr(gen, op)(adreg=vreg, bdreg=self.freg(), dt=self.dt,
+                                     tmpreg=self.vreg('tmp'))
+        asmblock += gen.fill_vector(sreg=self.freg(), vreg=vreg, dt=self.dt)
+        return asmblock
+
+    def consts(self, name : str, values : dict[str,float]) -> str:
+        """
+        Returns the ASM broadcasting constants into the vector registers with
+        the given names
+
+        :param name: Name of the kernel the constants belong to
+        :type name: str
+        :param values: Constants by register name
+        :type values: dict[str,float]
+        :return: String with the required ASM
+        :rtype: str
+        """
+        asmblock = self.vmath.begin(name)
+        for reg,value in values.items():
+            asmblock += self.vmath.const(self.vreg(reg), value)
+        return asmblock
+
+    def count(self, nreg : greg_base) -> str:
+        """
+        Returns the ASM broadcasting the number of elements n into the 'red'
+        vector register
+
+        :param nreg: GP register containing the number of elements
+        :type nreg: class:`asmgen.registers.greg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        asmblock  = self.gen.greg_to_freg(greg=nreg, freg=self.freg(), dt=self.dt)
+        asmblock += self.gen.fill_vector(sreg=self.freg(), vreg=self.vreg('red'), dt=self.dt)
+        return asmblock
+
+    def rstd(self, *, sq : vreg_base, one : vreg_base) -> str:
+        """
+        Returns the ASM dividing the broadcast sum of squares by n (see
+        :meth:`count`) and writing 1/sqrt(sq/n+eps) to one, which contains 1
+        in all elements
+
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        nvec = self.vreg('red')
+        asmblock  = gen.fdiv(adreg=sq, bdreg=nvec, cdreg=sq, **self.fp())
+        # Rounding may leave the variance slightly negative
+        asmblock += gen.zero_vreg(vreg=nvec, dt=self.dt)
+        asmblock += gen.fmax(adreg=sq, bdreg=nvec, cdreg=sq, **self.fp())
+        asmblock += gen.fadd(adreg=sq, bdreg=self.vreg('eps'), cdreg=sq, **self.fp())
+        asmblock += gen.sqrt_vreg(vreg=sq, dst=sq, dt=self.dt)
+        asmblock += gen.fdiv(adreg=one, bdreg=sq, cdreg=one, **self.fp())
+        return asmblock
+
+    def softmax(self, *, xreg : greg_base, yreg : greg_base, nreg : greg_base,
+                label : str = "softmax") -> str:
+        """
+        Returns the softmax kernel. x and y may be the same row, the registers
+        passed are not modified
+
+        :param xreg: Address of the input row
+        :type xreg: class:`asmgen.registers.greg_base`
+        :param yreg: Address of the output row
+        :type yreg: class:`asmgen.registers.greg_base`
+        :param nreg: Number of elements of the row, must be at least 1
+        :type nreg: class:`asmgen.registers.greg_base`
+        :param label: Prefix of the labels used in the kernel
+        :type label: str
+        :return: String with the kernel ASM
+        :rtype: str
+        """
+        gen = self.gen
+        px, py = self.greg('px'), self.greg('py')
+        x, acc, e = self.vreg('x'), self.vreg('acc'), self.vreg('e')
+        one, neg = self.vreg('one'), self.vreg('neg')
+
+        def maximum(mreg, step):
+            if mreg is self.scalar_tail:
+                # Zeroed elements would take part in the maximum
+                asmblock = gen.load_vector_bcast1(areg=px, vreg=x, dt=self.dt)
+            else:
+                asmblock = self.load(areg=px, vreg=x, mreg=mreg)
+            asmblock += gen.fmax(adreg=acc, bdreg=x, cdreg=acc, **self.fp(),
+                                 **self.masked(mreg))
+            return asmblock + self.advance(px, step)
+
+        def exponential(mreg, step):
+            asmblock  = self.load(areg=px, vreg=x, mreg=mreg)
+            asmblock += gen.fadd(adreg=x, bdreg=neg, cdreg=x, **self.fp())
+            asmblock += self.vmath.exp(dst=e, src=x)
+            asmblock += self.store(areg=py, vreg=e, mreg=mreg)
+            if mreg is self.scalar_tail:
+                # Only sum the stored element, e^(-max) of the zeroed ones isn't 0
+                asmblock += self.load(areg=py, vreg=e, mreg=mreg)
+            asmblock += gen.fadd(adreg=acc, bdreg=e, cdreg=acc, **self.fp(),
+                                 **self.masked(mreg))
+            asmblock += self.advance(px, step)
+            return asmblock + self.advance(py, step)
+
+        def scale(mreg, step):
+            asmblock  = self.load(areg=py, vreg=x, mreg=mreg)
+            asmblock += gen.fmul(adreg=x, bdreg=one, cdreg=x, **self.fp())
+            asmblock += self.store(areg=py, vreg=x, mreg=mreg)
+            return asmblock + self.advance(py, step)
+
+        asmblock  = self.consts("softmax", {'one':1.0, 'neg':-1.0})
+        # Starting from an element of the row, the inactive elements never count
+        asmblock += gen.load_vector_bcast1(areg=xreg, vreg=acc, dt=self.dt)
+        asmblock += gen.mov_greg(src=xreg, dst=px)
+        asmblock += self.loop(nreg=nreg, label=f"{label}_max", body=maximum)
+        asmblock += self.allreduce("fmaxv", acc)
+        asmblock += gen.fmul(adreg=neg, bdreg=acc, cdreg=neg, **self.fp())
+
+        asmblock += gen.zero_vreg(vreg=acc, dt=self.dt)
+        asmblock += gen.mov_greg(src=xreg, dst=px)
+        asmblock += gen.mov_greg(src=yreg, dst=py)
+        asmblock += self.loop(nreg=nreg, label=f"{label}_exp", body=exponential)
+        asmblock += self.allreduce("faddv", acc)
+        asmblock += gen.fdiv(adreg=one, bdreg=acc, cdreg=one, **self.fp())
+
+        asmblock += gen.mov_greg(src=yreg, dst=py)
+        asmblock += self.loop(nreg=nreg, label=f"{label}_scale", body=scale)
+        return asmblock
+
+    # pylint: disable-next=too-many-arguments,too-many-locals
+    def layernorm(self, *, xreg : greg_base, yreg : greg_base, nreg : greg_base,
+                  gammareg : greg_base|None = None, betareg : greg_base|None = None,
+                  label : str = "layernorm") -> str:
+        """
+        Returns the layernorm kernel. x and y may be the same row, the registers
+        passed are not modified
+
+        :param xreg: Address of the input row
+        :type xreg: class:`asmgen.registers.greg_base`
+        :param yreg: Address of the output row
+        :type yreg: class:`asmgen.registers.greg_base`
+        :param nreg: Number of elements of the row, must be at least 1
+        :type nreg: class:`asmgen.registers.greg_base`
+        :param gammareg: Address of the n scales, None to not scale
+        :type gammareg: class:`asmgen.registers.greg_base`
+        :param betareg: Address of the n offsets, None to not add an offset
+        :type betareg: class:`asmgen.registers.greg_base`
+        :param label: Prefix of the labels used in the kernel
+        :type label: str
+        :return: String with the kernel ASM
+        :rtype: str
+        """
+        gen = self.gen
+        px, py = self.greg('px'), self.greg('py')
+        x, acc, sq = self.vreg('x'), self.vreg('acc'), self.vreg('sq')
+        one, neg, shift = self.vreg('one'), self.vreg('neg'), self.vreg('shift')
+        pg = None if gammareg is None else self.greg('pgamma')
+        pb = None if betareg is None else self.greg('pbeta')
+
+        def moments(mreg, step):
+            asmblock  = self.load(areg=px, vreg=x, mreg=mreg)
+            if mreg is self.scalar_tail:
+                # Shift the loaded element only, the zeroed ones have to stay 0
+                tshift = self.vreg('tmp')
+                asmblock += self.load(areg=xreg, vreg=tshift, mreg=mreg)
+                asmblock += gen.fmul(adreg=tshift, bdreg=neg, cdreg=tshift, **self.fp())
+                asmblock += gen.fadd(adreg=x, bdreg=tshift, cdreg=x, **self.fp())
+            else:
+                asmblock += gen.fadd(adreg=x, bdreg=shift, cdreg=x, **self.fp())
+            asmblock += gen.fadd(adreg=acc, bdreg=x, cdreg=acc, **self.fp(),
+                                 **self.masked(mreg))
+            asmblock += gen.fma(adreg=x, bdreg=x, cdreg=sq, **self.fp(),
+                                **self.masked(mreg))
+            return asmblock + self.advance(px, step)
+
+        def normalize(mreg, step):
+            asmblock  = self.load(areg=px, vreg=x, mreg=mreg)
+            asmblock += gen.fadd(adreg=x, bdreg=shift, cdreg=x, **self.fp())
+            asmblock += gen.fmul(adreg=x, bdreg=one, cdreg=x, **self.fp())
+            asmblock += self.advance(px, step)
+            out = x
+            if pb is not None:
+                out = self.vreg('beta')
+                asmblock += self.load(areg=pb, vreg=out, mreg=mreg)
+                asmblock += self.advance(pb, step)
+            if pg is not None:
+                gamma = self.vreg('gamma')
+                asmblock += self.load(areg=pg, vreg=gamma, mreg=mreg)
+                asmblock += self.advance(pg, step)
+                if pb is not None:
+                    asmblock += gen.fma(adreg=x, bdreg=gamma, cdreg=out, **self.fp())
+                else:
+                    asmblock += gen.fmul(adreg=x, bdreg=gamma, cdreg=x, **self.fp())
+            elif pb is not None:
+                asmblock += gen.fadd(adreg=out, bdreg=x, cdreg=out, **self.fp())
+            asmblock += self.store(areg=py, vreg=out, mreg=mreg)
+            return asmblock + self.advance(py, step)
+
+        asmblock  = self.consts("layernorm", {'one':1.0, 'neg':-1.0, 'eps':self.eps})
+        # Shift by -x[0]
+        asmblock += gen.load_vector_bcast1(areg=xreg, vreg=shift, dt=self.dt)
+        asmblock += gen.fmul(adreg=shift, bdreg=neg, cdreg=shift, **self.fp())
+        asmblock += gen.zero_vreg(vreg=acc, dt=self.dt)
+        asmblock += gen.zero_vreg(vreg=sq, dt=self.dt)
+        asmblock += gen.mov_greg(src=xreg, dst=px)
+        asmblock += self.loop(nreg=nreg, label=f"{label}_moments", body=moments)
+        asmblock += self.allreduce("faddv", acc)
+        asmblock += self.allreduce("faddv", sq)
+
+        # d = mean of the shifted elements, var = sq/n - d^2, shift = -x[0] - d
+        nvec = self.vreg('red')
+        asmblock += self.count(nreg)
+        asmblock += gen.fdiv(adreg=acc, bdreg=nvec, cdreg=acc, **self.fp())
+        asmblock += gen.fmul(adreg=neg, bdreg=acc, cdreg=neg, **self.fp())
+        asmblock += gen.fadd(adreg=shift, bdreg=neg, cdreg=shift, **self.fp())
+        asmblock += gen.fmul(adreg=neg, bdreg=nvec, cdreg=neg, **self.fp())
+        asmblock += gen.fma(adreg=neg, bdreg=acc, cdreg=sq, **self.fp())
+        asmblock += self.rstd(sq=sq, one=one)
+
+        asmblock += gen.mov_greg(src=xreg, dst=px)
+        asmblock += gen.mov_greg(src=yreg, dst=py)
+        if pg is not None:
+            asmblock += gen.mov_greg(src=gammareg, dst=pg)
+        if pb is not None:
+            asmblock += gen.mov_greg(src=betareg, dst=pb)
+        asmblock += self.loop(nreg=nreg, label=f"{label}_normalize", body=normalize)
+        return asmblock
+
+    # pylint: disable-next=too-many-arguments
+    def rmsnorm(self, *, xreg : greg_base, yreg : greg_base, nreg : greg_base,
+                gammareg : greg_base|None = None, label : str = "rmsnorm") -> str:
+        """
+        Returns the rmsnorm kernel. x and y may be the same row, the registers
+        passed are not modified
+
+        :param xreg: Address of the input row
+        :type xreg: class:`asmgen.registers.greg_base`
+        :param yreg: Address of the output row
+        :type yreg: class:`asmgen.registers.greg_base`
+        :param nreg: Number of elements of the row, must be at least 1
+        :type nreg: class:`asmgen.registers.greg_base`
+        :param gammareg: Address of the n scales, None to not scale
+        :type gammareg: class:`asmgen.registers.greg_base`
+        :param label: Prefix of the labels used in the kernel
+        :type label: str
+        :return: String with the kernel ASM
+        :rtype: str
+        """
+        gen = self.gen
+        px, py = self.greg('px'), self.greg('py')
+        x, sq, one = self.vreg('x'), self.vreg('sq'), self.vreg('one')
+        pg = None if gammareg is None else self.greg('pgamma')
+
+        def squares(mreg, step):
+            asmblock  = self.load(areg=px, vreg=x, mreg=mreg)
+            asmblock += gen.fma(adreg=x, bdreg=x, cdreg=sq, **self.fp(),
+                                **self.masked(mreg))
+            return asmblock + self.advance(px, step)
+
+        def normalize(mreg, step):
+            asmblock  = self.load(areg=px, vreg=x, mreg=mreg)
+            asmblock += gen.fmul(adreg=x, bdreg=one, cdreg=x, **self.fp())
+            asmblock += self.advance(px, step)
+            if pg is not None:
+                gamma = self.vreg('gamma')
+                asmblock += self.load(areg=pg, vreg=gamma, mreg=mreg)
+                asmblock += gen.fmul(adreg=x, bdreg=gamma, cdreg=x, **self.fp())
+                asmblock += self.advance(pg, step)
+            asmblock += self.store(areg=py, vreg=x, mreg=mreg)
+            return asmblock + self.advance(py, step)
+
+        asmblock  = self.consts("rmsnorm", {'one':1.0, 'eps':self.eps})
+        asmblock += gen.zero_vreg(vreg=sq, dt=self.dt)
+        asmblock += gen.mov_greg(src=xreg, dst=px)
+        asmblock += self.loop(nreg=nreg, label=f"{label}_squares", body=squares)
+        asmblock += self.allreduce("faddv", sq)
+        asmblock += self.count(nreg)
+        asmblock += self.rstd(sq=sq, one=one)
+
+        asmblock += gen.mov_greg(src=xreg, dst=px)
+        asmblock += gen.mov_greg(src=yreg, dst=py)
+        if pg is not None:
+            asmblock += gen.mov_greg(src=gammareg, dst=pg)
+        asmblock += self.loop(nreg=nreg, label=f"{label}_normalize", body=normalize)
+        return asmblock
@@ -0,0 +1,252 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+SME GEMM microkernel generator accumulating in the ZA tiles
+"""
+
+from ..registers import (
+    reg_tracker,
+    asm_data_type as adt,
+    adt_size,
+    adt_is_float,
+    greg_base, freg_base
+)
+from ..asmblocks.sme import sme
+from ..asmblocks.noarch import comparison
+from ..asmblocks.operations import opdna1_modifier as mod
+
+class sme_gemm:
+    """
+    Generates SME GEMM microkernels computing C = alpha*A*B + beta*C for a block of
+    mr_tiles*SVL x nr_tiles*SVL elements of C (SVL: elements of c_dt per vector)
+
+    All tiles available for c_dt are used as accumulators, arranged as 2 x (tiles/2)
+    (or 1 x tiles if there are less than 4). Per step of the K loop mr_tiles vectors
+    of A and nr_tiles vectors of B are loaded and combined with one FMOPA per tile.
+
+    A and B have to be packed: for every step the mr_tiles (nr_tiles) vectors are
+    contiguous in memory. For widening data types each vector holds
+    adt_size(c_dt)/adt_size(a_dt) consecutive K values per element of C
+    (see :attr:`kstep`), which the instructions reduce into one element.
+    C is row-major with the leading dimension passed in bytes.
+
+    p0 has to be all-true for a_dt and streaming mode has to be enabled, i.e.
+    `sme.isaquirks` has to be called with a_dt before the kernel.
+    """
+
+    def __init__(self, *, gen : sme, rt : reg_tracker, a_dt : adt, c_dt : adt):
+        """
+        Constructor method
+
+        :param gen: SME generator to use
+        :type gen: class:`asmgen.asmblocks.sme.sme`
+        :param rt: register tracker to allocate the internally used registers from
+        :type rt: class:`asmgen.registers.reg_tracker`
+        :param a_dt: Data type of the A and B components
+        :type a_dt: class:`asmgen.registers.asm_data_type`
+        :param c_dt: Data type of the C component (accumulators)
+        :type c_dt: class:`asmgen.registers.asm_data_type`
+        """
+        dts = {'adreg':a_dt, 'bdreg':a_dt, 'cdreg':c_dt}
+        if not any(dts.items() <= sup.items() for sup in gen.fopa.supported_dts()):
+            raise ValueError(f"SME has no outer product for {a_dt.name} -> {c_dt.name}")
+
+        self.gen = gen
+        self.rt = rt
+        self.a_dt = a_dt
+        self.c_dt = c_dt
+
+        tiles = gen.max_tregs(c_dt)
+        self.mr_tiles = 2 if tiles >= 4 else 1
+        self.nr_tiles = tiles//self.mr_tiles
+
+    @property
+    def kstep(self) -> int:
+        """
+        Number of K values consumed by every FMOPA (widening outer products)
+        """
+        return adt_size(self.c_dt)//adt_size(self.a_dt)
+
+    @property
+    def slices_per_iter(self) -> int:
+        """
+        Number of tile rows stored per iteration of the store loop, limited
+        by the immediate slice offset range
+        """
+        return 16//adt_size(self.c_dt)
+
+    def reserve(self, type_tag : str) -> int:
+        """
+        Reserves a register for use in the kernel
+
+        :param type_tag: Type of the register
+        :type type_tag: str
+        :return: Index of the reserved register
+        :rtype: int
+        """
+        return self.rt.reserve_any_reg(type_tag)
+
+    def reserve_slice_reg(self) -> greg_base:
+        """
+        Reserves one of the GP registers usable as tile slice index (x12-x15)
+
+        :return: Reserved register
+        :rtype: class:`asmgen.registers.greg_base`
+        """
+        for idx in range(12, 16):
+            if idx not in self.rt.used_regs['greg']:
+                self.rt.reserve_specific_reg('greg', idx)
+                return self.gen.greg(idx)
+        raise IndexError("No tile slice register (x12-x15) available")
+
+    # pylint: disable-next=too-many-locals
+    def generate(self, *, areg : greg_base, breg : greg_base,
+                 creg : greg_base, ldcreg : greg_base, kreg : greg_base,
+                 label : str = "sme_gemm",
+                 alpha : freg_base|None = None,
+                 beta : freg_base|None = None) -> str:
+        """
+        Returns the microkernel. areg, breg, creg and kreg are modified
+
+        :param areg: Address of packed A
+        :type areg: class:`asmgen.registers.greg_base`
+        :param breg: Address of packed B
+        :type breg: class:`asmgen.registers.greg_base`
+        :param creg: Address of the C block
+        :type creg: class:`asmgen.registers.greg_base`
+        :param ldcreg: Leading dimension of C in bytes
+        :type ldcreg: class:`asmgen.registers.greg_base`
+        :param kreg: Number of K steps (K/kstep), must be at least 1
+        :type kreg: class:`asmgen.registers.greg_base`
+        :param label: Prefix of the labels used in the kernel
+        :type label: str
+        :param alpha: Scalar to scale A*B with, None for no scaling
+        :type alpha: class:`asmgen.registers.freg_base`
+        :param beta: Scalar to scale and add the previous C with, None to overwrite C
+        :type beta: class:`asmgen.registers.freg_base`
+        :return: String with the kernel ASM
+        :rtype: str
+        """
+        gen = self.gen
+        if (alpha is not None or beta is not None) and not adt_is_float(self.c_dt):
+            raise ValueError("alpha/beta scaling is only supported for floating point C")
+
+        tregs = [gen.treg(i, self.c_dt) for i in range(self.mr_tiles*self.nr_tiles)]
+        if 'treg' in self.rt.registered_types:
+            for t in tregs:
+                self.rt.reserve_specific_reg('treg', t.idx)
+        avregs = [gen.vreg(self.reserve('vreg')) for _ in range(self.mr_tiles)]
+        bvregs = [gen.vreg(self.reserve('vreg')) for _ in range(self.nr_tiles)]
+
+        asmblock = ""
+        for t in tregs:
+            asmblock += gen.zero_treg(treg=t, dt=self.c_dt)
+
+        # Accumulate
+        asmblock += gen.loopbegin(reg=kreg, label=f"{label}_k")
+        for i,v in enumerate(avregs):
+            asmblock += gen.load(dregs=[v], areg=areg, dt=self.a_dt,
+                                 modifiers={mod.VOFFSET}, voffset=i)
+        for i,v in enumerate(bvregs):
+            asmblock += gen.load(dregs=[v], areg=breg, dt=self.a_dt,
+                                 modifiers={mod.VOFFSET}, voffset=i)
+        asmblock += gen.add_greg_voff(reg=areg, offset=self.mr_tiles, dt=self.a_dt)
+        asmblock += gen.add_greg_voff(reg=breg, offset=self.nr_tiles, dt=self.a_dt)
+        for i,av in enumerate(avregs):
+            for j,bv in enumerate(bvregs):
+                asmblock += gen.fopa(adreg=av, bdreg=bv, cdreg=tregs[i*self.nr_tiles+j],
+                                     a_dt=self.a_dt, b_dt=self.a_dt, c_dt=self.c_dt)
+        asmblock += gen.loopend(reg=kreg, label=f"{label}_k")
+
+        asmblock += self.store(creg=creg, ldcreg=ldcreg, label=label,
+                               tregs=tregs, alpha=alpha, beta=beta)
+        return asmblock
+
+    # pylint: disable-next=too-many-locals,too-many-arguments
+    def store(self, *, creg : greg_base, ldcreg : greg_base, label : str,
+              tregs : list, alpha : freg_base|None, beta : freg_base|None) -> str:
+        """
+        Returns the ASM storing the accumulator tiles back to C row by row
+
+        :param creg: Address of the C block
+        :type creg: class:`asmgen.registers.greg_base`
+        :param ldcreg: Leading dimension of C in bytes
+        :type ldcreg: class:`asmgen.registers.greg_base`
+        :param label: Prefix of the labels used in the kernel
+        :type label: str
+        :param tregs: Accumulator tiles
+        :type tregs: list[class:`asmgen.registers.treg_base`]
+        :param alpha: Scalar to scale A*B with, None for no scaling
+        :type alpha: class:`asmgen.registers.freg_base`
+        :param beta: Scalar to scale and add the previous C with, None to overwrite C
+        :type beta: class:`asmgen.registers.freg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        dt = self.c_dt
+        scaled = alpha is not None or beta is not None
+
+        slicereg = self.reserve_slice_reg()
+        rowsreg = gen.greg(self.reserve('greg'))
+        # Row pointer into C for every row of tiles
+        crowregs = [creg] + [gen.greg(self.reserve('greg')) for _ in range(1, self.mr_tiles)]
+        # Element offset of every column of tiles
+        coffregs = [None] + [gen.greg(self.reserve('greg')) for _ in range(1, self.nr_tiles)]
+
+        asmblock  = gen.simd_size_to_greg(reg=rowsreg, dt=dt)
+        asmblock += gen.zero_greg(greg=slicereg)
+        for j in range(1, self.nr_tiles):
+            if 1 == j:
+                asmblock += gen.mov_greg(src=rowsreg, dst=coffregs[j])
+            else:
+                asmblock += gen.add_greg_greg(dst=coffregs[j], reg1=coffregs[j-1],
+                                              reg2=rowsreg)
+        if self.mr_tiles > 1:
+            asmblock += gen.mul_greg_greg(dst=crowregs[1], reg1=rowsreg, reg2=ldcreg)
+            asmblock += gen.add_greg_greg(dst=crowregs[1], reg1=crowregs[1], reg2=creg)
+
+        if scaled:
+            accv = gen.vreg(self.reserve('vreg'))
+            cv = gen.vreg(self.reserve('vreg'))
+            alphav = None if alpha is None else gen.vreg(self.reserve('vreg'))
+            betav = None if beta is None else gen.vreg(self.reserve('vreg'))
+            if alpha is not None:
+                asmblock += gen.fill_vector(sreg=alpha, vreg=alphav, dt=dt)
+            if beta is not None:
+                asmblock += gen.fill_vector(sreg=beta, vreg=betav, dt=dt)
+
+        asmblock += gen.label(label=f"{label}_store")
+        for r in range(self.slices_per_iter):
+            for i in range(self.mr_tiles):
+                for j in range(self.nr_tiles):
+                    treg = tregs[i*self.nr_tiles+j]
+                    memmods = set() if j == 0 else {mod.GOFFSET}
+                    memargs = {} if j == 0 else {'offreg' : coffregs[j]}
+                    if not scaled:
+                        asmblock += gen.store(dregs=[treg], areg=crowregs[i], dt=dt,
+                                              modifiers={mod.ROW}|memmods,
+                                              rowreg=slicereg, immrow=r, **memargs)
+                        continue
+                    asmblock += gen.extract_tile_rows(rreg=slicereg, roff_start=r,
+                                                      roff_end=r, treg=treg,
+                                                      vregs=[accv], dt=dt)
+                    if alpha is not None:
+                        asmblock += gen.fmul(adreg=accv, bdreg=alphav, cdreg=accv,
+                                             a_dt=dt, b_dt=dt, c_dt=dt)
+                    if beta is not None:
+                        asmblock += gen.load(dregs=[cv], areg=crowregs[i], dt=dt,
+                                             modifiers=memmods, **memargs)
+                        asmblock += gen.fma(adreg=cv, bdreg=betav, cdreg=accv,
+                                            a_dt=dt, b_dt=dt, c_dt=dt)
+                    asmblock += gen.store(dregs=[accv], areg=crowregs[i], dt=dt,
+                                          modifiers=memmods, **memargs)
+            for i in range(self.mr_tiles):
+                asmblock += gen.add_greg_greg(dst=crowregs[i], reg1=crowregs[i], reg2=ldcreg)
+        asmblock += gen.add_greg_imm(reg=slicereg, imm=self.slices_per_iter)
+        asmblock += gen.cb(reg1=slicereg, reg2=rowsreg, cmp=comparison.LT,
+                           label=f"{label}_store")
+        return asmblock
@@ -0,0 +1,500 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Generators for vectorized transcendental functions (exp, log, tanh, sigmoid)
+"""
+
+import math
+import struct
+from decimal import Decimal, localcontext
+from enum import Enum, auto
+from fractions import Fraction
+from functools import lru_cache
+
+from ..asmdata import asm_data, adt_fp_bits
+from ..registers import (
+    reg_tracker,
+    asm_data_type as adt,
+    adt_size,
+    greg_base, vreg_base
+)
+from ..asmblocks.noarch import asmgen
+
+class poly_scheme(Enum):
+    """
+    Ways to evaluate the polynomials
+    """
+    HORNER = auto() # one dependent fma per coefficient, fewest registers
+    ESTRIN = auto() # independent fmas on a tree of powers, more ILP and registers
+
+# Target relative error of exp and log (absolute error of tanh and sigmoid),
+# about 4 ulp
+vmath_accuracy = {
+        adt.FP16 : 2**-8,
+        adt.FP32 : 2**-21,
+        adt.FP64 : 2**-50,
+        }
+
+VMATH_MAX_DEGREE = 32
+
+def round_to_dt(value : float|Decimal|Fraction, dt : adt) -> float:
+    """
+    Rounds a value to the nearest value representable in a floating point type
+
+    :param value: Value to round
+    :type value: float
+    :param dt: Floating point data type
+    :type dt: class:`asmgen.registers.asm_data_type`
+    :return: Rounded value
+    :rtype: float
+    """
+    fmt = {adt.FP16 : 'e', adt.FP32 : 'f', adt.FP64 : 'd'}
+    if dt not in fmt:
+        raise ValueError(f"{dt} is not supported by vmath")
+    return struct.unpack(fmt[dt], struct.pack(fmt[dt], float(value)))[0]
+
+def vmath_reference(func : str, x : Decimal) -> Decimal:
+    """
+    Returns the function approximated by the polynomial of a vmath function
+
+    - exp: e^r on the reduced interval
+    - log: log(1+f)/f on the reduced interval
+
+    :param func: Name of the vmath function
+    :type func: str
+    :param x: Argument
+    :type x: Decimal
+    :return: Function value
+    :rtype: Decimal
+    """
+    if "exp" == func:
+        return x.exp()
+    if "log" == func:
+        return (1+x).ln()/x if x else Decimal(1)
+    raise ValueError(f"No polynomial for {func}")
+
+def vmath_interval(func : str) -> tuple[float,float]:
+    """
+    Returns the reduced interval of a vmath function, slightly widened to cover
+    the rounding errors of the range reduction
+
+    :param func: Name of the vmath function
+    :type func: str
+    :return: Lower and upper bound
+    :rtype: tuple[float,float]
+    """
+    if "exp" == func:
+        return (-0.35, 0.35)
+    if "log" == func:
+        return (-0.34, 0.34)
+    raise ValueError(f"No polynomial for {func}")
+
+@lru_cache
+def vmath_coefficients(func : str, dt : adt) -> tuple[float,...]:
+    """
+    Returns the coefficients (lowest order first) of the polynomial of a vmath
+    function. The degree is the smallest one for which the interpolant in the
+    Chebyshev nodes, rounded to dt, has a relative error below a quarter of the
+    accuracy target of dt
+
+    :param func: Name of the vmath function (exp, log)
+    :type func: str
+    :param dt: Floating point data type
+    :type dt: class:`asmgen.registers.asm_data_type`
+    :return: Coefficients
+    :rtype: tuple[float,...]
+    """
+    if dt not in vmath_accuracy:
+        raise ValueError(f"{dt} is not supported by vmath")
+    tolerance = vmath_accuracy[dt]/4
+    lo, hi = vmath_interval(func)
+    with localcontext() as ctx:
+        ctx.prec = 60
+        grid = [Decimal(lo) + (Decimal(hi)-Decimal(lo))*i/256 for i in range(257)]
+        reference = [vmath_reference(func, x) for x in grid]
+        for degree in range(1, VMATH_MAX_DEGREE+1):
+            nodes = [Decimal((lo+hi)/2 + (hi-lo)/2*math.cos((2*k+1)*math.pi/(2*degree+2)))
+                     for k in range(degree+1)]
+            # Vandermonde system, solved by Gaussian elimination with pivoting
+            rows = [[x**i for i in range(degree+1)] + [vmath_reference(func, x)]
+                    for x in nodes]
+            for col in range(degree+1):
+                pivot = max(range(col, degree+1), key=lambda r, c=col: abs(rows[r][c]))
+                rows[col], rows[pivot] = rows[pivot], rows[col]
+                for r in range(col+1, degree+1):
+                    factor = rows[r][col]/rows[col][col]
+                    rows[r] = [a - factor*b for a,b in zip(rows[r], rows[col])]
+            coeffs = [Decimal(0)]*(degree+1)
+            for r in reversed(range(degree+1)):
+                acc = rows[r][-1] - sum(rows[r][c]*coeffs[c] for c in range(r+1, degree+1))
+                coeffs[r] = acc/rows[r][r]
+            rounded = [round_to_dt(c, dt) for c in coeffs]
+            error = 0
+            for x,ref in zip(grid, reference):
+                value = Decimal(0)
+                for c in reversed(rounded):
+                    value = value*x + Decimal(c)
+                error = max(error, abs((value-ref)/ref))
+            if error < tolerance:
+                return tuple(rounded)
+    raise ValueError(f"No polynomial of degree <= {VMATH_MAX_DEGREE} reaches the "
+                     f"accuracy target of {func} for {dt}")
+
+class vmath:
+    """
+    Generates vectorized exp, log, tanh and sigmoid from the generator primitives:
+    a range reduction, a polynomial evaluated with fma (see :class:`poly_scheme`)
+    and a reconstruction with the exponent helpers of the ISA
+    (:meth:`asmgen.asmblocks.noarch.asmgen.scale_pow2`,
+    :meth:`asmgen.asmblocks.noarch.asmgen.split_exponent`).
+
+    - exp: x = n*ln2 + r with |r| <= ln2/2, e^x = 2^n*p(r)
+    - log: x = 2^n*m with m in [2/3,4/3), log(x) = n*ln2 + f*p(f) with f = m-1
+    - tanh: 1 - 2/(1+e^(2x))
+    - sigmoid: 1/(1+e^(-x))
+
+    The polynomial degrees are chosen per data type to reach
+    :data:`vmath_accuracy` (relative error for exp and log, absolute error for
+    tanh and sigmoid). The inputs are clamped: exp saturates at the largest and
+    smallest normal results it can scale to instead of overflowing to infinity
+    or flushing to zero, log of values below the smallest normal number returns
+    the log of the smallest normal number. The results for NaN and infinity
+    are unspecified.
+
+    The constants (clamping bounds, ln2 split into two parts, coefficients) are
+    stored in the ISA data of the generator, one table per function, see
+    :meth:`asmgen.asmblocks.noarch.asmgen.isadata`, and are broadcast from
+    memory when they are needed. The temporary registers are reserved from the
+    register tracker on first use and kept.
+
+    The ISA quirks have to be set up for dt before the functions (e.g. p0 all-true
+    on SVE, vtype on RVV). Every data type needs the conversion to the signed
+    integer type of the same size, i.e. FP64 isn't supported with AVX2
+    """
+
+    def __init__(self, *, gen : asmgen, rt : reg_tracker, dt : adt = adt.FP32,
+                 scheme : poly_scheme = poly_scheme.HORNER):
+        """
+        Constructor method
+
+        :param gen: Generator to use
+        :type gen: class:`asmgen.asmblocks.noarch.asmgen`
+        :param rt: register tracker to allocate the internally used registers from
+        :type rt: class:`asmgen.registers.reg_tracker`
+        :param dt: Floating point data type of the elements
+        :type dt: class:`asmgen.registers.asm_data_type`
+        :param scheme: How to evaluate the polynomials
+        :type scheme: class:`asmgen.kernels.vmath.poly_scheme`
+        """
+        if dt not in vmath_accuracy:
+            raise ValueError(f"{dt} is not supported by vmath")
+        self.gen = gen
+        self.rt = rt
+        self.dt = dt
+        self.scheme = scheme
+        self.regs = {}
+        self.table = []
+        self.ptroff = 0
+
+    @property
+    def accuracy(self) -> float:
+        """
+        Accuracy target of the data type
+        """
+        return vmath_accuracy[self.dt]
+
+    @property
+    def int_dt(self) -> adt:
+        """
+        Signed integer type of the same size as the data type
+        """
+        return {2 : adt.SINT16, 4 : adt.SINT32, 8 : adt.SINT64}[adt_size(self.dt)]
+
+    def greg(self) -> greg_base:
+        """
+        Returns the GP register holding the address of the constants
+        """
+        if 'ptr' not in self.regs:
+            self.regs['ptr'] = self.gen.greg(self.rt.reserve_any_reg('greg'))
+        return self.regs['ptr']
+
+    def vreg(self, name : str) -> vreg_base:
+        """
+        Returns the temporary vector register with the given name, reserves it
+        on first use
+
+        :param name: Name of the temporary register
+        :type name: str
+        :return: Vector register
+        :rtype: class:`asmgen.registers.vreg_base`
+        """
+        if name not in self.regs:
+            self.regs[name] = self.gen.vreg(self.rt.reserve_any_reg('vreg'))
+        return self.regs[name]
+
+    def table_name(self, func : str) -> str:
+        """
+        Returns the name of the constant table of a function in the ISA data
+
+        :param func: Name of the function
+        :type func: str
+        :return: Name of the table
+        :rtype: str
+        """
+        return f"vmath_{func}_{self.dt.name.lower()}_{self.scheme.name.lower()}"
+
+    def begin(self, func : str) -> str:
+        """
+        Starts a new constant table and returns the ASM loading its address
+
+        :param func: Name of the function
+        :type func: str
+        :return: String with the required ASM
+        :rtype: str
+        """
+        self.table = []
+        self.ptroff = 0
+        self.gen.asmdata[self.table_name(func)] = self.table
+        return self.gen.load_data_address(areg=self.greg(), name=self.table_name(func))
+
+    def const(self, vreg : vreg_base, value : float) -> str:
+        """
+        Appends a constant to the current table and returns the ASM broadcasting
+        it into vreg. The constants are consumed in order, so the address only
+        ever moves forward
+
+        :param vreg: Vector register to broadcast the constant into
+        :type vreg: class:`asmgen.registers.vreg_base`
+        :param value: Value of the constant
+        :type value: float
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        size = adt_size(self.dt)
+        offset = len(self.table)*size
+        self.table.append(asm_data(self.dt, round_to_dt(value, self.dt)))
+
+        delta = offset - self.ptroff
+        asmblock = ""
+        if delta and gen.min_bcast_immoff(self.dt) <= delta <= gen.max_bcast_immoff(self.dt):
+            return gen.load_vector_bcast1_immoff(areg=self.greg(), offset=delta,
+                                                 vreg=vreg, dt=self.dt)
+        if delta:
+            asmblock += gen.add_greg_imm(reg=self.greg(), imm=delta)
+            self.ptroff = offset
+        try:
+            asmblock += gen.load_vector_bcast1_inc(areg=self.greg(), offset=size,
+                                                   vreg=vreg, dt=self.dt)
+            self.ptroff += size
+        except NotImplementedError:
+            asmblock += gen.load_vector_bcast1(areg=self.greg(), vreg=vreg, dt=self.dt)
+        return asmblock
+
+    def fp(self) -> dict:
+        """
+        Returns the data type arguments of the opd3 operations
+        """
+        return {'a_dt':self.dt, 'b_dt':self.dt, 'c_dt':self.dt}
+
+    def ln2_parts(self) -> tuple[float,float]:
+        """
+        Returns ln2 split into a part with trailing zero bits, such that its
+        products with all exponents are exact, and the rounded remainder
+        """
+        ebits,mbits,_ = adt_fp_bits(self.dt)
+        bits = mbits + 1 - (1 << (ebits-1)).bit_length()
+        with localcontext() as ctx:
+            ctx.prec = 60
+            ln2 = Decimal(2).ln()
+            hi = Fraction(round(ln2*2**bits), 2**bits)
+            return float(hi), round_to_dt(ln2 - Decimal(hi.numerator)/hi.denominator, self.dt)
+
+    def poly(self, *, dst : vreg_base, xreg : vreg_base, func : str) -> str:
+        """
+        Returns the ASM evaluating the polynomial of a function in xreg into dst
+
+        :param dst: Vector register to write the result to
+        :type dst: class:`asmgen.registers.vreg_base`
+        :param xreg: Vector register containing the argument
+        :type xreg: class:`asmgen.registers.vreg_base`
+        :param func: Name of the function
+        :type func: str
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        coeffs = vmath_coefficients(func, self.dt)
+        if poly_scheme.HORNER == self.scheme:
+            # Alternate between two registers such that the last step writes dst
+            accs = [dst, self.vreg('t1')]
+            degree = len(coeffs)-1
+            asmblock = self.const(accs[degree%2], coeffs[degree])
+            for i in reversed(range(degree)):
+                asmblock += self.const(accs[i%2], coeffs[i])
+                asmblock += gen.fma(adreg=accs[(i+1)%2], bdreg=xreg, cdreg=accs[i%2],
+                                    **self.fp())
+            return asmblock
+
+        # Pairs c[2j] + c[2j+1]*x, combined with x^2, x^4, ... in a tree
+        terms = [dst] + [self.vreg(f"term{j}") for j in range(1, (len(coeffs)+1)//2)]
+        asmblock = ""
+        for j,term in enumerate(terms):
+            asmblock += self.const(term, coeffs[2*j])
+            if 2*j+1 < len(coeffs):
+                asmblock += self.const(self.vreg('t1'), coeffs[2*j+1])
+                asmblock += gen.fma(adreg=self.vreg('t1'), bdreg=xreg, cdreg=term,
+                                    **self.fp())
+        power = self.vreg('t2')
+        if len(terms) > 1:
+            asmblock += gen.zero_vreg(vreg=power, dt=self.dt)
+            asmblock += gen.fma(adreg=xreg, bdreg=xreg, cdreg=power, **self.fp())
+        while len(terms) > 1:
+            for j in range(1, len(terms), 2):
+                asmblock += gen.fma(adreg=terms[j], bdreg=power, cdreg=terms[j-1],
+                                    **self.fp())
+            terms = terms[::2]
+            if len(terms) > 1:
+                asmblock += gen.fmul(adreg=power, bdreg=power, cdreg=power, **self.fp())
+        return asmblock
+
+    def exp_body(self, *, dst : vreg_base, src : vreg_base, factor : float) -> str:
+        """
+        Returns the ASM computing e^(factor*src) into dst with the current table
+
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        ebits,_,_ = adt_fp_bits(self.dt)
+        bias = (1 << (ebits-1)) - 1
+        ln2 = math.log(2)
+        ln2hi, ln2lo = self.ln2_parts()
+        t1, t2, t3, n = self.vreg('t1'), self.vreg('t2'), self.vreg('t3'), self.vreg('n')
+
+        # Clamp such that 2^n*p(r) stays normal
+        asmblock = ""
+        if 1 != factor:
+            asmblock += self.const(t3, factor)
+            asmblock += gen.fmul(adreg=t3, bdreg=src, cdreg=t3, **self.fp())
+            asmblock += self.const(t1, (2-bias)*ln2)
+            asmblock += gen.fmax(adreg=t3, bdreg=t1, cdreg=t3, **self.fp())
+        else:
+            asmblock += self.const(t3, (2-bias)*ln2)
+            asmblock += gen.fmax(adreg=t3, bdreg=src, cdreg=t3, **self.fp())
+        asmblock += self.const(t1, bias*ln2)
+        asmblock += gen.fmin(adreg=t3, bdreg=t1, cdreg=t3, **self.fp())
+
+        # n = round(x/ln2), r = x - n*ln2
+        asmblock += self.const(t1, 1/ln2)
+        asmblock += gen.fmul(adreg=t1, bdreg=t3, cdreg=t1, **self.fp())
+        asmblock += gen.convert_vectors(adregs=[t1], bdregs=[n],
+                                        a_dt=self.dt, b_dt=self.int_dt)
+        asmblock += gen.convert_vectors(adregs=[n], bdregs=[t1],
+                                        a_dt=self.int_dt, b_dt=self.dt)
+        asmblock += self.const(t2, -ln2hi)
+        asmblock += gen.fma(adreg=t1, bdreg=t2, cdreg=t3, **self.fp())
+        asmblock += self.const(t2, -ln2lo)
+        asmblock += gen.fma(adreg=t1, bdreg=t2, cdreg=t3, **self.fp())
+
+        asmblock += self.poly(dst=dst, xreg=t3, func="exp")
+        asmblock += gen.scale_pow2(vreg=dst, nreg=n, dt=self.dt)
+        return asmblock
+
+    def exp(self, *, dst : vreg_base, src : vreg_base) -> str:
+        """
+        Returns the ASM computing e^x for all elements
+
+        :param dst: Vector register to write the result to, may be src
+        :type dst: class:`asmgen.registers.vreg_base`
+        :param src: Vector register containing x
+        :type src: class:`asmgen.registers.vreg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        asmblock  = self.begin("exp")
+        asmblock += self.exp_body(dst=dst, src=src, factor=1)
+        return asmblock
+
+    def log(self, *, dst : vreg_base, src : vreg_base) -> str:
+        """
+        Returns the ASM computing the natural logarithm of all elements
+
+        :param dst: Vector register to write the result to, may be src
+        :type dst: class:`asmgen.registers.vreg_base`
+        :param src: Vector register containing x
+        :type src: class:`asmgen.registers.vreg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        ebits,_,_ = adt_fp_bits(self.dt)
+        bias = (1 << (ebits-1)) - 1
+        ln2hi, ln2lo = self.ln2_parts()
+        t1, t2, t3, n = self.vreg('t1'), self.vreg('t2'), self.vreg('t3'), self.vreg('n')
+
+        asmblock  = self.begin("log")
+        asmblock += self.const(t3, 2.0**(1-bias))
+        asmblock += gen.fmax(adreg=t3, bdreg=src, cdreg=t3, **self.fp())
+        # x = 2^n*m, f = m-1 is exact
+        asmblock += self.const(t1, 2/3)
+        asmblock += gen.split_exponent(vreg=t3, ereg=n, offreg=t1, tmpreg=t2, dt=self.dt)
+        asmblock += self.const(t1, -1)
+        asmblock += gen.fadd(adreg=t3, bdreg=t1, cdreg=t3, **self.fp())
+
+        asmblock += self.poly(dst=dst, xreg=t3, func="log")
+        asmblock += gen.fmul(adreg=dst, bdreg=t3, cdreg=dst, **self.fp())
+        asmblock += gen.convert_vectors(adregs=[n], bdregs=[t1],
+                                        a_dt=self.int_dt, b_dt=self.dt)
+        asmblock += self.const(t2, ln2lo)
+        asmblock += gen.fma(adreg=t1, bdreg=t2, cdreg=dst, **self.fp())
+        asmblock += self.const(t2, ln2hi)
+        asmblock += gen.fma(adreg=t1, bdreg=t2, cdreg=dst, **self.fp())
+        return asmblock
+
+    def tanh(self, *, dst : vreg_base, src : vreg_base) -> str:
+        """
+        Returns the ASM computing the hyperbolic tangent of all elements
+
+        :param dst: Vector register to write the result to, may be src
+        :type dst: class:`asmgen.registers.vreg_base`
+        :param src: Vector register containing x
+        :type src: class:`asmgen.registers.vreg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        t1 = self.vreg('t1')
+        asmblock  = self.begin("tanh")
+        asmblock += self.exp_body(dst=dst, src=src, factor=2)
+        asmblock += self.const(t1, 1)
+        asmblock += gen.fadd(adreg=t1, bdreg=dst, cdreg=t1, **self.fp())
+        asmblock += self.const(dst, -2)
+        asmblock += gen.fdiv(adreg=dst, bdreg=t1, cdreg=dst, **self.fp())
+        asmblock += self.const(t1, 1)
+        asmblock += gen.fadd(adreg=dst, bdreg=t1, cdreg=dst, **self.fp())
+        return asmblock
+
+    def sigmoid(self, *, dst : vreg_base, src : vreg_base) -> str:
+        """
+        Returns the ASM computing the logistic function of all elements
+
+        :param dst: Vector register to write the result to, may be src
+        :type dst: class:`asmgen.registers.vreg_base`
+        :param src: Vector register containing x
+        :type src: class:`asmgen.registers.vreg_base`
+        :return: String with the required ASM
+        :rtype: str
+        """
+        gen = self.gen
+        t1 = self.vreg('t1')
+        asmblock  = self.begin("sigmoid")
+        asmblock += self.exp_body(dst=dst, src=src, factor=-1)
+        asmblock += self.const(t1, 1)
+        asmblock += gen.fadd(adreg=t1, bdreg=dst, cdreg=t1, **self.fp())
+        asmblock += self.const(dst, 1)
+        asmblock += gen.fdiv(adreg=dst, bdreg=t1, cdreg=dst, **self.fp())
+        return asmblock
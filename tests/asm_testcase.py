@@ -0,0 +1,24 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Base class for test cases comparing generated ASM strings
+"""
+import unittest
+
+from asmgen.asmblocks.noarch import asmgen
+
+class asm_testcase(unittest.TestCase):
+    """
+    Base class for test cases comparing generated ASM strings
+    """
+
+    def gen(self, cls : type[asmgen]) -> asmgen:
+        """
+        Returns a generator producing normal ASM
+        """
+        gen = cls()
+        gen.set_output_inline(yesno=False)
+        return gen
@@ -8,7 +8,7 @@ Generator for tests of SIMD/vector ASM
 """
 
 from asmgen.asmblocks.noarch import asm_data_type as dt, reg_tracker
-from asmgen.cppgen.checkers import always_true, vec_fp64_close, vec_fp32_close
+from asmgen.cppgen.checkers import always_true, vec_fp64_close, vec_fp32_close, vec_fp16_close
 from asmgen.cppgen.expressions import identity
 from asmgen.cppgen.declarations import vargen, vio_type
 
@@ -365,3 +365,164 @@ class vec_test_generator:
                           check_function_definition=check_function,
                           check=f"check_{test_name}({avec}, result)",
                           extra_prepare=extra_prepare)
+
+    @classmethod
+    def fp16_skip_reason(cls, testcase) -> str:
+        """
+        Returns why FP16 arithmetic can't be tested with the generator,
+        an empty string if it can
+        """
+        fp16_dts = {'adreg':dt.HALF, 'bdreg':dt.HALF, 'cdreg':dt.HALF}
+        if fp16_dts not in testcase.gen.fma.supported_dts():
+            return f"{testcase.name} has no FP16 arithmetic"
+        # Emulators support FP16, a native run needs the extension on the host
+        if testcase.gen.supported_on_host() and not testcase.gen.dt_supported_on_host(dt.HALF):
+            return "Host CPU has no FP16 arithmetic"
+        return ""
+
+    @classmethod
+    def generate_vec_fma_fp16(cls, testcase, rt : reg_tracker, vg : vargen):
+        """
+        Tests correctness of an ASM block that performs an FMA instruction
+        on SIMD/vector registers filled with FP16 elements
+        """
+        test_name = "vec_fma_fp16"
+
+        skip_reason = cls.fp16_skip_reason(testcase)
+        if skip_reason:
+            testcase.skip_test(name=test_name, reason=skip_reason)
+            return
+
+        simd_nelements = "get_simd_size()/sizeof(_Float16)"
+
+        imm1 = testcase.random_fimmediate()
+        avec = vg.new_vector(cpp_type="_Float16",
+                             size=simd_nelements,
+                             fillwith=imm1,
+                             vt=vio_type.INPUT)
+        imm2 = testcase.random_fimmediate()
+        bvec = vg.new_vector(cpp_type="_Float16",
+                             size=simd_nelements,
+                             fillwith=imm2,
+                             vt=vio_type.INPUT)
+        imm3 = testcase.random_fimmediate()
+        cvec = vg.new_vector(cpp_type="_Float16",
+                             size=simd_nelements,
+                             fillwith=imm3,
+                             vt=vio_type.INPUT)
+
+        avreg_idx = rt.reserve_any_reg(type_tag="vreg")
+        avreg = testcase.gen.vreg(avreg_idx)
+        bvreg_idx = rt.reserve_any_reg(type_tag="vreg")
+        bvreg = testcase.gen.vreg(bvreg_idx)
+        cvreg_idx = rt.reserve_any_reg(type_tag="vreg")
+        cvreg = testcase.gen.vreg(cvreg_idx)
+
+        asmblock  = testcase.gen.isaquirks(rt=rt, dt=dt.HALF)
+
+        asmblock += testcase.gen.zero_vreg(vreg=avreg, dt=dt.HALF)
+        asmblock += testcase.gen.zero_vreg(vreg=bvreg, dt=dt.HALF)
+        asmblock += testcase.gen.zero_vreg(vreg=cvreg, dt=dt.HALF)
+
+        aareg_idx = rt.reserve_any_reg(type_tag="greg")
+        aareg = testcase.gen.greg(aareg_idx)
+        asmblock += testcase.gen.mov_param_to_greg(param=avec, dst=aareg)
+        asmblock += testcase.gen.load_vector(areg=aareg, vreg=avreg, dt=dt.HALF)
+        rt.unuse_reg(type_tag="greg", idx=aareg_idx)
+
+        bareg_idx = rt.reserve_any_reg(type_tag="greg")
+        bareg = testcase.gen.greg(bareg_idx)
+        asmblock += testcase.gen.mov_param_to_greg(param=bvec, dst=bareg)
+        asmblock += testcase.gen.load_vector(areg=bareg, vreg=bvreg, dt=dt.HALF)
+        rt.unuse_reg(type_tag="greg", idx=bareg_idx)
+
+        careg_idx = rt.reserve_any_reg(type_tag="greg")
+        careg = testcase.gen.greg(careg_idx)
+        asmblock += testcase.gen.mov_param_to_greg(param=cvec, dst=careg)
+        asmblock += testcase.gen.load_vector(areg=careg, vreg=cvreg, dt=dt.HALF)
+        asmblock += testcase.gen.fma(adreg=avreg, bdreg=bvreg, cdreg=cvreg,
+                                     a_dt=dt.HALF, b_dt=dt.HALF, c_dt=dt.HALF)
+        asmblock += testcase.gen.store_vector(areg=careg, vreg=cvreg, dt=dt.HALF)
+        rt.unuse_reg(type_tag="greg", idx=careg_idx)
+
+        rt.unuse_reg(type_tag="vreg", idx=avreg_idx)
+        rt.unuse_reg(type_tag="vreg", idx=bvreg_idx)
+        rt.unuse_reg(type_tag="vreg", idx=cvreg_idx)
+
+        extra_prepare  = f"std::vector<_Float16> result({simd_nelements});\n"
+        # the inputs are rounded to FP16, so the reference has to use the rounded values
+        extra_prepare += ("std::fill(result.begin(), result.end(), "
+                          f"(_Float16){imm3}+(_Float16){imm1}*(_Float16){imm2});\n")
+
+        check_function = vec_fp16_close(f"check_{test_name}", identity)
+        testcase.add_test(name=test_name, rt=rt, vg=vg,
+                          asmblock=asmblock,
+                          check_function_definition=check_function,
+                          check=f"check_{test_name}({cvec}, result)",
+                          extra_prepare=extra_prepare)
+
+    @classmethod
+    def generate_vec_fmul_fp16(cls, testcase, rt : reg_tracker, vg : vargen):
+        """
+        Tests correctness of an ASM block that performs an FMUL instruction
+        on SIMD/vector registers filled with FP16 elements
+        """
+        test_name = "vec_fmul_fp16"
+
+        skip_reason = cls.fp16_skip_reason(testcase)
+        if skip_reason:
+            testcase.skip_test(name=test_name, reason=skip_reason)
+            return
+
+        simd_nelements = "get_simd_size()/sizeof(_Float16)"
+
+        imm1 = testcase.random_fimmediate()
+        avec = vg.new_vector(cpp_type="_Float16",
+                             size=simd_nelements,
+                             fillwith=imm1,
+                             vt=vio_type.INPUT)
+        imm2 = testcase.random_fimmediate()
+        bvec = vg.new_vector(cpp_type="_Float16",
+                             size=simd_nelements,
+                             fillwith=imm2,
+                             vt=vio_type.INPUT)
+
+        avreg_idx = rt.reserve_any_reg(type_tag="vreg")
+        avreg = testcase.gen.vreg(avreg_idx)
+        bvreg_idx = rt.reserve_any_reg(type_tag="vreg")
+        bvreg = testcase.gen.vreg(bvreg_idx)
+
+        asmblock  = testcase.gen.isaquirks(rt=rt, dt=dt.HALF)
+
+        asmblock += testcase.gen.zero_vreg(vreg=avreg, dt=dt.HALF)
+        asmblock += testcase.gen.zero_vreg(vreg=bvreg, dt=dt.HALF)
+
+        aareg_idx = rt.reserve_any_reg(type_tag="greg")
+        aareg = testcase.gen.greg(aareg_idx)
+        asmblock += testcase.gen.mov_param_to_greg(param=avec, dst=aareg)
+        asmblock += testcase.gen.load_vector(areg=aareg, vreg=avreg, dt=dt.HALF)
+
+        bareg_idx = rt.reserve_any_reg(type_tag="greg")
+        bareg = testcase.gen.greg(bareg_idx)
+        asmblock += testcase.gen.mov_param_to_greg(param=bvec, dst=bareg)
+        asmblock += testcase.gen.load_vector(areg=bareg, vreg=bvreg, dt=dt.HALF)
+        rt.unuse_reg(type_tag="greg", idx=bareg_idx)
+        asmblock += testcase.gen.fmul(adreg=avreg, bdreg=bvreg, cdreg=avreg,
+                                     a_dt=dt.HALF, b_dt=dt.HALF, c_dt=dt.HALF)
+        asmblock += testcase.gen.store_vector(areg=aareg, vreg=avreg, dt=dt.HALF)
+        rt.unuse_reg(type_tag="greg", idx=aareg_idx)
+
+        rt.unuse_reg(type_tag="vreg", idx=avreg_idx)
+        rt.unuse_reg(type_tag="vreg", idx=bvreg_idx)
+
+        extra_prepare  = f"std::vector<_Float16> result({simd_nelements});\n"
+        # the inputs are rounded to FP16, so the reference has to use the rounded values
+        extra_prepare += ("std::fill(result.begin(), result.end(), "
+                          f"(_Float16){imm1}*(_Float16){imm2});\n")
+
+        check_function = vec_fp16_close(f"check_{test_name}", identity)
+        testcase.add_test(name=test_name, rt=rt, vg=vg,
+                          asmblock=asmblock,
+                          check_function_definition=check_function,
+                          check=f"check_{test_name}({avec}, result)",
+                          extra_prepare=extra_prepare)
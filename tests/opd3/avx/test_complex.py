@@ -0,0 +1,70 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests AVX complex instruction sequence generation
+"""
+from asmgen.registers import asm_data_type as adt
+
+from .test_avx_opd3 import test_avx_opd3
+
+class test_avx_complex(test_avx_opd3):
+    """
+    Tests AVX cfma and cadd
+    """
+    def test_cfma(self):
+        """
+        Tests the emulated complex fma sequences
+        """
+        gen = self.gen256
+        v = gen.vreg
+        self.assertEqual(
+            "vmovsldup %ymm1,%ymm5\n"
+            "vfmadd231ps %ymm2,%ymm5,%ymm0\n",
+            gen.cfma(adreg=v(1), bdreg=v(2), cdreg=v(0),
+                     a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                     rot=0, tmpregs=[v(5),v(6)]))
+        self.assertEqual(
+            "vpermilps $0xb1,%ymm2,%ymm5\n"
+            "vpxor %ymm6,%ymm6,%ymm6\n"
+            "vfmaddsub231ps %ymm6,%ymm6,%ymm5\n"
+            "vmovshdup %ymm1,%ymm6\n"
+            "vfmadd231ps %ymm5,%ymm6,%ymm0\n",
+            gen.cfma(adreg=v(1), bdreg=v(2), cdreg=v(0),
+                     a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                     rot=90, tmpregs=[v(5),v(6)]))
+        gen = self.gen512
+        v = gen.vreg
+        self.assertEqual(
+            "vpermilpd $0x55,%zmm2,%zmm5\n"
+            "vpxorq %zmm6,%zmm6,%zmm6\n"
+            "vfmsubadd231pd %zmm6,%zmm6,%zmm5\n"
+            "vpermilpd $0xff,%zmm1,%zmm6\n"
+            "vfmadd231pd %zmm5,%zmm6,%zmm0\n",
+            gen.cfma(adreg=v(1), bdreg=v(2), cdreg=v(0),
+                     a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                     rot=270, tmpregs=[v(5),v(6)]))
+        with self.assertRaises(ValueError):
+            gen.cfma(adreg=v(1), bdreg=v(2), cdreg=v(0),
+                     a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                     rot=90, tmpregs=[v(5),v(0)])
+        with self.assertRaises(ValueError):
+            gen.cfma(adreg=v(1), bdreg=v(2), cdreg=v(0),
+                     a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64, rot=90)
+
+    def test_cadd(self):
+        """
+        Tests the emulated complex add sequences
+        """
+        gen = self.gen128
+        v = gen.vreg
+        self.assertEqual(
+            "vpermilpd $0x55,%xmm2,%xmm5\n"
+            "vpxor %xmm6,%xmm6,%xmm6\n"
+            "vfmaddsub231pd %xmm6,%xmm6,%xmm5\n"
+            "vaddpd %xmm5,%xmm1,%xmm0\n",
+            gen.cadd(adreg=v(1), bdreg=v(2), cdreg=v(0),
+                     a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                     rot=90, tmpregs=[v(5),v(6)]))
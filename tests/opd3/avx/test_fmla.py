@@ -7,6 +7,7 @@
 Tests AVX fmla instruction code generation
 """
 from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opd3_modifier as mod
 
 from .test_avx_opd3 import test_avx_opd3
 
@@ -84,6 +85,58 @@ class test_avx_fma(test_avx_opd3):
                 cdreg=self.gen512.vreg(0),
                 a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP16))
 
+    def test_mem(self):
+        """
+        Tests that B can be read from memory instead of a register
+        """
+        self.assertEqual(
+            "vfmadd231ps 64(%r8),%ymm1,%ymm0\n",
+            self.gen256.fma(
+                adreg=self.gen256.vreg(1),
+                bdreg=None,
+                cdreg=self.gen256.vreg(0),
+                a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                modifiers={mod.MEM}, areg=self.gen256.greg(0), offset=64))
+
+        with self.assertRaisesRegex(ValueError, "Missing one of these parameters: areg"):
+            self.gen256.fma(
+                adreg=self.gen256.vreg(1),
+                bdreg=None,
+                cdreg=self.gen256.vreg(0),
+                a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                modifiers={mod.MEM})
+
+    def test_bcast(self):
+        """
+        Tests AVX512 embedded broadcasts of B and their rejection on AVX2
+        """
+        self.assertEqual(
+            "vfmadd231pd 8(%r8){1to8},%zmm1,%zmm0\n",
+            self.gen512.fma(
+                adreg=self.gen512.vreg(1),
+                bdreg=None,
+                cdreg=self.gen512.vreg(0),
+                a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                modifiers={mod.BCAST}, areg=self.gen512.greg(0), offset=8))
+
+        self.gen512.set_output_inline(yesno=True)
+        self.assertEqual(
+            "\"vfmadd231ps (%%r8)%{1to16%},%%zmm1,%%zmm0\\n\\t\"\n",
+            self.gen512.fma(
+                adreg=self.gen512.vreg(1),
+                bdreg=None,
+                cdreg=self.gen512.vreg(0),
+                a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                modifiers={mod.BCAST}, areg=self.gen512.greg(0)))
+
+        with self.assertRaisesRegex(ValueError, "Embedded broadcast requires AVX512"):
+            self.gen256.fma(
+                adreg=self.gen256.vreg(1),
+                bdreg=None,
+                cdreg=self.gen256.vreg(0),
+                a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                modifiers={mod.BCAST}, areg=self.gen256.greg(0))
+
     def test_wrong_registers(self):
         """
         Tests that the correct error is raised if wrong registers are passed
@@ -0,0 +1,62 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests NEON complex instruction code generation
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opd3_modifier as mod
+
+from .test_neon_opd3 import test_neon_opd3
+
+class test_neon_complex(test_neon_opd3):
+    """
+    Tests NEON cfma and cadd
+    """
+    def test_cfma(self):
+        """
+        Tests that the NEON generator generates correct FCMLA instructions
+        """
+        gen = self.gen
+        self.assertEqual(
+                "fcmla v0.4s,v1.4s,v2.4s,#0\n"
+                "fcmla v0.4s,v1.4s,v2.4s,#90\n",
+                "".join(gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                                 a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32, rot=rot)
+                        for rot in [0, 90]))
+        self.assertEqual(
+                "fcmla v0.8h,v1.8h,v2.h[3],#270\n",
+                gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP16, rot=270,
+                         modifiers={mod.IDX}, idx=3))
+        with self.assertRaises(ValueError):
+            gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                     a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32, rot=45)
+        with self.assertRaises(ValueError):
+            gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                     a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32, rot=0,
+                     modifiers={mod.IDX}, idx=2)
+        with self.assertRaises(ValueError):
+            gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                     a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64, rot=0,
+                     modifiers={mod.IDX}, idx=0)
+
+    def test_cadd(self):
+        """
+        Tests that the NEON generator generates correct FCADD instructions
+        """
+        gen = self.gen
+        self.assertEqual(
+                "fcadd v0.2d,v1.2d,v2.2d,#270\n",
+                gen.cadd(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64, rot=270))
+        with self.assertRaises(ValueError):
+            gen.cadd(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                     a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64, rot=180)
+
+if __name__ == '__main__':
+    unittest.main()
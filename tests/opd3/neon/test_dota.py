@@ -0,0 +1,66 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests NEON dot product instruction code generation
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opd3_modifier as mod
+
+from .test_neon_opd3 import test_neon_opd3
+
+class test_neon_dota(test_neon_opd3):
+    """
+    Tests NEON dota
+    """
+    def dota(self, a_dt : adt, b_dt : adt, c_dt : adt, **kwargs) -> str:
+        """
+        Generates a dot product with z0 += z1 . z2
+        """
+        return self.gen.dota(adreg=self.gen.vreg(1),
+                             bdreg=self.gen.vreg(2),
+                             cdreg=self.gen.vreg(0),
+                             a_dt=a_dt, b_dt=b_dt, c_dt=c_dt, **kwargs)
+
+    def test_dota(self):
+        """
+        Tests that the NEON generator generates correct dot product instructions
+        """
+        self.assertEqual("sdot v0.4s,v1.16b,v2.16b\n",
+                         self.dota(adt.SINT8, adt.SINT8, adt.SINT32))
+        self.assertEqual("udot v0.4s,v1.16b,v2.4b[3]\n",
+                         self.dota(adt.UINT8, adt.UINT8, adt.UINT32,
+                                   modifiers={mod.IDX}, idx=3))
+        self.assertEqual("usdot v0.4s,v1.16b,v2.16b\n",
+                         self.dota(adt.UINT8, adt.SINT8, adt.SINT32))
+        self.assertEqual("bfdot v0.4s,v1.8h,v2.2h[1]\n",
+                         self.dota(adt.BF16, adt.BF16, adt.FP32,
+                                   modifiers={mod.IDX}, idx=1))
+
+    def test_sudot(self):
+        """
+        Tests that signed*unsigned uses the indexed sudot or swaps the operands
+        """
+        self.assertEqual("sudot v0.4s,v1.16b,v2.4b[0]\n",
+                         self.dota(adt.SINT8, adt.UINT8, adt.SINT32,
+                                   modifiers={mod.IDX}, idx=0))
+        self.assertEqual("usdot v0.4s,v2.16b,v1.16b\n",
+                         self.dota(adt.SINT8, adt.UINT8, adt.SINT32))
+
+    def test_invalid(self):
+        """
+        Tests that invalid data types, modifiers and indices are refused
+        """
+        with self.assertRaises(ValueError):
+            self.dota(adt.FP32, adt.FP32, adt.FP32)
+        with self.assertRaises(ValueError):
+            self.dota(adt.SINT8, adt.SINT8, adt.SINT32, modifiers={mod.NP})
+        with self.assertRaises(ValueError):
+            self.dota(adt.SINT8, adt.SINT8, adt.SINT32, modifiers={mod.IDX}, idx=4)
+
+if __name__ == '__main__':
+    unittest.main()
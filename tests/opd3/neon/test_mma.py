@@ -0,0 +1,63 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests NEON matrix multiplication instruction code generation
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opd3_modifier as mod
+
+from .test_neon_opd3 import test_neon_opd3
+
+class test_neon_mma(test_neon_opd3):
+    """
+    Tests NEON mma and its layout helpers
+    """
+    def test_mma(self):
+        """
+        Tests that the NEON generator generates correct MMLA instructions
+        """
+        gen = self.gen
+        self.assertEqual(
+                "smmla v0.4s,v1.16b,v2.16b\n",
+                gen.mma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                        a_dt=adt.SINT8, b_dt=adt.SINT8, c_dt=adt.SINT32))
+        self.assertEqual(
+                "usmmla v0.4s,v1.16b,v2.16b\n",
+                gen.mma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                        a_dt=adt.UINT8, b_dt=adt.SINT8, c_dt=adt.SINT32))
+        self.assertEqual(
+                "bfmmla v0.4s,v1.8h,v2.8h\n",
+                gen.mma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                        a_dt=adt.BF16, b_dt=adt.BF16, c_dt=adt.FP32))
+        # A*B with signed A and unsigned B has no instruction
+        with self.assertRaises(ValueError):
+            gen.mma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                    a_dt=adt.SINT8, b_dt=adt.UINT8, c_dt=adt.SINT32)
+        with self.assertRaises(ValueError):
+            gen.mma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                    a_dt=adt.SINT8, b_dt=adt.SINT8, c_dt=adt.SINT32,
+                    modifiers={mod.IDX}, idx=0)
+
+    def test_layout(self):
+        """
+        Tests the block shape and the row/block conversion
+        """
+        gen = self.gen
+        self.assertEqual((2, 8, 2), gen.mma.block_shape(adt.SINT8))
+        self.assertEqual((2, 4, 2), gen.mma.block_shape(adt.BF16))
+        self.assertEqual(
+                "trn1 v2.2d,v0.2d,v1.2d\n"
+                "trn2 v3.2d,v0.2d,v1.2d\n",
+                gen.mma_transpose(src0=gen.vreg(0), src1=gen.vreg(1),
+                                  dst0=gen.vreg(2), dst1=gen.vreg(3)))
+        with self.assertRaises(ValueError):
+            gen.mma_transpose(src0=gen.vreg(0), src1=gen.vreg(1),
+                              dst0=gen.vreg(1), dst1=gen.vreg(3))
+
+if __name__ == '__main__':
+    unittest.main()
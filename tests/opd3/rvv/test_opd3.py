@@ -176,6 +176,33 @@ class test_rvv_opd3(unittest.TestCase):
                              modifiers={mod.NP,mod.VF}))
 
 
+    def test_dota(self):
+        """
+        Dot products with Zvqdotq
+        """
+        with self.assertRaises(NotImplementedError):
+            self.gen.dota(adreg=self.gen.vreg(1), bdreg=self.gen.vreg(2),
+                          cdreg=self.gen.vreg(0),
+                          a_dt=adt.SINT8, b_dt=adt.SINT8, c_dt=adt.SINT32)
+
+        self.gen.set_parameter("ZVQDOTQ", 1)
+        self.assertEqual(
+                "vqdot.vv v0,v1,v2\n",
+                self.gen.dota(adreg=self.gen.vreg(1), bdreg=self.gen.vreg(2),
+                              cdreg=self.gen.vreg(0),
+                              a_dt=adt.SINT8, b_dt=adt.SINT8, c_dt=adt.SINT32))
+        self.assertEqual(
+                "vqdotu.vv v0,v1,v2\n",
+                self.gen.dota(adreg=self.gen.vreg(1), bdreg=self.gen.vreg(2),
+                              cdreg=self.gen.vreg(0),
+                              a_dt=adt.UINT8, b_dt=adt.UINT8, c_dt=adt.UINT32))
+        # vqdotsu takes the signed operand first
+        self.assertEqual(
+                "vqdotsu.vv v0,v2,v1\n",
+                self.gen.dota(adreg=self.gen.vreg(1), bdreg=self.gen.vreg(2),
+                              cdreg=self.gen.vreg(0),
+                              a_dt=adt.UINT8, b_dt=adt.SINT8, c_dt=adt.SINT32))
+
     def test_wrong_registers(self):
         """
         Tests that the correct error is raised if wrong registers are passed
@@ -206,3 +233,48 @@ class test_rvv_opd3(unittest.TestCase):
                 bdreg=self.gen.vreg(2),
                 cdreg=self.gen.vreg(0),
                 a_dt=adt.FP64,b_dt=adt.FP64,c_dt=adt.FP64)
+
+    def test_complex(self):
+        """
+        Complex fma/add sequences using the odd element mask in v0
+        """
+        gen = self.gen
+        v = gen.vreg
+        self.assertEqual(
+                "vid.v v4\n"
+                "vand.vi v4,v4,1\n"
+                "vmsne.vi v0,v4,0\n",
+                gen.complex_mask(tmpreg=v(4)))
+        self.assertEqual(
+                "vslideup.vi v4,v1,1\n"
+                "vmerge.vvm v4,v1,v4,v0\n"
+                "vfnmsac.vv v3,v4,v2\n",
+                gen.cfma(adreg=v(1), bdreg=v(2), cdreg=v(3),
+                         a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                         rot=180, tmpregs=[v(4),v(5)]))
+        self.assertEqual(
+                "vslidedown.vi v4,v2,1\n"
+                "vslideup.vi v5,v2,1\n"
+                "vmerge.vvm v4,v4,v5,v0\n"
+                "vfneg.v v5,v4\n"
+                "vmerge.vvm v4,v5,v4,v0\n"
+                "vslidedown.vi v5,v1,1\n"
+                "vmerge.vvm v5,v5,v1,v0\n"
+                "vfmacc.vv v3,v5,v4\n",
+                gen.cfma(adreg=v(1), bdreg=v(2), cdreg=v(3),
+                         a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                         rot=90, tmpregs=[v(4),v(5)]))
+        self.assertEqual(
+                "vslidedown.vi v4,v2,1\n"
+                "vslideup.vi v5,v2,1\n"
+                "vmerge.vvm v4,v4,v5,v0\n"
+                "vfneg.v v5,v4\n"
+                "vmerge.vvm v4,v4,v5,v0\n"
+                "vfadd.vv v3,v1,v4\n",
+                gen.cadd(adreg=v(1), bdreg=v(2), cdreg=v(3),
+                         a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                         rot=270, tmpregs=[v(4),v(5)]))
+        with self.assertRaises(ValueError):
+            gen.cfma(adreg=v(0), bdreg=v(2), cdreg=v(3),
+                     a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                     rot=0, tmpregs=[v(4),v(5)])
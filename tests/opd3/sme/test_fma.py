@@ -0,0 +1,85 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests SME fma instruction code generation (SME2 multi-vector ZA array forms)
+"""
+import unittest
+
+from asmgen.asmblocks.sme import sme
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opd3_modifier as mod
+
+class test_sme_fma(unittest.TestCase):
+    """
+    Tests SME fma operations
+    """
+
+    def setUp(self):
+        """
+        Initialize the generator before each test to reduce boilerplate.
+        """
+        self.gen = sme()
+        self.gen.set_output_inline(yesno=False)
+        self.za4 = self.gen.za_vgroup(vsreg=self.gen.greg(8), offset=2, vgx=4)
+
+    def test_fma_za_multi_single(self):
+        """Tests multi-vector times single vector accumulation into ZA"""
+        self.assertEqual(
+            "fmla za.s[w8, 2, vgx4], {z0.s-z3.s}, z4.s\n",
+            self.gen.fma(adreg=self.gen.vgroup(0, 4), bdreg=self.gen.vreg(4),
+                         cdreg=self.za4, a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32))
+        self.assertEqual(
+            "fmls za.d[w9, 0, vgx2], {z2.d-z3.d}, {z6.d-z7.d}\n",
+            self.gen.fma(adreg=self.gen.vgroup(2, 2), bdreg=self.gen.vgroup(6, 2),
+                         cdreg=self.gen.za_vgroup(vsreg=self.gen.greg(9), offset=0, vgx=2),
+                         a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                         modifiers={mod.NP}))
+
+    def test_fma_za_widening(self):
+        """Tests widening FP16->FP32 accumulation into ZA"""
+        self.assertEqual(
+            "fmlal za.s[w8, 2:3, vgx4], {z0.h-z3.h}, z4.h\n",
+            self.gen.fma(adreg=self.gen.vgroup(0, 4), bdreg=self.gen.vreg(4),
+                         cdreg=self.za4, a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP32))
+
+    def test_fma_routing_to_sve(self):
+        """Tests that single vector fma is still generated by SVE"""
+        self.assertEqual(
+            "fmla z2.s,p0/m,z0.s,z1.s\n",
+            self.gen.fma(adreg=self.gen.vreg(0), bdreg=self.gen.vreg(1),
+                         cdreg=self.gen.vreg(2), a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32))
+
+    def test_extract(self):
+        """Tests reading a ZA array vector group back, only the .d form exists"""
+        for dt in [adt.FP32, adt.FP16, adt.FP64]:
+            self.assertEqual(
+                "mov {z4.d-z7.d}, za.d[w8, 2, vgx4]\n",
+                self.gen.extract_za_vgroup(zavg=self.za4, vgroup=self.gen.vgroup(4, 4),
+                                           dt=dt))
+
+    def test_fma_za_invalid(self):
+        """Tests that invalid multi-vector operands are refused"""
+        gen = self.gen
+        with self.assertRaises(ValueError):
+            gen.vgroup(2, 4)
+        with self.assertRaises(ValueError):
+            gen.za_vgroup(vsreg=gen.greg(12), offset=0, vgx=4)
+        # Group size mismatch
+        with self.assertRaises(ValueError):
+            gen.fma(adreg=gen.vgroup(0, 2), bdreg=gen.vreg(4), cdreg=self.za4,
+                    a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32)
+        # Single B vector has to be z0-z15
+        with self.assertRaises(ValueError):
+            gen.fma(adreg=gen.vgroup(0, 4), bdreg=gen.vreg(16), cdreg=self.za4,
+                    a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32)
+        # FMLAL ranges start at even offsets
+        with self.assertRaises(ValueError):
+            gen.fma(adreg=gen.vgroup(0, 4), bdreg=gen.vreg(4),
+                    cdreg=gen.za_vgroup(vsreg=gen.greg(8), offset=1, vgx=4),
+                    a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP32)
+
+if __name__ == '__main__':
+    unittest.main()
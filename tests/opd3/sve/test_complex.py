@@ -0,0 +1,63 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests SVE complex instruction code generation
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opd3_modifier as mod
+
+from .test_sve_opd3 import test_sve_opd3
+
+class test_sve_complex(test_sve_opd3):
+    """
+    Tests SVE cfma and cadd
+    """
+    def test_cfma(self):
+        """
+        Tests that the SVE generator generates correct FCMLA instructions
+        """
+        gen = self.gen
+        self.assertEqual(
+                "fcmla z0.d,p0/m,z1.d,z2.d,#180\n",
+                gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64, rot=180))
+        self.assertEqual(
+                "fcmla z0.s,p2/m,z1.s,z2.s,#90\n",
+                gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32, rot=90,
+                         modifiers={mod.MASK}, mreg="p2"))
+        self.assertEqual(
+                "fcmla z0.s,z1.s,z15.s[1],#0\n",
+                gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(15), cdreg=gen.vreg(0),
+                         a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32, rot=0,
+                         modifiers={mod.IDX}, idx=1))
+        with self.assertRaises(ValueError):
+            gen.cfma(adreg=gen.vreg(1), bdreg=gen.vreg(8), cdreg=gen.vreg(0),
+                     a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP16, rot=0,
+                     modifiers={mod.IDX}, idx=0)
+
+    def test_cadd(self):
+        """
+        Tests that the SVE generator generates correct (prefixed) FCADD instructions
+        """
+        gen = self.gen
+        self.assertEqual(
+                "fcadd z0.h,p0/m,z0.h,z2.h,#90\n",
+                gen.cadd(adreg=gen.vreg(0), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP16, rot=90))
+        self.assertEqual(
+                "movprfx z0,z1\n"
+                "fcadd z0.s,p0/m,z0.s,z2.s,#270\n",
+                gen.cadd(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32, rot=270))
+        with self.assertRaises(ValueError):
+            gen.cadd(adreg=gen.vreg(1), bdreg=gen.vreg(0), cdreg=gen.vreg(0),
+                     a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32, rot=90)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests SVE dot product instruction code generation
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opd3_modifier as mod
+
+from .test_sve_opd3 import test_sve_opd3
+
+class test_sve_dota(test_sve_opd3):
+    """
+    Tests SVE dota
+    """
+    def test_dota(self):
+        """
+        Tests that the SVE generator generates correct dot product instructions
+        """
+        gen = self.gen
+        self.assertEqual(
+                "sdot z0.d,z1.h,z2.h\n",
+                gen.dota(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.SINT16, b_dt=adt.SINT16, c_dt=adt.SINT64))
+        self.assertEqual(
+                "udot z0.s,z1.b,z7.b[3]\n",
+                gen.dota(adreg=gen.vreg(1), bdreg=gen.vreg(7), cdreg=gen.vreg(0),
+                         a_dt=adt.UINT8, b_dt=adt.UINT8, c_dt=adt.UINT32,
+                         modifiers={mod.IDX}, idx=3))
+        self.assertEqual(
+                "bfdot z0.s,z1.h,z2.h\n",
+                gen.dota(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.BF16, b_dt=adt.BF16, c_dt=adt.FP32))
+        self.assertEqual(
+                "usdot z0.s,z2.b,z1.b\n",
+                gen.dota(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                         a_dt=adt.SINT8, b_dt=adt.UINT8, c_dt=adt.SINT32))
+
+    def test_idx_restrictions(self):
+        """
+        Tests the index and register restrictions of the indexed forms
+        """
+        gen = self.gen
+        with self.assertRaises(ValueError):
+            gen.dota(adreg=gen.vreg(1), bdreg=gen.vreg(8), cdreg=gen.vreg(0),
+                     a_dt=adt.SINT8, b_dt=adt.SINT8, c_dt=adt.SINT32,
+                     modifiers={mod.IDX}, idx=0)
+        self.assertEqual(
+                "sdot z0.d,z1.h,z15.h[1]\n",
+                gen.dota(adreg=gen.vreg(1), bdreg=gen.vreg(15), cdreg=gen.vreg(0),
+                         a_dt=adt.SINT16, b_dt=adt.SINT16, c_dt=adt.SINT64,
+                         modifiers={mod.IDX}, idx=1))
+        with self.assertRaises(ValueError):
+            gen.dota(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                     a_dt=adt.SINT16, b_dt=adt.SINT16, c_dt=adt.SINT64,
+                     modifiers={mod.IDX}, idx=2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -92,6 +92,47 @@ class test_sve_fmla(test_sve_opd3):
                              a_dt=adt.FP8E5M2, b_dt=adt.FP8E5M2, c_dt=adt.FP32,
                              modifiers={mod.PART, mod.NP}, part=3))
 
+    def test_fmla_idx(self):
+        """
+        Tests the unpredicated indexed fmla and its register restrictions
+        """
+        self.assertEqual(
+                "fmla z0.d,z1.d,z15.d[1]\n",
+                self.gen.fma(adreg=self.gen.vreg(1),
+                             bdreg=self.gen.vreg(15),
+                             cdreg=self.gen.vreg(0),
+                             a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                             modifiers={mod.IDX}, idx=1))
+        self.assertEqual(
+                "fmls z0.s,z1.s,z7.s[3]\n",
+                self.gen.fma(adreg=self.gen.vreg(1),
+                             bdreg=self.gen.vreg(7),
+                             cdreg=self.gen.vreg(0),
+                             a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                             modifiers={mod.IDX, mod.NP}, idx=3))
+        with self.assertRaises(ValueError):
+            self.gen.fma(adreg=self.gen.vreg(1), bdreg=self.gen.vreg(8),
+                         cdreg=self.gen.vreg(0),
+                         a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                         modifiers={mod.IDX}, idx=0)
+        with self.assertRaises(ValueError):
+            self.gen.fma(adreg=self.gen.vreg(1), bdreg=self.gen.vreg(2),
+                         cdreg=self.gen.vreg(0),
+                         a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                         modifiers={mod.IDX}, idx=2)
+
+    def test_preg(self):
+        """
+        Tests that the governing predicate can be passed explicitly
+        """
+        self.assertEqual(
+                "fmla z0.d,p3/m,z1.d,z2.d\n",
+                self.gen.fma(adreg=self.gen.vreg(1),
+                             bdreg=self.gen.vreg(2),
+                             cdreg=self.gen.vreg(0),
+                             a_dt=adt.FP64, b_dt=adt.FP64, c_dt=adt.FP64,
+                             preg=self.gen.preg(3)))
+
     def test_wrong_registers(self):
         """
         Tests that the correct error is raised if wrong registers are passed
@@ -0,0 +1,49 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests SVE matrix multiplication instruction code generation
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.sme import sme
+
+from .test_sve_opd3 import test_sve_opd3
+
+class test_sve_mma(test_sve_opd3):
+    """
+    Tests SVE mma and its layout helpers
+    """
+    def test_mma(self):
+        """
+        Tests that the SVE generator generates correct MMLA instructions
+        """
+        gen = self.gen
+        self.assertEqual(
+                "ummla z0.s,z1.b,z2.b\n",
+                gen.mma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                        a_dt=adt.UINT8, b_dt=adt.UINT8, c_dt=adt.UINT32))
+        self.assertEqual(
+                "bfmmla z0.s,z1.h,z2.h\n",
+                gen.mma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                        a_dt=adt.BF16, b_dt=adt.BF16, c_dt=adt.FP32))
+        self.assertEqual(
+                "trn1 z2.d,z0.d,z1.d\n"
+                "trn2 z3.d,z0.d,z1.d\n",
+                gen.mma_transpose(src0=gen.vreg(0), src1=gen.vreg(1),
+                                  dst0=gen.vreg(2), dst1=gen.vreg(3)))
+
+    def test_streaming(self):
+        """
+        Tests that SME doesn't provide the MMLA instructions illegal in streaming mode
+        """
+        gen = sme()
+        with self.assertRaises(NotImplementedError):
+            gen.mma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(0),
+                    a_dt=adt.SINT8, b_dt=adt.SINT8, c_dt=adt.SINT32)
+
+if __name__ == '__main__':
+    unittest.main()
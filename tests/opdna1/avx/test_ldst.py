@@ -6,6 +6,7 @@ from asmgen.asmblocks.types.avx_types import (
     x86_greg,
     xmm_vreg, ymm_vreg, zmm_vreg,
     avx_freg,
+    avx512_mreg,
     reg_prefixer
 )
 # Adjust imports based on your structure
@@ -103,13 +104,34 @@ class test_avx_opdna1(unittest.TestCase):
 
     # --- 4. Gather & Scatter (VINDEX) ---
     def test_gather_avx2(self):
-        """ AVX2 Gather format """
+        """ AVX2 Gather format with all-ones vector mask """
         self.assertEqual(
             self.load_256(dregs=[self.ymm0], areg=self.r8, dt=adt.FP64, 
-                          modifiers={mod.VINDEX}, vidxreg=self.xmm1, it=adt.SINT32),
-            f"vgatherdpd (%r8), %xmm1, %ymm0\n"
+                          modifiers={mod.VINDEX}, vidxreg=self.xmm1, it=adt.SINT32,
+                          maskreg=ymm_vreg(2)),
+            "vpcmpeqd %ymm2, %ymm2, %ymm2\n"
+            "vgatherdpd %ymm2, (%r8,%xmm1,1), %ymm0\n"
+        )
+        # 4 FP32 elements need a 256 bit index vector with 64 bit indices
+        self.assertEqual(
+            self.load_128(dregs=[self.xmm0], areg=self.r8, dt=adt.FP32,
+                          modifiers={mod.VINDEX}, vidxreg=self.xmm1, it=adt.SINT64,
+                          maskreg=xmm_vreg(2)),
+            "vpcmpeqd %xmm2, %xmm2, %xmm2\n"
+            "vgatherqps %xmm2, (%r8,%ymm1,1), %xmm0\n"
         )
 
+    def test_gather_avx2_invalid(self):
+        """ AVX2 gathers need a distinct mask and at most 256 bit of indices """
+        with self.assertRaisesRegex(ValueError, "must differ"):
+            self.load_256(dregs=[self.ymm0], areg=self.r8, dt=adt.FP32,
+                          modifiers={mod.VINDEX}, vidxreg=self.ymm1, it=adt.SINT32,
+                          maskreg=self.ymm1)
+        with self.assertRaisesRegex(ValueError, "no qps gather"):
+            self.load_256(dregs=[self.ymm0], areg=self.r8, dt=adt.FP32,
+                          modifiers={mod.VINDEX}, vidxreg=self.ymm1, it=adt.SINT64,
+                          maskreg=ymm_vreg(2))
+
     def test_gather_avx512(self):
         """ AVX512 Gather with K-mask prefill """
         expected = "kxnorw %k2, %k2, %k2\nvgatherqps (%r8,%zmm1,1), %zmm0{%k2}\n"
@@ -128,5 +150,40 @@ class test_avx_opdna1(unittest.TestCase):
             store_128(dregs=[self.xmm0], areg=self.r8, dt=adt.FP32, 
                       modifiers={mod.VINDEX}, vidxreg=self.xmm1, it=adt.SINT32)
 
+    def test_non_temporal(self):
+        """ NT uses vmovntdqa for loads and vmovnt* for stores """
+        self.assertEqual(
+            self.load_512(dregs=[self.zmm0], areg=self.r8, dt=adt.FP32, modifiers={mod.NT}),
+            "vmovntdqa (%r8), %zmm0\n"
+        )
+        self.assertEqual(
+            self.store_512(dregs=[self.zmm0], areg=self.r8, dt=adt.FP64, modifiers={mod.NT}),
+            "vmovntpd %zmm0, (%r8)\n"
+        )
+        with self.assertRaises(ValueError):
+            self.load_512(dregs=[self.zmm0], areg=self.r8, dt=adt.FP32,
+                          modifiers={mod.NT, mod.BCAST})
+
+    def test_masked(self):
+        """ AVX512 zero-masks loads and merge-masks stores, AVX2 has no masks """
+        self.assertEqual(
+            self.load_512(dregs=[self.zmm1], areg=self.r8, dt=adt.FP32,
+                          modifiers={mod.MASK}, mreg=avx512_mreg(1)),
+            "vmovups (%r8), %zmm1{%k1}{z}\n"
+        )
+        self.assertEqual(
+            self.store_512(dregs=[self.zmm0], areg=self.r8, dt=adt.SINT16,
+                           modifiers={mod.MASK, mod.VOFFSET}, voffset=1, mreg=avx512_mreg(2)),
+            "vmovdqu16 %zmm0, 64(%r8){%k2}\n"
+        )
+        with self.assertRaisesRegex(ValueError, "Missing one of these parameters: mreg"):
+            self.load_512(dregs=[self.zmm0], areg=self.r8, dt=adt.FP32, modifiers={mod.MASK})
+        with self.assertRaises(ValueError):
+            self.load_512(dregs=[self.zmm0], areg=self.r8, dt=adt.FP32,
+                          modifiers={mod.MASK}, mreg=avx512_mreg(0))
+        with self.assertRaises(NotImplementedError):
+            self.load_256(dregs=[self.ymm0], areg=self.r8, dt=adt.FP32,
+                          modifiers={mod.MASK}, mreg=avx512_mreg(1))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,104 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests strided and gather access of the fma128/fma256 generators
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt, asm_index_type as ait
+from asmgen.asmblocks.avx_fma import fma128,fma256
+
+class test_avx2_strided(unittest.TestCase):
+    """
+    Tests AVX2 lane assembly for strided ld/st and masked gathers
+    """
+
+    def setUp(self):
+        """
+        Sets up the generators for all tests
+        """
+        self.gen128 = fma128()
+        self.gen256 = fma256()
+        self.gen128.set_output_inline(yesno=False)
+        self.gen256.set_output_inline(yesno=False)
+
+    def test_immstride_load(self):
+        """
+        Tests that immediate strides turn into per-lane displacements
+        """
+        gen = self.gen128
+        self.assertEqual(
+            "vmovsd (%r8),%xmm1\n"
+            "vmovhpd 24(%r8),%xmm1,%xmm1\n",
+            gen.load_vector_immstride(areg=gen.greg(0), byte_stride=24,
+                                      vreg=gen.vreg(1), dt=adt.FP64))
+
+    def test_gregstride_load(self):
+        """
+        Tests that the base register is advanced for lanes that can't be
+        reached with a scale and restored afterwards
+        """
+        gen = self.gen128
+        self.assertEqual(
+            "vmovss (%r8),%xmm1\n"
+            "vinsertps $16,(%r8,%r9,1),%xmm1,%xmm1\n"
+            "vinsertps $32,(%r8,%r9,2),%xmm1,%xmm1\n"
+            "lea (%r8,%r9,2),%r8\n"
+            "vinsertps $48,(%r8,%r9,1),%xmm1,%xmm1\n"
+            "neg %r9\n"
+            "lea (%r8,%r9,2),%r8\n"
+            "neg %r9\n",
+            gen.load_vector_gregstride(areg=gen.greg(0), sreg=gen.greg(1),
+                                       vreg=gen.vreg(1), dt=adt.FP32))
+
+    def test_ymm_strided(self):
+        """
+        Tests that the upper half of 256 bit vectors goes through the scratch register
+        """
+        gen = self.gen256
+        self.assertEqual(
+            "vmovsd (%r8),%xmm1\n"
+            "vmovhpd 8(%r8),%xmm1,%xmm1\n"
+            "vmovsd 16(%r8),%xmm3\n"
+            "vmovhpd 24(%r8),%xmm3,%xmm3\n"
+            "vinsertf128 $1,%xmm3,%ymm1,%ymm1\n",
+            gen.load_vector_immstride(areg=gen.greg(0), byte_stride=8,
+                                      vreg=gen.vreg(1), dt=adt.FP64,
+                                      tmpvreg=gen.vreg(3)))
+        self.assertEqual(
+            "vextractf128 $1,%ymm1,%xmm15\n"
+            "vmovsd %xmm1,(%r8)\n"
+            "vmovhpd %xmm1,(%r8,%r9,1)\n"
+            "vmovsd %xmm15,(%r8,%r9,2)\n"
+            "lea (%r8,%r9,2),%r8\n"
+            "vmovhpd %xmm15,(%r8,%r9,1)\n"
+            "neg %r9\n"
+            "lea (%r8,%r9,2),%r8\n"
+            "neg %r9\n",
+            gen.store_vector_gregstride(areg=gen.greg(0), sreg=gen.greg(1),
+                                        vreg=gen.vreg(1), dt=adt.FP64))
+        with self.assertRaises(ValueError):
+            gen.load_vector_immstride(areg=gen.greg(0), byte_stride=8,
+                                      vreg=gen.vreg(1), dt=adt.FP64,
+                                      tmpvreg=gen.vreg(1))
+
+    def test_gather(self):
+        """
+        Tests AVX2 gathers with the index vector sized to the element count
+        """
+        gen = self.gen256
+        self.assertEqual(
+            "vpcmpeqd %ymm2,%ymm2,%ymm2\n"
+            "vgatherdpd %ymm2,(%r8,%xmm1,1),%ymm0\n",
+            gen.load_vector_gather(areg=gen.greg(0), offvreg=gen.vreg(1),
+                                   vreg=gen.vreg(0), dt=adt.FP64, it=ait.INT32,
+                                   maskvreg=gen.vreg(2)))
+        with self.assertRaises(ValueError):
+            gen.load_vector_gather(areg=gen.greg(0), offvreg=gen.vreg(1),
+                                   vreg=gen.vreg(0), dt=adt.FP32, it=ait.INT64)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -122,5 +122,22 @@ class test_neon_opdna1(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Missing one of these parameters: iinc, increg"):
             self.gen.load(dregs=[self.v0], areg=self.x0, dt=adt.FP32, modifiers={mod.POSTINC})
 
+    def test_non_temporal(self):
+        """ NT maps to ldnp/stnp register pairs """
+        self.assertEqual(
+            self.gen.load(dregs=[self.v1, self.v2], areg=self.x0, dt=adt.FP32, modifiers={mod.NT}),
+            "ldnp q1, q2, [x0]\n"
+        )
+        self.assertEqual(
+            self.gen.store(dregs=[self.v1, self.v2], areg=self.x0, dt=adt.FP32,
+                           modifiers={mod.NT, mod.IOFFSET}, ioffset=32),
+            "stnp q1, q2, [x0, #32]\n"
+        )
+        with self.assertRaises(ValueError):
+            self.gen.load(dregs=[self.v1], areg=self.x0, dt=adt.FP32, modifiers={mod.NT})
+        with self.assertRaises(ValueError):
+            self.gen.load(dregs=[self.v1, self.v2], areg=self.x0, dt=adt.FP32,
+                          modifiers={mod.NT, mod.IOFFSET}, ioffset=8)
+
 if __name__ == '__main__':
     unittest.main()
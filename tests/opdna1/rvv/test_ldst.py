@@ -84,5 +84,37 @@ class test_rvv_opdna1(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "Missing one of these parameters: nstructs"):
             self.rvv.load(dregs=self.vs[:1], areg=self.t0, dt=adt.FP32, modifiers={mod.STRUCT})
 
+    def test_non_temporal(self):
+        """ NT adds the Zihintntl hint only if the extension is enabled """
+        self.assertEqual(
+            self.rvv.load(dregs=self.vs[1:2], areg=self.t0, dt=adt.FP32, modifiers={mod.NT}),
+            "vle32.v v1, (t0)\n"
+        )
+        self.rvv.set_parameter("ZIHINTNTL", 1)
+        self.assertEqual(
+            self.rvv.load(dregs=self.vs[1:2], areg=self.t0, dt=adt.FP32, modifiers={mod.NT}),
+            "ntl.all\nvle32.v v1, (t0)\n"
+        )
+        self.assertEqual(
+            self.rvv.store(dregs=self.vs[1:2], areg=self.t0, dt=adt.FP32,
+                           modifiers={mod.NT}, ntlevel="p1"),
+            "ntl.p1\nvse32.v v1, (t0)\n"
+        )
+
+    def test_first_faulting(self):
+        """ Test fault-only-first unit-stride loads """
+        self.assertEqual(
+            self.rvv.load(dregs=self.vs[:1], areg=self.t0, dt=adt.FP32, modifiers={mod.FF}),
+            "vle32ff.v v0, (t0)\n"
+        )
+        self.assertEqual(
+            self.rvv.load(dregs=self.vs[:2], areg=self.t0, dt=adt.FP16,
+                          modifiers={mod.FF, mod.STRUCT}, nstructs=2),
+            "vlseg2e16ff.v v0, (t0)\n"
+        )
+        with self.assertRaises(ValueError):
+            self.rvv.load(dregs=self.vs[:1], areg=self.t0, dt=adt.FP32,
+                          modifiers={mod.FF, mod.GSTRIDE}, streg=self.t1)
+
 if __name__ == '__main__':
     unittest.main()
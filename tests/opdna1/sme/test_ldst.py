@@ -101,5 +101,31 @@ class test_sme_opdna1(unittest.TestCase):
             "stnt1w {z0.s}, pn8, [x0, x1, lsl #2]\n"
         )
 
+    def test_sme2_multi_vector(self):
+        """ Test SME2 LD1W/ST1D with consecutive and strided register tuples """
+        zregs = [sve_vreg(i) for i in range(4, 8)]
+        self.assertEqual(
+            self.load(dregs=zregs, areg=self.x0, dt=adt.FP32,
+                      modifiers={mod.VOFFSET}, voffset=-8),
+            "ld1w {z4.s-z7.s}, pn8/z, [x0, #-8, MUL VL]\n"
+        )
+        self.assertEqual(
+            self.store(dregs=[self.z0, self.z8], areg=self.x0, dt=adt.FP64,
+                       modifiers={mod.GOFFSET}, offreg=self.x1, preg=sve_preg(9, is_pn=True)),
+            "st1d {z0.d, z8.d}, pn9, [x0, x1, lsl #3]\n"
+        )
+
+    def test_sme2_multi_vector_invalid(self):
+        """ Ensure misaligned tuples, offsets and predicates are refused """
+        with self.assertRaises(ValueError):
+            self.load(dregs=[sve_vreg(i) for i in range(2, 6)], areg=self.x0,
+                      dt=adt.FP32, modifiers={})
+        with self.assertRaises(ValueError):
+            self.load(dregs=[self.z0, sve_vreg(1)], areg=self.x0, dt=adt.FP32,
+                      modifiers={mod.VOFFSET}, voffset=3)
+        with self.assertRaises(ValueError):
+            self.load(dregs=[self.z0, sve_vreg(1)], areg=self.x0, dt=adt.FP32,
+                      modifiers={}, preg=sve_preg(1))
+
 if __name__ == '__main__':
     unittest.main()
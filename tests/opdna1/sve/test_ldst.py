@@ -54,6 +54,15 @@ class test_sve_opdna1(unittest.TestCase):
             "ld1w {z0.s}, p1/z, [x0]\n"
         )
 
+    def test_masked(self):
+        """ MASK requires an explicit predicate """
+        self.assertEqual(
+            self.store(dregs=[self.z0], areg=self.x0, dt=adt.FP64, modifiers={mod.MASK}, preg=self.p1),
+            "st1d {z0.d}, p1, [x0]\n"
+        )
+        with self.assertRaisesRegex(ValueError, "Missing one of these parameters: preg"):
+            self.load(dregs=[self.z0], areg=self.x0, dt=adt.FP32, modifiers={mod.MASK})
+
     def test_voffset_mul_vl(self):
         """ Test that VOFFSET calculates MUL VL """
         self.assertEqual(
@@ -93,5 +102,60 @@ class test_sve_opdna1(unittest.TestCase):
             "ld2w {z0.s, z1.s}, p0/z, [x0]\n"
         )
 
+    def test_non_temporal(self):
+        """ Test non-temporal contiguous loads/stores (ldnt1/stnt1) """
+        self.assertEqual(
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.FP32, modifiers={mod.NT}),
+            "ldnt1w {z1.s}, p0/z, [x0]\n"
+        )
+        self.assertEqual(
+            self.store(dregs=[self.z1], areg=self.x0, dt=adt.FP64,
+                       modifiers={mod.NT, mod.VOFFSET}, voffset=3),
+            "stnt1d {z1.d}, p0, [x0, #3, MUL VL]\n"
+        )
+        with self.assertRaises(ValueError):
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.FP32, modifiers={mod.NT, mod.BCAST})
+
+    def test_first_faulting(self):
+        """ Test first-faulting loads (ldff1) """
+        self.assertEqual(
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.UINT8,
+                      modifiers={mod.FF, mod.GOFFSET}, offreg=self.x1),
+            "ldff1b {z1.b}, p0/z, [x0, x1]\n"
+        )
+        with self.assertRaises(ValueError):
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.FP32,
+                      modifiers={mod.FF, mod.VOFFSET}, voffset=1)
+        with self.assertRaises(ValueError):
+            self.store(dregs=[self.z1], areg=self.x0, dt=adt.FP32, modifiers={mod.FF})
+
+    def test_segment_bcast(self):
+        """ Test quadword/octaword replicating loads (ld1rq/ld1ro) """
+        self.assertEqual(
+            self.load(dregs=[self.z0], areg=self.x0, dt=adt.FP32, modifiers={mod.QBCAST}),
+            "ld1rqw {z0.s}, p0/z, [x0]\n"
+        )
+        self.assertEqual(
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.FP64,
+                      modifiers={mod.QBCAST, mod.IOFFSET}, ioffset=-128),
+            "ld1rqd {z1.d}, p0/z, [x0, #-128]\n"
+        )
+        self.assertEqual(
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.FP64,
+                      modifiers={mod.OBCAST, mod.GOFFSET}, offreg=self.x1),
+            "ld1rod {z1.d}, p0/z, [x0, x1, lsl #3]\n"
+        )
+        with self.assertRaises(ValueError):
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.FP64,
+                      modifiers={mod.QBCAST, mod.IOFFSET}, ioffset=8)
+        with self.assertRaises(ValueError):
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.FP64,
+                      modifiers={mod.OBCAST, mod.IOFFSET}, ioffset=240)
+        with self.assertRaises(ValueError):
+            self.load(dregs=[self.z1], areg=self.x0, dt=adt.FP32,
+                      modifiers={mod.QBCAST, mod.VOFFSET}, voffset=1)
+        with self.assertRaises(ValueError):
+            self.store(dregs=[self.z1], areg=self.x0, dt=adt.FP32, modifiers={mod.QBCAST})
+
 if __name__ == '__main__':
     unittest.main()
@@ -105,6 +105,9 @@ class asm_correctness_test(unittest.TestCase,testcase):
                 ]
         rt = reg_tracker(reg_type_init_list=reg_init_list)
 
+        # Tests that the generators can't produce for this ISA/host
+        cls.skipped_tests = {}
+
         # Run all generators
         generators = [getattr(asm_test_generator,name) for\
             name in dir(asm_test_generator) if name.startswith("generate_")]
@@ -222,6 +225,16 @@ class asm_correctness_test(unittest.TestCase,testcase):
         cls.testlib_source += write_test_asmblock_func(name, asmblock, tparams)
         cls.header_source += write_test_func_declaration(name, tparams)
 
+    @classmethod
+    def skip_test(cls, *, name : str, reason : str):
+        """
+        Marks a test as skipped instead of adding it
+
+        :param name: Name of the test
+        :param reason: Why the test can't be generated
+        """
+        cls.skipped_tests[name] = reason
+
     @staticmethod
     def wrap_test_call(function_name):
         """
@@ -264,6 +277,8 @@ class asm_correctness_test(unittest.TestCase,testcase):
 
         :param test_name: name of the test/function
         """
+        if test_name in self.skipped_tests:
+            self.skipTest(f"Skipping: {self.skipped_tests[test_name]}")
         log = logging.getLogger("ASMCORTEST")
         source = self.header_source+"\n"+self.wrap_test_call(test_name)
         cxx = compiler(self.cxx_name,self.name)
@@ -12,7 +12,7 @@ import inspect
 
 from parameterized import parameterized, parameterized_class
 
-from asmgen.asmblocks.noarch import asmgen,comparison
+from asmgen.asmblocks.noarch import asmgen,comparison,bscalar_strategy
 from asmgen.registers import asm_data_type as adt
 from asmgen.registers import asm_index_type as ait
 from asmgen.registers import reg_tracker
@@ -46,6 +46,8 @@ allowed_not_implemented = {
                  'greg_to_voffs',
                  'fma_idx',
                  'fma_np_idx',
+                 'prefetch_voff',
+                 'transpose',
                  ],
         'rvv071' : ['load_vector_bcast1_inc',
                     'load_vector_bcast1_immoff',
@@ -65,6 +67,8 @@ allowed_not_implemented = {
                     'greg_to_voffs',
                     'fma_idx',
                     'fma_np_idx',
+                    'prefetch_voff',
+                    'transpose',
                     ],
         'sve' : ['load_vector_bcast1_inc',
                  'load_vector_immstride',
@@ -81,6 +85,7 @@ allowed_not_implemented = {
                  'zero_treg',
                  'fma_vf',
                  'fma_np_vf',
+                 'transpose',
                  ],
         'sme' : ['load_vector_bcast1_inc',
                  'load_vector_immstride',
@@ -95,6 +100,8 @@ allowed_not_implemented = {
                  'store_tile',
                  'fma_vf',
                  'fma_np_vf',
+                 'ff_loop',
+                 'transpose',
                  ],
         'neon' : ['load_vector_bcast1_immoff',
                   'load_vector_immstride',
@@ -110,14 +117,12 @@ allowed_not_implemented = {
                   'greg_to_voffs',
                   'fma_vf',
                   'fma_np_vf',
+                  'vector_loop',
+                  'ff_loop',
                   ],
         'fma128' : ['load_vector_bcast1_inc',
-                    'load_vector_immstride',
-                    'load_vector_gregstride',
                     'load_vector_lane',
                     'store_vector_lane',
-                    'store_vector_immstride',
-                    'store_vector_gregstride',
                     'store_vector_scatter',
                     'load_tile',
                     'store_tile',
@@ -127,14 +132,15 @@ allowed_not_implemented = {
                     'fma_np_idx',
                     'fma_vf',
                     'fma_np_vf',
+                    'vector_loop',
+                    'ff_loop',
+                    'widening_fma_cregs',
+                    'reserve_widening_cregs',
+                    'widening_fma',
                     ],
         'fma256' : ['load_vector_bcast1_inc',
-                    'load_vector_immstride',
-                    'load_vector_gregstride',
                     'load_vector_lane',
                     'store_vector_lane',
-                    'store_vector_immstride',
-                    'store_vector_gregstride',
                     'store_vector_scatter',
                     'load_tile',
                     'store_tile',
@@ -144,6 +150,11 @@ allowed_not_implemented = {
                     'fma_np_idx',
                     'fma_vf',
                     'fma_np_vf',
+                    'vector_loop',
+                    'ff_loop',
+                    'widening_fma_cregs',
+                    'reserve_widening_cregs',
+                    'widening_fma',
                     ],
         'avx512' : ['load_vector_bcast1_inc',
                     'load_vector_immstride',
@@ -160,6 +171,10 @@ allowed_not_implemented = {
                     'fma_np_idx',
                     'fma_vf',
                     'fma_np_vf',
+                    'ff_loop',
+                    'widening_fma_cregs',
+                    'reserve_widening_cregs',
+                    'widening_fma',
                     ]
 }
 
@@ -176,6 +191,13 @@ def get_rt(gen : asmgen, name: str) -> reg_tracker:
                 )
     return rts[name]
 
+def get_bregs(gen : asmgen, count : int) -> list:
+    strategy = gen.select_bscalar_strategy(dt=adt.SINGLE)
+    reg_count = gen.bscalar_reg_count(strategy=strategy, count=count, dt=adt.SINGLE)
+    if bscalar_strategy.VF == strategy:
+        return [gen.freg(4+i, adt.SINGLE) for i in range(reg_count)]
+    return [gen.vreg(4+i) for i in range(reg_count)]
+
 
 function_tests = [
         ['simd_size', None],
@@ -185,6 +207,9 @@ function_tests = [
         ['is_vla', None],
         ['supported_on_host', None],
         ['supportedby_cpuinfo', {'cpuinfo' : lambda gen : 'invalid_isa'}],
+        ['dt_supported_on_host', {'dt' : lambda gen : adt.HALF}],
+        ['dt_supportedby_cpuinfo', {'cpuinfo' : lambda gen : 'invalid_isa',
+                                    'dt' : lambda gen : adt.HALF}],
         ['indexable_elements', {'dt' : lambda gen : adt.DOUBLE} ],
         ['max_vregs', None],
         ['max_gregs', None],
@@ -208,6 +233,8 @@ function_tests = [
         ['isaendquirks', {
             'rt' : lambda gen : get_rt(gen=gen, name=gen.__class__),
             'dt' : lambda gen : adt.SINGLE} ],
+        ['optimize_mode_transitions', {'asmblock' : lambda gen : ""}],
+        ['nt_fence', None],
         ['min_load_immoff', {'dt' : lambda gen : adt.DOUBLE} ],
         ['max_load_immoff', {'dt' : lambda gen : adt.DOUBLE} ],
         ['min_load_immoff', {'dt' : lambda gen : adt.SINGLE} ],
@@ -216,6 +243,7 @@ function_tests = [
         ['freg', { 'reg_idx' : lambda gen :  0, 'dt' : lambda gen : adt.DOUBLE} ],
         ['greg', { 'reg_idx' : lambda gen :  0} ],
         ['vreg', { 'reg_idx' : lambda gen :  0} ],
+        ['mreg', { 'reg_idx' : lambda gen :  1} ],
         ['cb', {'reg1' : lambda gen: gen.greg(0),
                 'reg2' : lambda gen: gen.greg(1),
                 'cmp' : lambda gen: comparison.NE,
@@ -241,7 +269,111 @@ function_tests = [
                          'labelskip' : lambda gen : 'someloop_nz'}],
         ['loopend', {'reg' : lambda gen: gen.greg(0),
                      'label' : lambda gen : 'someloop'}],
-        ['label', {'label' : lambda gen : "label"}],
+        ['vector_loop', {'count_reg' : lambda gen: gen.greg(0),
+                         'step_reg' : lambda gen: gen.greg(1),
+                         'label' : lambda gen : 'someloop',
+                         'dt' : lambda gen : adt.SINGLE,
+                         'body' : lambda gen : lambda mreg, step : ""}],
+        ['ff_loop', {'step_reg' : lambda gen: gen.greg(1),
+                     'label' : lambda gen : 'someloop',
+                     'dt' : lambda gen : adt.SINGLE,
+                     'load' : lambda gen : lambda : "",
+                     'body' : lambda gen : lambda mreg, step : ""}],
+        ['widening_fma_cregs', {'a_dt' : lambda gen : adt.HALF,
+                                'c_dt' : lambda gen : adt.SINGLE}],
+        ['reserve_widening_cregs', {
+            'rt' : lambda gen : get_rt(gen=gen, name=gen.__class__),
+            'a_dt' : lambda gen : adt.HALF,
+            'c_dt' : lambda gen : adt.SINGLE}],
+        ['widening_fma', {'adreg' : lambda gen : gen.vreg(0),
+                          'bdreg' : lambda gen : gen.vreg(1),
+                          'cdregs' : lambda gen : [gen.vreg(2), gen.vreg(3)],
+                          'a_dt' : lambda gen : adt.HALF,
+                          'b_dt' : lambda gen : adt.HALF,
+                          'c_dt' : lambda gen : adt.SINGLE}],
+        ['select_bscalar_strategy', {'dt' : lambda gen : adt.SINGLE}],
+        ['bscalar_reg_count', {
+            'strategy' : lambda gen : gen.select_bscalar_strategy(dt=adt.SINGLE),
+            'count' : lambda gen : 4,
+            'dt' : lambda gen : adt.SINGLE}],
+        ['reserve_bscalar_regs', {
+            'rt' : lambda gen : get_rt(gen=gen, name=gen.__class__),
+            'strategy' : lambda gen : gen.select_bscalar_strategy(dt=adt.SINGLE),
+            'count' : lambda gen : 1,
+            'dt' : lambda gen : adt.SINGLE}],
+        ['load_bscalars', {
+            'strategy' : lambda gen : gen.select_bscalar_strategy(dt=adt.SINGLE),
+            'areg' : lambda gen : gen.greg(0),
+            'offset' : lambda gen : 16,
+            'bregs' : lambda gen : get_bregs(gen=gen, count=2),
+            'count' : lambda gen : 2,
+            'dt' : lambda gen : adt.SINGLE}],
+        ['fma_bscalar', {
+            'strategy' : lambda gen : gen.select_bscalar_strategy(dt=adt.SINGLE),
+            'adreg' : lambda gen : gen.vreg(0),
+            'bregs' : lambda gen : get_bregs(gen=gen, count=2),
+            'j' : lambda gen : 1,
+            'cdreg' : lambda gen : gen.vreg(1),
+            'areg' : lambda gen : gen.greg(0),
+            'offset' : lambda gen : 4,
+            'dt' : lambda gen : adt.SINGLE}],
+        ['outer_product_kstep', {
+            'strategy' : lambda gen : gen.select_bscalar_strategy(dt=adt.SINGLE),
+            'adregs' : lambda gen : [gen.vreg(0)],
+            'areg' : lambda gen : gen.greg(0),
+            'offset' : lambda gen : 16,
+            'bregs' : lambda gen : get_bregs(gen=gen, count=2),
+            'cdregs' : lambda gen : [[gen.vreg(1), gen.vreg(2)]],
+            'dt' : lambda gen : adt.SINGLE}],
+        ['accumulator_count', {'latency' : lambda gen : 4,
+                               'throughput' : lambda gen : 2}],
+        ['reduce_accumulators', {
+            'accregs' : lambda gen : [gen.vreg(0), gen.vreg(1), gen.vreg(2)],
+            'freg' : lambda gen : gen.freg(4, adt.SINGLE),
+            'tmpreg' : lambda gen : gen.vreg(3),
+            'dt' : lambda gen : adt.SINGLE}],
+        ['perm_setup', {'group' : lambda gen : 2,
+                        'tmpreg' : lambda gen : gen.vreg(1)}],
+        ['trn_pair', {
+            'adreg' : lambda gen : gen.vreg(1),
+            'bdreg' : lambda gen : gen.vreg(2),
+            'lodreg' : lambda gen : gen.vreg(3),
+            'hidreg' : lambda gen : gen.vreg(1),
+            'dt' : lambda gen : adt.SINGLE,
+            'group' : lambda gen : 1}],
+        ['transpose', {
+            'srcregs' : lambda gen : [gen.vreg(i) for i in range(gen.simd_size//8)],
+            'dstregs' : lambda gen : [gen.vreg(gen.simd_size//8+i)
+                                      for i in range(gen.simd_size//8)],
+            'tmpreg' : lambda gen : gen.vreg(gen.simd_size//4),
+            'dt' : lambda gen : adt.DOUBLE}],
+        ['unpack_nibbles', {'vreg' : lambda gen : gen.vreg(0),
+                            'lodst' : lambda gen : gen.vreg(1),
+                            'hidst' : lambda gen : gen.vreg(2),
+                            'tmpreg' : lambda gen : gen.vreg(3)}],
+        ['scale_pow2', {'vreg' : lambda gen : gen.vreg(0),
+                        'nreg' : lambda gen : gen.vreg(1),
+                        'dt' : lambda gen : adt.SINGLE}],
+        ['split_exponent', {'vreg' : lambda gen : gen.vreg(0),
+                            'ereg' : lambda gen : gen.vreg(1),
+                            'offreg' : lambda gen : gen.vreg(2),
+                            'tmpreg' : lambda gen : gen.vreg(3),
+                            'dt' : lambda gen : adt.SINGLE}],
+        ['sqrt_vreg', {'vreg' : lambda gen : gen.vreg(0),
+                       'dst' : lambda gen : gen.vreg(1),
+                       'dt' : lambda gen : adt.SINGLE}],
+        ['convert_vectors', {'adregs' : lambda gen : [gen.vreg(0)],
+                             'bdregs' : lambda gen : [gen.vreg(2), gen.vreg(3)],
+                             'a_dt' : lambda gen : adt.HALF,
+                             'b_dt' : lambda gen : adt.SINGLE}],
+        ['intermediate_conversion_dt', {'a_dt' : lambda gen : adt.SINT32,
+                                        'b_dt' : lambda gen : adt.SINT8}],
+        ['convert_vectors_chained', {'adregs' : lambda gen : [gen.vreg(0)],
+                                     'bdregs' : lambda gen : [gen.vreg(2), gen.vreg(3)],
+                                     'a_dt' : lambda gen : adt.SINT16,
+                                     'mid_dt' : lambda gen : adt.SINT32,
+                                     'b_dt' : lambda gen : adt.SINGLE}],
+        ['label',{'label' : lambda gen : "label"}],
         ['labelstr', {'label' : lambda gen : "label"}],
         ['simd_size_to_greg', {'reg' : lambda gen : gen.greg(0),
                                'dt' : lambda gen : adt.SINGLE} ],
@@ -297,6 +429,9 @@ function_tests = [
         ['mov_freg', {'src' : lambda gen : gen.freg(0, adt.SINGLE),
                       'dst' : lambda gen : gen.freg(1, adt.SINGLE),
                       'dt' : lambda gen : adt.SINGLE} ],
+        ['greg_to_freg', {'greg' : lambda gen : gen.greg(0),
+                          'freg' : lambda gen : gen.freg(0, adt.SINGLE),
+                          'dt' : lambda gen : adt.SINGLE} ],
         ['zero_vreg', {'vreg' : lambda gen : gen.vreg(0),
                        'dt' : lambda gen : adt.DOUBLE}],
         ['zero_vreg', {'vreg' : lambda gen : gen.vreg(0),
@@ -307,8 +442,20 @@ function_tests = [
                        'dt' : lambda gen : adt.SINGLE}],
         ['prefetch_l1_immoff', {'areg'   : lambda gen : gen.greg(0),
                               'offset' : lambda gen : 256}],
+        ['prefetch_immoff', {'areg'   : lambda gen : gen.greg(0),
+                             'offset' : lambda gen : 256,
+                             'level'  : lambda gen : 2,
+                             'write'  : lambda gen : True}],
+        ['prefetch_voff', {'areg'    : lambda gen : gen.greg(0),
+                           'voffset' : lambda gen : 2,
+                           'dt'      : lambda gen : adt.DOUBLE}],
+        ['insert_prefetches', {'asmblock' : lambda gen : "",
+                               'aregs'    : lambda gen : [gen.greg(0)],
+                               'distance' : lambda gen : 256}],
         ['load_pointer', {'areg' : lambda gen : gen.greg(0),
                           'name' : lambda gen : 'someparam'}],
+        ['load_data_address', {'areg' : lambda gen : gen.greg(0),
+                               'name' : lambda gen : 'somedata'}],
         ['load_tile', {'areg' : lambda gen : gen.greg(0),
                        'treg' : lambda gen : gen.treg(0),
                        'dt' :  lambda gen : adt.DOUBLE}],
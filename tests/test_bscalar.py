@@ -0,0 +1,186 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the scalar B element strategies for vector-times-scalar fmas
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt, reg_tracker
+from asmgen.asmblocks.noarch import bscalar_strategy
+from asmgen.asmblocks.operations import opd3_modifier as mod
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma256,avx512
+
+class test_bscalar(unittest.TestCase):
+    """
+    Tests the strategy selection and the emitted k step on the different ISAs
+    """
+
+    def kstep(self, cls, count : int, dt : adt = adt.FP64, offset : int = 8):
+        """
+        Returns the strategy and the ASM of a 2 x count outer product k step
+        """
+        gen = cls()
+        gen.set_output_inline(yesno=False)
+        rt = reg_tracker([('freg', gen.max_fregs), ('vreg', gen.max_vregs)])
+        strategy = gen.select_bscalar_strategy(dt=dt)
+        bregs = gen.reserve_bscalar_regs(rt=rt, strategy=strategy, count=count, dt=dt)
+        adregs = [gen.vreg(rt.reserve_any_reg('vreg')) for _ in range(2)]
+        cdregs = [[gen.vreg(rt.reserve_any_reg('vreg')) for _ in range(count)]
+                  for _ in range(2)]
+        self.assertEqual(len(bregs),
+                         gen.bscalar_reg_count(strategy=strategy, count=count, dt=dt))
+        asmblock = gen.outer_product_kstep(strategy=strategy, adregs=adregs,
+                                           areg=gen.greg(1), offset=offset,
+                                           bregs=bregs, cdregs=cdregs, dt=dt)
+        return strategy, asmblock
+
+    def test_idx(self):
+        """
+        Tests packing the B elements into lanes on NEON
+        """
+        strategy,asmblock = self.kstep(neon, 3)
+        self.assertEqual(bscalar_strategy.IDX, strategy)
+        self.assertEqual(
+                "ldr q0, [x1, #8]\n"
+                "ldr q1, [x1, #24]\n"
+                "fmla v4.2d,v2.2d,v0.d[0]\n"
+                "fmla v7.2d,v3.2d,v0.d[0]\n"
+                "fmla v5.2d,v2.2d,v0.d[1]\n"
+                "fmla v8.2d,v3.2d,v0.d[1]\n"
+                "fmla v6.2d,v2.2d,v1.d[0]\n"
+                "fmla v9.2d,v3.2d,v1.d[0]\n",
+                asmblock)
+
+    def test_idx_sve(self):
+        """
+        Tests replicating the B elements into every segment on SVE
+        """
+        strategy,asmblock = self.kstep(sve, 3, adt.FP32, 16)
+        self.assertEqual(bscalar_strategy.IDX, strategy)
+        self.assertEqual(
+                "ld1rqw {z0.s}, p0/z, [x1, #16]\n"
+                "fmla z3.s,z1.s,z0.s[0]\n"
+                "fmla z6.s,z2.s,z0.s[0]\n"
+                "fmla z4.s,z1.s,z0.s[1]\n"
+                "fmla z7.s,z2.s,z0.s[1]\n"
+                "fmla z5.s,z1.s,z0.s[2]\n"
+                "fmla z8.s,z2.s,z0.s[2]\n",
+                asmblock)
+        _,asmblock = self.kstep(sve, 5, adt.FP64, -32)
+        self.assertEqual(
+                "ld1rqd {z0.d}, p0/z, [x1, #-32]\n"
+                "ld1rqd {z1.d}, p0/z, [x1, #-16]\n"
+                "ld1rqd {z2.d}, p0/z, [x1]\n",
+                asmblock[:asmblock.index("fmla")])
+        self.assertIn("fmla z14.d,z4.d,z2.d[0]\n", asmblock)
+        # Offsets ld1rq can't encode fall back to broadcast loads
+        _,asmblock = self.kstep(sve, 3, adt.FP64, 24)
+        self.assertEqual(
+                "ld1rd z0.d, p0/z, [x1, #24]\n"
+                "fmla z4.d,p0/m,z2.d,z0.d\n"
+                "fmla z7.d,p0/m,z3.d,z0.d\n"
+                "ld1rd z1.d, p0/z, [x1, #32]\n"
+                "fmla z5.d,p0/m,z2.d,z1.d\n"
+                "fmla z8.d,p0/m,z3.d,z1.d\n"
+                "ld1rd z0.d, p0/z, [x1, #40]\n"
+                "fmla z6.d,p0/m,z2.d,z0.d\n"
+                "fmla z9.d,p0/m,z3.d,z0.d\n",
+                asmblock)
+        _,asmblock = self.kstep(sve, 2, adt.FP64, 256)
+        self.assertEqual(
+                "ld1rd z0.d, p0/z, [x1, #256]\n"
+                "fmla z3.d,p0/m,z1.d,z0.d\n"
+                "fmla z5.d,p0/m,z2.d,z0.d\n"
+                "ld1rd z0.d, p0/z, [x1, #264]\n"
+                "fmla z4.d,p0/m,z1.d,z0.d\n"
+                "fmla z6.d,p0/m,z2.d,z0.d\n",
+                asmblock)
+        gen = sve()
+        with self.assertRaises(ValueError):
+            gen.load_bscalars(strategy=bscalar_strategy.IDX, areg=gen.greg(1), offset=24,
+                              bregs=[gen.vreg(0)], count=2, dt=adt.FP64)
+
+    def test_vf(self):
+        """
+        Tests using scalar registers on RVV
+        """
+        strategy,asmblock = self.kstep(rvv, 2)
+        self.assertEqual(bscalar_strategy.VF, strategy)
+        self.assertEqual(
+                "fld f0, 8(t1)\n"
+                "fld f1, 16(t1)\n"
+                "vfmacc.vf v2,f0,v0\n"
+                "vfmacc.vf v4,f0,v1\n"
+                "vfmacc.vf v3,f1,v0\n"
+                "vfmacc.vf v5,f1,v1\n",
+                asmblock)
+
+    def test_vf_int(self):
+        """
+        Tests falling back to broadcasts for integers on RVV, vf forms take FP scalars
+        """
+        strategy,asmblock = self.kstep(rvv, 1, adt.SINT32, 0)
+        self.assertEqual(bscalar_strategy.BCAST, strategy)
+        self.assertEqual(
+                "vlse32.v v0, (t1), zero\n"
+                "vmacc.vv v3,v0,v1\n"
+                "vmacc.vv v4,v0,v2\n",
+                asmblock)
+        strategy,_ = self.kstep(rvv, 1, adt.SINT16, 0)
+        self.assertEqual(bscalar_strategy.BCAST, strategy)
+        gen = rvv()
+        with self.assertRaises(ValueError):
+            gen.fma(adreg=gen.vreg(1), bdreg=gen.freg(0, adt.SINT32), cdreg=gen.vreg(2),
+                    a_dt=adt.SINT32, b_dt=adt.SINT32, c_dt=adt.SINT32,
+                    modifiers={mod.VF})
+
+    def test_bcast(self):
+        """
+        Tests broadcasting loads on AVX2
+        """
+        strategy,asmblock = self.kstep(fma256, 2)
+        self.assertEqual(bscalar_strategy.BCAST, strategy)
+        self.assertEqual(
+                "vbroadcastsd 8(%r9),%ymm0\n"
+                "vbroadcastsd 16(%r9),%ymm1\n"
+                "vfmadd231pd %ymm2,%ymm0,%ymm4\n"
+                "vfmadd231pd %ymm3,%ymm0,%ymm6\n"
+                "vfmadd231pd %ymm2,%ymm1,%ymm5\n"
+                "vfmadd231pd %ymm3,%ymm1,%ymm7\n",
+                asmblock)
+
+    def test_membcast(self):
+        """
+        Tests the embedded broadcast on AVX512, which needs no B registers
+        """
+        strategy,asmblock = self.kstep(avx512, 2, adt.FP32)
+        self.assertEqual(bscalar_strategy.MEMBCAST, strategy)
+        self.assertEqual(
+                "vfmadd231ps 8(%r9){1to16},%zmm0,%zmm2\n"
+                "vfmadd231ps 8(%r9){1to16},%zmm1,%zmm4\n"
+                "vfmadd231ps 12(%r9){1to16},%zmm0,%zmm3\n"
+                "vfmadd231ps 12(%r9){1to16},%zmm1,%zmm5\n",
+                asmblock)
+
+    def test_errors(self):
+        """
+        Tests mismatching register counts
+        """
+        gen = neon()
+        with self.assertRaises(ValueError):
+            gen.load_bscalars(strategy=bscalar_strategy.IDX, areg=gen.greg(0),
+                              offset=0, bregs=[gen.vreg(0)], count=4, dt=adt.FP64)
+        with self.assertRaises(ValueError):
+            gen.outer_product_kstep(strategy=bscalar_strategy.IDX,
+                                    adregs=[gen.vreg(0)], areg=gen.greg(0), offset=0,
+                                    bregs=[gen.vreg(1)],
+                                    cdregs=[[gen.vreg(2)], [gen.vreg(3)]], dt=adt.FP64)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the compare and select operations and the masked opd3 operations
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.noarch import comparison
+from asmgen.asmblocks.operations import (
+    opcmp_modifier as cmod,
+    opsel_modifier as smod,
+    opd3_modifier as dmod
+)
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma128,fma256,avx512
+
+from .asm_testcase import asm_testcase
+
+class test_compare_select(asm_testcase):
+    """
+    Tests cmp, sel and masked fma on the different ISAs
+    """
+
+    def cmp(self, gen, dt : adt, cmp : comparison, zero : bool = False, **kwargs):
+        """
+        Returns the ASM of a comparison of v1 and v2 (or v1 and zero) into mask 0
+        """
+        return gen.cmp(adreg=gen.vreg(1), bdreg=None if zero else gen.vreg(2),
+                       mreg=gen.mreg(0), dt=dt, cmp=cmp,
+                       modifiers={cmod.ZERO} if zero else set(), **kwargs)
+
+    def sel(self, gen, dt : adt, cidx : int = 3, modifiers : set[smod] = set()):
+        """
+        Returns the ASM of a selection between v1 (mask clear) and v2 (mask set)
+        """
+        return gen.sel(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(cidx),
+                       mreg=gen.mreg(0), dt=dt, modifiers=modifiers)
+
+    def masked_fma(self, gen, **kwargs):
+        """
+        Returns the ASM of an fma of v1 and v2 into v3, only where the mask is set
+        """
+        return gen.fma(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(3),
+                       a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32,
+                       modifiers={dmod.MASK}, **kwargs)
+
+    def test_neon(self):
+        """
+        Tests NEON compares into vector masks, LT/LE swap operands and NE is negated
+        """
+        gen = self.gen(neon)
+        self.assertEqual("fcmgt v0.4s,v2.4s,v1.4s\n", self.cmp(gen, adt.FP32, comparison.LT))
+        self.assertEqual("fcmle v0.4s,v1.4s,#0.0\n",
+                         self.cmp(gen, adt.FP32, comparison.LE, zero=True))
+        self.assertEqual(
+                "cmeq v0.8h,v1.8h,v2.8h\n"
+                "mvn v0.16b,v0.16b\n",
+                self.cmp(gen, adt.SINT16, comparison.NE))
+        self.assertEqual("cmtst v0.4s,v1.4s,v1.4s\n",
+                         self.cmp(gen, adt.UINT32, comparison.NZ, zero=True))
+        self.assertEqual("cmhs v0.4s,v2.4s,v1.4s\n", self.cmp(gen, adt.UINT32, comparison.LE))
+        with self.assertRaises(ValueError):
+            self.cmp(gen, adt.UINT32, comparison.LT, zero=True)
+        with self.assertRaises(ValueError):
+            self.cmp(gen, adt.FP32, comparison.EZ)
+
+        self.assertEqual(
+                "mov v3.16b,v0.16b\n"
+                "bsl v3.16b,v2.16b,v1.16b\n",
+                self.sel(gen, adt.FP32))
+        self.assertEqual("bsl v0.16b,v2.16b,v1.16b\n", self.sel(gen, adt.FP32, cidx=0))
+        self.assertEqual("bit v1.16b,v2.16b,v0.16b\n", self.sel(gen, adt.FP32, cidx=1))
+        self.assertEqual("bit v2.16b,v1.16b,v0.16b\n",
+                         self.sel(gen, adt.FP32, cidx=2, modifiers={smod.INV}))
+        with self.assertRaises(ValueError):
+            self.masked_fma(gen, mreg=gen.mreg(0))
+
+    def test_sve(self):
+        """
+        Tests SVE compares into predicates, the governing predicate defaults to p0
+        """
+        gen = self.gen(sve)
+        self.assertEqual("fcmge p0.d,p0/z,z1.d,z2.d\n",
+                         self.cmp(gen, adt.FP64, comparison.GE))
+        self.assertEqual("cmplo p0.b,p1/z,z1.b,z2.b\n",
+                         self.cmp(gen, adt.UINT8, comparison.LT, preg=gen.preg(1)))
+        self.assertEqual("cmpne p0.s,p0/z,z1.s,#0\n",
+                         self.cmp(gen, adt.SINT32, comparison.NZ, zero=True))
+        self.assertEqual("sel z3.s,p0,z2.s,z1.s\n", self.sel(gen, adt.FP32))
+        self.assertEqual("sel z3.h,p0,z1.h,z2.h\n",
+                         self.sel(gen, adt.FP16, modifiers={smod.INV}))
+        self.assertEqual("fmla z3.s,p0/m,z1.s,z2.s\n",
+                         self.masked_fma(gen, mreg=gen.mreg(0)))
+        with self.assertRaises(ValueError):
+            gen.sel(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(3),
+                    mreg=gen.vreg(0), dt=adt.FP32)
+
+    def test_avx(self):
+        """
+        Tests AVX2 compares into vector masks and AVX512 compares into mask registers
+        """
+        gen = self.gen(fma256)
+        self.assertEqual("vcmpps $0x11,%ymm2,%ymm1,%ymm0\n",
+                         self.cmp(gen, adt.FP32, comparison.LT))
+        self.assertEqual("vpcmpgtd %ymm1,%ymm2,%ymm0\n",
+                         self.cmp(gen, adt.SINT32, comparison.LT))
+        self.assertEqual(
+                "vpxor %ymm4,%ymm4,%ymm4\n"
+                "vcmppd $0x1e,%ymm4,%ymm1,%ymm0\n",
+                self.cmp(gen, adt.FP64, comparison.GT, zero=True, tmpreg=gen.vreg(4)))
+        self.assertEqual("vblendvps %ymm0,%ymm2,%ymm1,%ymm3\n", self.sel(gen, adt.FP32))
+        self.assertEqual("vpblendvb %ymm0,%ymm1,%ymm2,%ymm3\n",
+                         self.sel(gen, adt.SINT16, modifiers={smod.INV}))
+        with self.assertRaises(ValueError):
+            self.cmp(gen, adt.SINT32, comparison.GE)
+        with self.assertRaises(ValueError):
+            self.cmp(gen, adt.UINT32, comparison.GT)
+        with self.assertRaises(ValueError):
+            self.cmp(gen, adt.FP32, comparison.GT, zero=True)
+        with self.assertRaises(ValueError):
+            self.masked_fma(gen, mreg=gen.mreg(0))
+
+        gen = self.gen(fma128)
+        self.assertEqual("vpcmpeqq %xmm2,%xmm1,%xmm0\n",
+                         self.cmp(gen, adt.SINT64, comparison.EQ))
+
+        gen = self.gen(avx512)
+        kreg = gen.mreg(1)
+        self.assertEqual("vpcmpuw $5,%zmm2,%zmm1,%k1\n",
+                         gen.cmp(adreg=gen.vreg(1), bdreg=gen.vreg(2), mreg=kreg,
+                                 dt=adt.UINT16, cmp=comparison.GE))
+        self.assertEqual("vcmpph $0x04,%zmm2,%zmm1,%k1\n",
+                         gen.cmp(adreg=gen.vreg(1), bdreg=gen.vreg(2), mreg=kreg,
+                                 dt=adt.FP16, cmp=comparison.NE))
+        self.assertEqual("vblendmpd %zmm2,%zmm1,%zmm3{%k1}\n",
+                         gen.sel(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(3),
+                                 mreg=kreg, dt=adt.FP64))
+        self.assertEqual("vpblendmb %zmm2,%zmm1,%zmm3{%k1}\n",
+                         gen.sel(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(3),
+                                 mreg=kreg, dt=adt.UINT8))
+        self.assertEqual("vfmadd231ps %zmm1,%zmm2,%zmm3{%k1}\n",
+                         self.masked_fma(gen, mreg=kreg))
+        with self.assertRaises(ValueError):
+            self.masked_fma(gen, mreg=gen.mreg(0))
+        gen.set_output_inline(yesno=True)
+        self.assertIn("%%zmm3%{%%k1%}",
+                      gen.sel(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(3),
+                              mreg=kreg, dt=adt.FP32))
+
+    def test_avx_flags(self):
+        """
+        Tests that integer compares and blends on ymm require AVX2, byte/word
+        elements AVX512BW and vcmpph AVX512-FP16
+        """
+        cpuinfo = "flags\t\t: fpu sse2 avx fma avx512f\n"
+        gen = self.gen(fma256)
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo, adt.FP32))
+        self.assertFalse(gen.dt_supportedby_cpuinfo(cpuinfo, adt.SINT32))
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo+" avx2", adt.SINT32))
+        gen = self.gen(avx512)
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo, adt.UINT32))
+        for dt in [adt.SINT8, adt.UINT16]:
+            self.assertFalse(gen.dt_supportedby_cpuinfo(cpuinfo, dt))
+            self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo+" avx512bw", dt))
+        self.assertFalse(gen.dt_supportedby_cpuinfo(cpuinfo+" avx512bw", adt.FP16))
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo+" avx512_fp16", adt.FP16))
+
+    def test_rvv(self):
+        """
+        Tests RVV compares into mask registers, masked operations need the MU parameter
+        """
+        gen = self.gen(rvv)
+        self.assertEqual("vmflt.vv v0,v2,v1\n", self.cmp(gen, adt.FP32, comparison.GT))
+        self.assertEqual("vmsleu.vv v0,v1,v2\n", self.cmp(gen, adt.UINT8, comparison.LE))
+        self.assertEqual("vmsgt.vi v0,v1,-1\n",
+                         self.cmp(gen, adt.SINT32, comparison.GE, zero=True))
+        self.assertEqual(
+                "fmv.d.x f4,zero\n"
+                "vmfne.vf v0,v1,f4\n",
+                self.cmp(gen, adt.FP64, comparison.NZ, zero=True,
+                         tmpreg=gen.freg(4, adt.FP64)))
+        self.assertEqual("vmerge.vvm v3,v1,v2,v0\n", self.sel(gen, adt.FP32))
+        with self.assertRaises(ValueError):
+            self.cmp(gen, adt.FP32, comparison.EZ, zero=True)
+        with self.assertRaises(ValueError):
+            self.sel(gen, adt.FP32, cidx=0)
+
+        with self.assertRaises(ValueError):
+            self.masked_fma(gen)
+        gen.set_parameter("MU", 1)
+        self.assertEqual("vfmacc.vv v3,v2,v1,v0.t\n", self.masked_fma(gen))
+        self.assertEqual("vsetvli t5, zero, e32, m1, ta, mu\n",
+                         gen.vsetvlmax(reg=gen.greg(5), dt=adt.FP32))
+        with self.assertRaises(ValueError):
+            self.masked_fma(gen, mreg=gen.mreg(1))
+
+        gen.set_parameter("LMUL", 2)
+        # Register groups are scaled by LMUL, masks are single registers
+        self.assertEqual("vmseq.vv v1,v2,v4\n",
+                         gen.cmp(adreg=gen.vreg(1), bdreg=gen.vreg(2), mreg=gen.mreg(1),
+                                 dt=adt.SINT32, cmp=comparison.EQ))
+
+if __name__ == '__main__':
+    unittest.main()
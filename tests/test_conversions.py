@@ -0,0 +1,263 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the conversion operations and the vector conversion helper
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opcvt_modifier as mod
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.rvv071 import rvv071
+from asmgen.asmblocks.avx_fma import fma128,fma256,avx512
+
+from .asm_testcase import asm_testcase
+
+class test_conversions(asm_testcase):
+    """
+    Tests fcvt and convert_vectors on the different ISAs
+    """
+
+    def cvt(self, gen, a_dt : adt, b_dt : adt, modifiers : set[mod] = set(), **kwargs):
+        """
+        Returns the ASM of a conversion of v2 into v4
+        """
+        return gen.fcvt(adreg=gen.vreg(2), bdreg=gen.vreg(4), a_dt=a_dt, b_dt=b_dt,
+                        modifiers=modifiers, **kwargs)
+
+    def test_neon(self):
+        """
+        Tests the NEON conversions, parts are the lower and upper halves
+        """
+        gen = self.gen(neon)
+        self.assertEqual("fcvtns v4.4s,v2.4s\n", self.cvt(gen, adt.FP32, adt.SINT32))
+        self.assertEqual("fcvtzu v4.2d,v2.2d\n",
+                         self.cvt(gen, adt.FP64, adt.UINT64, {mod.RTZ}))
+        self.assertEqual("scvtf v4.8h,v2.8h\n", self.cvt(gen, adt.SINT16, adt.FP16))
+        self.assertEqual("fcvtl2 v4.4s,v2.8h\n",
+                         self.cvt(gen, adt.FP16, adt.FP32, {mod.PART}, part=1))
+        self.assertEqual("shll v4.4s,v2.4h,#16\n", self.cvt(gen, adt.BF16, adt.FP32))
+        self.assertEqual("bfcvtn2 v4.8h,v2.4s\n",
+                         self.cvt(gen, adt.FP32, adt.BF16, {mod.PART}, part=1))
+        self.assertEqual("sqxtun v4.8b,v2.8h\n",
+                         self.cvt(gen, adt.SINT16, adt.UINT8, {mod.SAT}))
+        self.assertEqual("xtn v4.4h,v2.4s\n", self.cvt(gen, adt.SINT32, adt.SINT16))
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.SINT32, adt.FP32, {mod.RTZ})
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.FP32, adt.FP16, {mod.SAT})
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.FP16, adt.FP32, {mod.PART}, part=2)
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.FP16, adt.FP64)
+
+    def test_sve(self):
+        """
+        Tests the SVE conversions, parts are the even and odd elements
+        """
+        gen = self.gen(sve)
+        self.assertEqual(
+                "frintn z4.s,p0/m,z2.s\n"
+                "fcvtzs z4.s,p0/m,z4.s\n",
+                self.cvt(gen, adt.FP32, adt.SINT32))
+        self.assertEqual("fcvtlt z4.d,p0/m,z2.s\n",
+                         self.cvt(gen, adt.FP32, adt.FP64, {mod.PART}, part=1))
+        self.assertEqual(
+                "movprfx z4,z2\n"
+                "and z4.s,z4.s,#0xffff0000\n",
+                self.cvt(gen, adt.BF16, adt.FP32, {mod.PART}, part=1))
+        self.assertEqual("bfcvt z4.h,p0/m,z2.s\n", self.cvt(gen, adt.FP32, adt.BF16))
+        self.assertEqual("uqxtnt z4.b,z2.h\n",
+                         self.cvt(gen, adt.UINT16, adt.UINT8, {mod.SAT, mod.PART}, part=1))
+        self.assertEqual("trn1 z4.h,z4.h,z2.h\n",
+                         self.cvt(gen, adt.SINT32, adt.SINT16, {mod.PART}, part=1))
+
+    def test_avx(self):
+        """
+        Tests the AVX conversions, writing the upper half needs a temporary register
+        """
+        gen = self.gen(fma256)
+        self.assertEqual("vcvttps2dq %ymm2,%ymm4\n",
+                         self.cvt(gen, adt.FP32, adt.SINT32, {mod.RTZ}))
+        self.assertEqual(
+                "vextractf128 $1,%ymm2,%xmm4\n"
+                "vcvtph2ps %xmm4,%ymm4\n",
+                self.cvt(gen, adt.FP16, adt.FP32, {mod.PART}, part=1))
+        self.assertEqual(
+                "vcvtps2ph $0,%ymm2,%xmm6\n"
+                "vinsertf128 $1,%xmm6,%ymm4,%ymm4\n",
+                self.cvt(gen, adt.FP32, adt.FP16, {mod.PART}, part=1, tmpreg=gen.vreg(6)))
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.FP32, adt.FP16, {mod.PART}, part=1)
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.FP32, adt.BF16)
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.UINT32, adt.FP32)
+
+        gen = self.gen(fma128)
+        self.assertEqual(
+                "vmovhlps %xmm2,%xmm2,%xmm4\n"
+                "vpmovzxwd %xmm4,%xmm4\n"
+                "vpslld $16,%xmm4,%xmm4\n",
+                self.cvt(gen, adt.BF16, adt.FP32, {mod.PART}, part=1))
+
+        gen = self.gen(avx512)
+        self.assertEqual("vpmovusdw %zmm2,%ymm4\n",
+                         self.cvt(gen, adt.UINT32, adt.UINT16, {mod.SAT}))
+        self.assertEqual("vcvtpd2uqq %zmm2,%zmm4\n", self.cvt(gen, adt.FP64, adt.UINT64))
+
+    def test_avx_flags(self):
+        """
+        Tests that the extensions used for integer and BF16 elements are required
+        """
+        cpuinfo = "flags\t\t: fpu sse2 avx fma avx512f\n"
+        self.assertTrue(self.gen(fma256).dt_supportedby_cpuinfo(cpuinfo, adt.FP32))
+        self.assertFalse(self.gen(fma256).dt_supportedby_cpuinfo(cpuinfo, adt.SINT32))
+        self.assertTrue(self.gen(fma128).dt_supportedby_cpuinfo(cpuinfo, adt.SINT32))
+        self.assertTrue(self.gen(fma256).dt_supportedby_cpuinfo(cpuinfo+"avx2", adt.BF16))
+        gen = self.gen(avx512)
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo, adt.UINT32))
+        for dt,flag in [(adt.UINT8, "avx512bw"), (adt.SINT16, "avx512bw"),
+                        (adt.SINT64, "avx512dq"), (adt.BF16, "avx512bw avx512_bf16")]:
+            self.assertFalse(gen.dt_supportedby_cpuinfo(cpuinfo, dt))
+            self.assertTrue(gen.dt_supportedby_cpuinfo(f"{cpuinfo[:-1]} {flag}\n", dt))
+        self.assertEqual(['avx512bw'], gen.get_dt_req_flags(adt.SINT8))
+
+    def test_rvv(self):
+        """
+        Tests the RVV conversions between registers and register groups
+        """
+        gen = self.gen(rvv)
+        self.assertEqual("vfwcvt.f.f.v v4,v2\n", self.cvt(gen, adt.FP16, adt.FP32))
+        self.assertEqual("vfcvt.rtz.xu.f.v v4,v2\n",
+                         self.cvt(gen, adt.FP32, adt.UINT32, {mod.RTZ}))
+        self.assertEqual("vnclip.wi v2,v4,0\n",
+                         gen.fcvt(adreg=gen.vreg(4), bdreg=gen.vreg(2), a_dt=adt.SINT32,
+                                  b_dt=adt.SINT16, modifiers={mod.SAT}))
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.FP16, adt.FP32, {mod.PART}, part=1)
+        with self.assertRaises(ValueError):
+            gen.fcvt(adreg=gen.vreg(2), bdreg=gen.vreg(3), a_dt=adt.FP16, b_dt=adt.FP32)
+        gen.set_parameter("LMUL", 2)
+        with self.assertRaises(ValueError):
+            gen.fcvt(adreg=gen.vreg(1), bdreg=gen.vreg(3), a_dt=adt.FP16, b_dt=adt.FP32)
+
+        gen = self.gen(rvv071)
+        self.assertEqual("vfncvt.f.f.v v4,v2\n", self.cvt(gen, adt.FP32, adt.FP16))
+        with self.assertRaises(ValueError):
+            self.cvt(gen, adt.FP32, adt.SINT32, {mod.RTZ})
+
+    def test_convert_vectors(self):
+        """
+        Tests that the helper converts all parts, or the whole register group
+        """
+        gen = self.gen(neon)
+        self.assertEqual(
+                "fcvtn v4.4h,v0.4s\n"
+                "fcvtn2 v4.8h,v1.4s\n",
+                gen.convert_vectors(adregs=[gen.vreg(0), gen.vreg(1)], bdregs=[gen.vreg(4)],
+                                    a_dt=adt.FP32, b_dt=adt.FP16))
+        with self.assertRaises(ValueError):
+            gen.convert_vectors(adregs=[gen.vreg(0)], bdregs=[gen.vreg(4)],
+                                a_dt=adt.FP32, b_dt=adt.FP16)
+
+        gen = self.gen(avx512)
+        self.assertEqual("vcvtne2ps2bf16 %zmm0,%zmm1,%zmm4\n",
+                         gen.convert_vectors(adregs=[gen.vreg(0), gen.vreg(1)],
+                                             bdregs=[gen.vreg(4)],
+                                             a_dt=adt.FP32, b_dt=adt.BF16))
+
+        gen = self.gen(rvv)
+        self.assertEqual("vfwcvt.f.f.v v4,v0\n",
+                         gen.convert_vectors(adregs=[gen.vreg(0)],
+                                             bdregs=[gen.vreg(4), gen.vreg(5)],
+                                             a_dt=adt.FP16, b_dt=adt.FP32))
+        with self.assertRaises(ValueError):
+            gen.convert_vectors(adregs=[gen.vreg(0)], bdregs=[gen.vreg(5), gen.vreg(6)],
+                                a_dt=adt.FP16, b_dt=adt.FP32)
+        with self.assertRaises(ValueError):
+            gen.convert_vectors(adregs=[gen.vreg(0)], bdregs=[gen.vreg(4+i) for i in range(4)],
+                                a_dt=adt.UINT8, b_dt=adt.UINT32)
+
+    def test_convert_vectors_chained(self):
+        """
+        Tests that conversions fcvt can't do in one step are chained,
+        narrowing through adregs and widening through bdregs
+        """
+        gen = self.gen(neon)
+        aregs = [gen.vreg(i) for i in range(4)]
+        bregs = [gen.vreg(4+i) for i in range(4)]
+        self.assertEqual(adt.SINT16, gen.intermediate_conversion_dt(a_dt=adt.SINT32,
+                                                                    b_dt=adt.SINT8))
+        self.assertEqual(adt.SINT32, gen.intermediate_conversion_dt(a_dt=adt.FP32,
+                                                                    b_dt=adt.SINT8))
+        self.assertIsNone(gen.intermediate_conversion_dt(a_dt=adt.SINT32, b_dt=adt.SINT16))
+        self.assertIsNone(gen.intermediate_conversion_dt(a_dt=adt.FP64, b_dt=adt.FP16))
+        self.assertEqual(
+                "xtn v0.4h,v0.4s\n"
+                "xtn2 v0.8h,v1.4s\n"
+                "xtn v2.4h,v2.4s\n"
+                "xtn2 v2.8h,v3.4s\n"
+                "xtn v4.8b,v0.8h\n"
+                "xtn2 v4.16b,v2.8h\n",
+                gen.convert_vectors(adregs=aregs, bdregs=bregs[:1],
+                                    a_dt=adt.SINT32, b_dt=adt.SINT8))
+        self.assertEqual(
+                "uxtl v5.8h,v0.8b\n"
+                "uxtl2 v7.8h,v0.16b\n"
+                "uxtl v4.4s,v5.4h\n"
+                "uxtl2 v5.4s,v5.8h\n"
+                "uxtl v6.4s,v7.4h\n"
+                "uxtl2 v7.4s,v7.8h\n",
+                gen.convert_vectors(adregs=aregs[:1], bdregs=bregs,
+                                    a_dt=adt.UINT8, b_dt=adt.UINT32))
+        self.assertEqual(
+                "fcvtzs v0.4s,v0.4s\n"
+                "fcvtzs v1.4s,v1.4s\n"
+                "fcvtzs v2.4s,v2.4s\n"
+                "fcvtzs v3.4s,v3.4s\n"
+                "sqxtn v0.4h,v0.4s\n"
+                "sqxtn2 v0.8h,v1.4s\n"
+                "sqxtn v2.4h,v2.4s\n"
+                "sqxtn2 v2.8h,v3.4s\n"
+                "sqxtn v4.8b,v0.8h\n"
+                "sqxtn2 v4.16b,v2.8h\n",
+                gen.convert_vectors(adregs=aregs, bdregs=bregs[:1],
+                                    a_dt=adt.FP32, b_dt=adt.SINT8,
+                                    modifiers={mod.RTZ, mod.SAT}))
+        with self.assertRaises(ValueError):
+            gen.convert_vectors(adregs=aregs[:1], bdregs=bregs,
+                                a_dt=adt.FP16, b_dt=adt.FP64)
+
+        gen = self.gen(sve)
+        self.assertEqual(
+                "trn1 z0.h,z0.h,z1.h\n"
+                "trn1 z2.h,z2.h,z3.h\n"
+                "mov z4.d,z0.d\n"
+                "trn1 z4.b,z4.b,z2.b\n",
+                gen.convert_vectors(adregs=[gen.vreg(i) for i in range(4)],
+                                    bdregs=[gen.vreg(4)],
+                                    a_dt=adt.SINT32, b_dt=adt.SINT8))
+
+        gen = self.gen(avx512)
+        self.assertEqual(
+                "vpmovzxbw %ymm0,%zmm5\n"
+                "vextractf64x4 $1,%zmm0,%ymm7\n"
+                "vpmovzxbw %ymm7,%zmm7\n"
+                "vpmovzxwd %ymm5,%zmm4\n"
+                "vextractf64x4 $1,%zmm5,%ymm5\n"
+                "vpmovzxwd %ymm5,%zmm5\n"
+                "vpmovzxwd %ymm7,%zmm6\n"
+                "vextractf64x4 $1,%zmm7,%ymm7\n"
+                "vpmovzxwd %ymm7,%zmm7\n",
+                gen.convert_vectors(adregs=[gen.vreg(0)],
+                                    bdregs=[gen.vreg(4+i) for i in range(4)],
+                                    a_dt=adt.UINT8, b_dt=adt.UINT32))
+
+if __name__ == '__main__':
+    unittest.main()
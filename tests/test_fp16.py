@@ -0,0 +1,102 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests native FP16 arithmetic and the checks for the required ISA extensions
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opd3_modifier as mod
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma256,avx512
+from asmgen.compilation.compiler_presets import arch_flags
+
+from .asm_testcase import asm_testcase
+
+class test_fp16(asm_testcase):
+    """
+    Tests FP16 fma/fmul/fadd and the FP16 cpuinfo checks on the different ISAs
+    """
+
+    def opd3(self, gen, op : str, modifiers : set[mod] = set()):
+        """
+        Returns the ASM of an FP16 operation on v0 and v1 into v2
+        """
+        return getattr(gen, op)(adreg=gen.vreg(0), bdreg=gen.vreg(1), cdreg=gen.vreg(2),
+                                a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP16,
+                                modifiers=modifiers)
+
+    def test_arm(self):
+        """
+        Tests the NEON/SVE FP16 arithmetic and the FEAT_FP16 cpuinfo flags
+        """
+        gen = self.gen(neon)
+        self.assertEqual("fmla v2.8h,v0.8h,v1.8h\n", self.opd3(gen, 'fma'))
+        self.assertEqual("fadd v2.8h,v0.8h,v1.8h\n", self.opd3(gen, 'fadd'))
+        cpuinfo = "Features\t: fp asimd evtstrm aes pmull sha1 sha2 crc32 cpuid\n"
+        self.assertTrue(gen.supportedby_cpuinfo(cpuinfo))
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo, adt.SINGLE))
+        self.assertFalse(gen.dt_supportedby_cpuinfo(cpuinfo, adt.HALF))
+        cpuinfo = "Features\t: fp asimd evtstrm aes pmull fphp asimdhp cpuid sve\n"
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo, adt.HALF))
+
+        gen = self.gen(sve)
+        self.assertEqual("fmul z2.h,p0/m,z0.h,z1.h\n", self.opd3(gen, 'fmul'))
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo, adt.HALF))
+        self.assertFalse(gen.dt_supportedby_cpuinfo("Features\t: fp asimd fphp asimdhp\n",
+                                                    adt.HALF))
+
+    def test_rvv(self):
+        """
+        Tests the RVV FP16 arithmetic, which can be disabled if Zvfh is missing
+        """
+        gen = self.gen(rvv)
+        self.assertEqual("vfmacc.vv v2,v1,v0\n", self.opd3(gen, 'fma'))
+        self.assertEqual("vfmul.vf v2,v0,f1\n",
+                         gen.fmul(adreg=gen.vreg(0), bdreg=gen.freg(1, adt.FP16),
+                                  cdreg=gen.vreg(2), a_dt=adt.FP16, b_dt=adt.FP16,
+                                  c_dt=adt.FP16, modifiers={mod.VF}))
+        self.assertEqual(1, gen.get_param_value("ZVFH"))
+        gen.set_parameter("ZVFH", 0)
+        with self.assertRaises(ValueError):
+            self.opd3(gen, 'fadd')
+        with self.assertRaises(ValueError):
+            gen.fma(adreg=gen.vreg(0), bdreg=gen.vreg(1), cdreg=gen.vreg(2),
+                    a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP32)
+        self.assertEqual("vfadd.vv v2,v0,v1\n",
+                         gen.fadd(adreg=gen.vreg(0), bdreg=gen.vreg(1), cdreg=gen.vreg(2),
+                                  a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32))
+
+        cpuinfo = "isa\t\t: rv64imafdcv_zicbom_zvfh_zvfhmin\n"
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo, adt.HALF))
+        cpuinfo = "isa\t\t: rv64imafdcv_zicbom_zvfhmin\n"
+        self.assertTrue(gen.dt_supportedby_cpuinfo(cpuinfo, adt.SINGLE))
+        self.assertFalse(gen.dt_supportedby_cpuinfo(cpuinfo, adt.HALF))
+
+    def test_avx(self):
+        """
+        Tests that only AVX512 with AVX512-FP16 supports FP16 arithmetic
+        """
+        cpuinfo = "flags\t\t: fpu sse2 avx fma avx2 avx512f avx512_bf16 avx512_fp16\n"
+        self.assertFalse(self.gen(fma256).dt_supportedby_cpuinfo(cpuinfo, adt.HALF))
+        self.assertTrue(self.gen(avx512).dt_supportedby_cpuinfo(cpuinfo, adt.HALF))
+        cpuinfo = "flags\t\t: fpu sse2 avx fma avx2 avx512f avx512_bf16\n"
+        self.assertFalse(self.gen(avx512).dt_supportedby_cpuinfo(cpuinfo, adt.HALF))
+
+    def test_arch_flags(self):
+        """
+        Tests that the compilation flags enable the FP16 extensions
+        """
+        for cxx in ['g++', 'clang++', 'armclang++']:
+            self.assertIn('+fp16', arch_flags[cxx]['neon'][0])
+            self.assertIn('armv8.2-a+sve', arch_flags[cxx]['sve'][0])
+        for cxx in ['g++', 'clang++']:
+            self.assertIn('_zvfh', arch_flags[cxx]['rvv'][0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the table lookup dequantization GEMV kernel generator
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt, reg_tracker
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma256
+from asmgen.kernels import lut_dequant, lut_method
+
+class test_lut_dequant(unittest.TestCase):
+    """
+    Tests weight packing and the generated FMA and DOT kernels
+    """
+
+    def kernel(self, gen, method : lut_method, offsets : bool = False) -> tuple:
+        """
+        Generates a one row kernel, returns the kernel generator and the ASM
+        """
+        gen.set_output_inline(yesno=False)
+        rt = reg_tracker(reg_type_init_list=[
+            ("greg", gen.max_gregs),
+            ("vreg", gen.max_vregs),
+            ])
+        gregs = [gen.greg(rt.reserve_any_reg("greg")) for _ in range(7)]
+        rt.reserve_specific_reg("vreg", 0)
+        kernel = lut_dequant(gen=gen, rt=rt, method=method)
+        asm = kernel.generate(wregs=[gregs[0]], sregs=[gregs[1]], xreg=gregs[2],
+                              lutreg=gregs[3], kreg=gregs[4],
+                              yregs=[gen.freg(0, adt.FP32)],
+                              mregs=[gregs[5]] if offsets else None,
+                              xsreg=gregs[6] if lut_method.DOT == method else None)
+        return kernel, asm
+
+    def test_packing(self):
+        """
+        Tests that the packed order follows the element order of the widening
+        """
+        kernel = lut_dequant(gen=neon(), rt=reg_tracker(reg_type_init_list=[]))
+        self.assertEqual(32, kernel.group_size)
+        self.assertEqual(list(range(16)), kernel.code_order())
+        indices = [i%16 for i in range(32)]
+        indices[16] = 3
+        self.assertEqual([0x30] + [i | i << 4 for i in range(1,16)],
+                         kernel.pack_group(indices))
+        with self.assertRaises(ValueError):
+            kernel.pack_group(indices[:16])
+
+        gen = sve()
+        gen.set_parameter("VL", 256)
+        kernel = lut_dequant(gen=gen, rt=reg_tracker(reg_type_init_list=[]))
+        # Byte 4*l+2*q+p ends up in lane l of vector 2*p+q
+        self.assertEqual([0, 16, 8, 24, 1, 17, 9, 25], kernel.code_order()[:8])
+        self.assertEqual(list(range(32)),
+                         lut_dequant(gen=gen, rt=reg_tracker(reg_type_init_list=[]),
+                                     method=lut_method.DOT).code_order())
+
+        kernel = lut_dequant(gen=fma256(), rt=reg_tracker(reg_type_init_list=[]))
+        kernel.add_table("iq4nl", list(range(16)))
+        self.assertEqual(32, len(kernel.gen.asmdata["iq4nl"]))
+
+    def test_unsupported(self):
+        """
+        Tests the requirements on the ISA
+        """
+        rt = reg_tracker(reg_type_init_list=[])
+        with self.assertRaises(ValueError):
+            lut_dequant(gen=sve(), rt=rt)
+        with self.assertRaises(ValueError):
+            lut_dequant(gen=fma256(), rt=rt, method=lut_method.DOT)
+        gen = rvv()
+        gen.set_parameter("VL", 256)
+        with self.assertRaises(ValueError):
+            lut_dequant(gen=gen, rt=rt)
+
+    def test_fma(self):
+        """
+        Tests the FMA kernel dequantizing the weights with scales and offsets
+        """
+        _, asm = self.kernel(neon(), lut_method.FMA, offsets=True)
+        self.assertIn("tbl v2.16b,{v1.16b},v3.16b\n"
+                      "tbl v3.16b,{v1.16b},v4.16b\n"
+                      "sxtl v8.8h,v2.8b\n"
+                      "sxtl2 v9.8h,v2.16b\n", asm)
+        self.assertIn("scvtf v10.4s,v10.4s\n"
+                      "fmul v10.4s,v10.4s,v5.4s\n"
+                      "fadd v10.4s,v10.4s,v13.4s\n"
+                      "ldr q12, [x2, #0]\n"
+                      "fmla v6.4s,v10.4s,v12.4s\n", asm)
+        self.assertIn("fmla v7.4s,v11.4s,v12.4s\n"
+                      "add x2,x2,#128\n", asm)
+
+        _, asm = self.kernel(fma256(), lut_method.FMA)
+        self.assertIn("vpshufb %ymm3,%ymm1,%ymm2\n", asm)
+        self.assertIn("vcvtdq2ps %ymm10,%ymm10\n"
+                      "vmulps %ymm10,%ymm5,%ymm10\n"
+                      "vmovups (%r10),%ymm12\n", asm)
+
+    def test_dot(self):
+        """
+        Tests the DOT kernel scaling the INT32 dot products of every group
+        """
+        kernel, asm = self.kernel(neon(), lut_method.DOT)
+        self.assertIn("dup v10.4s,wzr\n"
+                      "sdot v10.4s,v2.16b,v7.16b\n"
+                      "sdot v10.4s,v3.16b,v8.16b\n"
+                      "scvtf v10.4s,v10.4s\n"
+                      "ld1r {v5.4s}, [x1]\n"
+                      "add x1,x1,#4\n"
+                      "fmul v5.4s,v5.4s,v9.4s\n"
+                      "fmla v6.4s,v10.4s,v5.4s\n", asm)
+        with self.assertRaises(ValueError):
+            kernel.generate(wregs=[], sregs=[], xreg=None, lutreg=None, kreg=None, yregs=[])
+
+        gen = rvv()
+        gen.set_parameter("VL", 256)
+        gen.set_parameter("ZVQDOTQ", 1)
+        _, asm = self.kernel(gen, lut_method.DOT)
+        # vtype switches between the byte lookups and the FP32 accumulation
+        self.assertIn("vsetvli s1, zero, e8, m1, ta, ma\n"
+                      "vle8.v v7, (t2)\n", asm)
+        self.assertIn("vrgather.vv v2,v1,v3\n"
+                      "vrgather.vv v3,v1,v4\n"
+                      "vsetvli s1, zero, e32, m1, ta, ma\n", asm)
+
+if __name__ == '__main__':
+    unittest.main()
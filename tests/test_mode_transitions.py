@@ -0,0 +1,114 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the optimization of ISA mode transitions (SME streaming mode, AVX upper state)
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt, reg_tracker
+from asmgen.asmblocks.sme import sme
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.avx_fma import fma128,fma256
+
+class test_sme_mode_transitions(unittest.TestCase):
+    """
+    Tests coalescing and hoisting of smstart/smstop
+    """
+
+    def setUp(self):
+        """
+        Sets up the generator for all tests
+        """
+        self.gen = sme()
+
+    def streaming_block(self) -> str:
+        """
+        Returns a block that enables streaming mode, zeroes a tile and disables it again
+        """
+        gen = self.gen
+        rt = reg_tracker(reg_type_init_list=[("greg", 31), ("preg", gen.max_pregs)])
+        asmblock  = gen.isaquirks(rt=rt, dt=adt.FP32)
+        asmblock += gen.zero_treg(treg=gen.treg(0, adt.FP32), dt=adt.FP32)
+        asmblock += gen.isaendquirks(rt=rt, dt=adt.FP32)
+        return asmblock
+
+    def test_coalesce(self):
+        """
+        Tests that streaming regions separated by scalar code are merged
+        """
+        gen = self.gen
+        for inline in [False, True]:
+            gen.set_output_inline(yesno=inline)
+            asmblock  = self.streaming_block()
+            asmblock += gen.add_greg_imm(reg=gen.greg(0), imm=8)
+            asmblock += self.streaming_block()
+            optimized = gen.optimize_mode_transitions(asmblock)
+            self.assertEqual(1, optimized.count("smstart"))
+            self.assertEqual(1, optimized.count("smstop"))
+            self.assertEqual(len(asmblock.splitlines())-2, len(optimized.splitlines()))
+
+        # Vector code can't be moved into streaming mode
+        gen.set_output_inline(yesno=False)
+        asmblock  = self.streaming_block()
+        asmblock += neon().asmwrap("fadd v0.4s,v0.4s,v1.4s")
+        asmblock += self.streaming_block()
+        self.assertEqual(asmblock, gen.optimize_mode_transitions(asmblock))
+
+    def test_hoist(self):
+        """
+        Tests that streaming mode switches around a loop body are moved out of the loop
+        """
+        gen = self.gen
+        gen.set_output_inline(yesno=False)
+        reg = gen.greg(0)
+        asmblock  = gen.loopbegin(reg=reg, label="loop")
+        asmblock += self.streaming_block()
+        asmblock += gen.loopend(reg=reg, label="loop")
+        optimized = gen.optimize_mode_transitions(asmblock)
+        self.assertTrue(optimized.startswith("smstart\n.loop:\n"))
+        self.assertTrue(optimized.endswith("b.ne .loop\nsmstop\n"))
+
+        # Labels reachable from elsewhere prevent the hoisting
+        asmblock = gen.jump(label="loop") + asmblock
+        self.assertEqual(asmblock, gen.optimize_mode_transitions(asmblock))
+
+    def test_simd_size_function(self):
+        """
+        Tests that querying the streaming vector length doesn't switch modes
+        """
+        self.assertNotIn("smstart", self.gen.c_simd_size_function)
+        self.assertIn("rdsvl %[byte_size],#1", self.gen.c_simd_size_function)
+
+class test_avx_mode_transitions(unittest.TestCase):
+    """
+    Tests placement of vzeroupper
+    """
+
+    def test_vzeroupper(self):
+        """
+        Tests that vzeroupper is inserted before ret/call after ymm use only
+        """
+        gen = fma256()
+        gen.set_output_inline(yesno=False)
+        asmblock  = gen.zero_vreg(vreg=gen.vreg(0), dt=adt.FP64)
+        asmblock += gen.asmwrap("call func")
+        asmblock += gen.asmwrap("vzeroupper")
+        asmblock += gen.asmwrap("ret")
+        # The redundant vzeroupper before ret is removed
+        self.assertEqual(("vpxor %ymm0,%ymm0,%ymm0\n"
+                          "vzeroupper\n"
+                          "call func\n"
+                          "ret\n"),
+                         gen.optimize_mode_transitions(asmblock))
+
+        gen = fma128()
+        gen.set_output_inline(yesno=False)
+        asmblock  = gen.zero_vreg(vreg=gen.vreg(0), dt=adt.FP64)
+        asmblock += gen.asmwrap("ret")
+        self.assertEqual(asmblock, gen.optimize_mode_transitions(asmblock))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests cache level/write prefetches and the automatic prefetch insertion
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opdna1_modifier as mod
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma256
+
+from .asm_testcase import asm_testcase
+
+class test_prefetch(asm_testcase):
+    """
+    Tests the prefetch variants of the different ISAs
+    """
+
+    def test_aarch64(self):
+        """
+        Tests PRFM/PRF* prefetch operations
+        """
+        gen = self.gen(sve)
+        self.assertEqual("prfm pldl2keep,[x1,#64]\n",
+                         gen.prefetch_immoff(areg=gen.greg(1), offset=64, level=2))
+        self.assertEqual("prfm pstl1keep,[x1,#64]\n",
+                         gen.prefetch_immoff(areg=gen.greg(1), offset=64, write=True))
+        self.assertEqual("prfd pstl3keep, p0, [x0, #-3, MUL VL]\n",
+                         gen.prefetch_voff(areg=gen.greg(0), voffset=-3, dt=adt.FP64,
+                                           level=3, write=True))
+        with self.assertRaises(ValueError):
+            gen.prefetch_voff(areg=gen.greg(0), voffset=32, dt=adt.FP64)
+        with self.assertRaises(ValueError):
+            gen.prefetch_immoff(areg=gen.greg(1), offset=64, level=4)
+
+        # Fixed vector length ISAs convert vector offsets to bytes
+        gen = self.gen(neon)
+        self.assertEqual("prfm pldl1keep,[x0,#32]\n",
+                         gen.prefetch_voff(areg=gen.greg(0), voffset=2, dt=adt.FP32))
+
+    def test_x86(self):
+        """
+        Tests prefetcht0-2 and prefetchw
+        """
+        gen = self.gen(fma256)
+        self.assertEqual("prefetcht2 64(%r9)\n",
+                         gen.prefetch_immoff(areg=gen.greg(1), offset=64, level=3))
+        self.assertEqual("prefetchw 64(%r9)\n",
+                         gen.prefetch_immoff(areg=gen.greg(1), offset=64, level=2, write=True))
+        self.assertEqual("prefetcht0 64(%r8)\n",
+                         gen.prefetch_voff(areg=gen.greg(0), voffset=2, dt=adt.FP64))
+
+    def test_riscv(self):
+        """
+        Tests Zicbop prefetches
+        """
+        gen = self.gen(rvv)
+        self.assertEqual("prefetch.w -64(t1)\n",
+                         gen.prefetch_immoff(areg=gen.greg(1), offset=-64, write=True))
+        with self.assertRaises(ValueError):
+            gen.prefetch_immoff(areg=gen.greg(1), offset=48)
+        with self.assertRaises(NotImplementedError):
+            gen.prefetch_voff(areg=gen.greg(0), voffset=2, dt=adt.FP32)
+
+    def test_insert_prefetches(self):
+        """
+        Tests that prefetches are only inserted into innermost loops for the
+        address registers used in them
+        """
+        gen = self.gen(fma256)
+        counter = gen.greg(0)
+        inner = gen.greg(1)
+        areg = gen.greg(2)
+        breg = gen.greg(3)
+        asmblock  = gen.loopbegin(reg=counter, label="outer")
+        asmblock += gen.loopbegin(reg=inner, label="inner")
+        asmblock += gen.load(dregs=[gen.vreg(0)], areg=areg, dt=adt.FP32, modifiers=set())
+        asmblock += gen.store(dregs=[gen.vreg(0)], areg=areg, dt=adt.FP32,
+                              modifiers={mod.IOFFSET}, ioffset=32)
+        asmblock += gen.loopend(reg=inner, label="inner")
+        asmblock += gen.loopend(reg=counter, label="outer")
+        optimized = gen.insert_prefetches(asmblock, aregs=[areg, breg], distance=1024)
+        self.assertEqual(1, optimized.count("prefetch"))
+        self.assertIn(".inner:\nprefetcht0 1024(%r10)\n", optimized)
+
+        # A label targeted from elsewhere is no loop
+        asmblock = gen.jump(label="inner") + asmblock
+        self.assertEqual(asmblock,
+                         gen.insert_prefetches(asmblock, aregs=[areg], distance=1024))
+
+        gen = self.gen(rvv)
+        with self.assertRaises(ValueError):
+            gen.insert_prefetches("", aregs=[gen.greg(0)], distance=4096)
+
+        gen.set_output_inline(yesno=True)
+        reg = gen.greg(0)
+        asmblock  = gen.loopbegin(reg=reg, label="loop")
+        asmblock += gen.load(dregs=[gen.vreg(0)], areg=gen.greg(1), dt=adt.FP32,
+                             modifiers=set())
+        asmblock += gen.loopend(reg=reg, label="loop")
+        optimized = gen.insert_prefetches(asmblock, aregs=[gen.greg(1)], distance=256,
+                                          write=True)
+        self.assertIn("\".loop%=:\\n\\t\"\n\"prefetch.w 256(t1)\\n\\t\"\n", optimized)
+
+if __name__ == '__main__':
+    unittest.main()
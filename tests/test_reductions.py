@@ -0,0 +1,151 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the reduction operations and the multi-accumulator reduction
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opred_modifier as mod
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.sme import sme
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.rvv071 import rvv071
+from asmgen.asmblocks.avx_fma import fma256,avx512
+
+from .asm_testcase import asm_testcase
+
+class test_reductions(asm_testcase):
+    """
+    Tests faddv/fmaxv/fminv and reduce_accumulators on the different ISAs
+    """
+
+    def reduce(self, gen, op : str, dt : adt, modifiers : set[mod] = set()):
+        """
+        Returns the ASM of a reduction of v1 into f2 using v3 as temporary
+        """
+        return getattr(gen, op)(adreg=gen.vreg(1), bdreg=gen.freg(2, dt), dt=dt,
+                                modifiers=modifiers, tmpreg=gen.vreg(3))
+
+    def test_neon(self):
+        """
+        Tests the pairwise adds and the across-lanes min/max on NEON
+        """
+        gen = self.gen(neon)
+        self.assertEqual(
+                "faddp v2.4s,v1.4s,v1.4s\n"
+                "faddp s2,v2.2s\n",
+                self.reduce(gen, 'faddv', adt.FP32))
+        self.assertEqual("faddp d2,v1.2d\n", self.reduce(gen, 'faddv', adt.FP64))
+        self.assertEqual("fmaxp d2,v1.2d\n", self.reduce(gen, 'fmaxv', adt.FP64))
+        self.assertEqual("fminv h2,v1.8h\n", self.reduce(gen, 'fminv', adt.FP16))
+        with self.assertRaises(ValueError):
+            self.reduce(gen, 'faddv', adt.FP32, {mod.ORDERED})
+
+    def test_sve(self):
+        """
+        Tests the SVE reductions, fadda is illegal in streaming mode
+        """
+        gen = self.gen(sve)
+        self.assertEqual("faddv s2,p0,z1.s\n", self.reduce(gen, 'faddv', adt.FP32))
+        self.assertEqual("fadda d2,p0,d2,z1.d\n",
+                         self.reduce(gen, 'faddv', adt.FP64, {mod.ORDERED}))
+        with self.assertRaises(ValueError):
+            self.reduce(gen, 'fmaxv', adt.FP64, {mod.ORDERED})
+        gen = self.gen(sme)
+        self.assertEqual("fmaxv h2,p0,z1.h\n", self.reduce(gen, 'fmaxv', adt.FP16))
+        with self.assertRaises(ValueError):
+            self.reduce(gen, 'faddv', adt.FP64, {mod.ORDERED})
+
+    def test_rvv(self):
+        """
+        Tests the RVV reductions through element 0 of the temporary register
+        """
+        gen = self.gen(rvv)
+        self.assertEqual(
+                "vmv.s.x v3,zero\n"
+                "vfredusum.vs v3,v1,v3\n"
+                "vfmv.f.s f2,v3\n",
+                self.reduce(gen, 'faddv', adt.FP32))
+        self.assertEqual(
+                "vfmv.s.f v3,f2\n"
+                "vfredosum.vs v3,v1,v3\n"
+                "vfmv.f.s f2,v3\n",
+                self.reduce(gen, 'faddv', adt.FP64, {mod.ORDERED}))
+        self.assertEqual(
+                "vfredmax.vs v3,v1,v1\n"
+                "vfmv.f.s f2,v3\n",
+                self.reduce(gen, 'fmaxv', adt.FP64))
+        with self.assertRaises(ValueError):
+            gen.faddv(adreg=gen.vreg(1), bdreg=gen.freg(2, adt.FP32), dt=adt.FP32)
+        with self.assertRaises(ValueError):
+            gen.faddv(adreg=gen.vreg(1), bdreg=gen.freg(2, adt.FP32), dt=adt.FP32,
+                      tmpreg=gen.vreg(1))
+        gen = self.gen(rvv071)
+        self.assertIn("vfredsum.vs v3,v1,v3\n", self.reduce(gen, 'faddv', adt.FP32))
+
+    def test_avx(self):
+        """
+        Tests the AVX shuffle trees
+        """
+        gen = self.gen(fma256)
+        self.assertEqual(
+                "vextractf128 $1,%ymm1,%xmm3\n"
+                "vaddpd %xmm3,%xmm1,%xmm2\n"
+                "vpermilpd $1,%xmm2,%xmm3\n"
+                "vaddsd %xmm3,%xmm2,%xmm2\n",
+                self.reduce(gen, 'faddv', adt.FP64))
+        gen = self.gen(avx512)
+        self.assertEqual(
+                "vextractf64x4 $1,%zmm1,%ymm3\n"
+                "vmaxps %ymm3,%ymm1,%ymm2\n"
+                "vextractf32x4 $1,%ymm2,%xmm3\n"
+                "vmaxps %xmm3,%xmm2,%xmm2\n"
+                "vmovhlps %xmm2,%xmm2,%xmm3\n"
+                "vmaxps %xmm3,%xmm2,%xmm2\n"
+                "vmovshdup %xmm2,%xmm3\n"
+                "vmaxss %xmm3,%xmm2,%xmm2\n",
+                self.reduce(gen, 'fmaxv', adt.FP32))
+        # Registers 16-31 can only be encoded with EVEX
+        self.assertEqual(
+                "vextractf64x4 $1,%zmm17,%ymm30\n"
+                "vaddpd %ymm30,%ymm17,%ymm18\n"
+                "vextractf32x4 $1,%ymm18,%xmm30\n"
+                "vaddpd %xmm30,%xmm18,%xmm18\n"
+                "vpermilpd $1,%xmm18,%xmm30\n"
+                "vaddsd %xmm30,%xmm18,%xmm18\n",
+                gen.faddv(adreg=gen.vreg(17), bdreg=gen.freg(18, adt.FP64), dt=adt.FP64,
+                          tmpreg=gen.vreg(30)))
+        with self.assertRaises(ValueError):
+            gen.faddv(adreg=gen.vreg(1), bdreg=gen.freg(2, adt.FP32), dt=adt.FP32,
+                      tmpreg=gen.vreg(2))
+        with self.assertRaises(ValueError):
+            self.reduce(gen, 'faddv', adt.FP32, {mod.ORDERED})
+
+    def test_accumulators(self):
+        """
+        Tests the accumulator count and the tree of adds before the reduction
+        """
+        gen = self.gen(neon)
+        self.assertEqual(8, gen.accumulator_count(latency=4, throughput=2))
+        self.assertEqual(3, gen.accumulator_count(latency=5, throughput=0.5))
+        self.assertEqual(1, gen.accumulator_count(latency=1, throughput=0.5))
+        self.assertEqual(
+                "fadd v0.2d,v0.2d,v1.2d\n"
+                "fadd v2.2d,v2.2d,v3.2d\n"
+                "fadd v0.2d,v0.2d,v2.2d\n"
+                "fadd v0.2d,v0.2d,v4.2d\n"
+                "faddp d6,v0.2d\n",
+                gen.reduce_accumulators(accregs=[gen.vreg(i) for i in range(5)],
+                                        freg=gen.freg(6, adt.FP64), tmpreg=gen.vreg(7),
+                                        dt=adt.FP64))
+        with self.assertRaises(ValueError):
+            gen.reduce_accumulators(accregs=[], freg=gen.freg(6, adt.FP64),
+                                    tmpreg=gen.vreg(7), dt=adt.FP64)
+
+if __name__ == '__main__':
+    unittest.main()
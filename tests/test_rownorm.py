@@ -0,0 +1,233 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the fused row-wise normalization kernels and their building blocks
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt, reg_tracker
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.rvv071 import rvv071
+from asmgen.asmblocks.avx_fma import fma256,avx512
+from asmgen.kernels import rownorm
+
+from .asm_testcase import asm_testcase
+
+class test_rownorm(asm_testcase):
+    """
+    Tests sqrt_vreg, greg_to_freg and the softmax, layernorm and rmsnorm kernels
+    """
+
+    def gen(self, cls):
+        """
+        Returns a generator producing normal ASM, RVV keeps the tail undisturbed
+        """
+        gen = super().gen(cls)
+        if isinstance(gen, rvv):
+            gen.set_parameter("TU", 1)
+        return gen
+
+    def rownorm(self, gen, dt : adt = adt.FP32) -> rownorm:
+        """
+        Returns a kernel generator, greg 0-4 are reserved for the arguments
+        """
+        rt = reg_tracker(reg_type_init_list=[
+            ("greg", gen.max_gregs),
+            ("vreg", gen.max_vregs),
+            ("freg", gen.max_fregs),
+            ])
+        for i in range(5):
+            rt.reserve_specific_reg("greg", i)
+        return rownorm(gen=gen, rt=rt, dt=dt)
+
+    def test_primitives(self):
+        """
+        Tests the square root and the conversion of the element count
+        """
+        def primitives(gen, dt):
+            return (gen.sqrt_vreg(vreg=gen.vreg(1), dst=gen.vreg(2), dt=dt) +
+                    gen.greg_to_freg(greg=gen.greg(1), freg=gen.freg(3, dt), dt=dt))
+
+        self.assertEqual("fsqrt v2.2d,v1.2d\n"
+                         "ucvtf d3,x1\n",
+                         primitives(self.gen(neon), adt.FP64))
+        self.assertEqual("fsqrt z2.h,p0/m,z1.h\n"
+                         "ucvtf h3,x1\n",
+                         primitives(self.gen(sve), adt.FP16))
+        self.assertEqual("vfsqrt.v v2,v1\n"
+                         "fcvt.s.lu f3,t1\n",
+                         primitives(self.gen(rvv), adt.FP32))
+        self.assertEqual("vsqrtps %zmm1,%zmm2\n"
+                         "vcvtsi2ssq %r9,%xmm3,%xmm3\n",
+                         primitives(self.gen(avx512), adt.FP32))
+        gen = self.gen(fma256)
+        with self.assertRaises(ValueError):
+            primitives(gen, adt.FP16)
+        with self.assertRaises(ValueError):
+            gen.sqrt_vreg(vreg=gen.vreg(1), dst=gen.vreg(1), dt=adt.SINT32)
+
+        gen = rvv()
+        gen.set_output_inline(yesno=False)
+        self.assertEqual(0, gen.get_param_value("TU"))
+        gen.set_parameter("TU", 1)
+        self.assertEqual("vsetvli t5, zero, e64, m1, tu, ma\n",
+                         gen.vsetvlmax(reg=gen.greg(5), dt=adt.FP64))
+
+    def test_softmax(self):
+        """
+        Tests that the tail elements are masked out of the maximum and the sum
+        """
+        gen = self.gen(sve)
+        asm = self.rownorm(gen).softmax(xreg=gen.greg(0), yreg=gen.greg(1),
+                                        nreg=gen.greg(2))
+        self.assertTrue(asm.startswith(
+                "adr x7,.vmath_softmax_single_horner\n"
+                "ld1rw z3.s, p0/z, [x7]\n"
+                "ld1rw z4.s, p0/z, [x7, #4]\n"
+                "ld1rw z1.s, p0/z, [x0]\n"))
+        self.assertIn(".softmax_max:\n"
+                      "ld1w {z0.s}, p1/z, [x5]\n"
+                      "fmax z1.s,p1/m,z1.s,z0.s\n"
+                      "mov x10,x9\n"
+                      "lsl x10,x10,#2\n"
+                      "add x5,x5,x10\n", asm)
+        # The maximum is negated and added to the elements
+        self.assertIn("fmaxv s5,p0,z1.s\n"
+                      "dup z1.s, z5.s[0]\n"
+                      "fmul z4.s,p0/m,z4.s,z1.s\n", asm)
+        self.assertIn("fadd z0.s,p0/m,z0.s,z4.s\n"
+                      "adr x7,.vmath_exp_single_horner\n", asm)
+        self.assertIn("st1w {z2.s}, p1, [x6]\n"
+                      "fadd z1.s,p1/m,z1.s,z2.s\n", asm)
+        self.assertIn("fdiv z3.s,p0/m,z3.s,z1.s\n", asm)
+        self.assertEqual(3, asm.count("b.first"))
+        self.assertEqual([".long 0x3f800000", ".long 0xbf800000"],
+                         [str(d) for d in gen.asmdata["vmath_softmax_single_horner"]])
+
+    def test_layernorm(self):
+        """
+        Tests the masked accumulation of the shifted moments and the affine
+        transformation on AVX512
+        """
+        gen = self.gen(avx512)
+        asm = self.rownorm(gen).layernorm(xreg=gen.greg(0), yreg=gen.greg(1),
+                                          nreg=gen.greg(2), gammareg=gen.greg(3),
+                                          betareg=gen.greg(4))
+        self.assertIn(".layernorm_moments_full:\n"
+                      "vmovups (%r13), %zmm0{%k1}{z}\n"
+                      "vaddps %zmm0,%zmm5,%zmm0\n"
+                      "vaddps %zmm1,%zmm0,%zmm1{%k1}\n"
+                      "vfmadd231ps %zmm0,%zmm0,%zmm2{%k1}\n"
+                      "movq %rdx, %rsi\n"
+                      "shlq $2,%rsi\n"
+                      "addq %rsi,%r13\n", asm)
+        self.assertIn("vcvtsi2ssq %r10,%xmm7,%xmm7\n"
+                      "vbroadcastss %xmm7, %zmm7\n", asm)
+        self.assertIn("vsqrtps %zmm2,%zmm2\n", asm)
+        self.assertIn("vfmadd231ps %zmm0,%zmm10,%zmm9\n"
+                      "vmovups %zmm9, (%r14){%k1}\n", asm)
+        self.assertEqual(3, len(gen.asmdata["vmath_layernorm_single_horner"]))
+
+        # Without gamma only beta is added
+        gen = self.gen(avx512)
+        asm = self.rownorm(gen, dt=adt.FP64).layernorm(xreg=gen.greg(0), yreg=gen.greg(1),
+                                                       nreg=gen.greg(2), betareg=gen.greg(4))
+        self.assertIn("vaddpd %zmm9,%zmm0,%zmm9\n"
+                      "vmovupd %zmm9, (%r14){%k1}\n", asm)
+
+    def test_rmsnorm(self):
+        """
+        Tests that the pointers are advanced by the vl set by vsetvli on RVV
+        """
+        gen = self.gen(rvv)
+        asm = self.rownorm(gen).rmsnorm(xreg=gen.greg(0), yreg=gen.greg(1),
+                                        nreg=gen.greg(2), gammareg=gen.greg(3))
+        self.assertIn(".rmsnorm_squares:\n"
+                      "vsetvli s4, s3, e32, m1, tu, ma\n"
+                      "vle32.v v0, (t5)\n"
+                      "vfmacc.vv v1,v0,v0\n"
+                      "add s5,s4,0\n"
+                      "slli s5,s5,2\n"
+                      "add t5,t5,s5\n", asm)
+        self.assertIn("vfredusum.vs v4,v1,v4\n", asm)
+        self.assertIn("fcvt.s.lu f0,t2\n"
+                      "vfmv.v.f v5, f0\n"
+                      "vfdiv.vv v1,v1,v5\n", asm)
+
+    def test_unpredicated(self):
+        """
+        Tests the full vector loops and the scalar remainder loops without predication
+        """
+        gen = self.gen(neon)
+        asm = self.rownorm(gen).rmsnorm(xreg=gen.greg(0), yreg=gen.greg(1),
+                                        nreg=gen.greg(2))
+        self.assertIn("mov x8,x2\n"
+                      "lsr x8,x8,#2\n"
+                      "mov x9,#4\n"
+                      "cmp x8,0\n"
+                      "b.eq .rmsnorm_squares_end\n"
+                      ".rmsnorm_squares:\n"
+                      "sub x8,x8,1\n"
+                      "ldr q0, [x5]\n"
+                      "fmla v1.4s,v0.4s,v0.4s\n"
+                      "mov x10,x9\n"
+                      "lsl x10,x10,#2\n"
+                      "add x5,x5,x10\n", asm)
+        self.assertIn(".rmsnorm_squares_end:\n"
+                      "mov x9,x2\n"
+                      "lsr x9,x9,#2\n"
+                      "lsl x9,x9,#2\n"
+                      "sub x8,x2,x9\n"
+                      "mov x9,#1\n"
+                      "cmp x8,0\n"
+                      "b.eq .rmsnorm_squares_tail_end\n"
+                      ".rmsnorm_squares_tail:\n"
+                      "sub x8,x8,1\n"
+                      "ldr s0,[x5,#0]\n"
+                      "fmla v1.4s,v0.4s,v0.4s\n"
+                      "mov x10,x9\n"
+                      "lsl x10,x10,#2\n"
+                      "add x5,x5,x10\n", asm)
+        self.assertTrue(asm.endswith("str s0,[x6,#0]\n"
+                                     "mov x10,x9\n"
+                                     "lsl x10,x10,#2\n"
+                                     "add x6,x6,x10\n"
+                                     "cmp x8,0\n"
+                                     "b.ne .rmsnorm_normalize_tail\n"
+                                     ".rmsnorm_normalize_tail_end:\n"))
+
+        gen = self.gen(fma256)
+        asm = self.rownorm(gen).softmax(xreg=gen.greg(0), yreg=gen.greg(1),
+                                        nreg=gen.greg(2))
+        self.assertIn("shrq $3,%rax\n", asm)
+        self.assertNotIn("%k1", asm)
+        # Zeroed elements would take part in the maximum, the tail is broadcast
+        self.assertIn(".softmax_max_tail:\n"
+                      "sub $1, %rax\n"
+                      "vbroadcastss (%r13),%ymm0\n"
+                      "vmaxps %ymm1,%ymm0,%ymm1\n"
+                      "movq %rbx, %rcx\n"
+                      "shlq $2,%rcx\n"
+                      "addq %rcx,%r13\n", asm)
+
+    def test_unsupported(self):
+        """
+        Tests the requirements on the data type and the ISA
+        """
+        gen = self.gen(fma256)
+        with self.assertRaises(ValueError):
+            self.rownorm(gen, dt=adt.BF16)
+        with self.assertRaises(ValueError):
+            rownorm(gen=gen, rt=reg_tracker(reg_type_init_list=[]), eps=-1.0)
+        with self.assertRaises(ValueError):
+            self.rownorm(rvv())
+        with self.assertRaises(ValueError):
+            self.rownorm(rvv071())
+
+if __name__ == '__main__':
+    unittest.main()
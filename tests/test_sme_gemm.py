@@ -0,0 +1,112 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the SME ZA-tile GEMM microkernel generator
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt, reg_tracker
+from asmgen.asmblocks.sme import sme
+from asmgen.kernels import sme_gemm
+
+class test_sme_gemm(unittest.TestCase):
+    """
+    Tests tile arrangement, accumulation and store-back of the SME GEMM kernel
+    """
+
+    def setUp(self):
+        """
+        Sets up the generator for all tests
+        """
+        self.gen = sme()
+        self.gen.set_output_inline(yesno=False)
+
+    def kernel(self, a_dt : adt, c_dt : adt, scaled : bool = False) -> str:
+        """
+        Generates a kernel with the arguments in x0-x4
+        """
+        gen = self.gen
+        rt = reg_tracker(reg_type_init_list=[
+            ("greg", gen.max_gregs),
+            ("vreg", gen.max_vregs),
+            ("treg", gen.max_tregs(c_dt)),
+            ])
+        for i in range(5):
+            rt.reserve_specific_reg("greg", i)
+        kwargs = {}
+        if scaled:
+            rt.reserve_specific_reg("vreg", 0)
+            rt.reserve_specific_reg("vreg", 1)
+            kwargs = {'alpha' : gen.freg(0, c_dt), 'beta' : gen.freg(1, c_dt)}
+        kernel = sme_gemm(gen=gen, rt=rt, a_dt=a_dt, c_dt=c_dt)
+        return kernel.generate(areg=gen.greg(0), breg=gen.greg(1), creg=gen.greg(2),
+                               ldcreg=gen.greg(3), kreg=gen.greg(4), **kwargs)
+
+    def test_fp32(self):
+        """
+        Tests that all four FP32 tiles accumulate a 2x2 block of outer products
+        and are stored directly as tile slices
+        """
+        asm = self.kernel(adt.FP32, adt.FP32)
+        self.assertIn("zero {za3.s}\n", asm)
+        self.assertIn(".sme_gemm_k:\n"
+                      "sub x4,x4,1\n"
+                      "ld1w {z0.s}, p0/z, [x0, #0, MUL VL]\n"
+                      "ld1w {z1.s}, p0/z, [x0, #1, MUL VL]\n"
+                      "ld1w {z2.s}, p0/z, [x1, #0, MUL VL]\n"
+                      "ld1w {z3.s}, p0/z, [x1, #1, MUL VL]\n"
+                      "incb x0, ALL, MUL #2\n"
+                      "incb x1, ALL, MUL #2\n"
+                      "fmopa za0.s,p0/m,p0/m,z0.s,z2.s\n"
+                      "fmopa za1.s,p0/m,p0/m,z0.s,z3.s\n"
+                      "fmopa za2.s,p0/m,p0/m,z1.s,z2.s\n"
+                      "fmopa za3.s,p0/m,p0/m,z1.s,z3.s\n"
+                      "cmp x4,0\n"
+                      "b.ne .sme_gemm_k\n", asm)
+        self.assertIn("st1w {za1h.s[w12, 3]}, p0, [x2, x7, lsl #2]\n", asm)
+        self.assertIn("st1w {za2h.s[w12, 0]}, p0, [x6]\n", asm)
+        self.assertTrue(asm.endswith("add x12,x12,#4\n"
+                                     "cmp x12,x5\n"
+                                     "b.lt .sme_gemm_store\n"))
+
+    def test_widening_scaled(self):
+        """
+        Tests widening FP16->FP32 accumulation and alpha/beta scaling on store
+        """
+        asm = self.kernel(adt.FP16, adt.FP32, scaled=True)
+        self.assertIn("fmopa za3.s,p0/m,p0/m,z3.h,z5.h\n", asm)
+        self.assertIn("dup z8.s, z0.s[0]\n"
+                      "dup z9.s, z1.s[0]\n", asm)
+        self.assertIn("mov z6.s,p0/m,za1h.s[w12,0]\n"
+                      "fmul z6.s,p0/m,z6.s,z8.s\n"
+                      "ld1w {z7.s}, p0/z, [x2, x7, lsl #2]\n"
+                      "fmla z6.s,p0/m,z7.s,z9.s\n"
+                      "st1w {z6.s}, p0, [x2, x7, lsl #2]\n", asm)
+
+    def test_tile_arrangement(self):
+        """
+        Tests that the number of tiles follows max_tregs
+        """
+        gen = self.gen
+        rt = reg_tracker(reg_type_init_list=[("greg", 31), ("vreg", 32)])
+        kernel = sme_gemm(gen=gen, rt=rt, a_dt=adt.FP64, c_dt=adt.FP64)
+        self.assertEqual((kernel.mr_tiles, kernel.nr_tiles, kernel.kstep), (2, 4, 1))
+        kernel = sme_gemm(gen=gen, rt=rt, a_dt=adt.SINT8, c_dt=adt.SINT32)
+        self.assertEqual((kernel.mr_tiles, kernel.nr_tiles, kernel.kstep), (2, 2, 4))
+
+    def test_invalid(self):
+        """
+        Tests that unsupported combinations are refused
+        """
+        gen = self.gen
+        rt = reg_tracker(reg_type_init_list=[("greg", 31), ("vreg", 32)])
+        with self.assertRaises(ValueError):
+            sme_gemm(gen=gen, rt=rt, a_dt=adt.FP32, c_dt=adt.FP64)
+        with self.assertRaises(ValueError):
+            self.kernel(adt.SINT8, adt.SINT32, scaled=True)
+
+if __name__ == '__main__':
+    unittest.main()
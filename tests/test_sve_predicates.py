@@ -0,0 +1,95 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests predicate generation and tracking of the SVE/SME generators
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt, reg_tracker
+from asmgen.asmblocks.noarch import comparison
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.sme import sme
+
+class test_sve_predicates(unittest.TestCase):
+    """
+    Tests ptrue/pfalse/whilelt/cmp_vreg and the reservation of implicit predicates
+    """
+
+    def setUp(self):
+        """
+        Sets up the generator for all tests
+        """
+        self.gen = sve()
+        self.gen.set_output_inline(yesno=False)
+
+    def test_ptrue(self):
+        """
+        Tests ptrue with and without a pattern
+        """
+        gen = self.gen
+        self.assertEqual("ptrue p1.s\n", gen.ptrue(gen.preg(1), adt.FP32))
+        self.assertEqual("ptrue p1.d,VL4\n", gen.ptrue(gen.preg(1), adt.FP64, "vl4"))
+        self.assertEqual("pfalse p2.b\n", gen.pfalse(gen.preg(2)))
+        with self.assertRaises(ValueError):
+            gen.ptrue(gen.preg(1), adt.FP32, "VL9")
+
+    def test_whilelt(self):
+        """
+        Tests signed and unsigned while-predicates
+        """
+        gen = self.gen
+        self.assertEqual("whilelt p1.s,x0,x1\n",
+                         gen.whilelt(preg=gen.preg(1), reg1=gen.greg(0),
+                                     reg2=gen.greg(1), dt=adt.FP32))
+        self.assertEqual("whilelo p2.h,x0,x1\n",
+                         gen.whilelt(preg=gen.preg(2), reg1=gen.greg(0),
+                                     reg2=gen.greg(1), dt=adt.FP16, signed=False))
+
+    def test_cmp_vreg(self):
+        """
+        Tests vector comparisons into predicates
+        """
+        gen = self.gen
+        self.assertEqual("fcmge p1.d,p0/z,z0.d,z1.d\n",
+                         gen.cmp_vreg(preg=gen.preg(1), govpreg=gen.preg(0),
+                                      vreg1=gen.vreg(0), vreg2=gen.vreg(1),
+                                      cmp=comparison.GE, dt=adt.FP64))
+        self.assertEqual("fcmne p1.s,p0/z,z0.s,#0.0\n",
+                         gen.cmp_vreg(preg=gen.preg(1), govpreg=gen.preg(0),
+                                      vreg1=gen.vreg(0), vreg2=None,
+                                      cmp=comparison.NZ, dt=adt.FP32))
+        self.assertEqual("cmphi p1.s,p0/z,z0.s,z1.s\n",
+                         gen.cmp_vreg(preg=gen.preg(1), govpreg=gen.preg(0),
+                                      vreg1=gen.vreg(0), vreg2=gen.vreg(1),
+                                      cmp=comparison.GT, dt=adt.UINT32))
+        self.assertEqual("cmpgt p1.s,p0/z,z0.s,z1.s\n",
+                         gen.cmp_vreg(preg=gen.preg(1), govpreg=gen.preg(0),
+                                      vreg1=gen.vreg(0), vreg2=gen.vreg(1),
+                                      cmp=comparison.GT, dt=adt.SINT32))
+        with self.assertRaises(ValueError):
+            gen.cmp_vreg(preg=gen.preg(1), govpreg=gen.preg(0),
+                         vreg1=gen.vreg(0), vreg2=gen.vreg(1),
+                         cmp=comparison.EZ, dt=adt.FP32)
+
+    def test_isaquirks_reserve(self):
+        """
+        Tests that the implicitly used predicates are reserved and aliased
+        """
+        rt = reg_tracker(reg_type_init_list=[("preg", self.gen.max_pregs)])
+        self.gen.isaquirks(rt=rt, dt=adt.FP32)
+        self.assertEqual(rt.aliased_regs['preg'], {'ptrue' : 0})
+        self.assertNotEqual(rt.reserve_any_reg('preg'), 0)
+
+        rt = reg_tracker(reg_type_init_list=[("preg", self.gen.max_pregs)])
+        sme().isaquirks(rt=rt, dt=adt.FP32)
+        self.assertEqual(rt.aliased_regs['preg'], {'ptrue' : 0, 'ptrue_pn' : 8})
+
+        # Trackers without predicates are left alone
+        rt = reg_tracker(reg_type_init_list=[("greg", 31)])
+        self.assertEqual("ptrue p0.s\n", self.gen.isaquirks(rt=rt, dt=adt.FP32))
+
+if __name__ == '__main__':
+    unittest.main()
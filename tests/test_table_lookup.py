@@ -0,0 +1,127 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the table lookup operations and the nibble unpacking
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import oplut_modifier as mod
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma128,fma256,avx512
+
+from .asm_testcase import asm_testcase
+
+class test_table_lookup(asm_testcase):
+    """
+    Tests tbl and unpack_nibbles on the different ISAs
+    """
+
+    def tbl(self, gen, dt : adt, cidx : int = 3, modifiers : set[mod] = set()):
+        """
+        Returns the ASM of a lookup in the table v1 with the indices in v2
+        """
+        return gen.tbl(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(cidx),
+                       dt=dt, modifiers=modifiers)
+
+    def unpack(self, gen, loidx : int, hiidx : int):
+        """
+        Returns the ASM splitting the bytes of v0, v3 is the temporary register
+        """
+        return gen.unpack_nibbles(vreg=gen.vreg(0), lodst=gen.vreg(loidx),
+                                  hidst=gen.vreg(hiidx), tmpreg=gen.vreg(3))
+
+    def test_neon(self):
+        """
+        Tests that NEON only looks up bytes and keeps elements with tbx
+        """
+        gen = self.gen(neon)
+        self.assertEqual("tbl v3.16b,{v1.16b},v2.16b\n", self.tbl(gen, adt.UINT8))
+        self.assertEqual("tbx v3.16b,{v1.16b},v2.16b\n",
+                         self.tbl(gen, adt.SINT8, modifiers={mod.KEEP}))
+        with self.assertRaises(ValueError):
+            self.tbl(gen, adt.FP32)
+
+        self.assertEqual(
+                "shl v1.16b,v0.16b,#4\n"
+                "ushr v1.16b,v1.16b,#4\n"
+                "ushr v2.16b,v0.16b,#4\n",
+                self.unpack(gen, 1, 2))
+        # The high nibbles have to be extracted before v0 is overwritten
+        self.assertEqual(
+                "ushr v2.16b,v0.16b,#4\n"
+                "shl v0.16b,v0.16b,#4\n"
+                "ushr v0.16b,v0.16b,#4\n",
+                self.unpack(gen, 0, 2))
+        with self.assertRaises(ValueError):
+            self.unpack(gen, 1, 1)
+
+    def test_sve(self):
+        """
+        Tests SVE lookups of all element sizes
+        """
+        gen = self.gen(sve)
+        self.assertEqual("tbl z3.b,{z1.b},z2.b\n", self.tbl(gen, adt.SINT8))
+        self.assertEqual("tbl z3.s,{z1.s},z2.s\n", self.tbl(gen, adt.FP32))
+        self.assertEqual("tbx z3.h,z1.h,z2.h\n",
+                         self.tbl(gen, adt.UINT16, modifiers={mod.KEEP}))
+        self.assertEqual(
+                "lsr z2.b,z0.b,#4\n"
+                "lsl z0.b,z0.b,#4\n"
+                "lsr z0.b,z0.b,#4\n",
+                self.unpack(gen, 0, 2))
+
+    def test_avx(self):
+        """
+        Tests vpshufb lookups within 128 bit lanes and whole register permutes
+        """
+        gen = self.gen(fma128)
+        self.assertEqual("vpshufb %xmm2,%xmm1,%xmm3\n", self.tbl(gen, adt.UINT8))
+        self.assertEqual("vpermilps %xmm2,%xmm1,%xmm3\n", self.tbl(gen, adt.SINT32))
+
+        gen = self.gen(fma256)
+        self.assertEqual("vpermd %ymm1,%ymm2,%ymm3\n", self.tbl(gen, adt.UINT32))
+        # vpermps needs AVX2, which is only required for integer elements
+        with self.assertRaises(ValueError):
+            self.tbl(gen, adt.FP32)
+        with self.assertRaises(ValueError):
+            self.tbl(gen, adt.SINT16)
+        with self.assertRaises(ValueError):
+            self.tbl(gen, adt.SINT8, modifiers={mod.KEEP})
+        self.assertEqual(
+                "vbroadcastss .nibble_mask(%rip),%ymm3\n"
+                "vpand %ymm3,%ymm0,%ymm1\n"
+                "vpsrlw $4,%ymm0,%ymm2\n"
+                "vpand %ymm3,%ymm2,%ymm2\n",
+                self.unpack(gen, 1, 2))
+        self.assertEqual(".nibble_mask:\n.long 0xf0f0f0f\n", gen.isadata())
+        with self.assertRaises(ValueError):
+            gen.unpack_nibbles(vreg=gen.vreg(0), lodst=gen.vreg(1), hidst=gen.vreg(2))
+
+        gen = self.gen(avx512)
+        self.assertEqual("vpermw %zmm1,%zmm2,%zmm3\n", self.tbl(gen, adt.SINT16))
+        self.assertEqual("vpermpd %zmm1,%zmm2,%zmm3\n", self.tbl(gen, adt.FP64))
+        self.assertIn("vpandq %zmm3,%zmm0,%zmm0\n", self.unpack(gen, 0, 2))
+
+    def test_rvv(self):
+        """
+        Tests that vrgather can't overwrite its sources
+        """
+        gen = self.gen(rvv)
+        self.assertEqual("vrgather.vv v3,v1,v2\n", self.tbl(gen, adt.FP16))
+        with self.assertRaises(ValueError):
+            self.tbl(gen, adt.UINT8, cidx=2)
+        with self.assertRaises(ValueError):
+            self.tbl(gen, adt.UINT8, modifiers={mod.KEEP})
+        self.assertEqual(
+                "vand.vi v1,v0,15\n"
+                "vsrl.vi v2,v0,4\n",
+                self.unpack(gen, 1, 2))
+
+if __name__ == '__main__':
+    unittest.main()
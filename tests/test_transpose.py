@@ -0,0 +1,275 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the permutation operations and the in-register transpose
+"""
+import re
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.operations import opperm_modifier as mod
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.sme import sme
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma128,fma256,avx512
+
+from .asm_testcase import asm_testcase
+
+class test_transpose(asm_testcase):
+    """
+    Tests zip/uzp/trn and transpose on the different ISAs
+    """
+
+    def perm(self, gen, op : str, dt : adt, modifiers : set[mod] = set(), **kwargs):
+        """
+        Returns the ASM of a permutation of v1 and v2 into v3
+        """
+        return getattr(gen, op)(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(3),
+                                dt=dt, modifiers=modifiers, **kwargs)
+
+    def test_neon(self):
+        """
+        Tests the native NEON permutations, groups use wider arrangements
+        """
+        gen = self.gen(neon)
+        self.assertEqual("zip1 v3.4s,v1.4s,v2.4s\n", self.perm(gen, 'zip', adt.FP32))
+        self.assertEqual("uzp2 v3.16b,v1.16b,v2.16b\n",
+                         self.perm(gen, 'uzp', adt.UINT8, {mod.HI}))
+        self.assertEqual("trn2 v3.2d,v1.2d,v2.2d\n",
+                         self.perm(gen, 'trn', adt.FP16, {mod.HI, mod.GROUP}, group=4))
+        with self.assertRaises(ValueError):
+            self.perm(gen, 'trn', adt.FP64, {mod.GROUP}, group=2)
+        with self.assertRaises(ValueError):
+            self.perm(gen, 'trn', adt.FP32, {mod.GROUP}, group=3)
+        with self.assertRaises(ValueError):
+            self.perm(gen, 'trn', adt.FP32, {mod.GROUP})
+
+    def test_sve(self):
+        """
+        Tests the SVE permutations, 128 bit groups are illegal in streaming mode
+        """
+        gen = self.gen(sve)
+        self.assertEqual("trn1 z3.q,z1.q,z2.q\n",
+                         self.perm(gen, 'trn', adt.FP64, {mod.GROUP}, group=2))
+        gen = self.gen(sme)
+        self.assertEqual("zip2 z3.h,z1.h,z2.h\n", self.perm(gen, 'zip', adt.FP16, {mod.HI}))
+        with self.assertRaises(ValueError):
+            self.perm(gen, 'trn', adt.FP64, {mod.GROUP}, group=2)
+
+    def test_avx(self):
+        """
+        Tests the AVX instruction sequences for the different element sizes
+        """
+        gen = self.gen(fma256)
+        self.assertEqual(
+                "vshufps $0xdd,%ymm2,%ymm1,%ymm3\n"
+                "vpermilps $0xd8,%ymm3,%ymm3\n",
+                self.perm(gen, 'trn', adt.FP32, {mod.HI}))
+        self.assertEqual(
+                "vunpcklpd %ymm2,%ymm1,%ymm3\n"
+                "vpermpd $0xd8,%ymm3,%ymm3\n",
+                self.perm(gen, 'uzp', adt.FP64))
+        self.assertEqual("vperm2f128 $0x31,%ymm2,%ymm1,%ymm3\n",
+                         self.perm(gen, 'zip', adt.FP32, {mod.HI, mod.GROUP}, group=4))
+        self.assertEqual(
+                "vperm2f128 $0x20,%ymm2,%ymm1,%ymm3\n"
+                "vpermpd $0xd8,%ymm3,%ymm3\n"
+                "vpermilps $0xd8,%ymm3,%ymm3\n",
+                self.perm(gen, 'zip', adt.FP32))
+        self.assertEqual(
+                "vperm2f128 $0x31,%ymm2,%ymm1,%ymm3\n"
+                "vpermpd $0xd8,%ymm3,%ymm3\n",
+                self.perm(gen, 'zip', adt.SINT64, {mod.HI}))
+        with self.assertRaises(ValueError):
+            self.perm(gen, 'trn', adt.FP16)
+        gen = self.gen(avx512)
+        self.assertEqual(
+                "vshuff32x4 $0x88,%zmm2,%zmm1,%zmm3\n"
+                "vshuff32x4 $0xd8,%zmm3,%zmm3,%zmm3\n",
+                self.perm(gen, 'trn', adt.FP64, {mod.GROUP}, group=2))
+        # Permutations across the 128 bit lanes read their indices from ISA data
+        self.assertEqual(
+                "vmovdqu32 .uzp2_idx_32(%rip),%zmm3\n"
+                "vpermi2ps %zmm2,%zmm1,%zmm3\n",
+                self.perm(gen, 'uzp', adt.FP32, {mod.HI}))
+        self.assertEqual(
+                "vmovdqu32 .zip1_idx_128(%rip),%zmm3\n"
+                "vpermi2pd %zmm2,%zmm1,%zmm3\n",
+                self.perm(gen, 'zip', adt.FP16, {mod.GROUP}, group=8))
+        self.assertEqual(
+                ".uzp2_idx_32:\n"+"".join(f".long {hex(2*i+1)}\n" for i in range(16))+
+                ".zip1_idx_128:\n"+"".join(f".quad {hex(i)}\n" for i in [0,1,8,9,2,3,10,11]),
+                gen.isadata())
+        with self.assertRaises(ValueError):
+            gen.zip(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(1), dt=adt.FP32)
+        gen = self.gen(fma128)
+        self.assertEqual("vunpckhps %xmm2,%xmm1,%xmm3\n",
+                         self.perm(gen, 'zip', adt.SINT32, {mod.HI}))
+
+    def test_rvv(self):
+        """
+        Tests the RVV slide and merge sequences
+        """
+        gen = self.gen(rvv)
+        self.assertEqual(
+                "vid.v v4\n"
+                "vsrl.vi v4,v4,2\n"
+                "vand.vi v4,v4,1\n"
+                "vmsne.vi v0,v4,0\n",
+                gen.perm_setup(group=4, tmpreg=gen.vreg(4)))
+        self.assertEqual(
+                "vslideup.vi v3,v2,1\n"
+                "vmerge.vvm v3,v1,v3,v0\n",
+                self.perm(gen, 'trn', adt.FP32))
+        self.assertEqual(
+                "vslidedown.vi v4,v1,2\n"
+                "vmerge.vvm v2,v4,v2,v0\n",
+                gen.trn(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(2),
+                        dt=adt.FP32, modifiers={mod.HI, mod.GROUP}, group=2,
+                        tmpreg=gen.vreg(4)))
+        with self.assertRaises(ValueError):
+            gen.trn(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(1), dt=adt.FP32)
+        with self.assertRaises(ValueError):
+            gen.trn(adreg=gen.vreg(0), bdreg=gen.vreg(2), cdreg=gen.vreg(3), dt=adt.FP32)
+
+    def test_rvv_gather(self):
+        """
+        Tests the RVV zip/uzp gathers and the setup of their indices and masks
+        """
+        gen = self.gen(rvv)
+        self.assertEqual(
+                "vid.v v6\n"
+                "vsrl.vi v6,v6,1\n"
+                "vand.vi v6,v6,1\n"
+                "vmsne.vi v0,v6,0\n"
+                "vid.v v5\n"
+                "vand.vi v6,v5,1\n"
+                "vsrl.vi v5,v5,2\n"
+                "vsll.vi v5,v5,1\n"
+                "vor.vv v5,v5,v6\n"
+                "csrr s1, vl\n"
+                "srli s1,s1,1\n"
+                "vadd.vx v5,v5,s1\n",
+                gen.zip_setup(group=2, hi=True, idxreg=gen.vreg(5), tmpreg=gen.vreg(6),
+                              greg=gen.greg(7)))
+        self.assertEqual(
+                "vid.v v5\n"
+                "vsll.vi v5,v5,1\n"
+                "csrr s1, vl\n"
+                "addi s1,s1,-1\n"
+                "vand.vx v5,v5,s1\n"
+                "srli s1,s1,1\n"
+                "vid.v v6\n"
+                "vmsgtu.vx v0,v6,s1\n",
+                gen.uzp_setup(group=1, hi=False, idxreg=gen.vreg(5), tmpreg=gen.vreg(6),
+                              greg=gen.greg(7)))
+        self.assertEqual(
+                "vid.v v5\n"
+                "li s1,31\n"
+                "vand.vx v6,v5,s1\n"
+                "vsll.vi v5,v5,1\n"
+                "vsub.vv v5,v5,v6\n"
+                "li s1,32\n"
+                "vadd.vx v5,v5,s1\n",
+                gen.uzp_setup(group=32, hi=True, idxreg=gen.vreg(5), tmpreg=gen.vreg(6),
+                              greg=gen.greg(7)).split("csrr")[0])
+        self.assertEqual(
+                "vrgather.vv v3,v1,v5\n"
+                "vrgather.vv v6,v2,v5\n"
+                "vmerge.vvm v3,v3,v6,v0\n",
+                self.perm(gen, 'uzp', adt.FP32, {mod.HI}, idxreg=gen.vreg(5),
+                          tmpreg=gen.vreg(6)))
+        with self.assertRaises(ValueError):
+            self.perm(gen, 'zip', adt.FP32)
+        with self.assertRaises(ValueError):
+            gen.zip(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(5), dt=adt.FP32,
+                    idxreg=gen.vreg(5), tmpreg=gen.vreg(6))
+        with self.assertRaises(ValueError):
+            gen.uzp(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(3), dt=adt.FP32,
+                    idxreg=gen.vreg(5), tmpreg=gen.vreg(2))
+        with self.assertRaises(ValueError):
+            gen.zip_setup(group=3, hi=False, idxreg=gen.vreg(5), tmpreg=gen.vreg(6),
+                          greg=gen.greg(7))
+
+    def test_transpose(self):
+        """
+        Tests the NxN transpose, the last stage writes the destination rows
+        """
+        gen = self.gen(neon)
+        self.assertEqual(
+                "trn1 v8.4s,v0.4s,v1.4s\n"
+                "trn2 v0.4s,v0.4s,v1.4s\n"
+                "trn1 v1.4s,v2.4s,v3.4s\n"
+                "trn2 v2.4s,v2.4s,v3.4s\n"
+                "trn1 v4.2d,v8.2d,v1.2d\n"
+                "trn2 v6.2d,v8.2d,v1.2d\n"
+                "trn1 v5.2d,v0.2d,v2.2d\n"
+                "trn2 v7.2d,v0.2d,v2.2d\n",
+                gen.transpose(srcregs=[gen.vreg(i) for i in range(4)],
+                              dstregs=[gen.vreg(i) for i in range(4,8)],
+                              tmpreg=gen.vreg(8), dt=adt.FP32))
+        self.assertEqual(
+                "trn1 v4.4s,v0.4s,v1.4s\n"
+                "trn2 v1.4s,v0.4s,v1.4s\n"
+                "trn2 v0.4s,v2.4s,v3.4s\n"
+                "trn1 v2.4s,v2.4s,v3.4s\n"
+                "trn2 v3.2d,v1.2d,v0.2d\n"
+                "trn1 v1.2d,v1.2d,v0.2d\n"
+                "trn1 v0.2d,v4.2d,v2.2d\n"
+                "trn2 v2.2d,v4.2d,v2.2d\n",
+                gen.transpose(srcregs=[gen.vreg(i) for i in range(4)],
+                              dstregs=[gen.vreg(i) for i in range(4)],
+                              tmpreg=gen.vreg(4), dt=adt.FP32))
+        # 2 x 2 in place would need a move
+        with self.assertRaises(ValueError):
+            gen.transpose(srcregs=[gen.vreg(0), gen.vreg(1)],
+                          dstregs=[gen.vreg(0), gen.vreg(1)],
+                          tmpreg=gen.vreg(2), dt=adt.FP64)
+        with self.assertRaises(ValueError):
+            gen.transpose(srcregs=[gen.vreg(0), gen.vreg(1)],
+                          dstregs=[gen.vreg(2), gen.vreg(2)],
+                          tmpreg=gen.vreg(3), dt=adt.FP64)
+
+        gen = self.gen(rvv)
+        with self.assertRaises(ValueError):
+            gen.transpose(srcregs=[gen.vreg(1)], dstregs=[gen.vreg(2)],
+                          tmpreg=gen.vreg(3), dt=adt.FP64)
+        gen.set_parameter("VL", 128)
+        asmblock = gen.transpose(srcregs=[gen.vreg(1), gen.vreg(2)],
+                                 dstregs=[gen.vreg(3), gen.vreg(4)],
+                                 tmpreg=gen.vreg(5), dt=adt.FP64)
+        self.assertEqual(
+                "vid.v v5\n"
+                "vand.vi v5,v5,1\n"
+                "vmsne.vi v0,v5,0\n"
+                "vslideup.vi v3,v2,1\n"
+                "vmerge.vvm v3,v1,v3,v0\n"
+                "vslidedown.vi v4,v1,1\n"
+                "vmerge.vvm v4,v4,v2,v0\n",
+                asmblock)
+
+    def test_transpose_inplace(self):
+        """
+        Tests transposes using only N+1 registers
+        """
+        gen = self.gen(fma256)
+        asmblock = gen.transpose(srcregs=[gen.vreg(i) for i in range(8)],
+                                 dstregs=[gen.vreg(i) for i in range(8)],
+                                 tmpreg=gen.vreg(8), dt=adt.FP32)
+        self.assertEqual({f"%ymm{i}" for i in range(9)},
+                         set(re.findall(r"%[xyz]mm[0-9]+", asmblock)))
+        self.assertEqual(8, asmblock.count("vperm2f128"))
+
+        gen = self.gen(avx512)
+        asmblock = gen.transpose(srcregs=[gen.vreg(i) for i in range(16)],
+                                 dstregs=[gen.vreg(i) for i in range(16)],
+                                 tmpreg=gen.vreg(16), dt=adt.FP32)
+        self.assertEqual({f"%zmm{i}" for i in range(17)},
+                         set(re.findall(r"%[xyz]mm[0-9]+", asmblock)))
+
+if __name__ == '__main__':
+    unittest.main()
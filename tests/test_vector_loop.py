@@ -0,0 +1,157 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the predicated strip-mined loop construct of the generators
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.avx_fma import fma256,avx512
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.sme import sme
+from asmgen.asmblocks.rvv import rvv
+
+def body(mreg, step) -> str:
+    """
+    Loop body placeholder that records the registers it was given
+    """
+    return f"body {mreg} {step}\n"
+
+class test_vector_loop(unittest.TestCase):
+    """
+    Tests vector_loop for the ISAs with and without predication
+    """
+
+    def loop(self, gen, dt : adt) -> str:
+        """
+        Generates a loop over greg(0) elements with greg(1) as step register
+        """
+        gen.set_output_inline(yesno=False)
+        return gen.vector_loop(count_reg=gen.greg(0), step_reg=gen.greg(1),
+                               label="vloop", dt=dt, body=body)
+
+    def test_sve(self):
+        """
+        Tests the whilelo/uqdec loop on SVE
+        """
+        self.assertEqual(
+            "cntd x1\n"
+            "whilelo p1.d,xzr,x0\n"
+            "b.none .vloop_end\n"
+            ".vloop:\n"
+            "body p1 x1\n"
+            "uqdecd x0\n"
+            "whilelo p1.d,xzr,x0\n"
+            "b.first .vloop\n"
+            ".vloop_end:\n",
+            self.loop(sve(), adt.FP64))
+
+    def test_rvv(self):
+        """
+        Tests strip-mining over the remaining AVL on RVV
+        """
+        self.assertEqual(
+            "beqz t0,.vloop_end\n"
+            ".vloop:\n"
+            "vsetvli t1, t0, e32, m1, ta, ma\n"
+            "body None t1\n"
+            "sub t0,t0,t1\n"
+            "bnez t0,.vloop\n"
+            ".vloop_end:\n"
+            "vsetvli t1, zero, e32, m1, ta, ma\n",
+            self.loop(rvv(), adt.FP32))
+
+    def test_avx512(self):
+        """
+        Tests the k-mask tail on AVX512
+        """
+        self.assertEqual(
+            "test %r8,%r8\n"
+            "jz .vloop_end\n"
+            ".vloop:\n"
+            "kxnorb %k1,%k1,%k1\n"
+            "mov $8,%r9\n"
+            "cmp %r9,%r8\n"
+            "jae .vloop_full\n"
+            "mov $-1,%r9\n"
+            "bzhi %r8,%r9,%r9\n"
+            "kmovb %r9d,%k1\n"
+            "mov $8,%r9\n"
+            ".vloop_full:\n"
+            "body k1 r9\n"
+            "sub %r9,%r8\n"
+            "ja .vloop\n"
+            ".vloop_end:\n",
+            self.loop(avx512(), adt.FP64))
+
+    def test_unpredicated(self):
+        """
+        Tests that ISAs without predication refuse to generate the loop
+        """
+        with self.assertRaises(NotImplementedError):
+            self.loop(neon(), adt.FP32)
+        with self.assertRaises(NotImplementedError):
+            self.loop(fma256(), adt.FP32)
+        with self.assertRaises(ValueError):
+            gen = rvv()
+            gen.vector_loop(count_reg=gen.greg(0), step_reg=gen.greg(1),
+                            label="vloop", dt=adt.FP32, body=body,
+                            mreg=sve().preg(1))
+
+class test_ff_loop(unittest.TestCase):
+    """
+    Tests ff_loop for the ISAs with first-faulting loads
+    """
+
+    def loop(self, gen, dt : adt) -> str:
+        """
+        Generates a loop with a placeholder load and greg(1) as step register
+        """
+        gen.set_output_inline(yesno=False)
+        return gen.ff_loop(step_reg=gen.greg(1), label="ffloop", dt=dt,
+                           load=lambda : "load\n", body=body)
+
+    def test_sve(self):
+        """
+        Tests that the FFR is reset before and counted after the loads on SVE
+        """
+        self.assertEqual(
+            ".ffloop:\n"
+            "setffr\n"
+            "load\n"
+            "rdffr p1.b, p0/z\n"
+            "cntp x1,p0,p1.b\n"
+            "body p1 x1\n"
+            "b .ffloop\n"
+            ".ffloop_end:\n",
+            self.loop(sve(), adt.UINT8))
+
+    def test_rvv(self):
+        """
+        Tests that the shortened vl is read back on RVV
+        """
+        self.assertEqual(
+            ".ffloop:\n"
+            "vsetvli t1, zero, e32, m1, ta, ma\n"
+            "load\n"
+            "csrr t1, vl\n"
+            "body None t1\n"
+            "j .ffloop\n"
+            ".ffloop_end:\n"
+            "vsetvli t1, zero, e32, m1, ta, ma\n",
+            self.loop(rvv(), adt.FP32))
+
+    def test_unsupported(self):
+        """
+        Tests that ISAs without first-faulting loads refuse to generate the loop
+        """
+        for gen in [neon(), fma256(), avx512(), sme()]:
+            with self.assertRaises(NotImplementedError):
+                self.loop(gen, adt.FP32)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests fixed vector length (VLS) code generation for SVE and RVV
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+
+class test_vls(unittest.TestCase):
+    """
+    Tests the "VL" generator parameter of the VLA ISAs
+    """
+
+    def vls_gen(self, gen):
+        """
+        Configures the generator for a 512 bit vector length
+        """
+        gen.set_output_inline(yesno=False)
+        gen.set_parameter("VL", 512)
+        return gen
+
+    def test_sve(self):
+        """
+        Tests that SVE uses constants instead of runtime vector length queries
+        """
+        gen = self.vls_gen(sve())
+        self.assertFalse(gen.is_vla)
+        self.assertEqual(gen.get_param_value("VL"), 512)
+        self.assertEqual(gen.simd_size, 64)
+        self.assertEqual(gen.max_add_voff, 63)
+        self.assertEqual("mov x0,#8\n",
+                         gen.simd_size_to_greg(reg=gen.greg(0), dt=adt.FP64))
+        self.assertEqual("add x0,x0,#192\n",
+                         gen.add_greg_voff(reg=gen.greg(0), offset=3, dt=adt.FP64))
+        self.assertEqual("inline size_t get_simd_size() { return 64; }",
+                         gen.c_simd_size_function)
+        self.assertEqual("rdvl x1,#1\n"
+                         "cmp x1,#64\n"
+                         "b.ne .fallback\n",
+                         gen.check_vl(reg=gen.greg(1), label="fallback"))
+
+        gen.set_parameter("VL", 0)
+        self.assertTrue(gen.is_vla)
+        self.assertEqual("incb x0, ALL, MUL #3\n",
+                         gen.add_greg_voff(reg=gen.greg(0), offset=3, dt=adt.FP64))
+        with self.assertRaises(ValueError):
+            gen.check_vl(reg=gen.greg(1), label="fallback")
+        with self.assertRaises(ValueError):
+            gen.set_parameter("VL", 200)
+
+    def test_rvv(self):
+        """
+        Tests that RVV uses constants instead of runtime vector length queries
+        """
+        gen = self.vls_gen(rvv())
+        self.assertFalse(gen.is_vla)
+        self.assertEqual(gen.simd_size, 64)
+        self.assertEqual(gen.max_add_voff, 31)
+        self.assertEqual("li t0,16\n",
+                         gen.simd_size_to_greg(reg=gen.greg(0), dt=adt.FP32))
+        self.assertEqual("addi t0,t0,-128\n",
+                         gen.add_greg_voff(reg=gen.greg(0), offset=-2, dt=adt.FP32))
+        self.assertEqual("csrr t1,vlenb\n"
+                         "addi t1,t1,-64\n"
+                         "bnez t1,.fallback\n",
+                         gen.check_vl(reg=gen.greg(1), label="fallback"))
+        with self.assertRaises(ValueError):
+            gen.add_greg_voff(reg=gen.greg(0), offset=32, dt=adt.FP32)
+
+        # LMUL groups registers, the group size is the simd size
+        gen.set_parameter("LMUL", 2)
+        self.assertEqual(gen.simd_size, 128)
+        with self.assertRaises(ValueError):
+            gen.set_parameter("VL", 384)
+
+if __name__ == '__main__':
+    unittest.main()
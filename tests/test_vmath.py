@@ -0,0 +1,244 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the vectorized transcendental function generators and their building blocks
+"""
+import math
+import unittest
+
+from asmgen.asmdata import asm_data
+from asmgen.registers import asm_data_type as adt, reg_tracker
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma256,avx512
+from asmgen.kernels import vmath, poly_scheme
+from asmgen.kernels.vmath import vmath_coefficients, vmath_accuracy
+
+from .asm_testcase import asm_testcase
+
+class test_vmath(asm_testcase):
+    """
+    Tests the min/max/div operations, the exponent helpers and the generated functions
+    """
+
+    def opd3(self, gen, op : str, dt : adt, cidx : int = 1) -> str:
+        """
+        Returns the ASM of the operation on v1 and v2
+        """
+        return getattr(gen, op)(adreg=gen.vreg(1), bdreg=gen.vreg(2), cdreg=gen.vreg(cidx),
+                                a_dt=dt, b_dt=dt, c_dt=dt)
+
+    def vmath(self, gen, dt : adt = adt.FP32,
+              scheme : poly_scheme = poly_scheme.HORNER) -> vmath:
+        """
+        Returns a function generator, v0 and v1 are reserved for the argument
+        and the result
+        """
+        rt = reg_tracker(reg_type_init_list=[
+            ("greg", gen.max_gregs),
+            ("vreg", gen.max_vregs),
+            ])
+        rt.reserve_specific_reg("vreg", 0)
+        rt.reserve_specific_reg("vreg", 1)
+        return vmath(gen=gen, rt=rt, dt=dt, scheme=scheme)
+
+    def test_opd3(self):
+        """
+        Tests fmax, fmin and fdiv, SVE only has the destructive forms
+        """
+        gen = self.gen(neon)
+        self.assertEqual("fmax v3.4s,v1.4s,v2.4s\n", self.opd3(gen, "fmax", adt.FP32, 3))
+        self.assertEqual("fdiv v1.2d,v1.2d,v2.2d\n", self.opd3(gen, "fdiv", adt.FP64))
+        with self.assertRaises(ValueError):
+            self.opd3(gen, "fmin", adt.SINT32)
+
+        gen = self.gen(sve)
+        self.assertEqual("fmin z1.h,p0/m,z1.h,z2.h\n", self.opd3(gen, "fmin", adt.FP16))
+        self.assertEqual("fdiv z1.s,p0/m,z1.s,z2.s\n", self.opd3(gen, "fdiv", adt.FP32))
+        with self.assertRaises(ValueError):
+            self.opd3(gen, "fdiv", adt.FP32, 3)
+
+        gen = self.gen(fma256)
+        self.assertEqual("vmaxps %ymm1,%ymm2,%ymm3\n", self.opd3(gen, "fmax", adt.FP32, 3))
+        # AT&T order: the divisor comes first
+        self.assertEqual("vdivps %ymm2,%ymm1,%ymm1\n", self.opd3(gen, "fdiv", adt.FP32))
+
+        gen = self.gen(rvv)
+        self.assertEqual("vfmax.vv v1,v1,v2\n", self.opd3(gen, "fmax", adt.FP32))
+        self.assertEqual("vfdiv.vv v3,v1,v2\n", self.opd3(gen, "fdiv", adt.FP64, 3))
+
+    def test_exponent_helpers(self):
+        """
+        Tests scale_pow2, split_exponent and load_data_address
+        """
+        def helpers(gen, dt):
+            return (gen.scale_pow2(vreg=gen.vreg(0), nreg=gen.vreg(1), dt=dt) +
+                    gen.split_exponent(vreg=gen.vreg(0), ereg=gen.vreg(1),
+                                       offreg=gen.vreg(2), tmpreg=gen.vreg(3), dt=dt) +
+                    gen.load_data_address(areg=gen.greg(0), name="consts"))
+
+        self.assertEqual(
+                "shl v1.4s,v1.4s,#23\n"
+                "add v0.4s,v0.4s,v1.4s\n"
+                "sub v1.4s,v0.4s,v2.4s\n"
+                "sshr v1.4s,v1.4s,#23\n"
+                "shl v3.4s,v1.4s,#23\n"
+                "sub v0.4s,v0.4s,v3.4s\n"
+                "adr x0,.consts\n",
+                helpers(self.gen(neon), adt.FP32))
+        self.assertEqual(
+                "fscale z0.d,p0/m,z0.d,z1.d\n"
+                "sub z1.d,z0.d,z2.d\n"
+                "asr z1.d,z1.d,#52\n"
+                "lsl z3.d,z1.d,#52\n"
+                "sub z0.d,z0.d,z3.d\n"
+                "adr x0,.consts\n",
+                helpers(self.gen(sve), adt.FP64))
+        # The shifts are split to fit the 5 bit immediates
+        self.assertEqual(
+                "vsll.vi v1,v1,31\n"
+                "vsll.vi v1,v1,21\n"
+                "vadd.vv v0,v0,v1\n"
+                "vsub.vv v1,v0,v2\n"
+                "vsra.vi v1,v1,31\n"
+                "vsra.vi v1,v1,21\n"
+                "vsll.vi v3,v1,31\n"
+                "vsll.vi v3,v3,21\n"
+                "vsub.vv v0,v0,v3\n"
+                "lla t0,.consts\n",
+                helpers(self.gen(rvv), adt.FP64))
+        self.assertEqual(
+                "vpsllw $10,%zmm1,%zmm1\n"
+                "vpaddw %zmm1,%zmm0,%zmm0\n"
+                "vpsubw %zmm2,%zmm0,%zmm1\n"
+                "vpsraw $10,%zmm1,%zmm1\n"
+                "vpsllw $10,%zmm1,%zmm3\n"
+                "vpsubw %zmm3,%zmm0,%zmm0\n"
+                "lea .consts(%rip),%r8\n",
+                helpers(self.gen(avx512), adt.FP16))
+        gen = self.gen(fma256)
+        gen.set_output_inline(yesno=True)
+        self.assertIn("lea .consts%=(%%rip),%%r8",
+                      gen.load_data_address(areg=gen.greg(0), name="consts"))
+        gen.set_output_inline(yesno=False)
+        with self.assertRaises(ValueError):
+            helpers(gen, adt.FP64)
+        with self.assertRaises(ValueError):
+            gen.scale_pow2(vreg=gen.vreg(0), nreg=gen.vreg(1), dt=adt.SINT32)
+
+    def test_fp_encoding(self):
+        """
+        Tests that FP constants are rounded to the data type
+        """
+        self.assertEqual(".long 0x3f800000", str(asm_data(adt.FP32, 1.0)))
+        self.assertEqual(".long 0x3dcccccd", str(asm_data(adt.FP32, 0.1)))
+        self.assertEqual(".short 0xc100", str(asm_data(adt.FP16, -2.5)))
+        self.assertEqual(".short 0x7c00", str(asm_data(adt.FP16, 65520.0)))
+        self.assertEqual(".short 0x1", str(asm_data(adt.FP16, 2**-24)))
+        self.assertEqual(".quad 0x3fb999999999999a", str(asm_data(adt.FP64, 0.1)))
+
+    def test_coefficients(self):
+        """
+        Tests that the rounded polynomials reach the accuracy targets
+        """
+        for dt in [adt.FP16, adt.FP32, adt.FP64]:
+            tolerance = vmath_accuracy[dt]/4
+            for func,ref,lo,hi in [("exp", math.exp, -0.35, 0.35),
+                                   ("log", lambda f: math.log1p(f)/f, -0.34, 0.34)]:
+                coeffs = vmath_coefficients(func, dt)
+                for i in range(1, 101):
+                    x = lo + (hi-lo)*i/101
+                    value = sum(c*x**k for k,c in enumerate(coeffs))
+                    self.assertLess(abs(value/ref(x)-1), max(tolerance, 2**-50),
+                                    f"{func} {dt} {x}")
+        self.assertEqual(6, len(vmath_coefficients("exp", adt.FP32))-1)
+        with self.assertRaises(ValueError):
+            vmath_coefficients("exp", adt.BF16)
+
+    def test_constants(self):
+        """
+        Tests that the constants are stored in the ISA data in consumption order
+        """
+        gen = self.gen(fma256)
+        kernel = self.vmath(gen)
+        asm = kernel.exp(dst=gen.vreg(0), src=gen.vreg(0))
+        self.assertTrue(asm.startswith(
+                "lea .vmath_exp_single_horner(%rip),%r8\n"
+                "vbroadcastss (%r8),%ymm4\n"
+                "vmaxps %ymm4,%ymm0,%ymm4\n"
+                "vbroadcastss 4(%r8),%ymm2\n"
+                "vminps %ymm4,%ymm2,%ymm4\n"))
+        self.assertTrue(asm.endswith(
+                "vpslld $23,%ymm5,%ymm5\n"
+                "vpaddd %ymm5,%ymm0,%ymm0\n"))
+        table = gen.asmdata["vmath_exp_single_horner"]
+        # lower clamp -125*ln2, upper clamp 127*ln2, 1/ln2, -ln2 (high part)
+        self.assertEqual([".long 0xc2ad496b", ".long 0x42b00f34",
+                          ".long 0x3fb8aa3b", ".long 0xbf317200"],
+                         [str(d) for d in table[:4]])
+        # 5 range reduction constants and 7 coefficients
+        self.assertEqual(12, len(table))
+        self.assertIn("vbroadcastss 44(%r8),%ymm0\n", asm)
+
+        gen = self.gen(neon)
+        asm = self.vmath(gen).sigmoid(dst=gen.vreg(1), src=gen.vreg(0))
+        self.assertEqual(0, asm.count("add x"))
+        self.assertEqual(len(gen.asmdata["vmath_sigmoid_single_horner"]),
+                         asm.count("], #4\n"))
+
+        gen = self.gen(rvv)
+        asm = self.vmath(gen).log(dst=gen.vreg(1), src=gen.vreg(0))
+        self.assertIn("lla t0,.vmath_log_single_horner\n"
+                      "vlse32.v v4, (t0), zero\n"
+                      "vfmax.vv v4,v4,v0\n"
+                      "add t0,t0,4\n"
+                      "vlse32.v v2, (t0), zero\n"
+                      "vsub.vv v5,v4,v2\n", asm)
+
+        gen = self.gen(sve)
+        asm = self.vmath(gen, dt=adt.FP64).tanh(dst=gen.vreg(1), src=gen.vreg(0))
+        self.assertIn("fdiv z1.d,p0/m,z1.d,z2.d\n", asm)
+        # The address is only advanced beyond the immediate offset range
+        kernel = self.vmath(gen, dt=adt.FP64)
+        asm = kernel.begin("consts")
+        for i in range(34):
+            asm += kernel.const(gen.vreg(2), i)
+        self.assertIn("ld1rd z2.d, p0/z, [x0, #248]\n"
+                      "add x0,x0,#256\n"
+                      "ld1rd z2.d, p0/z, [x0]\n"
+                      "ld1rd z2.d, p0/z, [x0, #8]\n", asm)
+        self.assertEqual(34, len(gen.asmdata["vmath_consts_double_horner"]))
+
+    def test_schemes(self):
+        """
+        Tests that Estrin evaluates the pairs independently on powers of x
+        """
+        gen = self.gen(avx512)
+        horner = self.vmath(gen).exp(dst=gen.vreg(1), src=gen.vreg(0))
+        gen = self.gen(avx512)
+        kernel = self.vmath(gen, scheme=poly_scheme.ESTRIN)
+        estrin = kernel.exp(dst=gen.vreg(1), src=gen.vreg(0))
+        # 2 range reduction fmas + 6 polynomial fmas, Estrin squares x once more
+        self.assertEqual(8, horner.count("vfmadd"))
+        self.assertEqual(9, estrin.count("vfmadd"))
+        self.assertIn("vmulps %zmm3,%zmm3,%zmm3\n", estrin)
+        # Estrin needs a register per pair
+        self.assertEqual(7, len([r for r in kernel.regs if r != 'ptr']))
+        self.assertIn("vmath_exp_single_estrin", gen.asmdata)
+
+    def test_unsupported(self):
+        """
+        Tests the requirements on the data type and the ISA
+        """
+        gen = self.gen(fma256)
+        with self.assertRaises(ValueError):
+            self.vmath(gen, dt=adt.BF16)
+        with self.assertRaises(ValueError):
+            self.vmath(gen, dt=adt.FP64).exp(dst=gen.vreg(0), src=gen.vreg(0))
+
+if __name__ == '__main__':
+    unittest.main()
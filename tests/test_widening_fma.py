@@ -0,0 +1,108 @@
+# ------------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@fz-juelich.de>
+# Copyright (C) 2021 Stepan Nassyr <s.nassyr@xcpp.org>
+# ------------------------------------------------------------------------------
+"""
+Tests the ISA-independent widening fma lowering
+"""
+import unittest
+
+from asmgen.registers import asm_data_type as adt, reg_tracker
+from asmgen.asmblocks.operations import opd3_modifier as mod
+from asmgen.asmblocks.neon import neon
+from asmgen.asmblocks.sve import sve
+from asmgen.asmblocks.rvv import rvv
+from asmgen.asmblocks.avx_fma import fma256
+
+from .asm_testcase import asm_testcase
+
+class test_widening_fma(asm_testcase):
+    """
+    Tests widening_fma and the C register allocation on the different ISAs
+    """
+
+    def gen_tracked(self, cls):
+        """
+        Returns a generator producing normal ASM and a register tracker for it
+        """
+        gen = self.gen(cls)
+        return gen, reg_tracker([('vreg', gen.max_vregs)])
+
+    def test_split(self):
+        """
+        Tests the lowering to one instruction per part
+        """
+        gen,rt = self.gen_tracked(sve)
+        cregs = gen.reserve_widening_cregs(rt=rt, a_dt=adt.SINT8, c_dt=adt.SINT32)
+        self.assertEqual(4, len(cregs))
+        self.assertEqual(
+                "fmlalb z0.s,z4.h,z5.h\n"
+                "fmlalt z1.s,z4.h,z5.h\n",
+                gen.widening_fma(adreg=gen.vreg(4), bdreg=gen.vreg(5),
+                                 cdregs=cregs[:2],
+                                 a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP32))
+        self.assertEqual(
+                "fmla z0.s,p0/m,z4.s,z5.s\n",
+                gen.widening_fma(adreg=gen.vreg(4), bdreg=gen.vreg(5),
+                                 cdregs=cregs[:1],
+                                 a_dt=adt.FP32, b_dt=adt.FP32, c_dt=adt.FP32))
+        with self.assertRaises(ValueError):
+            gen.widening_fma(adreg=gen.vreg(4), bdreg=gen.vreg(5),
+                             cdregs=cregs[:1],
+                             a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP32)
+
+    def test_neon(self):
+        """
+        Tests the NEON low/high half instructions
+        """
+        gen = self.gen(neon)
+        self.assertEqual(
+                "fmlsl v0.4s,v4.4h,v5.4h\n"
+                "fmlsl2 v1.4s,v4.4h,v5.4h\n",
+                gen.widening_fma(adreg=gen.vreg(4), bdreg=gen.vreg(5),
+                                 cdregs=[gen.vreg(0), gen.vreg(1)],
+                                 a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP32,
+                                 modifiers={mod.NP}))
+        self.assertEqual(
+                "umlal v0.4s,v4.4h,v5.4h\n"
+                "umlal2 v1.4s,v4.8h,v5.8h\n",
+                gen.widening_fma(adreg=gen.vreg(4), bdreg=gen.vreg(5),
+                                 cdregs=[gen.vreg(0), gen.vreg(1)],
+                                 a_dt=adt.UINT16, b_dt=adt.UINT16, c_dt=adt.UINT32))
+        with self.assertRaises(ValueError):
+            gen.widening_fma(adreg=gen.vreg(4), bdreg=gen.vreg(5),
+                             cdregs=[gen.vreg(i) for i in range(4)],
+                             a_dt=adt.SINT8, b_dt=adt.SINT8, c_dt=adt.SINT32)
+
+    def test_vec_group(self):
+        """
+        Tests the lowering to a single instruction on an aligned register group
+        """
+        gen,rt = self.gen_tracked(rvv)
+        gen.set_parameter("LMUL", 2)
+        rt.reserve_specific_reg('vreg', 0)
+        cregs = gen.reserve_widening_cregs(rt=rt, a_dt=adt.FP16, c_dt=adt.FP32)
+        self.assertEqual(["v4", "v6"], [str(r) for r in cregs])
+        self.assertEqual({0,2,3}, rt.get_used_regs('vreg'))
+        self.assertEqual(
+                "vfwmacc.vv v4,v10,v2\n",
+                gen.widening_fma(adreg=gen.vreg(1), bdreg=gen.vreg(5),
+                                 cdregs=cregs,
+                                 a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP32))
+        with self.assertRaises(ValueError):
+            gen.widening_fma(adreg=gen.vreg(1), bdreg=gen.vreg(5),
+                             cdregs=[gen.vreg(3), gen.vreg(4)],
+                             a_dt=adt.FP16, b_dt=adt.FP16, c_dt=adt.FP32)
+
+    def test_none(self):
+        """
+        Tests that ISAs without widening instructions raise an error
+        """
+        gen,rt = self.gen_tracked(fma256)
+        self.assertEqual(1, gen.widening_fma_cregs(a_dt=adt.FP32, c_dt=adt.FP32))
+        with self.assertRaises(ValueError):
+            gen.reserve_widening_cregs(rt=rt, a_dt=adt.FP16, c_dt=adt.FP32)
+
+if __name__ == '__main__':
+    unittest.main()
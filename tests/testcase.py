@@ -18,3 +18,4 @@ class testcase:
     cxx_name : str
     name : str
     allowed : list[str]
+    skipped_tests : dict[str,str]